@@ -0,0 +1,172 @@
+"""
+Game Statistics - Estadísticas de las partidas terminadas en la aplicación.
+
+Los servicios de estadísticas del dominio se actualizan de forma
+incremental, pero no son seguros entre hilos. Este coordinador los agrupa,
+se registra como oyente de partidas terminadas de MakeMoveUseCase y
+serializa su acceso con un lock, de modo que los adaptadores web pueden
+alimentarlos desde cualquier hilo o actor de sesión.
+"""
+
+from typing import Dict, Any, List, Optional
+from dataclasses import asdict
+import threading
+
+from game.entities import GameSession
+from game.services.game_history import GameHistory
+from game.services.ranking_service import RankingService
+from game.services.statistics_aggregator import StatisticsAggregator
+from game.services.statistics_rollups import StatisticsRollups
+from game.services.statistics_tracker import StatisticsTracker, StatisticsPeriod
+from persistence.repositories.player_repository import PlayerRepository
+
+
+class GameStatisticsCoordinator:
+    """
+    Coordinador de las estadísticas de partidas terminadas.
+    
+    Mantiene el agregado de estadísticas globales, el historial acotado de
+    partidas de cada jugador, los agregados por hora, día y mes y la
+    clasificación por puntuación (RankingService), todos incrementales.
+    
+    Con un repositorio de jugadores, guarda además a los jugadores de cada
+    partida terminada, de modo que su índice de clasificación se mantiene
+    al día y get_statistics publica los mejores jugadores.
+    
+    Principios aplicados:
+    - Las reglas de las estadísticas siguen en los servicios del dominio
+    - Un solo punto de entrada (record_game_result) para todos ellos
+    """
+    
+    LEADERBOARD_SIZE = 10
+    
+    # Períodos publicados en las métricas cuando hay agregados por franjas
+    METRIC_PERIODS = (StatisticsPeriod.TODAY, StatisticsPeriod.WEEK)
+    
+    def __init__(
+        self,
+        tracker: Optional[StatisticsTracker] = None,
+        ranking: Optional[RankingService] = None,
+        player_repository: Optional[PlayerRepository] = None
+    ):
+        """
+        Inicializa el coordinador.
+        
+        Args:
+            tracker: Rastreador de estadísticas (por defecto, uno con
+                agregado incremental de estadísticas globales, historial
+                de partidas por jugador y agregados por franjas)
+            ranking: Clasificación por puntuación (por defecto, una vacía)
+            player_repository: Repositorio opcional donde se guardan los
+                jugadores de las partidas terminadas
+        """
+        self._tracker = tracker or StatisticsTracker(
+            aggregator=StatisticsAggregator(),
+            history=GameHistory(),
+            rollups=StatisticsRollups()
+        )
+        self._ranking = ranking or RankingService()
+        self._player_repository = player_repository
+        self._lock = threading.Lock()
+        self._games_recorded = 0
+    
+    def register(self, make_move_use_case: Any) -> None:
+        """
+        Se registra como oyente de partidas terminadas de un caso de uso.
+        
+        Args:
+            make_move_use_case: Caso de uso con add_game_finished_listener
+        """
+        make_move_use_case.add_game_finished_listener(self.record_game_result)
+    
+    def record_game_result(self, game_session: GameSession) -> None:
+        """
+        Agrega una partida terminada a todos los servicios de estadísticas.
+        
+        Args:
+            game_session: Sesión de juego terminada
+        """
+        if not game_session.is_finished():
+            return
+        
+        with self._lock:
+            self._games_recorded += 1
+            if self._tracker.aggregator is not None:
+                self._tracker.aggregator.record_game_result(game_session)
+            if self._tracker.history is not None:
+                self._tracker.history.record_game_result(game_session)
+            if self._tracker.rollups is not None:
+                self._tracker.rollups.record_game_result(game_session)
+            self._ranking.record_game_result(game_session)
+        
+        # El repositorio tiene su propio lock
+        if self._player_repository is not None:
+            for player in game_session.players:
+                self._player_repository.save(player)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene las estadísticas agregadas para el endpoint de métricas.
+        
+        Returns:
+            Diccionario con las partidas registradas, las estadísticas
+            globales (y por período, con agregados por franjas), los
+            mejores por puntuación y, con repositorio de jugadores, su
+            clasificación por tasa de victorias
+        """
+        with self._lock:
+            statistics = {
+                'games_recorded': self._games_recorded,
+                'global': self._tracker.get_global_statistics(),
+                'ranking': [asdict(entry) for entry in self._ranking.get_top(self.LEADERBOARD_SIZE)]
+            }
+            if self._tracker.rollups is not None:
+                statistics['periods'] = {
+                    period.value: self._tracker.get_global_statistics(period=period)
+                    for period in self.METRIC_PERIODS
+                }
+        
+        if self._player_repository is not None:
+            statistics['leaderboard'] = self._get_leaderboard()
+        return statistics
+    
+    def get_player_statistics(self, player_id: str, period: str = 'all_time') -> Optional[Dict[str, Any]]:
+        """
+        Obtiene las estadísticas de un jugador a partir de su historial.
+        
+        Args:
+            player_id: ID del jugador
+            period: Período (valor de StatisticsPeriod: today, week...)
+            
+        Returns:
+            Estadísticas del jugador, o None si no hay repositorio de
+            jugadores o el jugador no existe
+            
+        Raises:
+            ValueError: Si el período no es válido
+        """
+        statistics_period = StatisticsPeriod(period)
+        if self._player_repository is None:
+            return None
+        
+        player = self._player_repository.get_by_id(player_id)
+        if player is None:
+            return None
+        
+        with self._lock:
+            return asdict(self._tracker.get_player_statistics(player, statistics_period))
+    
+    def _get_leaderboard(self) -> List[Dict[str, Any]]:
+        """Mejores jugadores guardados en el repositorio."""
+        return [
+            {
+                'rank': rank,
+                'player_id': player.id,
+                'name': player.name,
+                'win_rate': player.stats.win_rate,
+                'games_played': player.stats.games_played
+            }
+            for rank, player in enumerate(
+                self._player_repository.get_top_players(self.LEADERBOARD_SIZE), start=1
+            )
+        ]
@@ -0,0 +1,486 @@
+"""
+Matchmaking - Emparejamiento de jugadores humanos en línea.
+
+/api/game/start crea los dos jugadores en el mismo navegador. Este
+coordinador mantiene una cola de espera por modalidad (por ejemplo,
+'casual' o 'ranked'), ordenada por valoración, y empareja a los jugadores
+por lotes en cada tick: cada jugador busca al rival de valoración más
+cercana con una búsqueda binaria, dentro de una ventana que se amplía
+cuanto más tiempo lleva esperando.
+
+La partida se crea con StartNewGameUseCase y se notifica a ambos jugadores
+a través de su función on_match o, para clientes HTTP, con poll.
+"""
+
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from dataclasses import dataclass
+import bisect
+import itertools
+import math
+import threading
+import time
+import uuid
+
+from game.entities import GameSession
+from game.use_cases.start_new_game import StartNewGameRequest, StartNewGameUseCase
+
+
+@dataclass(frozen=True)
+class MatchTicket:
+    """Jugador en la cola de emparejamiento."""
+    ticket_id: str
+    player_name: str
+    rating: float
+    queue: str
+    enqueued_at: float
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    """Partida asignada a uno de los dos jugadores emparejados."""
+    ticket_id: str
+    game_session_id: str
+    player_id: str
+    symbol: str
+    opponent_name: str
+    opponent_rating: float
+
+
+# Entrada de la lista ordenada de una cola: (valoración, orden de llegada, ticket)
+_Entry = Tuple[float, int, str]
+
+# Ticket retirado de la cola junto con su orden de llegada
+_Queued = Tuple[MatchTicket, int]
+
+
+class _QueueBucket:
+    """Jugadores en espera de una modalidad, ordenados por valoración."""
+    
+    def __init__(self):
+        self.entries: List[_Entry] = []
+        self.tickets: Dict[str, Tuple[MatchTicket, int]] = {}  # En orden de llegada
+    
+    def add(self, ticket: MatchTicket, sequence: int) -> None:
+        """Inserta un ticket manteniendo el orden por valoración."""
+        bisect.insort(self.entries, (ticket.rating, sequence, ticket.ticket_id))
+        self.tickets[ticket.ticket_id] = (ticket, sequence)
+    
+    def remove(self, ticket_id: str) -> Optional[MatchTicket]:
+        """Retira un ticket; devuelve None si no estaba en la cola."""
+        item = self.tickets.pop(ticket_id, None)
+        if item is None:
+            return None
+        
+        ticket, sequence = item
+        del self.entries[self.index_of(ticket, sequence)]
+        return ticket
+    
+    def index_of(self, ticket: MatchTicket, sequence: int) -> int:
+        """Posición de un ticket en la lista ordenada (búsqueda binaria)."""
+        return bisect.bisect_left(self.entries, (ticket.rating, sequence, ticket.ticket_id))
+
+
+class MatchmakingCoordinator:
+    """
+    Cola de emparejamiento con búsqueda del rival más cercano.
+    
+    Cada modalidad mantiene una lista ordenada por valoración, de modo que
+    el rival más cercano de un jugador es uno de sus dos vecinos y se
+    localiza en O(log n). Un tick recorre los jugadores por orden de
+    llegada (los que más esperan eligen primero) y forma todas las parejas
+    posibles en una pasada, en O(n log n) para n jugadores en espera.
+    
+    La ventana de valoración aceptable empieza en `rating_window` y crece
+    `window_growth` puntos por segundo de espera, hasta `max_rating_window`.
+    
+    Principios aplicados:
+    - Es un COORDINADOR de aplicación, no dominio
+    - Crea las partidas con el caso de uso StartNewGame
+    - Las notificaciones se envían fuera del lock de la cola
+    """
+    
+    DEFAULT_QUEUE = "casual"
+    DEFAULT_RATING = 1500.0
+    
+    def __init__(
+        self,
+        game_repository=None,
+        start_game_use_case: Optional[StartNewGameUseCase] = None,
+        rating_window: float = 100.0,
+        window_growth: float = 25.0,
+        max_rating_window: float = 800.0,
+        tick_interval: float = 1.0,
+        result_ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicializa el coordinador de emparejamiento.
+        
+        Args:
+            game_repository: Repositorio opcional donde guardar las partidas
+                creadas (GameRepository)
+            start_game_use_case: Caso de uso para crear las partidas
+            rating_window: Diferencia de valoración aceptada al entrar en cola
+            window_growth: Puntos que crece la ventana por segundo de espera
+            max_rating_window: Ventana máxima de valoración
+            tick_interval: Segundos entre ticks del hilo en segundo plano
+            result_ttl: Segundos que se conserva un emparejamiento sin recoger
+            clock: Reloj compatible con time.monotonic
+            
+        Raises:
+            ValueError: Si los parámetros no son válidos
+        """
+        if rating_window < 0 or window_growth < 0:
+            raise ValueError("La ventana de valoración no puede ser negativa")
+        if max_rating_window < rating_window:
+            raise ValueError("La ventana máxima debe ser al menos la ventana inicial")
+        if tick_interval <= 0:
+            raise ValueError("El intervalo entre ticks debe ser positivo")
+        
+        self._game_repository = game_repository
+        self._start_game_use_case = start_game_use_case or StartNewGameUseCase()
+        self._rating_window = rating_window
+        self._window_growth = window_growth
+        self._max_rating_window = max_rating_window
+        self._tick_interval = tick_interval
+        self._result_ttl = result_ttl
+        self._clock = clock
+        
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._buckets: Dict[str, _QueueBucket] = {}
+        self._ticket_queues: Dict[str, str] = {}
+        self._listeners: Dict[str, Callable[[MatchResult], None]] = {}
+        self._results: Dict[str, Tuple[MatchResult, float]] = {}
+        
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        self._matches_total = 0
+        self._ticks = 0
+        self._failed_matches = 0
+    
+    @property
+    def is_running(self) -> bool:
+        """Indica si el hilo de emparejamiento está activo."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def waiting_players(self) -> int:
+        """Jugadores en espera en todas las modalidades."""
+        return len(self._ticket_queues)
+    
+    def enqueue(
+        self,
+        player_name: str,
+        rating: float = DEFAULT_RATING,
+        queue: str = DEFAULT_QUEUE,
+        on_match: Optional[Callable[[MatchResult], None]] = None
+    ) -> str:
+        """
+        Añade un jugador a la cola de una modalidad.
+        
+        Args:
+            player_name: Nombre del jugador
+            rating: Valoración del jugador
+            queue: Modalidad o nivel en el que busca rival
+            on_match: Función opcional que recibe el MatchResult del jugador
+            
+        Returns:
+            ID del ticket de espera
+            
+        Raises:
+            ValueError: Si el nombre, la valoración o la modalidad no son válidos
+        """
+        name = (player_name or "").strip()
+        if len(name) < 2 or len(name) > 50:
+            raise ValueError("El nombre del jugador debe tener entre 2 y 50 caracteres")
+        if not queue:
+            raise ValueError("La modalidad de la cola es obligatoria")
+        
+        # NaN rompería el orden de la lista y un infinito la ventana de valoración
+        rating = float(rating)
+        if not math.isfinite(rating):
+            raise ValueError("La valoración debe ser un número finito")
+        
+        ticket = MatchTicket(
+            ticket_id=str(uuid.uuid4()),
+            player_name=name,
+            rating=rating,
+            queue=queue,
+            enqueued_at=self._clock()
+        )
+        
+        with self._lock:
+            self._insert(ticket, next(self._sequence))
+            if on_match is not None:
+                self._listeners[ticket.ticket_id] = on_match
+        
+        return ticket.ticket_id
+    
+    def cancel(self, ticket_id: str) -> bool:
+        """
+        Retira a un jugador de la cola.
+        
+        Args:
+            ticket_id: ID del ticket de espera
+            
+        Returns:
+            True si el jugador seguía en espera
+        """
+        with self._lock:
+            self._listeners.pop(ticket_id, None)
+            return self._remove(ticket_id) is not None
+    
+    def is_waiting(self, ticket_id: str) -> bool:
+        """
+        Indica si un ticket sigue en la cola.
+        
+        Args:
+            ticket_id: ID del ticket de espera
+            
+        Returns:
+            True si el jugador aún no tiene rival
+        """
+        return ticket_id in self._ticket_queues
+    
+    def poll(self, ticket_id: str) -> Optional[MatchResult]:
+        """
+        Consulta el emparejamiento de un ticket, si ya lo hay.
+        
+        El resultado se conserva hasta que caduca (result_ttl), de modo que
+        un cliente que pierde la respuesta puede volver a consultarlo.
+        
+        Args:
+            ticket_id: ID del ticket de espera
+            
+        Returns:
+            Partida asignada al jugador, o None si sigue esperando, el
+            ticket no existe o su resultado ha caducado
+        """
+        with self._lock:
+            item = self._results.get(ticket_id)
+        if item is None or item[1] <= self._clock():
+            return None
+        return item[0]
+    
+    def tick(self, now: Optional[float] = None) -> int:
+        """
+        Empareja en una pasada a todos los jugadores compatibles.
+        
+        Args:
+            now: Instante del tick (por defecto, el reloj del coordinador)
+            
+        Returns:
+            Número de partidas creadas
+        """
+        now = self._clock() if now is None else now
+        
+        with self._lock:
+            pairs = []
+            for bucket in self._buckets.values():
+                pairs.extend(self._pair_bucket(bucket, now))
+            
+            for ticket, _ in itertools.chain.from_iterable(pairs):
+                del self._ticket_queues[ticket.ticket_id]
+            
+            expired = [key for key, (_, expires_at) in self._results.items() if expires_at <= now]
+            for key in expired:
+                del self._results[key]
+            
+            self._ticks += 1
+        
+        created = 0
+        for first, second in pairs:
+            if self._create_match(first, second, now):
+                created += 1
+        
+        return created
+    
+    def start(self) -> None:
+        """Inicia los ticks periódicos en un hilo en segundo plano."""
+        if self.is_running:
+            return
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="matchmaking",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Detiene los ticks periódicos.
+        
+        Args:
+            timeout: Segundos máximos de espera por el hilo
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene las métricas del emparejamiento.
+        
+        Returns:
+            Diccionario con jugadores en espera por modalidad y partidas creadas
+        """
+        with self._lock:
+            return {
+                'waiting_players': len(self._ticket_queues),
+                'waiting_by_queue': {
+                    queue: len(bucket.tickets)
+                    for queue, bucket in self._buckets.items() if bucket.tickets
+                },
+                'pending_results': len(self._results),
+                'matches_total': self._matches_total,
+                'failed_matches': self._failed_matches,
+                'ticks': self._ticks,
+                'running': self.is_running
+            }
+    
+    def _run(self) -> None:
+        """Bucle del hilo en segundo plano."""
+        while not self._stop_event.wait(self._tick_interval):
+            try:
+                self.tick()
+            except Exception:
+                continue  # Un tick fallido no debe detener el hilo
+    
+    def _insert(self, ticket: MatchTicket, sequence: int) -> None:
+        """Añade un ticket a su cola (con el lock adquirido)."""
+        bucket = self._buckets.get(ticket.queue)
+        if bucket is None:
+            bucket = self._buckets[ticket.queue] = _QueueBucket()
+        bucket.add(ticket, sequence)
+        self._ticket_queues[ticket.ticket_id] = ticket.queue
+    
+    def _remove(self, ticket_id: str) -> Optional[MatchTicket]:
+        """Retira un ticket de su cola (con el lock adquirido)."""
+        queue = self._ticket_queues.pop(ticket_id, None)
+        if queue is None:
+            return None
+        return self._buckets[queue].remove(ticket_id)
+    
+    def _window(self, ticket: MatchTicket, now: float) -> float:
+        """Diferencia de valoración que acepta un jugador tras su espera."""
+        waited = max(0.0, now - ticket.enqueued_at)
+        return min(self._max_rating_window, self._rating_window + self._window_growth * waited)
+    
+    def _pair_bucket(self, bucket: _QueueBucket, now: float) -> List[Tuple[_Queued, _Queued]]:
+        """
+        Forma las parejas de una cola (con el lock adquirido).
+        
+        Args:
+            bucket: Cola de la modalidad
+            now: Instante del tick
+            
+        Returns:
+            Parejas (jugador que más esperaba, rival), cada uno con su orden
+            de llegada
+        """
+        pairs = []
+        
+        for ticket, sequence in list(bucket.tickets.values()):
+            if ticket.ticket_id not in bucket.tickets:
+                continue  # Ya emparejado en este tick
+            
+            entries = bucket.entries
+            index = bucket.index_of(ticket, sequence)
+            
+            best = None
+            for neighbour in (index - 1, index + 1):
+                if not 0 <= neighbour < len(entries):
+                    continue
+                rating, other_sequence, other_id = entries[neighbour]
+                other = bucket.tickets[other_id][0]
+                if other.player_name.lower() == ticket.player_name.lower():
+                    continue  # StartNewGame exige nombres diferentes
+                key = (abs(rating - ticket.rating), other_sequence)
+                if best is None or key < best[0]:
+                    best = (key, other)
+            
+            if best is None or best[0][0] > self._window(ticket, now):
+                continue
+            
+            opponent = best[1]
+            bucket.remove(ticket.ticket_id)
+            bucket.remove(opponent.ticket_id)
+            pairs.append(((ticket, sequence), (opponent, best[0][1])))
+        
+        return pairs
+    
+    def _create_match(self, first_queued: _Queued, second_queued: _Queued, now: float) -> bool:
+        """
+        Crea la partida de una pareja y notifica a ambos jugadores.
+        
+        Si la partida no se puede crear, los dos jugadores vuelven a la cola
+        con su orden de llegada original, conservando su antigüedad.
+        
+        Args:
+            first_queued: Jugador que más esperaba (juega con X) y su orden
+            second_queued: Rival (juega con O) y su orden
+            now: Instante del tick
+            
+        Returns:
+            True si la partida se creó
+        """
+        first, second = first_queued[0], second_queued[0]
+        game_session: Optional[GameSession] = None
+        try:
+            response = self._start_game_use_case.execute(StartNewGameRequest(
+                player1_name=first.player_name,
+                player2_name=second.player_name
+            ))
+            if response.success and response.game_session:
+                game_session = response.game_session
+                if self._game_repository is not None:
+                    self._game_repository.save(game_session)
+        except Exception:
+            game_session = None
+        
+        if game_session is None:
+            with self._lock:
+                self._failed_matches += 1
+                for ticket, sequence in (first_queued, second_queued):
+                    self._insert(ticket, sequence)
+            return False
+        
+        results = (
+            MatchResult(
+                ticket_id=first.ticket_id,
+                game_session_id=game_session.id,
+                player_id=game_session.player_x.id,
+                symbol="X",
+                opponent_name=second.player_name,
+                opponent_rating=second.rating
+            ),
+            MatchResult(
+                ticket_id=second.ticket_id,
+                game_session_id=game_session.id,
+                player_id=game_session.player_o.id,
+                symbol="O",
+                opponent_name=first.player_name,
+                opponent_rating=first.rating
+            )
+        )
+        
+        with self._lock:
+            self._matches_total += 1
+            listeners = [self._listeners.pop(result.ticket_id, None) for result in results]
+            for result, listener in zip(results, listeners):
+                if listener is None:
+                    self._results[result.ticket_id] = (result, now + self._result_ttl)
+        
+        for result, listener in zip(results, listeners):
+            if listener is not None:
+                try:
+                    listener(result)
+                except Exception:
+                    pass
+        
+        return True
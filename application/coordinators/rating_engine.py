@@ -0,0 +1,500 @@
+"""
+Rating Engine - Valoración Elo y Glicko-2 de jugadores por lotes.
+
+ScoreCalculator suma puntos por resultado sin tener en cuenta la fuerza
+del rival. Este coordinador mantiene una valoración (Elo o Glicko-2) por
+jugador y procesa los resultados por lotes: cada lote es un período de
+valoración cuyas actualizaciones se calculan de forma vectorizada con
+NumPy sobre todas las partidas del lote a la vez.
+
+La misma maquinaria permite recalcular toda la clasificación desde el
+archivo binario de partidas terminadas, agrupando las partidas en
+períodos por fecha de finalización.
+"""
+
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from dataclasses import dataclass
+from enum import Enum
+import math
+import threading
+
+from game.entities import GameSession, GameResult
+from persistence.data_sources.game_archive import GameArchiveReader, RESULT_CODES
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo necesita RatingEngine
+    np = None
+
+
+class RatingSystem(Enum):
+    """Sistemas de valoración soportados."""
+    ELO = "elo"
+    GLICKO2 = "glicko2"
+
+
+@dataclass(frozen=True)
+class PlayerRating:
+    """Valoración de un jugador."""
+    player_id: str
+    rating: float
+    deviation: float
+    volatility: float
+    games_played: int
+
+
+# Partida valorada: (jugador A, jugador B, puntuación de A: 1, 0.5 o 0)
+RatedGame = Tuple[str, str, float]
+
+# Escala de Glicko-2 (Glickman, "Example of the Glicko-2 system")
+GLICKO2_SCALE = 173.7178
+_CONVERGENCE_TOLERANCE = 1e-6
+_MAX_ITERATIONS = 100
+
+
+class RatingEngine:
+    """
+    Motor de valoración de jugadores por períodos.
+    
+    Las valoraciones se guardan en arrays indexados por jugador, por lo que
+    un lote de N partidas se procesa con operaciones vectorizadas sobre N
+    elementos y acumulaciones con np.add.at, sin bucles por partida:
+    - Elo: todos los resultados del lote se calculan con las valoraciones
+      del inicio del lote y sus cambios se suman al final
+    - Glicko-2: el lote es un período de valoración; la volatilidad se
+      resuelve con el algoritmo de Illinois vectorizado por jugador y los
+      jugadores sin partidas en el período aumentan su desviación
+      
+    Principios aplicados:
+    - Es un COORDINADOR de aplicación, no dominio
+    - Persiste las valoraciones a través de PlayerRepository
+    - NumPy es opcional para el resto de la aplicación, pero necesario aquí
+    """
+    
+    INITIAL_RATING = 1500.0
+    INITIAL_DEVIATION = 350.0
+    INITIAL_VOLATILITY = 0.06
+    
+    def __init__(
+        self,
+        system: RatingSystem = RatingSystem.ELO,
+        player_repository=None,
+        k_factor: float = 32.0,
+        tau: float = 0.5
+    ):
+        """
+        Inicializa el motor y carga las valoraciones persistidas.
+        
+        Args:
+            system: Sistema de valoración
+            player_repository: Repositorio opcional donde persistir las
+                valoraciones (PlayerRepository)
+            k_factor: Factor K de Elo
+            tau: Restricción del cambio de volatilidad de Glicko-2
+            
+        Raises:
+            ImportError: Si NumPy no está instalado
+            ValueError: Si los parámetros no son positivos
+        """
+        if np is None:
+            raise ImportError("NumPy es necesario para RatingEngine")
+        if k_factor <= 0:
+            raise ValueError("El factor K debe ser positivo")
+        if tau <= 0:
+            raise ValueError("El parámetro tau debe ser positivo")
+        
+        self._system = system
+        self._player_repository = player_repository
+        self._k_factor = k_factor
+        self._tau = tau
+        self._lock = threading.Lock()
+        self._pending: List[RatedGame] = []
+        
+        self._reset()
+        
+        if player_repository is not None:
+            self._load(player_repository.get_all_ratings(system.value))
+    
+    @property
+    def system(self) -> RatingSystem:
+        """Sistema de valoración del motor."""
+        return self._system
+    
+    @property
+    def pending_games(self) -> int:
+        """Partidas registradas pendientes de procesar."""
+        return len(self._pending)
+    
+    def get_rating(self, player_id: str) -> PlayerRating:
+        """
+        Obtiene la valoración de un jugador.
+        
+        Args:
+            player_id: ID del jugador
+            
+        Returns:
+            Valoración actual (la inicial si no ha jugado)
+        """
+        with self._lock:
+            index = self._index.get(player_id)
+            if index is None:
+                return PlayerRating(
+                    player_id, self.INITIAL_RATING, self.INITIAL_DEVIATION,
+                    self.INITIAL_VOLATILITY, 0
+                )
+            return self._rating_at(index)
+    
+    def get_leaderboard(self, limit: int = 10) -> List[PlayerRating]:
+        """
+        Obtiene los jugadores con mayor valoración.
+        
+        Args:
+            limit: Número máximo de jugadores
+            
+        Returns:
+            Valoraciones ordenadas de mayor a menor
+        """
+        with self._lock:
+            count = len(self._player_ids)
+            limit = max(0, min(limit, count))
+            if limit == 0:
+                return []
+            
+            ratings = self._ratings[:count]
+            top = np.argpartition(-ratings, limit - 1)[:limit]
+            top = top[np.argsort(-ratings[top], kind='stable')]
+            return [self._rating_at(int(index)) for index in top]
+    
+    def record_game_result(self, game_session: GameSession) -> None:
+        """
+        Registra una partida terminada para el siguiente lote.
+        
+        Puede usarse como oyente de MakeMoveUseCase; las partidas se
+        procesan al llamar a flush().
+        
+        Args:
+            game_session: Sesión de juego terminada
+        """
+        if not game_session.is_finished():
+            return
+        
+        player_x, player_o = game_session.player_x, game_session.player_o
+        score = _score_for_x(game_session.result)
+        if player_x is None or player_o is None or score is None:
+            return
+        
+        with self._lock:
+            self._pending.append((player_x.id, player_o.id, score))
+    
+    def flush(self) -> int:
+        """
+        Procesa como un lote las partidas registradas y persiste el resultado.
+        
+        Returns:
+            Número de partidas procesadas
+        """
+        with self._lock:
+            games, self._pending = self._pending, []
+        
+        if games:
+            self.process_batch(games)
+        return len(games)
+    
+    def process_batch(self, games: Iterable[RatedGame], persist: bool = True) -> int:
+        """
+        Procesa un lote de partidas como un período de valoración.
+        
+        Args:
+            games: Partidas (jugador A, jugador B, puntuación de A)
+            persist: Si se guardan las valoraciones modificadas
+            
+        Returns:
+            Número de partidas procesadas
+        """
+        games = list(games)
+        if not games:
+            return 0
+        
+        with self._lock:
+            first = np.fromiter((self._index_for(a) for a, _, _ in games), dtype=np.int64, count=len(games))
+            second = np.fromiter((self._index_for(b) for _, b, _ in games), dtype=np.int64, count=len(games))
+            scores = np.fromiter((score for _, _, score in games), dtype=np.float64, count=len(games))
+            
+            self._apply(first, second, scores)
+            if self._system == RatingSystem.ELO:
+                changed = np.unique(np.concatenate([first, second]))
+            else:
+                # En Glicko-2 la desviación de todos los jugadores cambia cada período
+                changed = np.arange(len(self._player_ids))
+            updated = [self._rating_at(int(index)) for index in changed]
+        
+        if persist:
+            self._persist(updated)
+        return len(games)
+    
+    def recompute_from_archive(
+        self,
+        reader: GameArchiveReader,
+        period_seconds: float = 86400.0
+    ) -> int:
+        """
+        Recalcula todas las valoraciones desde el archivo de partidas.
+        
+        Las partidas con ganador o empate se ordenan por fecha de
+        finalización y se agrupan en períodos de `period_seconds`; cada
+        período se procesa como un lote vectorizado. Al terminar se
+        persisten todas las valoraciones.
+        
+        Args:
+            reader: Lector del archivo de partidas
+            period_seconds: Duración de cada período de valoración
+            
+        Returns:
+            Número de partidas procesadas
+            
+        Raises:
+            ValueError: Si la duración del período no es positiva
+        """
+        if period_seconds <= 0:
+            raise ValueError("La duración del período debe ser positiva")
+        
+        records = reader.to_numpy()
+        results = records['result']
+        rated = (
+            (results == RESULT_CODES[GameResult.PLAYER_X_WINS])
+            | (results == RESULT_CODES[GameResult.PLAYER_O_WINS])
+            | (results == RESULT_CODES[GameResult.DRAW])
+        )
+        records = records[rated]
+        
+        finished = np.nan_to_num(records['finished_at'], nan=0.0)
+        order = np.argsort(finished, kind='stable')
+        records, finished = records[order], finished[order]
+        
+        # Una sola pasada para asignar índices a todos los jugadores
+        ids, inverse = np.unique(
+            np.concatenate([records['player_x_id'], records['player_o_id']]),
+            return_inverse=True
+        )
+        count = len(records)
+        
+        with self._lock:
+            self._reset()
+            self._ensure_capacity(len(ids))
+            for raw_id in ids:
+                self._index_for(raw_id.decode('ascii').rstrip('\x00'))
+            
+            first, second = inverse[:count], inverse[count:]
+            scores = np.select(
+                [
+                    records['result'] == RESULT_CODES[GameResult.PLAYER_X_WINS],
+                    records['result'] == RESULT_CODES[GameResult.PLAYER_O_WINS],
+                ],
+                [1.0, 0.0],
+                default=0.5
+            )
+            
+            periods = np.floor(finished / period_seconds)
+            boundaries = np.flatnonzero(np.diff(periods)) + 1
+            starts = np.concatenate([[0], boundaries]) if count else np.array([], dtype=np.int64)
+            ends = np.concatenate([boundaries, [count]]) if count else np.array([], dtype=np.int64)
+            
+            for start, end in zip(starts, ends):
+                self._apply(first[start:end], second[start:end], scores[start:end])
+            
+            updated = [self._rating_at(index) for index in range(len(self._player_ids))]
+        
+        self._persist(updated)
+        return count
+    
+    def _apply(self, first, second, scores) -> None:
+        """Aplica un período de valoración (requiere el lock)."""
+        if self._system == RatingSystem.ELO:
+            self._apply_elo(first, second, scores)
+        else:
+            self._apply_glicko2(first, second, scores)
+        
+        np.add.at(self._games, first, 1)
+        np.add.at(self._games, second, 1)
+    
+    def _apply_elo(self, first, second, scores) -> None:
+        """Actualización Elo simultánea de todas las partidas del lote."""
+        ratings = self._ratings
+        expected = 1.0 / (1.0 + 10.0 ** ((ratings[second] - ratings[first]) / 400.0))
+        delta = self._k_factor * (scores - expected)
+        
+        change = np.zeros_like(ratings)
+        np.add.at(change, first, delta)
+        np.add.at(change, second, -delta)
+        ratings += change
+    
+    def _apply_glicko2(self, first, second, scores) -> None:
+        """Período de valoración Glicko-2 vectorizado."""
+        count = len(self._player_ids)
+        mu = (self._ratings[:count] - self.INITIAL_RATING) / GLICKO2_SCALE
+        phi = self._deviations[:count] / GLICKO2_SCALE
+        sigma = self._volatilities[:count]
+        
+        # Cada partida cuenta desde el punto de vista de ambos jugadores
+        players = np.concatenate([first, second])
+        opponents = np.concatenate([second, first])
+        outcome = np.concatenate([scores, 1.0 - scores])
+        
+        g = 1.0 / np.sqrt(1.0 + 3.0 * phi[opponents] ** 2 / math.pi ** 2)
+        expected = 1.0 / (1.0 + np.exp(-g * (mu[players] - mu[opponents])))
+        
+        inverse_variance = np.zeros(count)
+        improvement = np.zeros(count)
+        np.add.at(inverse_variance, players, g * g * expected * (1.0 - expected))
+        np.add.at(improvement, players, g * (outcome - expected))
+        
+        played = inverse_variance > 0
+        
+        # Sin partidas en el período solo aumenta la desviación
+        new_phi = np.sqrt(phi ** 2 + sigma ** 2)
+        new_mu = mu.copy()
+        new_sigma = sigma.copy()
+        
+        if played.any():
+            v = 1.0 / inverse_variance[played]
+            delta = v * improvement[played]
+            sigma_played = self._solve_volatility(phi[played], sigma[played], v, delta)
+            phi_star = np.sqrt(phi[played] ** 2 + sigma_played ** 2)
+            phi_played = 1.0 / np.sqrt(1.0 / phi_star ** 2 + 1.0 / v)
+            
+            new_phi[played] = phi_played
+            new_mu[played] = mu[played] + phi_played ** 2 * improvement[played]
+            new_sigma[played] = sigma_played
+        
+        self._ratings[:count] = new_mu * GLICKO2_SCALE + self.INITIAL_RATING
+        self._deviations[:count] = np.minimum(new_phi * GLICKO2_SCALE, self.INITIAL_DEVIATION)
+        self._volatilities[:count] = new_sigma
+    
+    def _solve_volatility(self, phi, sigma, v, delta):
+        """Nueva volatilidad por el algoritmo de Illinois, vectorizado por jugador."""
+        tau = self._tau
+        a = np.log(sigma ** 2)
+        
+        def f(x):
+            ex = np.exp(x)
+            return (
+                ex * (delta ** 2 - phi ** 2 - v - ex) / (2.0 * (phi ** 2 + v + ex) ** 2)
+                - (x - a) / tau ** 2
+            )
+        
+        upper = np.empty_like(a)
+        large = delta ** 2 > phi ** 2 + v
+        upper[large] = np.log(delta[large] ** 2 - phi[large] ** 2 - v[large])
+        
+        k = np.ones_like(a)
+        searching = ~large
+        for _ in range(_MAX_ITERATIONS):
+            if not searching.any():
+                break
+            candidate = a - k * tau
+            still_negative = searching & (f(candidate) < 0)
+            k[still_negative] += 1
+            searching = still_negative
+        upper[~large] = (a - k * tau)[~large]
+        
+        low, high = a, upper
+        f_low, f_high = f(low), f(high)
+        for _ in range(_MAX_ITERATIONS):
+            active = np.abs(high - low) > _CONVERGENCE_TOLERANCE
+            if not active.any():
+                break
+            denominator = np.where(f_high - f_low == 0, 1.0, f_high - f_low)
+            middle = np.where(active, low + (low - high) * f_low / denominator, low)
+            f_middle = f(middle)
+            
+            crossed = active & (f_middle * f_high < 0)
+            halved = active & ~crossed
+            low = np.where(crossed, high, low)
+            f_low = np.where(crossed, f_high, np.where(halved, f_low / 2.0, f_low))
+            high = np.where(active, middle, high)
+            f_high = np.where(active, f_middle, f_high)
+        
+        return np.exp(low / 2.0)
+    
+    def _reset(self) -> None:
+        """Vacía todas las valoraciones (requiere el lock o la construcción)."""
+        self._index: Dict[str, int] = {}
+        self._player_ids: List[str] = []
+        self._ratings = np.empty(0)
+        self._deviations = np.empty(0)
+        self._volatilities = np.empty(0)
+        self._games = np.empty(0, dtype=np.int64)
+    
+    def _index_for(self, player_id: str) -> int:
+        """Índice de un jugador, dándolo de alta si es nuevo (requiere el lock)."""
+        index = self._index.get(player_id)
+        if index is None:
+            index = len(self._player_ids)
+            self._ensure_capacity(index + 1)
+            self._index[player_id] = index
+            self._player_ids.append(player_id)
+            self._ratings[index] = self.INITIAL_RATING
+            self._deviations[index] = self.INITIAL_DEVIATION
+            self._volatilities[index] = self.INITIAL_VOLATILITY
+            self._games[index] = 0
+        return index
+    
+    def _ensure_capacity(self, size: int) -> None:
+        """Amplía los arrays por duplicación hasta `size` jugadores."""
+        capacity = len(self._ratings)
+        if size <= capacity:
+            return
+        
+        new_capacity = max(size, 2 * capacity, 64)
+        extra = new_capacity - capacity
+        self._ratings = np.concatenate([self._ratings, np.zeros(extra)])
+        self._deviations = np.concatenate([self._deviations, np.zeros(extra)])
+        self._volatilities = np.concatenate([self._volatilities, np.zeros(extra)])
+        self._games = np.concatenate([self._games, np.zeros(extra, dtype=np.int64)])
+    
+    def _rating_at(self, index: int) -> PlayerRating:
+        """Valoración del jugador en un índice (requiere el lock)."""
+        return PlayerRating(
+            player_id=self._player_ids[index],
+            rating=float(self._ratings[index]),
+            deviation=float(self._deviations[index]),
+            volatility=float(self._volatilities[index]),
+            games_played=int(self._games[index])
+        )
+    
+    def _load(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Carga valoraciones persistidas."""
+        with self._lock:
+            for data in records:
+                index = self._index_for(data['player_id'])
+                self._ratings[index] = data.get('rating', self.INITIAL_RATING)
+                self._deviations[index] = data.get('deviation', self.INITIAL_DEVIATION)
+                self._volatilities[index] = data.get('volatility', self.INITIAL_VOLATILITY)
+                self._games[index] = data.get('games_played', 0)
+    
+    def _persist(self, ratings: List[PlayerRating]) -> None:
+        """Guarda valoraciones en el repositorio de jugadores, si lo hay."""
+        if self._player_repository is None or not ratings:
+            return
+        
+        self._player_repository.save_ratings(self._system.value, [
+            {
+                'player_id': rating.player_id,
+                'rating': rating.rating,
+                'deviation': rating.deviation,
+                'volatility': rating.volatility,
+                'games_played': rating.games_played
+            }
+            for rating in ratings
+        ])
+
+
+def _score_for_x(result: Optional[GameResult]) -> Optional[float]:
+    """Puntuación del jugador X según el resultado (None si no se valora)."""
+    if result == GameResult.PLAYER_X_WINS:
+        return 1.0
+    if result == GameResult.PLAYER_O_WINS:
+        return 0.0
+    if result == GameResult.DRAW:
+        return 0.5
+    return None
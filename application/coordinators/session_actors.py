@@ -0,0 +1,148 @@
+"""
+Session Actors - Ejecución serializada por sesión de juego.
+
+Cada sesión de juego tiene un actor: un buzón de tareas que se ejecutan
+de una en una y en orden de llegada sobre un pool de hilos compartido.
+Las tareas de una misma sesión nunca se solapan, mientras que las de
+sesiones distintas se ejecutan en paralelo, sin locks en el
+almacenamiento.
+"""
+
+from typing import Dict, Any, Callable, Deque, Tuple
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+
+
+_Task = Tuple[Future, Callable[..., Any], Tuple[Any, ...], Dict[str, Any]]
+
+
+class SessionActorPool:
+    """
+    Pool de actores por sesión de juego.
+    
+    Los actores se crean al recibir la primera tarea de una sesión y
+    desaparecen cuando su buzón queda vacío, por lo que el coste en memoria
+    solo depende de las sesiones con tareas pendientes.
+    
+    Un actor procesa como máximo `max_batch` tareas seguidas antes de
+    devolver su hilo al pool, para que una sesión muy activa no acapare
+    los hilos.
+    
+    Las tareas enviadas desde dentro del propio actor (por ejemplo, un caso
+    de uso que vuelve a enviar su trabajo a la sesión que ya está
+    procesando) se ejecutan directamente para evitar bloqueos.
+    
+    Principios aplicados:
+    - Es un COORDINADOR de aplicación, no dominio
+    - Orden garantizado por sesión, paralelismo entre sesiones
+    """
+    
+    def __init__(self, max_workers: int = 8, max_batch: int = 32):
+        """
+        Inicializa el pool de actores.
+        
+        Args:
+            max_workers: Número de hilos compartidos por todos los actores
+            max_batch: Tareas procesadas por un actor antes de ceder su hilo
+        """
+        if max_workers < 1:
+            raise ValueError("El número de hilos debe ser al menos 1")
+        if max_batch < 1:
+            raise ValueError("El tamaño de lote debe ser al menos 1")
+        
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="session-actor")
+        self._max_batch = max_batch
+        self._mailboxes: Dict[str, Deque[_Task]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._processed = 0
+    
+    @property
+    def active_actors(self) -> int:
+        """Número de sesiones con tareas pendientes o en curso."""
+        return len(self._mailboxes)
+    
+    def submit(self, session_id: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Envía una tarea al actor de una sesión.
+        
+        Args:
+            session_id: ID de la sesión de juego
+            fn: Función a ejecutar
+            *args: Argumentos posicionales de la función
+            **kwargs: Argumentos con nombre de la función
+            
+        Returns:
+            Future con el resultado de la tarea
+        """
+        future: Future = Future()
+        
+        if getattr(self._local, 'session_id', None) == session_id:
+            self._run(future, fn, args, kwargs)
+            return future
+        
+        with self._lock:
+            mailbox = self._mailboxes.get(session_id)
+            schedule = mailbox is None
+            if schedule:
+                mailbox = self._mailboxes[session_id] = deque()
+            mailbox.append((future, fn, args, kwargs))
+        
+        if schedule:
+            self._executor.submit(self._drain, session_id, mailbox)
+        
+        return future
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene las métricas del pool.
+        
+        Returns:
+            Diccionario con actores activos y tareas procesadas
+        """
+        with self._lock:
+            return {
+                'active_actors': len(self._mailboxes),
+                'pending_tasks': sum(len(mailbox) for mailbox in self._mailboxes.values()),
+                'processed_tasks': self._processed
+            }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Detiene el pool tras completar las tareas en curso.
+        
+        Args:
+            wait: Si se espera a que terminen los hilos
+        """
+        self._executor.shutdown(wait=wait)
+    
+    def _drain(self, session_id: str, mailbox: Deque[_Task]) -> None:
+        """Procesa en orden las tareas del buzón de una sesión."""
+        self._local.session_id = session_id
+        try:
+            for _ in range(self._max_batch):
+                with self._lock:
+                    if not mailbox:
+                        del self._mailboxes[session_id]
+                        return
+                    future, fn, args, kwargs = mailbox.popleft()
+                    self._processed += 1
+                
+                self._run(future, fn, args, kwargs)
+        finally:
+            self._local.session_id = None
+        
+        # Lote completo: ceder el hilo y continuar más tarde
+        self._executor.submit(self._drain, session_id, mailbox)
+    
+    @staticmethod
+    def _run(future: Future, fn: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        """Ejecuta una tarea y publica su resultado en el Future."""
+        if not future.set_running_or_notify_cancel():
+            return
+        
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
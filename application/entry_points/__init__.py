@@ -6,10 +6,20 @@ para la aplicación web con IA, torneos y funcionalidad online.
 """
 
 from .web_main import TicTacToeWebApp, create_app, main as web_main
+from .multiplayer_main import TicTacToeMultiplayerApp, main as multiplayer_main
+from .asgi_main import create_asgi_app, main as asgi_main
 
 __all__ = [
     # Web Application - Única interfaz del sistema
     'TicTacToeWebApp',
     'create_app', 
     'web_main',
+    
+    # Servidor multijugador WebSocket
+    'TicTacToeMultiplayerApp',
+    'multiplayer_main',
+    
+    # Aplicación ASGI
+    'create_asgi_app',
+    'asgi_main',
 ]
\ No newline at end of file
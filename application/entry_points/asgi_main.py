@@ -0,0 +1,110 @@
+"""
+ASGI Entry Point - Punto de entrada asíncrono de la aplicación web.
+
+Este módulo crea la aplicación ASGI del juego Tres en Raya para servirla
+con un servidor asíncrono. Con uvicorn instalado puede ejecutarse
+directamente; con otro servidor basta con apuntarlo a create_asgi_app:
+
+    uvicorn --factory application.entry_points.asgi_main:create_asgi_app
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al PYTHONPATH
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    import uvicorn
+except ImportError:  # uvicorn es opcional
+    uvicorn = None
+
+from interfaces.web_ui.asgi_adapter import AsgiWebAdapter
+from application.coordinators.session_actors import SessionActorPool
+from application.coordinators.game_statistics import GameStatisticsCoordinator
+from persistence.data_sources.memory_storage import MemoryStorage
+from persistence.repositories.player_repository import PlayerRepository
+
+
+def create_asgi_app(max_workers: int = 8):
+    """
+    Factory function para crear la aplicación ASGI.
+    
+    Los movimientos se serializan por sesión sobre un SessionActorPool y
+    el resto del trabajo bloqueante usa el pool de hilos del adaptador. Las
+    partidas terminadas alimentan un GameStatisticsCoordinator, que guarda
+    a sus jugadores en el mismo almacenamiento que las sesiones.
+    
+    Args:
+        max_workers: Hilos para los casos de uso
+        
+    Returns:
+        Aplicación ASGI configurada
+    """
+    storage = MemoryStorage()
+    return AsgiWebAdapter(
+        storage=storage,
+        session_executor=SessionActorPool(max_workers=max_workers),
+        max_workers=max_workers,
+        game_statistics=GameStatisticsCoordinator(
+            player_repository=PlayerRepository(storage)
+        )
+    )
+
+
+def main():
+    """
+    Función principal para ejecutar la aplicación ASGI con uvicorn.
+    
+    Returns:
+        Código de salida
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Servidor ASGI para el juego Tres en Raya'
+    )
+    
+    parser.add_argument(
+        '--host',
+        default='127.0.0.1',
+        help='Host del servidor (default: 127.0.0.1)'
+    )
+    
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8000,
+        help='Puerto del servidor (default: 8000)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=8,
+        help='Hilos para los casos de uso (default: 8)'
+    )
+    
+    args = parser.parse_args()
+    
+    if uvicorn is None:
+        print("uvicorn es necesario para ejecutar el servidor ASGI (pip install uvicorn)")
+        return 1
+    
+    print(f"🌐 Iniciando Tres en Raya ASGI Server")
+    print(f"🏠 Servidor: http://{args.host}:{args.port}")
+    print("=" * 60)
+    
+    try:
+        uvicorn.run(create_asgi_app(args.workers), host=args.host, port=args.port, lifespan='on')
+        return 0
+    except Exception as e:
+        print(f"Error fatal: {e}")
+        return 1
+
+
+if __name__ == '__main__':
+    exit_code = main()
+    sys.exit(exit_code)
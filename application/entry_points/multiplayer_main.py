@@ -0,0 +1,125 @@
+"""
+Multiplayer Entry Point - Punto de entrada del servidor multijugador.
+
+Este módulo arranca el servidor de salas WebSocket con la configuración
+de ExternalServicesConfiguration.get_multiplayer_server_config.
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+from urllib.parse import urlparse
+
+# Agregar el directorio raíz al PYTHONPATH
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent
+sys.path.insert(0, str(project_root))
+
+from interfaces.web_ui.multiplayer_server import MultiplayerRoomServer
+from infrastructure.external_services.service_config import ExternalServicesConfiguration
+
+
+class TicTacToeMultiplayerApp:
+    """
+    TicTacToeMultiplayerApp - Servidor multijugador para Tres en Raya.
+    
+    Wrapper alrededor de MultiplayerRoomServer que toma los límites y la
+    dirección de escucha de la configuración de servicios externos.
+    """
+    
+    def __init__(self, config=None):
+        """
+        Inicializa el servidor multijugador.
+        
+        Args:
+            config: Configuración del servidor multijugador (por defecto,
+                la de ExternalServicesConfiguration)
+        """
+        self.config = config or ExternalServicesConfiguration().get_multiplayer_server_config()
+        self.server = MultiplayerRoomServer.from_config(self.config)
+    
+    def get_address(self):
+        """
+        Obtiene la dirección de escucha a partir de websocket_url.
+        
+        Returns:
+            Tupla (host, puerto)
+        """
+        url = urlparse(self.config.get('websocket_url', 'ws://localhost:8080'))
+        return url.hostname or '127.0.0.1', url.port or 8080
+    
+    def run(self, host=None, port=None):
+        """
+        Ejecuta el servidor hasta que se interrumpa.
+        
+        Args:
+            host: Dirección del servidor (por defecto, la de websocket_url)
+            port: Puerto del servidor (por defecto, el de websocket_url)
+        """
+        default_host, default_port = self.get_address()
+        host = host or default_host
+        port = port or default_port
+        
+        print(f"🎮 Iniciando Tres en Raya Multiplayer Server")
+        print(f"🔌 WebSocket: ws://{host}:{port}")
+        print(f"👥 Conexiones máximas: {self.config.get('max_connections')}")
+        print("=" * 60)
+        
+        try:
+            asyncio.run(self._serve(host, port))
+        except KeyboardInterrupt:
+            print("\n👋 Servidor detenido por el usuario")
+    
+    async def _serve(self, host, port):
+        """Atiende conexiones hasta que se cancela la tarea."""
+        await self.server.start(host, port)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.server.stop()
+
+
+def main():
+    """
+    Función principal para ejecutar el servidor multijugador.
+    
+    Returns:
+        Código de salida
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Servidor multijugador WebSocket para el juego Tres en Raya'
+    )
+    
+    parser.add_argument(
+        '--host',
+        default=None,
+        help='Host del servidor (default: el de WEBSOCKET_URL)'
+    )
+    
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=None,
+        help='Puerto del servidor (default: el de WEBSOCKET_URL)'
+    )
+    
+    args = parser.parse_args()
+    
+    app = TicTacToeMultiplayerApp()
+    if not app.config.get('enabled', True):
+        print("El servidor multijugador está deshabilitado en este entorno")
+        return 1
+    
+    try:
+        app.run(host=args.host, port=args.port)
+        return 0
+    except Exception as e:
+        print(f"Error fatal: {e}")
+        return 1
+
+
+if __name__ == '__main__':
+    exit_code = main()
+    sys.exit(exit_code)
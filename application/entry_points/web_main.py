@@ -17,6 +17,13 @@ sys.path.insert(0, str(project_root))
 # Importar después de configurar el PYTHONPATH
 try:
     from interfaces.web_ui.flask_adapter import FlaskWebAdapter
+    from persistence.data_sources.shared_storage import SharedStorageServer
+    from application.coordinators.session_actors import SessionActorPool
+    from application.coordinators.matchmaking import MatchmakingCoordinator
+    from application.coordinators.game_statistics import GameStatisticsCoordinator
+    from persistence.data_sources.memory_storage import MemoryStorage
+    from persistence.repositories.game_repository import GameRepository
+    from persistence.repositories.player_repository import PlayerRepository
 except ImportError as e:
     print(f"Error al importar FlaskWebAdapter: {e}")
     sys.exit(1)
@@ -30,13 +37,46 @@ class TicTacToeWebApp:
     los principios de Screaming Architecture.
     """
     
-    def __init__(self):
+    def __init__(self, processes: int = 1):
         """
         Inicializa la aplicación web de Tres en Raya.
+        
+        Args:
+            processes: Número de procesos de trabajo; con más de uno las
+                sesiones se guardan en un almacenamiento compartido
         """
+        self.processes = max(1, processes)
+        self._storage_server = None
+        self.matchmaker = None
+        self.game_statistics = None
+        
+        if self.processes > 1:
+            self._storage_server = SharedStorageServer()
+            self._storage_server.start()
+            storage = self._storage_server.create_client()
+        else:
+            # La cola de emparejamiento y las estadísticas viven en memoria:
+            # solo con un proceso
+            storage = MemoryStorage()
+            self.matchmaker = MatchmakingCoordinator(GameRepository(storage))
+            self.game_statistics = GameStatisticsCoordinator(
+                player_repository=PlayerRepository(storage)
+            )
+        
+        # Movimientos serializados por sesión sobre un pool de hilos compartido,
+        # con las sesiones vivas en memoria. Solo con un proceso: con varios,
+        # cada uno tendría su propia caché de sesiones, desfasada respecto al
+        # almacenamiento compartido, que ya protege las escrituras con versiones
+        self.session_actors = SessionActorPool() if self.processes == 1 else None
+        
         # Usar directamente el adaptador web que ya funciona
         try:
-            self.web_adapter = FlaskWebAdapter()
+            self.web_adapter = FlaskWebAdapter(
+                storage=storage,
+                session_executor=self.session_actors,
+                matchmaker=self.matchmaker,
+                game_statistics=self.game_statistics
+            )
             self.app = self.web_adapter.app
         except Exception as e:
             print(f"Error inicializando FlaskWebAdapter: {e}")
@@ -54,15 +94,29 @@ class TicTacToeWebApp:
         print(f"🌐 Iniciando Tres en Raya Web Server")
         print(f"🏠 Servidor: http://{host}:{port}")
         print(f"🔧 Modo: {'Debug' if debug else 'Producción'}")
+        print(f"⚙️ Procesos: {self.processes}")
         print("=" * 60)
         
         try:
-            self.app.run(host=host, port=port, debug=debug, threaded=True)
+            self.web_adapter.start_background_tasks()
+            self.app.run(
+                host=host,
+                port=port,
+                debug=debug,
+                threaded=self.processes == 1,
+                processes=self.processes
+            )
         except KeyboardInterrupt:
             print("\n👋 Servidor detenido por el usuario")
         except Exception as e:
             print(f"\n❌ Error al iniciar el servidor: {e}")
             sys.exit(1)
+        finally:
+            self.web_adapter.stop_background_tasks()
+            if self.session_actors is not None:
+                self.session_actors.shutdown(wait=False)
+            if self._storage_server is not None:
+                self._storage_server.stop(timeout=2)
     
     def get_flask_app(self):
         """
@@ -123,6 +177,13 @@ def main():
         help='Ejecutar en modo producción'
     )
     
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=1,
+        help='Procesos de trabajo; más de uno comparte las sesiones entre ellos (default: 1)'
+    )
+    
     args = parser.parse_args()
     
     # Determinar modo debug
@@ -134,7 +195,7 @@ def main():
     
     # Crear y ejecutar aplicación
     try:
-        web_app = TicTacToeWebApp()
+        web_app = TicTacToeWebApp(processes=args.processes)
         web_app.run(host=args.host, port=args.port, debug=debug)
         return 0
     except Exception as e:
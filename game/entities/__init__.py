@@ -7,7 +7,9 @@ que representan los conceptos fundamentales del juego Tres en Raya.
 
 from .board import Board, Position, Move, CellState, BoardSize
 from .player import Player, PlayerType, PlayerSymbol, PlayerStats
-from .game_session import GameSession, GameState, GameResult, GameConfiguration
+from .game_session import (
+    GameSession, GameState, GameResult, GameConfiguration, ConcurrentModificationError
+)
 
 __all__ = [
     # Board entities
@@ -28,4 +30,5 @@ __all__ = [
     'GameState', 
     'GameResult',
     'GameConfiguration',
+    'ConcurrentModificationError',
 ]
@@ -32,6 +32,10 @@ class GameResult(Enum):
     ABANDONED = "abandoned"
 
 
+class ConcurrentModificationError(Exception):
+    """La sesión fue modificada por otra operación desde que se leyó."""
+
+
 @dataclass(frozen=True)
 class GameConfiguration:
     """Configuración inmutable del juego."""
@@ -82,6 +86,7 @@ class GameSession:
         self._started_at: Optional[datetime] = None
         self._finished_at: Optional[datetime] = None
         self._move_count = 0
+        self._version = 0
     
     @property
     def id(self) -> str:
@@ -138,6 +143,11 @@ class GameSession:
         """Número de movimientos realizados."""
         return self._move_count
     
+    @property
+    def version(self) -> int:
+        """Versión persistida de la sesión (0 si nunca se ha guardado)."""
+        return self._version
+    
     @property
     def created_at(self) -> datetime:
         """Fecha y hora de creación de la sesión."""
@@ -7,6 +7,7 @@ la lógica de negocio compleja y coordinan las operaciones entre entidades.
 
 from .ai_opponent import AIOpponent, AIStrategy, AIDifficulty
 from .score_calculator import ScoreCalculator, ScoreType, PerformanceRating
+from .ranking_service import RankingService, RankingEntry
 from .statistics_tracker import (
     StatisticsTracker, 
     StatisticsPeriod, 
@@ -14,6 +15,9 @@ from .statistics_tracker import (
     GameStatistics, 
     PlayerTrend
 )
+from .statistics_aggregator import StatisticsAggregator
+from .game_history import GameHistory, GameRecord, GameOutcome
+from .statistics_rollups import StatisticsRollups, RollupTotals, RollupGranularity
 
 __all__ = [
     # AI Opponent service
@@ -26,10 +30,25 @@ __all__ = [
     'ScoreType',
     'PerformanceRating',
     
+    # Ranking service
+    'RankingService',
+    'RankingEntry',
+    
     # Statistics Tracker service
     'StatisticsTracker',
     'StatisticsPeriod',
     'TrendDirection', 
     'GameStatistics',
     'PlayerTrend',
+    'StatisticsAggregator',
+    
+    # Game history
+    'GameHistory',
+    'GameRecord',
+    'GameOutcome',
+    
+    # Time-bucketed rollups
+    'StatisticsRollups',
+    'RollupTotals',
+    'RollupGranularity',
 ]
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+Servicio GameHistory - Historial compacto de partidas por jugador.
+
+Este servicio guarda, para cada jugador, una cola de tamaño fijo con
+las últimas partidas terminadas (fecha, resultado, duración y número de
+movimientos), de modo que las estadísticas por período y las tendencias
+se calculan con datos reales y con memoria acotada por jugador.
+"""
+
+from typing import Deque, Dict, List, Optional
+from enum import Enum
+from datetime import datetime
+from dataclasses import dataclass
+from collections import deque
+import bisect
+
+from game.entities import GameSession
+
+
+class GameOutcome(Enum):
+    """Resultado de una partida desde el punto de vista de un jugador."""
+    WIN = "win"
+    LOSS = "loss"
+    DRAW = "draw"
+
+
+@dataclass(frozen=True)
+class GameRecord:
+    """Registro inmutable de una partida terminada."""
+    finished_at: datetime
+    outcome: GameOutcome
+    duration: float      # Segundos
+    moves: int
+
+
+class GameHistory:
+    """
+    Servicio GameHistory - Historial de partidas por jugador.
+    
+    Se alimenta con record_game_result al terminar cada partida (por
+    ejemplo, como oyente de MakeMoveUseCase) y lo consulta
+    StatisticsTracker para las estadísticas por período y las tendencias.
+    
+    Solo se conservan las últimas `capacity_per_player` partidas de cada
+    jugador (la deque con maxlen descarta la más antigua al llenarse);
+    los totales históricos completos siguen en PlayerStats.
+    
+    Principios de Screaming Architecture aplicados:
+    - Se enfoca en el DOMINIO: Historial de partidas de Tres en Raya
+    - No depende de frameworks externos
+    - Utiliza entidades del dominio
+    """
+    
+    DEFAULT_CAPACITY_PER_PLAYER = 200
+    
+    def __init__(self, capacity_per_player: int = DEFAULT_CAPACITY_PER_PLAYER):
+        """
+        Inicializa el historial.
+        
+        Args:
+            capacity_per_player: Partidas conservadas por jugador
+            
+        Raises:
+            ValueError: Si la capacidad no es positiva
+        """
+        if capacity_per_player < 1:
+            raise ValueError("La capacidad del historial debe ser al menos 1")
+        
+        self._capacity = capacity_per_player
+        self._rings: Dict[str, Deque[GameRecord]] = {}
+    
+    @property
+    def capacity_per_player(self) -> int:
+        """Partidas conservadas por jugador."""
+        return self._capacity
+    
+    def record(self, player_id: str, record: GameRecord) -> None:
+        """
+        Añade una partida al historial de un jugador.
+        
+        Args:
+            player_id: ID del jugador
+            record: Registro de la partida
+        """
+        ring = self._rings.get(player_id)
+        if ring is None:
+            ring = self._rings[player_id] = deque(maxlen=self._capacity)
+        ring.append(record)
+    
+    def record_game_result(self, game_session: GameSession) -> None:
+        """
+        Añade una partida terminada al historial de sus jugadores.
+        
+        Args:
+            game_session: Sesión de juego terminada
+        """
+        if not game_session.is_finished():
+            return
+        
+        finished_at = game_session.finished_at or datetime.now()
+        duration = game_session.duration or 0.0
+        winner = game_session.get_winner()
+        
+        for player in game_session.players:
+            if game_session.is_draw():
+                outcome = GameOutcome.DRAW
+            elif winner is not None and winner.id == player.id:
+                outcome = GameOutcome.WIN
+            else:
+                outcome = GameOutcome.LOSS
+            
+            self.record(player.id, GameRecord(
+                finished_at=finished_at,
+                outcome=outcome,
+                duration=duration,
+                moves=game_session.move_count
+            ))
+    
+    def get_history(self, player_id: str, since: Optional[datetime] = None) -> List[GameRecord]:
+        """
+        Obtiene las partidas conservadas de un jugador.
+        
+        Args:
+            player_id: ID del jugador
+            since: Si se indica, solo partidas terminadas desde esa fecha
+            
+        Returns:
+            Registros en orden cronológico
+        """
+        ring = self._rings.get(player_id)
+        if ring is None:
+            return []
+        
+        records = list(ring)
+        if since is None:
+            return records
+        
+        # Los registros están en orden cronológico: buscar el primero válido
+        finished = [record.finished_at for record in records]
+        return records[bisect.bisect_left(finished, since):]
+    
+    def get_recent(self, player_id: str, limit: int) -> List[GameRecord]:
+        """
+        Obtiene las últimas partidas de un jugador.
+        
+        Args:
+            player_id: ID del jugador
+            limit: Número máximo de partidas
+            
+        Returns:
+            Registros en orden cronológico
+        """
+        if limit <= 0:
+            return []
+        return self.get_history(player_id)[-limit:]
+    
+    def get_last_activity(self, player_id: str) -> Optional[datetime]:
+        """
+        Obtiene la fecha de la última partida de un jugador.
+        
+        Args:
+            player_id: ID del jugador
+            
+        Returns:
+            Fecha de la última partida o None si no hay historial
+        """
+        ring = self._rings.get(player_id)
+        return ring[-1].finished_at if ring else None
+    
+    def count(self, player_id: str) -> int:
+        """
+        Cuenta las partidas conservadas de un jugador.
+        
+        Args:
+            player_id: ID del jugador
+            
+        Returns:
+            Número de registros en el historial
+        """
+        ring = self._rings.get(player_id)
+        return len(ring) if ring else 0
+    
+    def remove_player(self, player_id: str) -> bool:
+        """
+        Elimina el historial de un jugador.
+        
+        Args:
+            player_id: ID del jugador
+            
+        Returns:
+            True si el jugador tenía historial
+        """
+        return self._rings.pop(player_id, None) is not None
@@ -0,0 +1,328 @@
+"""
+Servicio RankingService - Clasificación incremental de jugadores.
+
+Este servicio mantiene la clasificación global de jugadores por
+puntuación total y responde consultas de posición, mejores jugadores
+y vecinos de un jugador sin reordenar a todos los jugadores.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+import bisect
+import math
+
+from game.entities import Player, GameSession
+from .score_calculator import ScoreCalculator
+
+
+@dataclass(frozen=True)
+class RankingEntry:
+    """Entrada inmutable de la clasificación."""
+    rank: int          # Posición con empates compartidos (1 = mejor)
+    player_id: str
+    player_name: str
+    score: int
+
+
+class _FenwickTree:
+    """
+    Árbol de Fenwick (Binary Indexed Tree) sobre índices 0..size-1.
+    
+    Permite sumar en un índice, obtener sumas de prefijo y buscar el
+    índice que contiene el k-ésimo elemento, todo en O(log n). El
+    tamaño crece por duplicación cuando se necesita un índice mayor.
+    """
+    
+    def __init__(self, size: int = 64):
+        self._counts = [0] * size
+        self._tree = [0] * (size + 1)
+    
+    @property
+    def size(self) -> int:
+        """Número de índices disponibles."""
+        return len(self._counts)
+    
+    def add(self, index: int, delta: int) -> None:
+        """Suma `delta` en `index`, ampliando el árbol si es necesario."""
+        if index >= len(self._counts):
+            self._grow(index + 1)
+        
+        self._counts[index] += delta
+        position = index + 1
+        while position < len(self._tree):
+            self._tree[position] += delta
+            position += position & -position
+    
+    def prefix_sum(self, index: int) -> int:
+        """Suma de los índices 0..index (ambos incluidos)."""
+        position = min(index + 1, len(self._tree) - 1)
+        total = 0
+        while position > 0:
+            total += self._tree[position]
+            position -= position & -position
+        return total
+    
+    def find_by_order(self, k: int) -> int:
+        """
+        Índice más pequeño cuya suma de prefijo es al menos k (k >= 1).
+        
+        Se resuelve descendiendo por potencias de dos, sin búsqueda binaria
+        sobre prefijos.
+        """
+        position = 0
+        step = 1
+        while step * 2 < len(self._tree):
+            step *= 2
+        
+        while step > 0:
+            next_position = position + step
+            if next_position < len(self._tree) and self._tree[next_position] < k:
+                position = next_position
+                k -= self._tree[next_position]
+            step //= 2
+        
+        return position  # Índice 0-based = posición 1-based - 1
+    
+    def _grow(self, minimum_size: int) -> None:
+        """Duplica el tamaño hasta `minimum_size` y reconstruye el árbol en O(n)."""
+        size = len(self._counts)
+        while size < minimum_size:
+            size *= 2
+        
+        self._counts.extend([0] * (size - len(self._counts)))
+        self._tree = [0] + list(self._counts)
+        for position in range(1, size + 1):
+            parent = position + (position & -position)
+            if parent <= size:
+                self._tree[parent] += self._tree[position]
+
+
+class RankingService:
+    """
+    Servicio RankingService - Clasificación global incremental.
+    
+    Los jugadores se agrupan en cubetas por puntuación total (la de
+    ScoreCalculator.calculate_total_score) y un árbol de Fenwick cuenta
+    cuántos jugadores hay en cada cubeta. Así:
+    - Actualizar a un jugador al terminar una partida es O(log n)
+    - La posición de un jugador es O(log n)
+    - Los k mejores y los vecinos de un jugador son O(k log n)
+    
+    A diferencia de ScoreCalculator.get_ranking_position, que ordena a
+    todos los jugadores en cada consulta, aquí los empates comparten
+    posición (1 + jugadores con más puntos) y, dentro de un empate, los
+    listados se ordenan por ID para ser deterministas.
+    
+    Principios de Screaming Architecture aplicados:
+    - Se enfoca en el DOMINIO: Clasificación de jugadores de Tres en Raya
+    - Reutiliza las reglas de puntuación de ScoreCalculator
+    - No depende de frameworks externos
+    """
+    
+    def __init__(self, score_calculator: Optional[ScoreCalculator] = None):
+        """
+        Inicializa el servicio de clasificación.
+        
+        Args:
+            score_calculator: Calculadora de puntuaciones a utilizar
+        """
+        self._score_calculator = score_calculator or ScoreCalculator()
+        
+        # Todas las puntuaciones son múltiplos del MCD de los puntos por
+        # resultado, por lo que cada cubeta corresponde a una puntuación exacta
+        self._bucket_width = math.gcd(
+            self._score_calculator.WIN_POINTS,
+            self._score_calculator.DRAW_POINTS,
+            self._score_calculator.LOSS_POINTS
+        ) or 1
+        
+        self._tree = _FenwickTree()
+        self._buckets: Dict[int, List[str]] = {}
+        self._players: Dict[str, Tuple[str, int]] = {}
+    
+    def __len__(self) -> int:
+        """Número de jugadores clasificados."""
+        return len(self._players)
+    
+    def update_player(self, player: Player) -> int:
+        """
+        Inserta o actualiza a un jugador con su puntuación actual.
+        
+        Args:
+            player: Jugador a clasificar
+            
+        Returns:
+            Puntuación total del jugador
+        """
+        score = self._score_calculator.calculate_total_score(player)
+        current = self._players.get(player.id)
+        
+        if current is not None and current[1] == score:
+            self._players[player.id] = (player.name, score)
+            return score
+        
+        if current is not None:
+            self._remove_from_bucket(player.id, current[1])
+        
+        self._players[player.id] = (player.name, score)
+        self._add_to_bucket(player.id, score)
+        return score
+    
+    def update_players(self, players: List[Player]) -> None:
+        """
+        Inserta o actualiza varios jugadores.
+        
+        Args:
+            players: Jugadores a clasificar
+        """
+        for player in players:
+            self.update_player(player)
+    
+    def record_game_result(self, game_session: GameSession) -> None:
+        """
+        Actualiza la clasificación con los jugadores de una partida terminada.
+        
+        Las estadísticas de los jugadores ya reflejan el resultado cuando
+        la sesión termina, por lo que basta con reclasificarlos.
+        
+        Args:
+            game_session: Sesión de juego terminada
+        """
+        if not game_session.is_finished():
+            return
+        
+        for player in game_session.players:
+            self.update_player(player)
+    
+    def remove_player(self, player_id: str) -> bool:
+        """
+        Elimina a un jugador de la clasificación.
+        
+        Args:
+            player_id: ID del jugador
+            
+        Returns:
+            True si el jugador estaba clasificado
+        """
+        current = self._players.pop(player_id, None)
+        if current is None:
+            return False
+        
+        self._remove_from_bucket(player_id, current[1])
+        return True
+    
+    def get_score(self, player_id: str) -> Optional[int]:
+        """
+        Obtiene la puntuación registrada de un jugador.
+        
+        Args:
+            player_id: ID del jugador
+            
+        Returns:
+            Puntuación o None si no está clasificado
+        """
+        current = self._players.get(player_id)
+        return current[1] if current else None
+    
+    def get_rank(self, player_id: str) -> Optional[int]:
+        """
+        Obtiene la posición de un jugador.
+        
+        Args:
+            player_id: ID del jugador
+            
+        Returns:
+            Posición (1 = primer lugar) o None si no está clasificado
+        """
+        current = self._players.get(player_id)
+        if current is None:
+            return None
+        
+        return self._count_above(self._bucket_of(current[1])) + 1
+    
+    def get_top(self, limit: int = 10) -> List[RankingEntry]:
+        """
+        Obtiene los mejores jugadores.
+        
+        Args:
+            limit: Número máximo de jugadores
+            
+        Returns:
+            Entradas ordenadas de mejor a peor
+        """
+        return self._entries_between(1, min(limit, len(self._players)))
+    
+    def get_around(self, player_id: str, radius: int = 2) -> List[RankingEntry]:
+        """
+        Obtiene los jugadores que rodean a uno en la clasificación.
+        
+        Args:
+            player_id: ID del jugador
+            radius: Número de jugadores a cada lado
+            
+        Returns:
+            Entradas ordenadas de mejor a peor (vacía si no está clasificado)
+        """
+        position = self._position_of(player_id)
+        if position is None:
+            return []
+        
+        return self._entries_between(
+            max(1, position - radius),
+            min(len(self._players), position + radius)
+        )
+    
+    def _position_of(self, player_id: str) -> Optional[int]:
+        """Posición ordinal (sin empates) de un jugador."""
+        current = self._players.get(player_id)
+        if current is None:
+            return None
+        
+        bucket = self._bucket_of(current[1])
+        members = self._buckets[bucket]
+        return self._count_above(bucket) + bisect.bisect_left(members, player_id) + 1
+    
+    def _entries_between(self, first: int, last: int) -> List[RankingEntry]:
+        """Entradas de las posiciones ordinales first..last (1-based)."""
+        entries: List[RankingEntry] = []
+        position = first
+        total = len(self._players)
+        
+        while position <= last:
+            # La posición p (de mejor a peor) es la total - p + 1 en orden ascendente
+            bucket = self._tree.find_by_order(total - position + 1)
+            above = self._count_above(bucket)
+            rank = above + 1
+            members = self._buckets[bucket]
+            
+            for player_id in members[position - above - 1:last - above]:
+                name, score = self._players[player_id]
+                entries.append(RankingEntry(rank, player_id, name, score))
+            
+            position = above + len(members) + 1
+        
+        return entries
+    
+    def _count_above(self, bucket: int) -> int:
+        """Número de jugadores en cubetas superiores a `bucket`."""
+        return len(self._players) - self._tree.prefix_sum(bucket)
+    
+    def _bucket_of(self, score: int) -> int:
+        """Cubeta correspondiente a una puntuación."""
+        return max(0, score) // self._bucket_width
+    
+    def _add_to_bucket(self, player_id: str, score: int) -> None:
+        """Añade un jugador a la cubeta de su puntuación."""
+        bucket = self._bucket_of(score)
+        members = self._buckets.setdefault(bucket, [])
+        bisect.insort(members, player_id)
+        self._tree.add(bucket, 1)
+    
+    def _remove_from_bucket(self, player_id: str, score: int) -> None:
+        """Quita a un jugador de la cubeta de su puntuación."""
+        bucket = self._bucket_of(score)
+        members = self._buckets[bucket]
+        del members[bisect.bisect_left(members, player_id)]
+        if not members:
+            del self._buckets[bucket]
+        self._tree.add(bucket, -1)
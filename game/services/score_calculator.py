@@ -187,6 +187,10 @@ class ScoreCalculator:
         """
         Determina la posición del jugador en el ranking global.
         
+        Ordena a todos los jugadores en cada llamada; para consultas
+        repetidas, RankingService mantiene la clasificación de forma
+        incremental.
+        
         Args:
             player: Jugador a evaluar
             all_players: Lista de todos los jugadores
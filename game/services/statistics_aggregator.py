@@ -0,0 +1,239 @@
+"""
+Servicio StatisticsAggregator - Estadísticas globales incrementales.
+
+Este servicio mantiene un agregado en ejecución de las estadísticas de
+todos los jugadores, actualizado con cada resultado de partida, para que
+las estadísticas globales se lean sin recorrer a todos los jugadores.
+"""
+
+from typing import Dict, List, Optional, Tuple, Any
+from dataclasses import dataclass
+import heapq
+
+from game.entities import Player, GameSession
+
+
+# Mínimo de partidas para optar a mejor jugador, igual que en
+# StatisticsTracker.get_global_statistics
+BEST_PERFORMER_MIN_GAMES = 5
+
+# Entrada de montículo (heapq): (clave negada, orden de registro, ID, versión).
+# La cima es el valor máximo y, en caso de empate, el jugador registrado primero
+_HeapEntry = Tuple[float, int, str, int]
+
+
+@dataclass
+class _PlayerSnapshot:
+    """Últimos valores agregados de un jugador."""
+    name: str
+    games_played: int
+    win_rate: float
+    order: int
+    version: int
+
+
+class StatisticsAggregator:
+    """
+    Servicio StatisticsAggregator - Agregado de estadísticas globales.
+    
+    Mantiene contadores, sumas y dos montículos heapq (jugador más activo y mejor
+    jugador) que se actualizan en O(log n) cada vez que cambia un jugador.
+    get_global_statistics devuelve el mismo resultado que
+    StatisticsTracker.get_global_statistics sin recorrer a los jugadores.
+    
+    Se alimenta con record_game_result al terminar cada partida (por
+    ejemplo, como oyente de MakeMoveUseCase) o con update_player.
+    
+    Principios de Screaming Architecture aplicados:
+    - Se enfoca en el DOMINIO: Estadísticas globales de Tres en Raya
+    - No depende de frameworks externos
+    - Utiliza entidades del dominio
+    """
+    
+    # Minutos estimados por partida, igual que StatisticsTracker
+    AVERAGE_GAME_DURATION_MINUTES = 2.0
+    
+    def __init__(self, players: Optional[List[Player]] = None):
+        """
+        Inicializa el agregado.
+        
+        Args:
+            players: Jugadores existentes con los que inicializar el agregado
+        """
+        self._players: Dict[str, _PlayerSnapshot] = {}
+        self._next_order = 0
+        self._next_version = 0
+        
+        self._total_games = 0
+        self._win_rate_sum = 0.0
+        self._rated_players = 0
+        
+        self._most_active: List[_HeapEntry] = []
+        self._best_performer: List[_HeapEntry] = []
+        
+        for player in players or []:
+            self.update_player(player)
+    
+    @property
+    def total_players(self) -> int:
+        """Número de jugadores agregados."""
+        return len(self._players)
+    
+    def update_player(self, player: Player) -> None:
+        """
+        Inserta o actualiza los valores agregados de un jugador.
+        
+        Args:
+            player: Jugador con sus estadísticas actuales
+        """
+        stats = player.stats
+        previous = self._players.get(player.id)
+        if previous is not None:
+            self._subtract(previous)
+        
+        self._next_version += 1
+        snapshot = _PlayerSnapshot(
+            name=player.name,
+            games_played=stats.games_played,
+            win_rate=stats.win_rate,
+            order=previous.order if previous else self._next_order,
+            version=self._next_version
+        )
+        if previous is None:
+            self._next_order += 1
+        
+        self._players[player.id] = snapshot
+        self._add(snapshot)
+        
+        heapq.heappush(
+            self._most_active,
+            (-snapshot.games_played, snapshot.order, player.id, snapshot.version)
+        )
+        heapq.heappush(
+            self._best_performer,
+            (-self._performance(snapshot), snapshot.order, player.id, snapshot.version)
+        )
+        self._compact_if_needed()
+    
+    def record_game_result(self, game_session: GameSession) -> None:
+        """
+        Agrega el resultado de una partida terminada.
+        
+        Args:
+            game_session: Sesión de juego terminada
+        """
+        if not game_session.is_finished():
+            return
+        
+        for player in game_session.players:
+            self.update_player(player)
+    
+    def remove_player(self, player_id: str) -> bool:
+        """
+        Elimina a un jugador del agregado.
+        
+        Args:
+            player_id: ID del jugador
+            
+        Returns:
+            True si el jugador estaba agregado
+        """
+        snapshot = self._players.pop(player_id, None)
+        if snapshot is None:
+            return False
+        
+        self._subtract(snapshot)
+        return True
+    
+    def get_global_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene las estadísticas globales del sistema.
+        
+        Returns:
+            Diccionario con el mismo formato que
+            StatisticsTracker.get_global_statistics
+        """
+        if not self._players:
+            return {
+                "total_players": 0,
+                "total_games": 0,
+                "average_win_rate": 0.0,
+                "most_active_player": None,
+                "best_performer": None,
+                "total_playtime_hours": 0.0
+            }
+        
+        total_players = len(self._players)
+        average_win_rate = (
+            self._win_rate_sum / self._rated_players if self._rated_players else 0.0
+        )
+        most_active = self._top(self._most_active)
+        best_performer = self._top(self._best_performer)
+        playtime = (self._total_games * self.AVERAGE_GAME_DURATION_MINUTES) / 60.0
+        
+        return {
+            "total_players": total_players,
+            "total_games": self._total_games,
+            "average_win_rate": round(average_win_rate, 2),
+            "most_active_player": {
+                "name": most_active.name,
+                "games_played": most_active.games_played
+            } if most_active else None,
+            "best_performer": {
+                "name": best_performer.name,
+                "win_rate": best_performer.win_rate,
+                "games_played": best_performer.games_played
+            } if best_performer else None,
+            "total_playtime_hours": round(playtime, 2),
+            "average_games_per_player": round(self._total_games / total_players, 2)
+        }
+    
+    def _add(self, snapshot: _PlayerSnapshot) -> None:
+        """Suma los valores de un jugador a los totales."""
+        self._total_games += snapshot.games_played
+        if snapshot.games_played > 0:
+            self._win_rate_sum += snapshot.win_rate
+            self._rated_players += 1
+    
+    def _subtract(self, snapshot: _PlayerSnapshot) -> None:
+        """Resta los valores de un jugador de los totales."""
+        self._total_games -= snapshot.games_played
+        if snapshot.games_played > 0:
+            self._win_rate_sum -= snapshot.win_rate
+            self._rated_players -= 1
+        if not self._rated_players:
+            # Evita arrastrar error de redondeo cuando no quedan jugadores
+            self._win_rate_sum = 0.0
+    
+    def _top(self, heap: List[_HeapEntry]) -> Optional[_PlayerSnapshot]:
+        """Cima vigente de un montículo, descartando entradas obsoletas (borrado perezoso)."""
+        while heap:
+            _, _, player_id, version = heap[0]
+            snapshot = self._players.get(player_id)
+            if snapshot is not None and snapshot.version == version:
+                return snapshot
+            heapq.heappop(heap)
+        return None
+    
+    def _compact_if_needed(self) -> None:
+        """Reconstruye los montículos cuando acumulan demasiadas entradas obsoletas."""
+        limit = 2 * len(self._players) + 64
+        if len(self._most_active) <= limit and len(self._best_performer) <= limit:
+            return
+        
+        snapshots = list(self._players.items())
+        self._most_active = [
+            (-s.games_played, s.order, player_id, s.version) for player_id, s in snapshots
+        ]
+        self._best_performer = [
+            (-self._performance(s), s.order, player_id, s.version) for player_id, s in snapshots
+        ]
+        heapq.heapify(self._most_active)
+        heapq.heapify(self._best_performer)
+    
+    @staticmethod
+    def _performance(snapshot: _PlayerSnapshot) -> float:
+        """Clave de mejor jugador: tasa de victorias con un mínimo de partidas."""
+        if snapshot.games_played >= BEST_PERFORMER_MIN_GAMES:
+            return snapshot.win_rate
+        return 0.0
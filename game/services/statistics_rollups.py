@@ -0,0 +1,270 @@
+"""
+Servicio StatisticsRollups - Agregados de partidas por franjas de tiempo.
+
+Este servicio mantiene, al terminar cada partida, totales pre-agregados
+por hora, día y mes para cada jugador y para el sistema completo, de modo
+que cualquier período se responde sumando unas pocas franjas en lugar de
+recorrer el historial de partidas.
+"""
+
+from typing import Dict, Optional, Tuple
+from enum import Enum
+from datetime import datetime, timedelta
+from dataclasses import dataclass
+
+from game.entities import GameSession
+from .game_history import GameOutcome
+
+
+class RollupGranularity(Enum):
+    """Granularidades de los agregados."""
+    HOUR = "hour"
+    DAY = "day"
+    MONTH = "month"
+
+
+# Ámbito de los agregados del sistema completo
+GLOBAL_SCOPE = ""
+
+
+@dataclass
+class RollupTotals:
+    """Totales agregados de un conjunto de partidas."""
+    games: int = 0
+    wins: int = 0
+    losses: int = 0
+    draws: int = 0
+    total_duration: float = 0.0
+    shortest_game: float = 0.0
+    longest_game: float = 0.0
+    
+    @property
+    def average_duration(self) -> float:
+        """Duración promedio en segundos."""
+        return self.total_duration / self.games if self.games else 0.0
+    
+    def add_game(self, outcome: Optional[GameOutcome], duration: float) -> None:
+        """Suma una partida a los totales."""
+        if self.games == 0:
+            self.shortest_game = self.longest_game = duration
+        else:
+            self.shortest_game = min(self.shortest_game, duration)
+            self.longest_game = max(self.longest_game, duration)
+        
+        self.games += 1
+        self.total_duration += duration
+        if outcome == GameOutcome.WIN:
+            self.wins += 1
+        elif outcome == GameOutcome.LOSS:
+            self.losses += 1
+        elif outcome == GameOutcome.DRAW:
+            self.draws += 1
+    
+    def merge(self, other: "RollupTotals") -> None:
+        """Suma otros totales a estos."""
+        if other.games == 0:
+            return
+        if self.games == 0:
+            self.shortest_game, self.longest_game = other.shortest_game, other.longest_game
+        else:
+            self.shortest_game = min(self.shortest_game, other.shortest_game)
+            self.longest_game = max(self.longest_game, other.longest_game)
+        
+        self.games += other.games
+        self.wins += other.wins
+        self.losses += other.losses
+        self.draws += other.draws
+        self.total_duration += other.total_duration
+
+
+class StatisticsRollups:
+    """
+    Servicio StatisticsRollups - Agregados por hora, día y mes.
+    
+    Cada partida terminada suma en tres franjas (su hora, su día y su mes)
+    de cada jugador y del ámbito global. Una consulta [inicio, fin) se
+    descompone de forma voraz en la franja alineada más grande que cabe,
+    por lo que un período de un año suma unas pocas decenas de franjas.
+    
+    Las franjas horarias y diarias se descartan pasada su retención; las
+    consultas alineadas a medianoche (como los períodos de
+    StatisticsTracker) solo necesitan horas del día en curso y días del
+    último año.
+    
+    Principios de Screaming Architecture aplicados:
+    - Se enfoca en el DOMINIO: Estadísticas de Tres en Raya por período
+    - No depende de frameworks externos
+    - Utiliza entidades del dominio
+    """
+    
+    HOUR_RETENTION = timedelta(days=2)
+    DAY_RETENTION = timedelta(days=400)
+    
+    def __init__(self):
+        """Inicializa los agregados vacíos."""
+        self._buckets: Dict[str, Dict[RollupGranularity, Dict[datetime, RollupTotals]]] = {}
+        self._all_time: Dict[str, RollupTotals] = {}
+    
+    def record_game_result(self, game_session: GameSession) -> None:
+        """
+        Agrega una partida terminada.
+        
+        Args:
+            game_session: Sesión de juego terminada
+        """
+        if not game_session.is_finished():
+            return
+        
+        finished_at = game_session.finished_at or datetime.now()
+        duration = game_session.duration or 0.0
+        winner = game_session.get_winner()
+        
+        draw_outcome = GameOutcome.DRAW if game_session.is_draw() else None
+        self.record(GLOBAL_SCOPE, finished_at, draw_outcome, duration)
+        
+        for player in game_session.players:
+            if game_session.is_draw():
+                outcome = GameOutcome.DRAW
+            elif winner is not None and winner.id == player.id:
+                outcome = GameOutcome.WIN
+            else:
+                outcome = GameOutcome.LOSS
+            self.record(player.id, finished_at, outcome, duration)
+    
+    def record(
+        self,
+        scope: str,
+        finished_at: datetime,
+        outcome: Optional[GameOutcome],
+        duration: float
+    ) -> None:
+        """
+        Agrega una partida a un ámbito.
+        
+        Args:
+            scope: ID del jugador o GLOBAL_SCOPE
+            finished_at: Fecha de finalización de la partida
+            outcome: Resultado para el jugador (None en el ámbito global
+                si la partida tuvo ganador)
+            duration: Duración en segundos
+        """
+        granularities = self._buckets.get(scope)
+        if granularities is None:
+            granularities = self._buckets[scope] = {
+                granularity: {} for granularity in RollupGranularity
+            }
+        
+        for granularity, buckets in granularities.items():
+            bucket_start = self._floor(finished_at, granularity)
+            totals = buckets.get(bucket_start)
+            if totals is None:
+                totals = buckets[bucket_start] = RollupTotals()
+            totals.add_game(outcome, duration)
+        
+        self._all_time.setdefault(scope, RollupTotals()).add_game(outcome, duration)
+        self._prune(granularities, finished_at)
+    
+    def summarize(
+        self,
+        scope: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> RollupTotals:
+        """
+        Suma los agregados de un ámbito en un intervalo.
+        
+        La precisión es de una hora: se incluyen completas la hora que
+        contiene `start` y la que contiene `end`.
+        
+        Args:
+            scope: ID del jugador o GLOBAL_SCOPE
+            start: Inicio del intervalo (None para todo el historial)
+            end: Fin del intervalo (por defecto, ahora)
+            
+        Returns:
+            Totales del intervalo
+        """
+        result = RollupTotals()
+        granularities = self._buckets.get(scope)
+        if granularities is None:
+            return result
+        
+        if start is None:
+            result.merge(self._all_time[scope])
+            return result
+        
+        end = end or datetime.now()
+        cursor = self._floor(start, RollupGranularity.HOUR)
+        
+        while cursor < end:
+            granularity, next_cursor = self._largest_bucket(cursor, end)
+            totals = granularities[granularity].get(cursor)
+            if totals is not None:
+                result.merge(totals)
+            cursor = next_cursor
+        
+        return result
+    
+    def remove_scope(self, scope: str) -> bool:
+        """
+        Elimina los agregados de un ámbito.
+        
+        Args:
+            scope: ID del jugador o GLOBAL_SCOPE
+            
+        Returns:
+            True si el ámbito tenía agregados
+        """
+        self._all_time.pop(scope, None)
+        return self._buckets.pop(scope, None) is not None
+    
+    @staticmethod
+    def _largest_bucket(cursor: datetime, end: datetime) -> Tuple[RollupGranularity, datetime]:
+        """Franja alineada más grande que empieza en `cursor` y cabe antes de `end`."""
+        if cursor.hour == 0:
+            if cursor.day == 1:
+                next_month = _next_month(cursor)
+                if next_month <= end:
+                    return RollupGranularity.MONTH, next_month
+            
+            next_day = cursor + timedelta(days=1)
+            if next_day <= end:
+                return RollupGranularity.DAY, next_day
+        
+        return RollupGranularity.HOUR, cursor + timedelta(hours=1)
+    
+    @staticmethod
+    def _floor(moment: datetime, granularity: RollupGranularity) -> datetime:
+        """Inicio de la franja que contiene `moment`."""
+        hour = moment.replace(minute=0, second=0, microsecond=0)
+        if granularity == RollupGranularity.HOUR:
+            return hour
+        day = hour.replace(hour=0)
+        if granularity == RollupGranularity.DAY:
+            return day
+        return day.replace(day=1)
+    
+    def _prune(
+        self,
+        granularities: Dict[RollupGranularity, Dict[datetime, RollupTotals]],
+        now: datetime
+    ) -> None:
+        """Descarta las franjas horarias y diarias más antiguas que su retención."""
+        for granularity, retention in (
+            (RollupGranularity.HOUR, self.HOUR_RETENTION),
+            (RollupGranularity.DAY, self.DAY_RETENTION),
+        ):
+            buckets = granularities[granularity]
+            # Las franjas se crean en orden cronológico: basta mirar las primeras
+            while buckets:
+                oldest = next(iter(buckets))
+                if oldest >= now - retention:
+                    break
+                del buckets[oldest]
+
+
+def _next_month(moment: datetime) -> datetime:
+    """Primer instante del mes siguiente a `moment`."""
+    if moment.month == 12:
+        return moment.replace(year=moment.year + 1, month=1)
+    return moment.replace(month=moment.month + 1)
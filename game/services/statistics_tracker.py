@@ -11,6 +11,9 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass
 
 from game.entities import Player, GameResult, GameSession
+from .statistics_aggregator import StatisticsAggregator
+from .game_history import GameHistory, GameRecord, GameOutcome
+from .statistics_rollups import StatisticsRollups, RollupTotals, GLOBAL_SCOPE
 
 
 class StatisticsPeriod(Enum):
@@ -44,6 +47,15 @@ class GameStatistics:
     games_per_day: float = 0.0
 
 
+# Días naturales que abarca cada período, contando el día de hoy
+PERIOD_DAYS = {
+    StatisticsPeriod.TODAY: 1,
+    StatisticsPeriod.WEEK: 7,
+    StatisticsPeriod.MONTH: 30,
+    StatisticsPeriod.YEAR: 365,
+}
+
+
 @dataclass
 class PlayerTrend:
     """Tendencia de rendimiento de un jugador."""
@@ -70,9 +82,45 @@ class StatisticsTracker:
     - Utiliza entidades del dominio
     """
     
-    def __init__(self):
-        """Inicializa el rastreador de estadísticas."""
-        pass
+    def __init__(
+        self,
+        aggregator: Optional[StatisticsAggregator] = None,
+        history: Optional[GameHistory] = None,
+        rollups: Optional[StatisticsRollups] = None
+    ):
+        """
+        Inicializa el rastreador de estadísticas.
+        
+        Args:
+            aggregator: Agregado incremental opcional para las estadísticas
+                globales; si se proporciona, get_global_statistics() sin
+                jugadores lo consulta en lugar de recorrer la lista
+            history: Historial opcional de partidas por jugador; si se
+                proporciona, las estadísticas por período, duraciones y
+                tendencias se calculan con partidas reales en lugar de
+                estimaciones
+            rollups: Agregados opcionales por hora, día y mes; si se
+                proporcionan, las consultas por período suman franjas en
+                lugar de recorrer el historial
+        """
+        self._aggregator = aggregator
+        self._history = history
+        self._rollups = rollups
+    
+    @property
+    def aggregator(self) -> Optional[StatisticsAggregator]:
+        """Agregado incremental de estadísticas globales."""
+        return self._aggregator
+    
+    @property
+    def history(self) -> Optional[GameHistory]:
+        """Historial de partidas por jugador."""
+        return self._history
+    
+    @property
+    def rollups(self) -> Optional[StatisticsRollups]:
+        """Agregados por franjas de tiempo."""
+        return self._rollups
     
     def get_player_statistics(
         self, 
@@ -89,9 +137,13 @@ class StatisticsTracker:
         Returns:
             Estadísticas compiladas del jugador
         """
-        # En una implementación completa, aquí se consultarían los registros
-        # de juegos del jugador filtrados por el período especificado
+        if self._rollups is not None and self._rollups.summarize(player.id).games > 0:
+            return self._get_player_statistics_from_rollups(player, period)
         
+        if self._history is not None and self._history.count(player.id) > 0:
+            return self._get_player_statistics_from_history(player, period)
+        
+        # Sin historial solo se dispone de los totales del jugador
         stats = player.stats
         
         # Calcular estadísticas básicas
@@ -148,11 +200,19 @@ class StatisticsTracker:
                 games_analyzed=stats.games_played
             )
         
-        # Simular análisis de tendencia basado en estadísticas disponibles
-        recent_performance = stats.win_rate
-        
-        # Estimación de rendimiento histórico basado en patrones típicos
-        historical_performance = self._estimate_historical_performance(player)
+        records = self._history.get_history(player.id) if self._history else []
+        if len(records) >= 2:
+            # Comparar las últimas partidas con las anteriores conservadas;
+            # si no hay suficientes, comparar las dos mitades del historial
+            split = max(len(records) - analysis_period, len(records) // 2)
+            recent_performance = self._win_rate_of(records[split:])
+            historical_performance = self._win_rate_of(records[:split])
+        else:
+            # Simular análisis de tendencia basado en estadísticas disponibles
+            recent_performance = stats.win_rate
+            
+            # Estimación de rendimiento histórico basado en patrones típicos
+            historical_performance = self._estimate_historical_performance(player)
         
         # Calcular cambio porcentual
         if historical_performance > 0:
@@ -173,16 +233,36 @@ class StatisticsTracker:
             games_analyzed=min(analysis_period, stats.games_played)
         )
     
-    def get_global_statistics(self, all_players: List[Player]) -> Dict[str, Any]:
+    def get_global_statistics(
+        self,
+        all_players: Optional[List[Player]] = None,
+        period: StatisticsPeriod = StatisticsPeriod.ALL_TIME
+    ) -> Dict[str, Any]:
         """
         Genera estadísticas globales del sistema.
         
+        Sin lista de jugadores y con un agregado configurado, la lectura es
+        O(1) porque el agregado se mantiene al terminar cada partida.
+        
         Args:
             all_players: Lista de todos los jugadores del sistema
-            
+            period: Período de tiempo; los distintos de ALL_TIME requieren
+                agregados por franjas
+                
         Returns:
             Diccionario con estadísticas globales
+            
+        Raises:
+            ValueError: Si se pide un período sin agregados por franjas
         """
+        if period != StatisticsPeriod.ALL_TIME:
+            if self._rollups is None:
+                raise ValueError("Las estadísticas globales por período requieren agregados por franjas")
+            return self._get_global_period_statistics(period)
+        
+        if all_players is None and self._aggregator is not None:
+            return self._aggregator.get_global_statistics()
+        
         if not all_players:
             return {
                 "total_players": 0,
@@ -328,6 +408,140 @@ class StatisticsTracker:
         
         return activity_metrics
     
+    def _get_player_statistics_from_history(
+        self,
+        player: Player,
+        period: StatisticsPeriod
+    ) -> GameStatistics:
+        """
+        Calcula las estadísticas de un jugador a partir de su historial.
+        
+        Los totales de ALL_TIME salen de PlayerStats, que no está limitado
+        por la capacidad del historial; las duraciones, de las partidas
+        conservadas.
+        
+        Args:
+            player: Jugador del cual obtener estadísticas
+            period: Período de tiempo a analizar
+            
+        Returns:
+            Estadísticas compiladas del jugador
+        """
+        records = self._history.get_history(player.id, since=self._period_start(period))
+        durations = [record.duration for record in records]
+        
+        if period == StatisticsPeriod.ALL_TIME:
+            stats = player.stats
+            wins, losses, draws = stats.games_won, stats.games_lost, stats.games_drawn
+            games_per_day = self._calculate_games_per_day(player)
+        else:
+            wins = sum(1 for record in records if record.outcome == GameOutcome.WIN)
+            losses = sum(1 for record in records if record.outcome == GameOutcome.LOSS)
+            draws = len(records) - wins - losses
+            games_per_day = len(records) / PERIOD_DAYS[period]
+        
+        total_games = wins + losses + draws
+        
+        return GameStatistics(
+            total_games=total_games,
+            wins=wins,
+            losses=losses,
+            draws=draws,
+            win_rate=(wins / total_games) * 100 if total_games > 0 else 0.0,
+            average_game_duration=sum(durations) / len(durations) if durations else 0.0,
+            shortest_game=min(durations) if durations else 0.0,
+            longest_game=max(durations) if durations else 0.0,
+            games_per_day=games_per_day
+        )
+    
+    def _get_player_statistics_from_rollups(
+        self,
+        player: Player,
+        period: StatisticsPeriod
+    ) -> GameStatistics:
+        """
+        Calcula las estadísticas de un jugador sumando franjas agregadas.
+        
+        Args:
+            player: Jugador del cual obtener estadísticas
+            period: Período de tiempo a analizar
+            
+        Returns:
+            Estadísticas compiladas del jugador
+        """
+        totals = self._rollups.summarize(player.id, self._period_start(period))
+        
+        if period == StatisticsPeriod.ALL_TIME:
+            stats = player.stats
+            wins, losses, draws = stats.games_won, stats.games_lost, stats.games_drawn
+            games_per_day = self._calculate_games_per_day(player)
+        else:
+            wins, losses, draws = totals.wins, totals.losses, totals.draws
+            games_per_day = totals.games / PERIOD_DAYS[period]
+        
+        total_games = wins + losses + draws
+        
+        return GameStatistics(
+            total_games=total_games,
+            wins=wins,
+            losses=losses,
+            draws=draws,
+            win_rate=(wins / total_games) * 100 if total_games > 0 else 0.0,
+            average_game_duration=totals.average_duration,
+            shortest_game=totals.shortest_game,
+            longest_game=totals.longest_game,
+            games_per_day=games_per_day
+        )
+    
+    def _get_global_period_statistics(self, period: StatisticsPeriod) -> Dict[str, Any]:
+        """
+        Calcula las estadísticas globales de un período sumando franjas.
+        
+        Args:
+            period: Período de tiempo a analizar
+            
+        Returns:
+            Diccionario con estadísticas globales del período
+        """
+        totals: RollupTotals = self._rollups.summarize(GLOBAL_SCOPE, self._period_start(period))
+        
+        return {
+            "period": period.value,
+            "total_games": totals.games,
+            "draws": totals.draws,
+            "games_per_day": round(totals.games / PERIOD_DAYS[period], 2),
+            "average_game_duration": round(totals.average_duration, 2),
+            "shortest_game": totals.shortest_game,
+            "longest_game": totals.longest_game,
+            "total_playtime_hours": round(totals.total_duration / 3600.0, 2)
+        }
+    
+    @staticmethod
+    def _period_start(period: StatisticsPeriod, now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Inicio de un período: medianoche del primer día natural que abarca.
+        
+        Args:
+            period: Período de tiempo
+            now: Momento de referencia (por defecto, ahora)
+            
+        Returns:
+            Fecha de inicio o None para ALL_TIME
+        """
+        if period == StatisticsPeriod.ALL_TIME:
+            return None
+        
+        today = (now or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+        return today - timedelta(days=PERIOD_DAYS[period] - 1)
+    
+    @staticmethod
+    def _win_rate_of(records: List[GameRecord]) -> float:
+        """Porcentaje de victorias de una lista de partidas."""
+        if not records:
+            return 0.0
+        wins = sum(1 for record in records if record.outcome == GameOutcome.WIN)
+        return (wins / len(records)) * 100
+    
     def _estimate_average_duration(self, player: Player) -> float:
         """Estima la duración promedio de juegos basada en el tipo de jugador."""
         if player.is_ai:
@@ -565,8 +779,11 @@ class StatisticsTracker:
     
     def _estimate_last_activity(self, player: Player) -> str:
         """Estima la última actividad del jugador."""
-        # En una implementación real, esto consultaría registros de actividad
-        days_since_creation = (datetime.now() - player.created_at).days
+        last_activity = self._history.get_last_activity(player.id) if self._history else None
+        
+        # Sin historial, se usa la antigüedad del jugador como aproximación
+        reference = last_activity or player.created_at
+        days_since_creation = (datetime.now() - reference).days
         
         if days_since_creation <= 1:
             return "Hoy"
@@ -6,14 +6,27 @@ un movimiento en el juego, incluyendo validaciones, actualización
 del estado y verificación de condiciones de victoria.
 """
 
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional
 from dataclasses import dataclass
 
 from game.entities import (
-    GameSession, Position, Player, GameState, GameResult
+    GameSession, Position, Player, GameState, GameResult, ConcurrentModificationError
 )
 
 
+def is_board_coordinate(value) -> bool:
+    """
+    Comprueba que un valor es una coordenada válida del tablero.
+    
+    Args:
+        value: Valor recibido como fila o columna
+        
+    Returns:
+        True si es un entero (no bool) entre 0 y 2
+    """
+    return isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= 2
+
+
 @dataclass
 class MakeMoveRequest:
     """Petición para realizar un movimiento."""
@@ -33,6 +46,16 @@ class MakeMoveResponse:
     winner: Optional[Player]
     is_draw: bool
     errors: List[str]
+    conflict: bool = False
+
+
+@dataclass
+class MakeMoveBatchResponse:
+    """Respuesta del caso de uso realizar movimientos en lote."""
+    success: bool
+    message: str
+    results: List[MakeMoveResponse]     # En el orden de las peticiones
+    errors: List[str]
 
 
 class MakeMoveUseCase:
@@ -51,111 +74,275 @@ class MakeMoveUseCase:
     - Encapsula las reglas de negocio para los movimientos
     - No depende de frameworks o tecnologías específicas
     - Utiliza entidades del dominio
+    
+    Concurrencia optimista: si otra petición guarda la misma sesión entre
+    la lectura y la escritura, el movimiento se vuelve a validar y aplicar
+    sobre la sesión actualizada, hasta MAX_SAVE_RETRIES intentos.
+    
+    Los oyentes registrados con add_game_finished_listener reciben la
+    sesión cuando un movimiento guardado termina la partida, para mantener
+    agregados (clasificación, estadísticas globales) de forma incremental.
+    
+    execute_batch aplica una lista ordenada de movimientos, posiblemente
+    de varias partidas, leyendo y guardando cada sesión una sola vez.
     """
     
-    def __init__(self, game_session_repository):
+    MAX_SAVE_RETRIES = 3
+    
+    def __init__(self, game_session_repository, session_executor=None):
         """
         Inicializa el caso de uso.
         
         Args:
             game_session_repository: Repositorio para obtener/guardar sesiones de juego
+            session_executor: Ejecutor opcional con método
+                submit(session_id, fn, *args) que devuelve un Future y ejecuta
+                en orden, de una en una, las tareas de cada sesión
         """
         self._game_session_repository = game_session_repository
+        self._session_executor = session_executor
+        self._game_finished_listeners: List[Callable[[GameSession], None]] = []
+    
+    def add_game_finished_listener(self, listener: Callable[[GameSession], None]) -> None:
+        """
+        Registra un oyente para las partidas terminadas.
+        
+        Args:
+            listener: Función que recibe la sesión de juego terminada
+        """
+        self._game_finished_listeners.append(listener)
     
     def execute(self, request: MakeMoveRequest) -> MakeMoveResponse:
         """
         Ejecuta el caso de uso de realizar movimiento.
         
+        Con un ejecutor por sesión, los movimientos de una misma partida se
+        procesan en orden de llegada y los de partidas distintas en paralelo.
+        
         Args:
             request: Datos necesarios para realizar el movimiento
             
         Returns:
             Respuesta con el resultado de la operación
         """
-        # Validar datos de entrada
-        errors = self._validate_request(request)
-        if errors:
-            return MakeMoveResponse(
-                success=False,
-                message="Error de validación en el movimiento",
-                game_session=None,
-                is_game_over=False,
-                winner=None,
-                is_draw=False,
-                errors=errors
-            )
+        if self._session_executor is not None:
+            return self._session_executor.submit(
+                request.game_session_id, self._execute, request
+            ).result()
         
-        try:
-            # Obtener la sesión de juego
-            game_session = self._game_session_repository.get_by_id(request.game_session_id)
-            if not game_session:
-                return MakeMoveResponse(
+        return self._execute(request)
+    
+    def execute_batch(
+        self,
+        requests: List[MakeMoveRequest],
+        on_session_saved: Optional[Callable[[GameSession], None]] = None
+    ) -> MakeMoveBatchResponse:
+        """
+        Ejecuta una lista ordenada de movimientos, posiblemente de varias partidas.
+        
+        Los movimientos se agrupan por sesión conservando su orden; cada
+        sesión se lee y se guarda una sola vez. Un movimiento inválido no
+        detiene a los siguientes: su resultado recoge el error y la sesión
+        queda como estaba antes de él. Con un ejecutor por sesión, los
+        grupos de partidas distintas se procesan en paralelo.
+        
+        Args:
+            requests: Movimientos a realizar, en orden
+            on_session_saved: Función opcional que recibe cada sesión tras
+                guardarla, antes de que otra tarea de la misma sesión pueda
+                modificarla (p. ej. para serializarla o publicar un evento)
+                
+        Returns:
+            Respuesta con un resultado por movimiento, en el mismo orden
+        """
+        results: List[Optional[MakeMoveResponse]] = [None] * len(requests)
+        groups: Dict[str, List[int]] = {}
+        
+        for index, request in enumerate(requests):
+            errors = self._validate_request(request)
+            if errors:
+                results[index] = MakeMoveResponse(
                     success=False,
-                    message="Sesión de juego no encontrada",
+                    message="Error de validación en el movimiento",
                     game_session=None,
                     is_game_over=False,
                     winner=None,
                     is_draw=False,
-                    errors=["Sesión de juego no encontrada"]
-                )
-            
-            # Validar el estado del juego
-            validation_errors = self._validate_game_state(game_session, request.player_id)
-            if validation_errors:
-                return MakeMoveResponse(
-                    success=False,
-                    message="Estado del juego inválido para realizar movimiento",
-                    game_session=game_session,
-                    is_game_over=False,
-                    winner=None,
-                    is_draw=False,
-                    errors=validation_errors
-                )
-            
-            # Buscar el jugador
-            player = self._find_player_by_id(game_session, request.player_id)
-            if not player:
-                return MakeMoveResponse(
-                    success=False,
-                    message="Jugador no encontrado en la sesión",
-                    game_session=game_session,
-                    is_game_over=False,
-                    winner=None,
-                    is_draw=False,
-                    errors=["Jugador no encontrado en la sesión"]
+                    errors=errors
                 )
+            else:
+                groups.setdefault(request.game_session_id, []).append(index)
+        
+        if self._session_executor is not None:
+            # Enviar primero todos los grupos para que avancen en paralelo
+            futures = [
+                (indexes, self._session_executor.submit(
+                    session_id, self._execute_session_batch,
+                    [requests[index] for index in indexes], on_session_saved
+                ))
+                for session_id, indexes in groups.items()
+            ]
+            outcomes = [(indexes, future.result()) for indexes, future in futures]
+        else:
+            outcomes = [
+                (indexes, self._execute_session_batch(
+                    [requests[index] for index in indexes], on_session_saved
+                ))
+                for indexes in groups.values()
+            ]
+        
+        for indexes, group_results in outcomes:
+            for index, response in zip(indexes, group_results):
+                results[index] = response
+        
+        errors = [
+            f"Movimiento {index}: {error}"
+            for index, response in enumerate(results)
+            for error in response.errors
+        ]
+        applied = sum(1 for response in results if response.success)
+        
+        return MakeMoveBatchResponse(
+            success=applied == len(results),
+            message=f"{applied} de {len(results)} movimientos realizados",
+            results=results,
+            errors=errors
+        )
+    
+    def _execute_session_batch(
+        self,
+        requests: List[MakeMoveRequest],
+        on_session_saved: Optional[Callable[[GameSession], None]] = None
+    ) -> List[MakeMoveResponse]:
+        """
+        Realiza en el hilo actual los movimientos de una misma sesión.
+        
+        Args:
+            requests: Movimientos de la sesión, ya validados y en orden
+            on_session_saved: Función opcional que recibe la sesión guardada
             
-            # Crear la posición del movimiento
-            position = Position(row=request.row, col=request.col)
-            
-            # Realizar el movimiento
-            move_success = game_session.make_move(position, player)
-            
-            if not move_success:
-                return MakeMoveResponse(
+        Returns:
+            Lista con un resultado por movimiento
+        """
+        def failure(message: str, errors: List[str], conflict: bool = False) -> List[MakeMoveResponse]:
+            return [
+                MakeMoveResponse(
                     success=False,
-                    message="No se pudo realizar el movimiento - posición ocupada",
-                    game_session=game_session,
+                    message=message,
+                    game_session=None,
                     is_game_over=False,
                     winner=None,
                     is_draw=False,
-                    errors=["La posición seleccionada ya está ocupada"]
+                    errors=list(errors),
+                    conflict=conflict
                 )
+                for _ in requests
+            ]
+        
+        try:
+            for _ in range(self.MAX_SAVE_RETRIES):
+                game_session = self._game_session_repository.get_by_id(requests[0].game_session_id)
+                if not game_session:
+                    return failure("Sesión de juego no encontrada", ["Sesión de juego no encontrada"])
+                
+                was_finished = game_session.is_finished()
+                responses = [self._apply_move(game_session, request) for request in requests]
+                
+                # Guardar una sola vez; ante un conflicto, repetir el grupo
+                # completo sobre la versión más reciente
+                if not any(response.success for response in responses):
+                    return responses
+                
+                try:
+                    self._game_session_repository.save(game_session)
+                except ConcurrentModificationError:
+                    continue
+                
+                if game_session.is_finished() and not was_finished:
+                    self._notify_game_finished(game_session)
+                
+                if on_session_saved is not None:
+                    try:
+                        on_session_saved(game_session)
+                    except Exception:
+                        pass
+                
+                return responses
             
-            # Guardar la sesión actualizada
-            self._game_session_repository.save(game_session)
+            return failure(
+                "La partida fue modificada por otra petición",
+                ["Conflicto de concurrencia: vuelve a intentar los movimientos"],
+                conflict=True
+            )
+        
+        except Exception as e:
+            return failure("Error interno al realizar el movimiento", [f"Error interno: {str(e)}"])
+    
+    def _execute(self, request: MakeMoveRequest) -> MakeMoveResponse:
+        """
+        Realiza el movimiento en el hilo actual.
+        
+        Args:
+            request: Datos necesarios para realizar el movimiento
             
-            # Preparar respuesta exitosa
+        Returns:
+            Respuesta con el resultado de la operación
+        """
+        # Validar datos de entrada
+        errors = self._validate_request(request)
+        if errors:
             return MakeMoveResponse(
-                success=True,
-                message=self._build_success_message(game_session, player),
-                game_session=game_session,
-                is_game_over=game_session.is_finished(),
-                winner=game_session.get_winner(),
-                is_draw=game_session.is_draw(),
-                errors=[]
+                success=False,
+                message="Error de validación en el movimiento",
+                game_session=None,
+                is_game_over=False,
+                winner=None,
+                is_draw=False,
+                errors=errors
             )
+        
+        try:
+            for _ in range(self.MAX_SAVE_RETRIES):
+                # Obtener la sesión de juego
+                game_session = self._game_session_repository.get_by_id(request.game_session_id)
+                if not game_session:
+                    return MakeMoveResponse(
+                        success=False,
+                        message="Sesión de juego no encontrada",
+                        game_session=None,
+                        is_game_over=False,
+                        winner=None,
+                        is_draw=False,
+                        errors=["Sesión de juego no encontrada"]
+                    )
+                
+                response = self._apply_move(game_session, request)
+                if not response.success:
+                    return response
+                
+                # Guardar la sesión actualizada; si otra petición la modificó
+                # entretanto, repetir sobre la versión más reciente
+                try:
+                    self._game_session_repository.save(game_session)
+                except ConcurrentModificationError:
+                    continue
+                
+                if game_session.is_finished():
+                    self._notify_game_finished(game_session)
+                
+                return response
             
+            return MakeMoveResponse(
+                success=False,
+                message="La partida fue modificada por otra petición",
+                game_session=None,
+                is_game_over=False,
+                winner=None,
+                is_draw=False,
+                errors=["Conflicto de concurrencia: vuelve a intentar el movimiento"],
+                conflict=True
+            )
+        
         except ValueError as e:
             return MakeMoveResponse(
                 success=False,
@@ -177,6 +364,85 @@ class MakeMoveUseCase:
                 errors=[f"Error interno: {str(e)}"]
             )
     
+    def _apply_move(self, game_session: GameSession, request: MakeMoveRequest) -> MakeMoveResponse:
+        """
+        Valida y aplica un movimiento sobre una sesión ya cargada, sin guardarla.
+        
+        Args:
+            game_session: Sesión de juego sobre la que mover
+            request: Datos del movimiento
+            
+        Returns:
+            Respuesta con el resultado del movimiento
+        """
+        # Validar el estado del juego
+        validation_errors = self._validate_game_state(game_session, request.player_id)
+        if validation_errors:
+            return MakeMoveResponse(
+                success=False,
+                message="Estado del juego inválido para realizar movimiento",
+                game_session=game_session,
+                is_game_over=False,
+                winner=None,
+                is_draw=False,
+                errors=validation_errors
+            )
+        
+        # Buscar el jugador
+        player = self._find_player_by_id(game_session, request.player_id)
+        if not player:
+            return MakeMoveResponse(
+                success=False,
+                message="Jugador no encontrado en la sesión",
+                game_session=game_session,
+                is_game_over=False,
+                winner=None,
+                is_draw=False,
+                errors=["Jugador no encontrado en la sesión"]
+            )
+        
+        # Crear la posición del movimiento
+        position = Position(row=request.row, col=request.col)
+        
+        # Realizar el movimiento
+        move_success = game_session.make_move(position, player)
+        
+        if not move_success:
+            return MakeMoveResponse(
+                success=False,
+                message="No se pudo realizar el movimiento - posición ocupada",
+                game_session=game_session,
+                is_game_over=False,
+                winner=None,
+                is_draw=False,
+                errors=["La posición seleccionada ya está ocupada"]
+            )
+        
+        return MakeMoveResponse(
+            success=True,
+            message=self._build_success_message(game_session, player),
+            game_session=game_session,
+            is_game_over=game_session.is_finished(),
+            winner=game_session.get_winner(),
+            is_draw=game_session.is_draw(),
+            errors=[]
+        )
+    
+    def _notify_game_finished(self, game_session: GameSession) -> None:
+        """
+        Notifica a los oyentes que la partida ha terminado.
+        
+        Un oyente que falla no afecta al movimiento, que ya está guardado.
+        
+        Args:
+            game_session: Sesión de juego terminada
+        """
+        for listener in self._game_finished_listeners:
+            try:
+                listener(game_session)
+            except Exception:
+                pass
+    
     def _validate_request(self, request: MakeMoveRequest) -> List[str]:
         """
         Valida los datos de la petición.
@@ -190,19 +456,19 @@ class MakeMoveUseCase:
         errors = []
         
         # Validar ID de sesión
-        if not request.game_session_id or not request.game_session_id.strip():
+        if not isinstance(request.game_session_id, str) or not request.game_session_id.strip():
             errors.append("ID de sesión de juego es obligatorio")
         
         # Validar ID de jugador
-        if not request.player_id or not request.player_id.strip():
+        if not isinstance(request.player_id, str) or not request.player_id.strip():
             errors.append("ID de jugador es obligatorio")
         
-        # Validar coordenadas
-        if not (0 <= request.row <= 2):
-            errors.append("La fila debe estar entre 0 y 2")
+        # Validar coordenadas (los datos llegan sin tipar desde JSON; bool es int)
+        if not is_board_coordinate(request.row):
+            errors.append("La fila debe ser un entero entre 0 y 2")
         
-        if not (0 <= request.col <= 2):
-            errors.append("La columna debe estar entre 0 y 2")
+        if not is_board_coordinate(request.col):
+            errors.append("La columna debe ser un entero entre 0 y 2")
         
         return errors
     
@@ -275,14 +541,15 @@ class MakeMoveUseCaseFactory:
     """Factory para crear instancias del caso de uso MakeMove."""
     
     @staticmethod
-    def create(game_session_repository) -> MakeMoveUseCase:
+    def create(game_session_repository, session_executor=None) -> MakeMoveUseCase:
         """
         Crea una nueva instancia del caso de uso.
         
         Args:
             game_session_repository: Repositorio de sesiones de juego
+            session_executor: Ejecutor opcional por sesión
             
         Returns:
             Nueva instancia de MakeMoveUseCase
         """
-        return MakeMoveUseCase(game_session_repository)
\ No newline at end of file
+        return MakeMoveUseCase(game_session_repository, session_executor)
\ No newline at end of file
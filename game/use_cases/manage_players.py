@@ -5,12 +5,28 @@ Este caso de uso encapsula toda la lógica necesaria para gestionar
 jugadores, incluyendo creación, configuración y estadísticas.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Protocol
 from dataclasses import dataclass
 
 from game.entities import Player, PlayerType, PlayerSymbol, PlayerStats
 
 
+class PlayerRepositoryContract(Protocol):
+    """Operaciones del repositorio de jugadores que usa el caso de uso."""
+    
+    def save(self, player: Player) -> bool: ...
+    
+    def get_by_id(self, player_id: str) -> Optional[Player]: ...
+    
+    def get_all(self) -> List[Player]: ...
+    
+    def exists_by_name(self, name: str) -> bool: ...
+    
+    def get_top_players(self, limit: int = 10) -> List[Player]:
+        """Jugadores con partidas, por tasa de victoria y partidas jugadas."""
+        ...
+
+
 @dataclass
 class CreatePlayerRequest:
     """Petición para crear un jugador."""
@@ -62,7 +78,7 @@ class ManagePlayersUseCase:
     - Utiliza entidades del dominio
     """
     
-    def __init__(self, player_repository):
+    def __init__(self, player_repository: PlayerRepositoryContract):
         """
         Inicializa el caso de uso.
         
@@ -301,14 +317,8 @@ class ManagePlayersUseCase:
             Respuesta con el ranking de jugadores
         """
         try:
-            all_players = self._player_repository.get_all()
-            
-            # Ordenar por tasa de victoria y número de partidas jugadas
-            top_players = sorted(
-                [p for p in all_players if p.stats.games_played > 0],
-                key=lambda p: (p.stats.win_rate, p.stats.games_played),
-                reverse=True
-            )[:limit]
+            # El repositorio mantiene un índice ordenado de la clasificación
+            top_players = self._player_repository.get_top_players(limit)
             
             return ManagePlayersResponse(
                 success=True,
@@ -408,7 +418,7 @@ class ManagePlayersUseCaseFactory:
     """Factory para crear instancias del caso de uso ManagePlayers."""
     
     @staticmethod
-    def create(player_repository) -> ManagePlayersUseCase:
+    def create(player_repository: PlayerRepositoryContract) -> ManagePlayersUseCase:
         """
         Crea una nueva instancia del caso de uso.
         
@@ -0,0 +1,607 @@
+"""
+ASGI Adapter - Adaptador ASGI asíncrono para la interfaz web.
+
+Expone la misma API REST que FlaskWebAdapter como aplicación ASGI, para
+servirla con un servidor asíncrono (uvicorn, hypercorn...). Los casos de
+uso se ejecutan fuera del bucle de eventos, en un pool de hilos o en el
+actor de la sesión, y los flujos de eventos esperan sin ocupar un hilo,
+de modo que un proceso mantiene miles de conexiones abiertas.
+
+Al no haber cookie de sesión, los clientes indican game_session_id en el
+cuerpo (movimientos y reinicios) o en la query (estado).
+"""
+
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from pathlib import Path
+from urllib.parse import parse_qs
+import asyncio
+import json
+import re
+
+from game.use_cases.make_move import MakeMoveUseCaseFactory
+from game.entities import GameSession
+from persistence.repositories.game_repository import GameRepository
+from persistence.repositories.live_session_repository import LiveSessionRepository
+from persistence.repositories.session_sweeper import SessionSweeper
+from persistence.data_sources.memory_storage import MemoryStorage
+from .request_processing import GameRequestProcessor, parse_move, parse_move_batch
+from .response_encoder import ResponseEncoder
+from .session_events import SessionEventBroker, format_sse_event
+from .static_assets import (
+    IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, StaticAsset, StaticAssetRegistry
+)
+from .session_views import SessionViewCache
+
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+_EVENTS_PATH = re.compile(r"^/api/game/([^/]+)/events$")
+
+# Accept-Encoding y modo compacto de la petición en curso (ver _send_json)
+_response_options: ContextVar[Tuple[Optional[str], Optional[bool]]] = ContextVar(
+    '_response_options', default=(None, None)
+)
+
+
+class AsgiWebAdapter:
+    """
+    Adaptador ASGI que conecta la interfaz web con el dominio del juego.
+    
+    Este adaptador:
+    - Recibe peticiones HTTP a través del protocolo ASGI
+    - Ejecuta los casos de uso del dominio en un ejecutor, sin bloquear
+      el bucle de eventos
+    - Delega el procesamiento de la API en GameRequestProcessor, igual
+      que FlaskWebAdapter
+    - Mantiene los flujos Server-Sent Events como corrutinas en espera
+    
+    Principios de Screaming Architecture:
+    - Es un MECANISMO DE ENTREGA, no parte del dominio
+    - Depende del dominio, no al revés
+    - Traduce entre protocolo ASGI y casos de uso del negocio
+    """
+    
+    # Segundos sin eventos tras los que un flujo SSE envía un latido
+    SSE_HEARTBEAT_SECONDS = 15.0
+    
+    # Tamaño máximo del cuerpo de una petición
+    MAX_BODY_BYTES = 64 * 1024
+    
+    def __init__(
+        self,
+        storage: Optional[Any] = None,
+        session_executor: Optional[Any] = None,
+        max_workers: int = 8,
+        response_encoder: Optional[ResponseEncoder] = None,
+        static_assets: Optional[StaticAssetRegistry] = None,
+        game_statistics: Optional[Any] = None
+    ):
+        """
+        Inicializa el adaptador ASGI.
+        
+        Args:
+            storage: Almacenamiento de sesiones (ver FlaskWebAdapter)
+            session_executor: Ejecutor por sesión (ver SessionActorPool); si se
+                indica, los movimientos y reinicios de una partida se procesan
+                en orden sobre su sesión viva en memoria
+            max_workers: Hilos para los casos de uso y el acceso al almacenamiento
+            response_encoder: Codificador de las respuestas JSON (ver
+                FlaskWebAdapter)
+            static_assets: Recursos estáticos con huella (ver FlaskWebAdapter)
+            game_statistics: Estadísticas de partidas terminadas (ver
+                FlaskWebAdapter)
+        """
+        self._storage = storage if storage is not None else MemoryStorage()
+        self._game_repository = GameRepository(self._storage)
+        self._session_sweeper = SessionSweeper(self._storage)
+        
+        self._session_executor = session_executor
+        self._live_sessions = (
+            LiveSessionRepository(self._game_repository) if session_executor is not None else None
+        )
+        self._move_repository = self._live_sessions or self._game_repository
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="asgi-use-case")
+        
+        self._session_events = SessionEventBroker()
+        self._session_views = SessionViewCache()
+        self._response_encoder = response_encoder or ResponseEncoder()
+        
+        self._make_move_use_case = MakeMoveUseCaseFactory.create(
+            self._move_repository, session_executor
+        )
+        self._game_statistics = game_statistics
+        if game_statistics is not None:
+            game_statistics.register(self._make_move_use_case)
+        self._requests = GameRequestProcessor(
+            self._game_repository, self._move_repository, self._make_move_use_case,
+            self._session_views, self._session_events
+        )
+        
+        self._static_root = Path(__file__).parent.resolve()
+        self._static_assets = static_assets or StaticAssetRegistry(self._static_root).register()
+        self._index_document: Optional[Tuple[int, StaticAsset]] = None  # (mtime de la plantilla, documento)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Punto de entrada ASGI."""
+        if scope['type'] == 'lifespan':
+            await self._handle_lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._handle_http(scope, receive, send)
+        elif scope['type'] == 'websocket':
+            # El juego en vivo por WebSocket lo sirve MultiplayerRoomServer
+            await send({'type': 'websocket.close', 'code': 1000})
+    
+    def start_background_tasks(self) -> None:
+        """Inicia las tareas en segundo plano (expiración de sesiones)."""
+        self._session_sweeper.start()
+    
+    def stop_background_tasks(self) -> None:
+        """Detiene las tareas en segundo plano, los flujos de eventos y el ejecutor."""
+        self._session_sweeper.stop()
+        self._session_events.close()
+        self._executor.shutdown(wait=False)
+    
+    async def _handle_lifespan(self, receive: Receive, send: Send) -> None:
+        """Atiende los eventos de arranque y parada del servidor."""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.start_background_tasks()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.stop_background_tasks()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    
+    async def _handle_http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Encamina una petición HTTP."""
+        method = scope['method']
+        path = scope['path']
+        
+        compact = (parse_qs(scope.get('query_string', b'').decode('latin-1')).get('compact') or [None])[0]
+        _response_options.set((
+            self._headers(scope).get('accept-encoding'),
+            None if compact is None else compact in ('1', 'true')
+        ))
+        
+        try:
+            if path == '/' and method == 'GET':
+                await self._send_index(scope, send)
+            elif path.startswith('/static/') and method == 'GET':
+                await self._send_static(scope, send, path[len('/static/'):])
+            elif path == '/api/game/start' and method == 'POST':
+                await self._start_new_game(receive, send)
+            elif path == '/api/game/move' and method == 'POST':
+                await self._make_move(receive, send)
+            elif path == '/api/game/moves:batch' and method == 'POST':
+                await self._make_moves_batch(receive, send)
+            elif path == '/api/game/status' and method == 'GET':
+                await self._get_game_status(scope, send)
+            elif path == '/api/game/reset' and method == 'POST':
+                await self._reset_game(receive, send)
+            elif path == '/api/lobby' and method == 'GET':
+                await self._get_lobby(scope, send)
+            elif path == '/api/metrics/sessions' and method == 'GET':
+                await self._get_session_metrics(send)
+            elif _EVENTS_PATH.match(path) and method == 'GET':
+                game_session_id = _EVENTS_PATH.match(path).group(1)
+                await self._stream_game_events(scope, receive, send, game_session_id)
+            else:
+                await self._send_json(send, 404, {
+                    'success': False,
+                    'message': 'Recurso no encontrado'
+                })
+        except _BodyTooLarge:
+            await self._send_json(send, 413, {
+                'success': False,
+                'message': 'Cuerpo de la petición demasiado grande'
+            })
+        except Exception as e:
+            await self._send_json(send, 500, {
+                'success': False,
+                'message': 'Error interno del servidor',
+                'errors': [str(e)]
+            })
+    
+    async def _start_new_game(self, receive: Receive, send: Send) -> None:
+        """API endpoint para iniciar una nueva partida."""
+        result, status = await self._run_blocking(self._requests.process_start, await self._read_json(receive))
+        await self._send_json(send, status, result)
+    
+    async def _make_move(self, receive: Receive, send: Send) -> None:
+        """
+        API endpoint para realizar un movimiento.
+        
+        Igual que en FlaskWebAdapter, con known_version igual a la versión
+        anterior la respuesta lleva solo los cambios ('delta').
+        """
+        data = await self._read_json(receive)
+        game_session_id = data.get('game_session_id')
+        
+        if not game_session_id:
+            await self._send_json(send, 400, {
+                'success': False,
+                'message': 'Sesión de juego no encontrada',
+                'errors': ['No hay una sesión de juego activa']
+            })
+            return
+        
+        use_case_request, errors = parse_move(data, game_session_id)
+        if errors:
+            await self._send_json(send, 400, {
+                'success': False,
+                'message': 'Error de validación en el movimiento',
+                'errors': errors
+            })
+            return
+        
+        known_version = data.get('known_version')
+        result, status = await self._run_in_session(
+            game_session_id, self._requests.process_move, use_case_request,
+            known_version if isinstance(known_version, int) else None
+        )
+        await self._send_json(send, status, result)
+    
+    async def _make_moves_batch(self, receive: Receive, send: Send) -> None:
+        """
+        API endpoint para realizar una lista ordenada de movimientos.
+        
+        Igual que en FlaskWebAdapter, pero cada movimiento debe indicar su
+        game_session_id.
+        """
+        use_case_requests, errors = parse_move_batch(await self._read_json(receive))
+        
+        if errors:
+            await self._send_json(send, 400, {
+                'success': False,
+                'message': 'Lote de movimientos inválido',
+                'errors': errors
+            })
+            return
+        
+        result = await self._run_blocking(self._requests.process_move_batch, use_case_requests)
+        await self._send_json(send, 200, result)
+    
+    async def _get_game_status(self, scope: Scope, send: Send) -> None:
+        """
+        API endpoint para obtener el estado de una partida.
+        
+        Igual que en FlaskWebAdapter, la respuesta lleva un ETag débil con
+        la versión de la sesión y se responde 304 a If-None-Match.
+        """
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        game_session_id = (query.get('game_session_id') or [''])[0]
+        
+        if not game_session_id:
+            await self._send_json(send, 200, {
+                'success': False,
+                'message': 'No hay sesión de juego activa',
+                'game_session': None
+            })
+            return
+        
+        version = await self._run_blocking(self._game_repository.get_version, game_session_id)
+        etag = f'"{game_session_id}-v{version}"' if version else None
+        if etag and etag in self._if_none_match(scope):
+            await self._send_empty(send, 304, [(b'etag', b'W/' + etag.encode()), (b'cache-control', b'no-cache')])
+            return
+        
+        view = self._session_views.lookup(game_session_id, version) if version else None
+        if view is None:
+            game_session = await self._run_blocking(self._game_repository.get_by_id, game_session_id)
+            
+            if not game_session:
+                await self._send_json(send, 200, {
+                    'success': False,
+                    'message': 'Sesión de juego no encontrada',
+                    'game_session': None
+                })
+                return
+            
+            view = self._session_views.get(game_session)
+        
+        etag = f'"{game_session_id}-v{view["version"]}"'
+        await self._send_json(send, 200, {
+            'success': True,
+            'message': 'Estado del juego obtenido',
+            'game_session': view
+        }, [(b'etag', b'W/' + etag.encode()), (b'cache-control', b'no-cache')])
+    
+    async def _reset_game(self, receive: Receive, send: Send) -> None:
+        """API endpoint para reiniciar el juego."""
+        data = await self._read_json(receive)
+        game_session_id = data.get('game_session_id')
+        
+        if not game_session_id:
+            await self._send_json(send, 400, {
+                'success': False,
+                'message': 'No hay sesión de juego activa'
+            })
+            return
+        
+        result, status = await self._run_in_session(
+            game_session_id, self._requests.process_reset, game_session_id
+        )
+        await self._send_json(send, status, result)
+    
+    async def _get_lobby(self, scope: Scope, send: Send) -> None:
+        """API endpoint con las partidas de un estado, paginadas por cursor."""
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        result, status = await self._run_blocking(
+            self._requests.process_lobby,
+            (query.get('state') or [''])[0],
+            (query.get('cursor') or [None])[0],
+            (query.get('limit') or [None])[0]
+        )
+        await self._send_json(send, status, result)
+    
+    async def _get_session_metrics(self, send: Send) -> None:
+        """API endpoint con métricas del almacenamiento de sesiones."""
+        await self._send_json(send, 200, {
+            'success': True,
+            'sessions': self._session_sweeper.get_gauges(),
+            'storage_locks': self._storage.get_lock_statistics(),
+            'session_actors': (
+                self._session_executor.get_statistics() if self._session_executor else None
+            ),
+            'live_sessions': self._live_sessions.get_statistics() if self._live_sessions else None,
+            'session_events': self._session_events.get_statistics(),
+            'session_views': self._session_views.get_statistics(),
+            'responses': self._response_encoder.get_statistics(),
+            'statistics': self._game_statistics.get_statistics() if self._game_statistics else None
+        })
+    
+    async def _stream_game_events(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        game_session_id: str
+    ) -> None:
+        """
+        API endpoint Server-Sent Events con los cambios de una partida.
+        
+        El flujo termina cuando el cliente se desconecta, la sesión expira
+        o se detiene el servidor.
+        """
+        game_session = await self._run_blocking(self._game_repository.get_by_id, game_session_id)
+        
+        if not game_session:
+            await self._send_json(send, 404, {
+                'success': False,
+                'message': 'Sesión de juego no encontrada'
+            })
+            return
+        
+        last_event_id = self._headers(scope).get('last-event-id', '')
+        known_version = int(last_event_id) if last_event_id.isdigit() else 0
+        
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream; charset=utf-8'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no')
+            ]
+        })
+        
+        stream = asyncio.ensure_future(self._pump_session_events(send, game_session, known_version))
+        disconnect = asyncio.ensure_future(self._wait_for_disconnect(receive))
+        done, pending = await asyncio.wait({stream, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        # Esperar la cancelación para que la suscripción se dé de baja
+        await asyncio.gather(*pending, return_exceptions=True)
+        
+        if stream in done:
+            stream.result()
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+    
+    async def _pump_session_events(self, send: Send, game_session: GameSession, known_version: int) -> None:
+        """Envía los eventos SSE de una partida (ver FlaskWebAdapter._stream_session_events)."""
+        game_session_id = game_session.id
+        version = game_session.version
+        
+        async def emit(chunk: str) -> None:
+            await send({'type': 'http.response.body', 'body': chunk.encode('utf-8'), 'more_body': True})
+        
+        if known_version != version:
+            await emit(format_sse_event(version, 'snapshot', self._session_views.get(game_session)))
+        
+        with self._session_events.subscribe(game_session_id) as subscription:
+            while True:
+                events = await subscription.wait_async(version, self.SSE_HEARTBEAT_SECONDS)
+                if subscription.closed:
+                    return
+                
+                if events:
+                    for event in events:
+                        version = event.version
+                        await emit(format_sse_event(event.version, event.event, event.data))
+                    continue
+                
+                stored_version = await self._run_blocking(
+                    self._game_repository.get_version, game_session_id
+                )
+                if stored_version == 0:
+                    # La sesión ha expirado o se ha eliminado
+                    await emit(format_sse_event(version, 'closed', {'game_session_id': game_session_id}))
+                    return
+                
+                if events is not None and stored_version == version:
+                    await emit(": keep-alive\n\n")
+                    continue
+                
+                # Faltan eventos: enviar la sesión completa
+                current = await self._run_blocking(self._game_repository.get_by_id, game_session_id)
+                if current is not None and current.version > version:
+                    version = current.version
+                    await emit(format_sse_event(version, 'snapshot', self._session_views.get(current)))
+    
+    async def _run_blocking(self, fn, *args) -> Any:
+        """Ejecuta una función bloqueante en el pool de hilos del adaptador."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+    
+    async def _run_in_session(self, game_session_id: str, fn, *args) -> Any:
+        """
+        Ejecuta una operación en el actor de la sesión, si lo hay.
+        
+        Args:
+            game_session_id: ID de la sesión
+            fn: Operación a ejecutar
+            *args: Argumentos de la operación
+            
+        Returns:
+            Resultado de la operación
+        """
+        if self._session_executor is None:
+            return await self._run_blocking(fn, *args)
+        
+        return await asyncio.wrap_future(self._session_executor.submit(game_session_id, fn, *args))
+    
+    async def _send_index(self, scope: Scope, send: Send) -> None:
+        """Envía la página principal del juego, con los recursos reescritos a sus URLs con huella."""
+        document = await self._run_blocking(self._load_index_document)
+        await self._send_asset(scope, send, document, REVALIDATE_CACHE_CONTROL)
+    
+    def _load_index_document(self) -> StaticAsset:
+        """Página principal renderizada; se renderiza de nuevo cuando cambia la plantilla."""
+        index_path = self._static_root / 'templates' / 'index.html'
+        modified_at = index_path.stat().st_mtime_ns
+        cached = self._index_document
+        if cached is not None and cached[0] == modified_at:
+            return cached[1]
+        
+        html = self._static_assets.rewrite(index_path.read_text(encoding='utf-8'))
+        document = self._static_assets.build_document(
+            'index.html', html.encode('utf-8'), 'text/html; charset=utf-8'
+        )
+        self._index_document = (modified_at, document)
+        return document
+    
+    async def _send_static(self, scope: Scope, send: Send, relative_path: str) -> None:
+        """Envía un recurso estático registrado (con caché inmutable si la URL lleva huella)."""
+        asset, fingerprinted = self._static_assets.resolve(relative_path)
+        if asset is None:
+            await self._send_json(send, 404, {
+                'success': False,
+                'message': 'Recurso no encontrado'
+            })
+            return
+        
+        await self._send_asset(
+            scope, send, asset, IMMUTABLE_CACHE_CONTROL if fingerprinted else REVALIDATE_CACHE_CONTROL
+        )
+    
+    async def _send_asset(self, scope: Scope, send: Send, asset: StaticAsset, cache_control: str) -> None:
+        """Envía un recurso precomprimido, o 304 si el cliente ya tiene esa versión (ETag débil)."""
+        etag = f'"{asset.etag}"'
+        headers = [
+            (b'etag', b'W/' + etag.encode('latin-1')),
+            (b'cache-control', cache_control.encode('latin-1')),
+            (b'vary', b'accept-encoding')
+        ]
+        if etag in self._if_none_match(scope):
+            await self._send_empty(send, 304, headers)
+            return
+        
+        body, encoding = self._static_assets.select(asset, self._headers(scope).get('accept-encoding'))
+        if encoding:
+            headers.append((b'content-encoding', encoding.encode('latin-1')))
+        await self._send_bytes(send, 200, body, asset.content_type.encode('latin-1'), headers)
+    
+    async def _read_json(self, receive: Receive) -> Dict[str, Any]:
+        """Lee el cuerpo de la petición como objeto JSON (vacío si no lo es)."""
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            body = message.get('body', b'')
+            size += len(body)
+            if size > self.MAX_BODY_BYTES:
+                raise _BodyTooLarge()
+            chunks.append(body)
+            if not message.get('more_body', False):
+                break
+        
+        try:
+            data = json.loads(b''.join(chunks) or b'{}')
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+    
+    @staticmethod
+    async def _wait_for_disconnect(receive: Receive) -> None:
+        """Espera a que el cliente cierre la conexión."""
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+    
+    @staticmethod
+    def _headers(scope: Scope) -> Dict[str, str]:
+        """Cabeceras de la petición con nombres en minúsculas."""
+        return {
+            name.decode('latin-1').lower(): value.decode('latin-1')
+            for name, value in scope.get('headers', [])
+        }
+    
+    def _if_none_match(self, scope: Scope) -> List[str]:
+        """ETags de la cabecera If-None-Match (sin prefijo débil)."""
+        header = self._headers(scope).get('if-none-match', '')
+        return [tag.strip().replace('W/', '', 1) for tag in header.split(',') if tag.strip()]
+    
+    async def _send_json(
+        self,
+        send: Send,
+        status: int,
+        data: Dict[str, Any],
+        headers: Optional[List[Tuple[bytes, bytes]]] = None
+    ) -> None:
+        """
+        Envía una respuesta JSON completa con el codificador del adaptador.
+        
+        La compresión se negocia con el Accept-Encoding de la petición en
+        curso y el modo compacto se elige con compact=1/0 en la query.
+        """
+        accept_encoding, compact = _response_options.get()
+        encoded = self._response_encoder.encode(data, accept_encoding, compact)
+        
+        extra = [(b'vary', b'accept-encoding')]
+        if encoded.content_encoding:
+            extra.append((b'content-encoding', encoded.content_encoding.encode('latin-1')))
+        await self._send_bytes(send, status, encoded.body, b'application/json', extra + (headers or []))
+    
+    @staticmethod
+    async def _send_bytes(
+        send: Send,
+        status: int,
+        body: bytes,
+        content_type: bytes,
+        headers: Optional[List[Tuple[bytes, bytes]]] = None
+    ) -> None:
+        """Envía una respuesta completa con el cuerpo indicado."""
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', content_type),
+                (b'content-length', str(len(body)).encode('latin-1'))
+            ] + (headers or [])
+        })
+        await send({'type': 'http.response.body', 'body': body})
+    
+    @staticmethod
+    async def _send_empty(send: Send, status: int, headers: List[Tuple[bytes, bytes]]) -> None:
+        """Envía una respuesta sin cuerpo."""
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b''})
+
+
+class _BodyTooLarge(Exception):
+    """El cuerpo de la petición supera MAX_BODY_BYTES."""
@@ -5,19 +5,23 @@ Este adaptador implementa el patrón Adapter para conectar Flask
 (tecnología de delivery) con los casos de uso del dominio.
 """
 
-from flask import Flask, render_template, request, jsonify, session as flask_session
-from typing import Dict, Any, Optional
-import uuid
+from flask import Flask, Response, render_template, request, session as flask_session
+from typing import Dict, Any, Iterator, Optional
+from pathlib import Path
 
-from game.use_cases.start_new_game import (
-    StartNewGameUseCase, StartNewGameRequest, StartNewGameUseCaseFactory
-)
-from game.use_cases.make_move import (
-    MakeMoveUseCase, MakeMoveRequest, MakeMoveUseCaseFactory  
-)
-from game.entities import PlayerType, GameSession, Player
+from game.use_cases.make_move import MakeMoveUseCaseFactory
+from game.entities import GameSession
 from persistence.repositories.game_repository import GameRepository
+from persistence.repositories.live_session_repository import LiveSessionRepository
+from persistence.repositories.session_sweeper import SessionSweeper
 from persistence.data_sources.memory_storage import MemoryStorage
+from .request_processing import GameRequestProcessor, parse_move, parse_move_batch
+from .response_encoder import ResponseEncoder
+from .session_events import SessionEventBroker, format_sse_event
+from .static_assets import (
+    IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, StaticAsset, StaticAssetRegistry
+)
+from .session_views import SessionViewCache
 
 
 class FlaskWebAdapter:
@@ -36,23 +40,89 @@ class FlaskWebAdapter:
     - Traduce entre protocolo HTTP y casos de uso del negocio
     """
     
-    def __init__(self):
-        """Inicializa el adaptador Flask."""
+    # Segundos sin eventos tras los que un flujo SSE envía un latido
+    SSE_HEARTBEAT_SECONDS = 15.0
+    
+    def __init__(
+        self,
+        storage: Optional[Any] = None,
+        session_executor: Optional[Any] = None,
+        matchmaker: Optional[Any] = None,
+        response_encoder: Optional[ResponseEncoder] = None,
+        static_assets: Optional[StaticAssetRegistry] = None,
+        game_statistics: Optional[Any] = None
+    ):
+        """
+        Inicializa el adaptador Flask.
+        
+        Args:
+            storage: Almacenamiento de sesiones; con varios procesos debe
+                compartirse entre ellos (ver SharedStorageClient)
+            session_executor: Ejecutor por sesión (ver SessionActorPool); si se
+                indica, los movimientos y reinicios de una partida se procesan
+                en orden sobre su sesión viva en memoria
+            matchmaker: Cola de emparejamiento en línea (ver
+                MatchmakingCoordinator); debe guardar las partidas en `storage`
+            response_encoder: Codificador de las respuestas JSON (por
+                defecto, ResponseEncoder con compresión negociada)
+            static_assets: Recursos estáticos con huella (por defecto, los
+                del directorio de la interfaz web)
+            game_statistics: Estadísticas de partidas terminadas (ver
+                GameStatisticsCoordinator); se registra como oyente del caso
+                de uso de movimientos y se publica en /api/metrics/sessions
+        """
         self.app = Flask(
             __name__,
             template_folder='templates',
-            static_folder='.',
-            static_url_path='/static'
+            static_folder=None
         )
         self.app.secret_key = 'tres-en-raya-screaming-architecture'
         
         # Repositorio en memoria (puede ser inyectado)
-        self._storage = MemoryStorage()
+        self._storage = storage if storage is not None else MemoryStorage()
         self._game_repository = GameRepository(self._storage)
         
-        # Casos de uso
-        self._start_game_use_case = StartNewGameUseCaseFactory.create()
-        self._make_move_use_case = MakeMoveUseCaseFactory.create(self._game_repository)
+        # Expiración de sesiones terminadas o abandonadas
+        self._session_sweeper = SessionSweeper(self._storage)
+        
+        # Sesiones vivas en memoria cuando hay un ejecutor por sesión
+        self._session_executor = session_executor
+        self._live_sessions = (
+            LiveSessionRepository(self._game_repository) if session_executor is not None else None
+        )
+        self._move_repository = self._live_sessions or self._game_repository
+        
+        # Eventos en vivo de las partidas (Server-Sent Events)
+        self._session_events = SessionEventBroker()
+        
+        # Vistas serializadas por versión de sesión
+        self._session_views = SessionViewCache()
+        
+        # Emparejamiento de jugadores en línea (opcional)
+        self._matchmaker = matchmaker
+        
+        # Codificación y compresión de las respuestas JSON
+        self._response_encoder = response_encoder or ResponseEncoder()
+        
+        # Recursos estáticos con huella y página principal ya renderizada
+        self._static_assets = static_assets or StaticAssetRegistry(Path(__file__).parent).register()
+        self._index_document: Optional[StaticAsset] = None
+        self.app.jinja_env.globals['asset_url'] = self._static_assets.url_for
+        
+        # Casos de uso y procesamiento de la API (común con AsgiWebAdapter)
+        self._make_move_use_case = MakeMoveUseCaseFactory.create(
+            self._move_repository, session_executor
+        )
+        
+        # Estadísticas alimentadas con cada partida terminada (opcional)
+        self._game_statistics = game_statistics
+        if game_statistics is not None:
+            game_statistics.register(self._make_move_use_case)
+        
+        self._requests = GameRequestProcessor(
+            self._game_repository, self._move_repository, self._make_move_use_case,
+            self._session_views, self._session_events
+        )
         
         # Configurar rutas
         self._setup_routes()
@@ -62,47 +132,54 @@ class FlaskWebAdapter:
         
         @self.app.route('/')
         def index():
-            """Página principal del juego."""
-            return render_template('index.html')
+            """
+            Página principal del juego.
+            
+            Se renderiza una vez, con las referencias a recursos estáticos
+            reescritas a sus URLs con huella, y se revalida con su ETag. En
+            modo debug se renderiza en cada petición, como Flask recarga las
+            plantillas, para ver los cambios sin reiniciar el servidor.
+            """
+            if self._index_document is None or self.app.debug:
+                html = self._static_assets.rewrite(render_template('index.html'))
+                self._index_document = self._static_assets.build_document(
+                    'index.html', html.encode('utf-8'), 'text/html; charset=utf-8'
+                )
+            return self._asset_response(self._index_document, REVALIDATE_CACHE_CONTROL)
+        
+        @self.app.route('/static/<path:filename>')
+        def static(filename: str):
+            """
+            Recursos estáticos registrados.
+            
+            Las URLs con huella se sirven con caché inmutable; las rutas sin
+            huella, con revalidación por ETag.
+            """
+            asset, fingerprinted = self._static_assets.resolve(filename)
+            if asset is None:
+                return self._json_response({
+                    'success': False,
+                    'message': 'Recurso no encontrado'
+                }), 404
+            
+            return self._asset_response(
+                asset, IMMUTABLE_CACHE_CONTROL if fingerprinted else REVALIDATE_CACHE_CONTROL
+            )
         
         @self.app.route('/api/game/start', methods=['POST'])
         def start_new_game():
             """API endpoint para iniciar una nueva partida."""
             try:
-                data = request.get_json() or {}
+                result, status = self._requests.process_start(request.get_json() or {})
                 
-                # Crear petición del caso de uso
-                use_case_request = StartNewGameRequest(
-                    player1_name=data.get('player1_name', 'Jugador 1'),
-                    player2_name=data.get('player2_name'),
-                    player2_type=self._parse_player_type(data.get('player2_type', 'human')),
-                    session_id=str(uuid.uuid4())
-                )
-                
-                # Ejecutar caso de uso
-                response = self._start_game_use_case.execute(use_case_request)
+                # Guardar ID de sesión en la sesión web
+                if result['success']:
+                    flask_session['game_session_id'] = result['game_session']['id']
                 
-                if response.success and response.game_session:
-                    # Guardar sesión en repositorio
-                    self._game_repository.save(response.game_session)
-                    
-                    # Guardar ID de sesión en la sesión web
-                    flask_session['game_session_id'] = response.game_session.id
-                    
-                    return jsonify({
-                        'success': True,
-                        'message': response.message,
-                        'game_session': self._serialize_game_session(response.game_session)
-                    })
-                else:
-                    return jsonify({
-                        'success': False,
-                        'message': response.message,
-                        'errors': response.errors
-                    }), 400
-                    
+                return self._json_response(result), status
+            
             except Exception as e:
-                return jsonify({
+                return self._json_response({
                     'success': False,
                     'message': 'Error interno del servidor',
                     'errors': [str(e)]
@@ -110,51 +187,76 @@ class FlaskWebAdapter:
         
         @self.app.route('/api/game/move', methods=['POST'])
         def make_move():
-            """API endpoint para realizar un movimiento."""
+            """
+            API endpoint para realizar un movimiento.
+            
+            Si el cliente envía known_version y es la versión anterior al
+            movimiento, la respuesta lleva solo los cambios ('delta') en
+            lugar de la sesión completa.
+            """
             try:
                 data = request.get_json() or {}
                 game_session_id = flask_session.get('game_session_id') or data.get('game_session_id')
                 
                 if not game_session_id:
-                    return jsonify({
+                    return self._json_response({
                         'success': False,
                         'message': 'Sesión de juego no encontrada',
                         'errors': ['No hay una sesión de juego activa']
                     }), 400
                 
                 # Crear petición del caso de uso
-                use_case_request = MakeMoveRequest(
-                    game_session_id=game_session_id,
-                    player_id=data.get('player_id', ''),
-                    row=data.get('row', -1),
-                    col=data.get('col', -1)
-                )
-                
-                # Ejecutar caso de uso
-                response = self._make_move_use_case.execute(use_case_request)
-                
-                result = {
-                    'success': response.success,
-                    'message': response.message,
-                    'is_game_over': response.is_game_over,
-                    'is_draw': response.is_draw,
-                    'errors': response.errors
-                }
+                use_case_request, errors = parse_move(data, game_session_id)
+                if errors:
+                    return self._json_response({
+                        'success': False,
+                        'message': 'Error de validación en el movimiento',
+                        'errors': errors
+                    }), 400
                 
-                if response.game_session:
-                    result['game_session'] = self._serialize_game_session(response.game_session)
+                # Ejecutar caso de uso en el actor de la sesión; la respuesta se
+                # serializa allí para que otro movimiento no la modifique a medias
+                known_version = data.get('known_version')
+                result, status = self._run_in_session(
+                    game_session_id, self._requests.process_move, use_case_request,
+                    known_version if isinstance(known_version, int) else None
+                )
                 
-                if response.winner:
-                    result['winner'] = {
-                        'id': response.winner.id,
-                        'name': response.winner.name,
-                        'symbol': response.winner.symbol.value if response.winner.symbol else None
-                    }
+                return self._json_response(result), status
+            
+            except Exception as e:
+                return self._json_response({
+                    'success': False,
+                    'message': 'Error interno del servidor',
+                    'errors': [str(e)]
+                }), 500
+        
+        @self.app.route('/api/game/moves:batch', methods=['POST'])
+        def make_moves_batch():
+            """
+            API endpoint para realizar una lista ordenada de movimientos.
+            
+            Pensado para importar partidas y para bots: cada movimiento puede
+            indicar su game_session_id (por defecto, la sesión de la cookie)
+            y cada sesión se lee y se guarda una sola vez. La respuesta lleva
+            un resultado por movimiento y la vista final de cada sesión.
+            """
+            try:
+                use_case_requests, errors = parse_move_batch(
+                    request.get_json(silent=True) or {}, flask_session.get('game_session_id')
+                )
                 
-                return jsonify(result)
+                if errors:
+                    return self._json_response({
+                        'success': False,
+                        'message': 'Lote de movimientos inválido',
+                        'errors': errors
+                    }), 400
                 
+                return self._json_response(self._requests.process_move_batch(use_case_requests)), 200
+            
             except Exception as e:
-                return jsonify({
+                return self._json_response({
                     'success': False,
                     'message': 'Error interno del servidor',
                     'errors': [str(e)]
@@ -162,39 +264,235 @@ class FlaskWebAdapter:
         
         @self.app.route('/api/game/status')
         def get_game_status():
-            """API endpoint para obtener el estado actual del juego."""
+            """
+            API endpoint para obtener el estado actual del juego.
+            
+            La respuesta lleva un ETag débil con la versión de la sesión (el
+            cuerpo varía con la compresión y el modo compacto); si el cliente
+            envía If-None-Match con esa versión se responde 304 sin leer ni
+            serializar la sesión.
+            """
             try:
                 game_session_id = flask_session.get('game_session_id')
                 
                 if not game_session_id:
-                    return jsonify({
+                    return self._json_response({
                         'success': False,
                         'message': 'No hay sesión de juego activa',
                         'game_session': None
                     })
                 
-                game_session = self._game_repository.get_by_id(game_session_id)
+                version = self._game_repository.get_version(game_session_id)
+                etag = self._format_etag(game_session_id, version) if version else None
+                if etag and request.if_none_match.contains_weak(etag):
+                    response = self.app.response_class(status=304)
+                    response.set_etag(etag, weak=True)
+                    response.headers['Cache-Control'] = 'no-cache'
+                    return response
                 
-                if not game_session:
-                    return jsonify({
-                        'success': False,
-                        'message': 'Sesión de juego no encontrada',
-                        'game_session': None
-                    })
+                # Con la vista de esa versión en caché no hace falta leer la sesión
+                view = self._session_views.lookup(game_session_id, version) if version else None
+                if view is None:
+                    game_session = self._game_repository.get_by_id(game_session_id)
+                    
+                    if not game_session:
+                        return self._json_response({
+                            'success': False,
+                            'message': 'Sesión de juego no encontrada',
+                            'game_session': None
+                        })
+                    
+                    view = self._session_views.get(game_session)
                 
-                return jsonify({
+                response = self._json_response({
                     'success': True,
                     'message': 'Estado del juego obtenido',
-                    'game_session': self._serialize_game_session(game_session)
+                    'game_session': view
                 })
-                
+                # La versión de la vista identifica el cuerpo
+                response.set_etag(self._format_etag(game_session_id, view['version']), weak=True)
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
+            
             except Exception as e:
-                return jsonify({
+                return self._json_response({
                     'success': False,
                     'message': 'Error interno del servidor',
                     'errors': [str(e)]
                 }), 500
         
+        @self.app.route('/api/metrics/sessions')
+        def get_session_metrics():
+            """API endpoint con métricas del almacenamiento de sesiones."""
+            return self._json_response({
+                'success': True,
+                'sessions': self._session_sweeper.get_gauges(),
+                'storage_locks': self._storage.get_lock_statistics(),
+                'session_actors': (
+                    self._session_executor.get_statistics() if self._session_executor else None
+                ),
+                'live_sessions': self._live_sessions.get_statistics() if self._live_sessions else None,
+                'session_events': self._session_events.get_statistics(),
+                'session_views': self._session_views.get_statistics(),
+                'matchmaking': self._matchmaker.get_statistics() if self._matchmaker else None,
+                'responses': self._response_encoder.get_statistics(),
+                'statistics': self._game_statistics.get_statistics() if self._game_statistics else None
+            })
+        
+        @self.app.route('/api/players/<player_id>/statistics')
+        def player_statistics(player_id: str):
+            """API endpoint con las estadísticas de un jugador (?period=week...)."""
+            if self._game_statistics is None:
+                return self._json_response({
+                    'success': False,
+                    'message': 'Las estadísticas no están disponibles'
+                }), 503
+            
+            period = request.args.get('period', 'all_time')
+            try:
+                statistics = self._game_statistics.get_player_statistics(player_id, period)
+            except ValueError:
+                return self._json_response({
+                    'success': False,
+                    'message': f'Período no válido: {period}'
+                }), 400
+            
+            if statistics is None:
+                return self._json_response({'success': False, 'message': 'Jugador no encontrado'}), 404
+            return self._json_response({
+                'success': True,
+                'player_id': player_id,
+                'period': period,
+                'statistics': statistics
+            })
+        
+        @self.app.route('/api/lobby')
+        def get_lobby():
+            """
+            API endpoint con las partidas de un estado, paginadas por cursor.
+            
+            Parámetros: state (por defecto waiting_for_players), cursor
+            (next_cursor de la página anterior) y limit.
+            """
+            try:
+                result, status = self._requests.process_lobby(
+                    request.args.get('state', ''),
+                    request.args.get('cursor'),
+                    request.args.get('limit')
+                )
+                return self._json_response(result), status
+            except Exception as e:
+                return self._json_response({
+                    'success': False,
+                    'message': 'Error interno del servidor',
+                    'errors': [str(e)]
+                }), 500
+        
+        @self.app.route('/api/matchmaking/queue', methods=['POST'])
+        def join_matchmaking():
+            """
+            API endpoint para buscar un rival humano en línea.
+            
+            Devuelve un ticket que el cliente consulta en
+            /api/matchmaking/<ticket_id> hasta que se le asigna partida.
+            """
+            if self._matchmaker is None:
+                return self._json_response({
+                    'success': False,
+                    'message': 'El emparejamiento en línea no está disponible'
+                }), 503
+            
+            data = request.get_json(silent=True) or {}
+            try:
+                ticket_id = self._matchmaker.enqueue(
+                    data.get('player_name', ''),
+                    rating=float(data.get('rating', self._matchmaker.DEFAULT_RATING)),
+                    queue=data.get('queue', self._matchmaker.DEFAULT_QUEUE)
+                )
+            except (TypeError, ValueError) as e:
+                return self._json_response({
+                    'success': False,
+                    'message': 'Error de validación',
+                    'errors': [str(e)]
+                }), 400
+            
+            return self._json_response({
+                'success': True,
+                'message': 'Buscando rival',
+                'ticket_id': ticket_id
+            }), 202
+        
+        @self.app.route('/api/matchmaking/<ticket_id>', methods=['GET', 'DELETE'])
+        def matchmaking_ticket(ticket_id: str):
+            """
+            API endpoint para consultar (GET) o cancelar (DELETE) una búsqueda.
+            
+            Cuando hay partida, la sesión del navegador pasa a ella, de modo
+            que /api/game/move y /api/game/status funcionan sin más cambios.
+            """
+            if self._matchmaker is None:
+                return self._json_response({
+                    'success': False,
+                    'message': 'El emparejamiento en línea no está disponible'
+                }), 503
+            
+            if request.method == 'DELETE':
+                if self._matchmaker.cancel(ticket_id):
+                    return self._json_response({'success': True, 'message': 'Búsqueda cancelada'})
+                return self._json_response({'success': False, 'message': 'Ticket no encontrado'}), 404
+            
+            match = self._matchmaker.poll(ticket_id)
+            if match is not None:
+                flask_session['game_session_id'] = match.game_session_id
+                return self._json_response({
+                    'success': True,
+                    'status': 'matched',
+                    'message': f'Partida encontrada contra {match.opponent_name}',
+                    'match': {
+                        'game_session_id': match.game_session_id,
+                        'player_id': match.player_id,
+                        'symbol': match.symbol,
+                        'opponent_name': match.opponent_name,
+                        'opponent_rating': match.opponent_rating
+                    }
+                })
+            
+            if self._matchmaker.is_waiting(ticket_id):
+                return self._json_response({
+                    'success': True,
+                    'status': 'waiting',
+                    'message': 'Buscando rival'
+                }), 202
+            
+            return self._json_response({'success': False, 'message': 'Ticket no encontrado'}), 404
+        
+        @self.app.route('/api/game/<game_session_id>/events')
+        def stream_game_events(game_session_id: str):
+            """
+            API endpoint Server-Sent Events con los cambios de una partida.
+            
+            Envía primero una instantánea (evento 'snapshot') salvo que el
+            cliente se reconecte con Last-Event-ID igual a la versión
+            actual; después, un evento 'move' con los cambios de cada
+            movimiento y 'reset' al reiniciar.
+            """
+            game_session = self._game_repository.get_by_id(game_session_id)
+            
+            if not game_session:
+                return self._json_response({
+                    'success': False,
+                    'message': 'Sesión de juego no encontrada'
+                }), 404
+            
+            last_event_id = request.headers.get('Last-Event-ID', '')
+            known_version = int(last_event_id) if last_event_id.isdigit() else 0
+            
+            return Response(
+                self._stream_session_events(game_session, known_version),
+                mimetype='text/event-stream',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
+        
         @self.app.route('/api/game/reset', methods=['POST'])
         def reset_game():
             """API endpoint para reiniciar el juego."""
@@ -202,121 +500,161 @@ class FlaskWebAdapter:
                 game_session_id = flask_session.get('game_session_id')
                 
                 if not game_session_id:
-                    return jsonify({
+                    return self._json_response({
                         'success': False,
                         'message': 'No hay sesión de juego activa'
                     }), 400
                 
-                game_session = self._game_repository.get_by_id(game_session_id)
-                
-                if not game_session:
-                    return jsonify({
-                        'success': False,
-                        'message': 'Sesión de juego no encontrada'
-                    }), 404
-                
-                # Reiniciar el juego
-                game_session.reset()
-                self._game_repository.save(game_session)
-                
-                return jsonify({
-                    'success': True,
-                    'message': 'Juego reiniciado exitosamente',
-                    'game_session': self._serialize_game_session(game_session)
-                })
+                # Reiniciar en el actor de la sesión, en orden con los movimientos
+                result, status = self._run_in_session(
+                    game_session_id, self._requests.process_reset, game_session_id
+                )
                 
+                return self._json_response(result), status
+            
             except Exception as e:
-                return jsonify({
+                return self._json_response({
                     'success': False,
                     'message': 'Error interno del servidor',
                     'errors': [str(e)]
                 }), 500
     
-    def _parse_player_type(self, player_type_str: str) -> PlayerType:
+    def _json_response(self, data: Dict[str, Any]) -> Response:
         """
-        Convierte string del tipo de jugador a enum PlayerType.
+        Construye una respuesta JSON con el codificador del adaptador.
+        
+        La compresión se negocia con Accept-Encoding y el modo compacto se
+        activa o desactiva con el parámetro de consulta compact=1/0.
         
         Args:
-            player_type_str: String del tipo de jugador
+            data: Cuerpo de la respuesta
             
         Returns:
-            PlayerType correspondiente
+            Respuesta HTTP
         """
-        mapping = {
-            'human': PlayerType.HUMAN,
-            'ai_easy': PlayerType.AI_EASY,
-            'ai_medium': PlayerType.AI_MEDIUM,
-            'ai_hard': PlayerType.AI_HARD
-        }
-        return mapping.get(player_type_str.lower(), PlayerType.HUMAN)
+        compact = request.args.get('compact')
+        encoded = self._response_encoder.encode(
+            data,
+            request.headers.get('Accept-Encoding'),
+            None if compact is None else compact in ('1', 'true')
+        )
+        
+        response = self.app.response_class(encoded.body, mimetype='application/json')
+        response.vary.add('Accept-Encoding')
+        if encoded.content_encoding:
+            response.headers['Content-Encoding'] = encoded.content_encoding
+        return response
     
-    def _serialize_winner(self, winner: Optional[Player]) -> Optional[Dict[str, Any]]:
+    def _asset_response(self, asset: StaticAsset, cache_control: str) -> Response:
         """
-        Serializa el jugador ganador.
+        Construye la respuesta de un recurso estático o documento precomprimido.
+        
+        El ETag es débil: identifica el contenido, que comparten todas sus
+        variantes comprimidas.
         
         Args:
-            winner: Jugador ganador o None
+            asset: Recurso a enviar
+            cache_control: Valor de la cabecera Cache-Control
             
         Returns:
-            Diccionario con datos del ganador o None
+            Respuesta HTTP (304 si el cliente ya tiene esa versión)
         """
-        if not winner:
-            return None
-        
-        return {
-            'id': winner.id,
-            'name': winner.name,
-            'symbol': winner.symbol.value if winner.symbol else None
-        }
+        if request.if_none_match.contains_weak(asset.etag):
+            response = self.app.response_class(status=304)
+        else:
+            body, encoding = self._static_assets.select(asset, request.headers.get('Accept-Encoding'))
+            response = self.app.response_class(body, content_type=asset.content_type)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        
+        response.set_etag(asset.etag, weak=True)
+        response.headers['Cache-Control'] = cache_control
+        response.vary.add('Accept-Encoding')
+        return response
     
-    def _serialize_game_session(self, game_session: GameSession) -> Dict[str, Any]:
+    @staticmethod
+    def _format_etag(game_session_id: str, version: int) -> str:
+        """Formatea el ETag de una versión de sesión."""
+        return f"{game_session_id}-v{version}"
+    
+    def _run_in_session(self, game_session_id: str, fn, *args) -> Any:
         """
-        Serializa una GameSession a diccionario para JSON.
+        Ejecuta una operación en el actor de la sesión, si lo hay.
         
         Args:
-            game_session: Sesión de juego a serializar
+            game_session_id: ID de la sesión
+            fn: Operación a ejecutar
+            *args: Argumentos de la operación
             
         Returns:
-            Diccionario con los datos de la sesión
+            Resultado de la operación
         """
-        return {
-            'id': game_session.id,
-            'state': game_session.state.value,
-            'result': game_session.result.value if game_session.result else None,
-            'board': game_session.board.to_list(),
-            'current_player': {
-                'id': game_session.current_player.id,
-                'name': game_session.current_player.name,
-                'symbol': game_session.current_player_symbol.value
-            } if game_session.current_player else None,
-            'players': [
-                {
-                    'id': player.id,
-                    'name': player.name,
-                    'symbol': player.symbol.value if player.symbol else None,
-                    'type': player.player_type.value,
-                    'stats': {
-                        'games_played': player.stats.games_played,
-                        'games_won': player.stats.games_won,
-                        'games_lost': player.stats.games_lost,
-                        'games_drawn': player.stats.games_drawn,
-                        'win_rate': player.stats.win_rate
-                    }
-                }
-                for player in game_session.players
-            ],
-            'move_count': game_session.move_count,
-            'is_finished': game_session.is_finished(),
-            'is_draw': game_session.is_draw(),
-            'winner': self._serialize_winner(game_session.get_winner()) if game_session.get_winner() else None,
-            'available_moves': [
-                {'row': pos.row, 'col': pos.col} 
-                for pos in game_session.get_available_moves()
-            ],
-            'created_at': game_session.created_at.isoformat() if game_session.created_at else None,
-            'started_at': game_session.started_at.isoformat() if game_session.started_at else None,
-            'finished_at': game_session.finished_at.isoformat() if game_session.finished_at else None
-        }
+        if self._session_executor is None:
+            return fn(*args)
+        
+        return self._session_executor.submit(game_session_id, fn, *args).result()
+    
+    def _stream_session_events(self, game_session: GameSession, known_version: int) -> Iterator[str]:
+        """
+        Genera el flujo SSE de una partida.
+        
+        En cada latido se compara la versión almacenada, para detectar
+        cambios que no pasaron por este proceso (varios procesos de
+        trabajo) y enviar una instantánea.
+        
+        Args:
+            game_session: Sesión de juego actual
+            known_version: Versión que el cliente ya conoce
+            
+        Returns:
+            Iterador de fragmentos SSE
+        """
+        game_session_id = game_session.id
+        version = game_session.version
+        
+        if known_version != version:
+            yield format_sse_event(version, 'snapshot', self._session_views.get(game_session))
+        
+        with self._session_events.subscribe(game_session_id) as subscription:
+            while True:
+                events = subscription.wait(version, self.SSE_HEARTBEAT_SECONDS)
+                if subscription.closed:
+                    return
+                
+                if events:
+                    for event in events:
+                        version = event.version
+                        yield format_sse_event(event.version, event.event, event.data)
+                    continue
+                
+                stored_version = self._game_repository.get_version(game_session_id)
+                if stored_version == 0:
+                    # La sesión ha expirado o se ha eliminado
+                    yield format_sse_event(version, 'closed', {'game_session_id': game_session_id})
+                    return
+                
+                if events is not None and stored_version == version:
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                # Faltan eventos: enviar la sesión completa
+                current = self._game_repository.get_by_id(game_session_id)
+                if current is not None and current.version > version:
+                    version = current.version
+                    yield format_sse_event(version, 'snapshot', self._session_views.get(current))
+    
+    def start_background_tasks(self) -> None:
+        """Inicia las tareas en segundo plano (expiración de sesiones y emparejamiento)."""
+        self._session_sweeper.start()
+        if self._matchmaker is not None:
+            self._matchmaker.start()
+    
+    def stop_background_tasks(self) -> None:
+        """Detiene las tareas en segundo plano y cierra los flujos de eventos."""
+        self._session_sweeper.stop()
+        if self._matchmaker is not None:
+            self._matchmaker.stop()
+        self._session_events.close()
     
     def run(self, debug: bool = True, host: str = '127.0.0.1', port: int = 5000):
         """
@@ -327,4 +665,5 @@ class FlaskWebAdapter:
             host: Host de la aplicación
             port: Puerto de la aplicación
         """
+        self.start_background_tasks()
         self.app.run(debug=debug, host=host, port=port)
\ No newline at end of file
@@ -0,0 +1,512 @@
+"""
+Multiplayer Server - Salas de juego en vivo sobre WebSocket.
+
+Servidor asyncio que aloja partidas entre dos jugadores humanos en
+memoria. Cada jugador mantiene una única conexión persistente por la que
+envía sus movimientos y recibe los del rival, en lugar de hacer una
+petición HTTP por movimiento.
+
+Protocolo (mensajes JSON con un campo "type"):
+- create_room {player_name} -> room_created {room_id, seat_token}
+- join_room {room_id, player_name} -> room_joined, y game_started a ambos
+- move {row, col} -> move (a ambos) o error (al remitente)
+- resume {room_id, seat_token} -> resumed, y opponent_reconnected al rival
+- leave {} -> room_closed al rival
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
+import asyncio
+import json
+import secrets
+import time
+import uuid
+
+from game.use_cases.start_new_game import StartNewGameRequest, StartNewGameUseCaseFactory
+from game.use_cases.make_move import MakeMoveRequest, MakeMoveUseCaseFactory
+from game.entities import PlayerType
+from persistence.repositories.game_repository import GameRepository
+from persistence.data_sources.memory_storage import MemoryStorage
+from .request_processing import coordinate_errors
+from .response_encoder import dumps
+from .session_views import serialize_game_session, serialize_move_delta
+from .websocket_protocol import (
+    WebSocketConnection, WebSocketError, read_http_head, validate_upgrade_request,
+    accept_connection, build_reject_response, CLOSE_GOING_AWAY
+)
+
+
+@dataclass
+class _Seat:
+    """Plaza de un jugador en una sala."""
+    name: str
+    token: str
+    connection: Optional[WebSocketConnection] = None
+    player_id: Optional[str] = None
+    disconnected_at: Optional[float] = None
+
+
+@dataclass
+class _Room:
+    """Sala con hasta dos plazas y su partida."""
+    id: str
+    seats: List[_Seat] = field(default_factory=list)
+    game_session_id: Optional[str] = None
+    last_activity: float = field(default_factory=time.monotonic)
+    
+    def opponent_of(self, seat: _Seat) -> Optional[_Seat]:
+        """Plaza del rival de `seat`, si la hay."""
+        for other in self.seats:
+            if other is not seat:
+                return other
+        return None
+
+
+class MultiplayerRoomServer:
+    """
+    Servidor de salas multijugador sobre WebSocket.
+    
+    Aplica los límites de ExternalServicesConfiguration.get_multiplayer_server_config:
+    - max_connections: las negociaciones por encima del límite reciben 503
+    - heartbeat_interval: cada intervalo se envía un ping y se cierran las
+      conexiones sin actividad en dos intervalos
+    - room_timeout: las salas sin actividad durante ese tiempo se cierran
+    - reconnection_timeout: un jugador desconectado puede volver a su
+      plaza con su seat_token durante ese tiempo; después la sala se cierra
+      
+    Todo el estado vive en el bucle de eventos, por lo que no hay locks:
+    los movimientos de una sala se procesan en el orden en que llegan.
+    
+    Principios de Screaming Architecture:
+    - Es un MECANISMO DE ENTREGA, no parte del dominio
+    - Ejecuta los mismos casos de uso que la API REST
+    """
+    
+    # Cierres de sala notificados al rival
+    REASON_LEFT = "opponent_left"
+    REASON_TIMEOUT = "reconnection_timeout"
+    REASON_EXPIRED = "room_expired"
+    REASON_SHUTDOWN = "server_shutdown"
+    
+    def __init__(
+        self,
+        max_connections: int = 100,
+        heartbeat_interval: float = 30.0,
+        room_timeout: float = 300.0,
+        enable_reconnection: bool = True,
+        reconnection_timeout: float = 60.0,
+        game_repository: Optional[GameRepository] = None
+    ):
+        """
+        Inicializa el servidor.
+        
+        Args:
+            max_connections: Conexiones WebSocket simultáneas permitidas
+            heartbeat_interval: Segundos entre pings de latido
+            room_timeout: Segundos sin actividad tras los que se cierra una sala
+            enable_reconnection: Si los jugadores pueden recuperar su plaza
+            reconnection_timeout: Segundos para recuperar una plaza
+            game_repository: Repositorio de partidas (en memoria por defecto)
+            
+        Raises:
+            ValueError: Si algún límite no es positivo
+        """
+        if max_connections < 1:
+            raise ValueError("El número máximo de conexiones debe ser al menos 1")
+        if heartbeat_interval <= 0 or room_timeout <= 0 or reconnection_timeout <= 0:
+            raise ValueError("Los intervalos del servidor multijugador deben ser positivos")
+        
+        self._max_connections = max_connections
+        self._heartbeat_interval = heartbeat_interval
+        self._room_timeout = room_timeout
+        self._enable_reconnection = enable_reconnection
+        self._reconnection_timeout = reconnection_timeout
+        
+        self._game_repository = game_repository or GameRepository(MemoryStorage())
+        self._start_game_use_case = StartNewGameUseCaseFactory.create()
+        self._make_move_use_case = MakeMoveUseCaseFactory.create(self._game_repository)
+        
+        self._connections: Dict[WebSocketConnection, Optional[Tuple[_Room, _Seat]]] = {}
+        self._rooms: Dict[str, _Room] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._rejected_connections = 0
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], **kwargs) -> 'MultiplayerRoomServer':
+        """
+        Crea el servidor a partir de get_multiplayer_server_config.
+        
+        Args:
+            config: Configuración del servidor multijugador
+            **kwargs: Argumentos adicionales del constructor
+            
+        Returns:
+            Servidor configurado
+        """
+        return cls(
+            max_connections=int(config.get('max_connections', 100)),
+            heartbeat_interval=float(config.get('heartbeat_interval', 30)),
+            room_timeout=float(config.get('room_timeout', 300)),
+            enable_reconnection=bool(config.get('enable_reconnection', True)),
+            reconnection_timeout=float(config.get('reconnection_timeout', 60)),
+            **kwargs
+        )
+    
+    @property
+    def port(self) -> Optional[int]:
+        """Puerto en el que escucha el servidor (útil con port=0)."""
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[1]
+    
+    async def start(self, host: str = '127.0.0.1', port: int = 8080) -> None:
+        """
+        Empieza a aceptar conexiones y lanza el latido.
+        
+        Args:
+            host: Dirección de escucha
+            port: Puerto de escucha (0 para uno libre)
+        """
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+    
+    async def stop(self) -> None:
+        """Deja de aceptar conexiones, cierra las salas y las conexiones."""
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        
+        if self._server is not None:
+            self._server.close()
+        
+        for room in list(self._rooms.values()):
+            await self._close_room(room, self.REASON_SHUTDOWN)
+        
+        for connection in list(self._connections):
+            await connection.close(CLOSE_GOING_AWAY, "Servidor detenido")
+            await connection.wait_closed()
+        
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene las métricas del servidor.
+        
+        Returns:
+            Diccionario con conexiones, salas y partidas en curso
+        """
+        return {
+            'connections': len(self._connections),
+            'max_connections': self._max_connections,
+            'rejected_connections': self._rejected_connections,
+            'rooms': len(self._rooms),
+            'active_games': sum(1 for room in self._rooms.values() if room.game_session_id)
+        }
+    
+    async def reap(self, now: Optional[float] = None) -> None:
+        """
+        Cierra conexiones muertas y salas caducadas, y envía pings.
+        
+        Args:
+            now: Instante de referencia (time.monotonic por defecto)
+        """
+        now = time.monotonic() if now is None else now
+        
+        for room in list(self._rooms.values()):
+            if now - room.last_activity > self._room_timeout:
+                await self._close_room(room, self.REASON_EXPIRED)
+                continue
+            
+            for seat in room.seats:
+                if (seat.disconnected_at is not None
+                        and now - seat.disconnected_at > self._reconnection_timeout):
+                    await self._close_room(room, self.REASON_TIMEOUT)
+                    break
+        
+        for connection in list(self._connections):
+            if now - connection.last_seen > 2 * self._heartbeat_interval:
+                # Sin pong en dos latidos: la conexión está muerta
+                await connection.wait_closed()
+            else:
+                await connection.ping()
+    
+    async def _heartbeat_loop(self) -> None:
+        """Ejecuta reap() cada heartbeat_interval segundos."""
+        while True:
+            await asyncio.sleep(self._heartbeat_interval)
+            await self.reap()
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Negocia una conexión WebSocket y atiende sus mensajes."""
+        try:
+            request_line, headers = await read_http_head(reader)
+            key = validate_upgrade_request(request_line, headers)
+        except WebSocketError:
+            writer.write(build_reject_response(400, "Bad Request"))
+            await self._close_writer(writer)
+            return
+        
+        if len(self._connections) >= self._max_connections:
+            self._rejected_connections += 1
+            writer.write(build_reject_response(503, "Service Unavailable"))
+            await self._close_writer(writer)
+            return
+        
+        connection = await accept_connection(reader, writer, key)
+        if connection is None:
+            return
+        self._connections[connection] = None
+        
+        try:
+            while True:
+                message = await connection.receive()
+                if message is None:
+                    break
+                await self._dispatch(connection, message)
+        finally:
+            await self._on_disconnect(connection)
+    
+    async def _dispatch(self, connection: WebSocketConnection, message: str) -> None:
+        """Procesa un mensaje de un cliente."""
+        try:
+            data = json.loads(message)
+        except ValueError:
+            data = None
+        
+        if not isinstance(data, dict) or not isinstance(data.get('type'), str):
+            await self._send_error(connection, "Mensaje no válido")
+            return
+        
+        handlers = {
+            'create_room': self._create_room,
+            'join_room': self._join_room,
+            'resume': self._resume,
+            'move': self._move,
+            'leave': self._leave
+        }
+        handler = handlers.get(data['type'])
+        if handler is None:
+            await self._send_error(connection, f"Tipo de mensaje desconocido: {data['type']}")
+            return
+        
+        await handler(connection, data)
+    
+    async def _create_room(self, connection: WebSocketConnection, data: Dict[str, Any]) -> None:
+        """Crea una sala y ocupa la primera plaza."""
+        if self._connections.get(connection) is not None:
+            await self._send_error(connection, "La conexión ya está en una sala")
+            return
+        
+        room = _Room(id=str(uuid.uuid4()))
+        seat = self._take_seat(room, connection, str(data.get('player_name') or 'Jugador 1'))
+        self._rooms[room.id] = room
+        
+        await self._send(connection, {
+            'type': 'room_created',
+            'room_id': room.id,
+            'seat_token': seat.token
+        })
+    
+    async def _join_room(self, connection: WebSocketConnection, data: Dict[str, Any]) -> None:
+        """Ocupa la segunda plaza de una sala e inicia la partida."""
+        room = self._rooms.get(str(data.get('room_id')))
+        if self._connections.get(connection) is not None:
+            await self._send_error(connection, "La conexión ya está en una sala")
+            return
+        if room is None:
+            await self._send_error(connection, "Sala no encontrada")
+            return
+        if len(room.seats) >= 2:
+            await self._send_error(connection, "La sala está completa")
+            return
+        
+        seat = self._take_seat(room, connection, str(data.get('player_name') or 'Jugador 2'))
+        response = self._start_game_use_case.execute(StartNewGameRequest(
+            player1_name=room.seats[0].name,
+            player2_name=seat.name,
+            player2_type=PlayerType.HUMAN,
+            session_id=room.id
+        ))
+        
+        if not response.success or response.game_session is None:
+            room.seats.remove(seat)
+            self._connections[connection] = None
+            await self._send_error(connection, response.message, response.errors)
+            return
+        
+        game_session = response.game_session
+        self._game_repository.save(game_session)
+        room.game_session_id = game_session.id
+        room.seats[0].player_id = game_session.player_x.id
+        seat.player_id = game_session.player_o.id
+        
+        await self._send(connection, {
+            'type': 'room_joined',
+            'room_id': room.id,
+            'seat_token': seat.token
+        })
+        
+        serialized = serialize_game_session(game_session)
+        for room_seat in room.seats:
+            await self._send(room_seat.connection, {
+                'type': 'game_started',
+                'player_id': room_seat.player_id,
+                'game_session': serialized
+            })
+    
+    async def _resume(self, connection: WebSocketConnection, data: Dict[str, Any]) -> None:
+        """Devuelve a un jugador a su plaza tras una desconexión."""
+        room = self._rooms.get(str(data.get('room_id')))
+        seat = None
+        if room is not None and self._enable_reconnection:
+            token = str(data.get('seat_token'))
+            seat = next((s for s in room.seats if secrets.compare_digest(s.token, token)), None)
+        
+        if seat is None or self._connections.get(connection) is not None:
+            await self._send_error(connection, "No se puede recuperar la plaza")
+            return
+        
+        previous = seat.connection
+        if previous is not None:
+            # Una conexión nueva sustituye a la antigua (p. ej. otra pestaña)
+            self._connections[previous] = None
+            await previous.close(CLOSE_GOING_AWAY, "Sesión reanudada en otra conexión")
+        
+        seat.connection = connection
+        seat.disconnected_at = None
+        room.last_activity = time.monotonic()
+        self._connections[connection] = (room, seat)
+        
+        game_session = (
+            self._game_repository.get_by_id(room.game_session_id) if room.game_session_id else None
+        )
+        await self._send(connection, {
+            'type': 'resumed',
+            'room_id': room.id,
+            'player_id': seat.player_id,
+            'game_session': serialize_game_session(game_session) if game_session else None
+        })
+        
+        opponent = room.opponent_of(seat)
+        if opponent is not None and previous is None:
+            await self._send(opponent.connection, {'type': 'opponent_reconnected'})
+    
+    async def _move(self, connection: WebSocketConnection, data: Dict[str, Any]) -> None:
+        """Ejecuta un movimiento y lo difunde a la sala."""
+        membership = self._connections.get(connection)
+        if membership is None or membership[0].game_session_id is None:
+            await self._send_error(connection, "No hay una partida en curso")
+            return
+        
+        # Las coordenadas llegan sin tipar desde el cliente
+        errors = coordinate_errors(data)
+        if errors:
+            await self._send_error(connection, "Movimiento no válido", errors)
+            return
+        
+        room, seat = membership
+        room.last_activity = time.monotonic()
+        
+        response = self._make_move_use_case.execute(MakeMoveRequest(
+            game_session_id=room.game_session_id,
+            player_id=seat.player_id,
+            row=data['row'],
+            col=data['col']
+        ))
+        
+        if not response.success or response.game_session is None:
+            await self._send_error(connection, response.message, response.errors)
+            return
+        
+        message = dict(serialize_move_delta(response.game_session), type='move')
+        for room_seat in room.seats:
+            await self._send(room_seat.connection, message)
+    
+    async def _leave(self, connection: WebSocketConnection, data: Dict[str, Any]) -> None:
+        """Abandona la sala y la cierra."""
+        membership = self._connections.get(connection)
+        if membership is None:
+            return
+        
+        room, seat = membership
+        seat.connection = None
+        self._connections[connection] = None
+        await self._close_room(room, self.REASON_LEFT)
+    
+    async def _on_disconnect(self, connection: WebSocketConnection) -> None:
+        """Libera la plaza de una conexión cerrada y avisa al rival."""
+        membership = self._connections.pop(connection, None)
+        if membership is None:
+            return
+        
+        room, seat = membership
+        if seat.connection is not connection:
+            return
+        
+        seat.connection = None
+        seat.disconnected_at = time.monotonic()
+        
+        if not self._enable_reconnection:
+            await self._close_room(room, self.REASON_LEFT)
+            return
+        
+        opponent = room.opponent_of(seat)
+        if opponent is not None:
+            await self._send(opponent.connection, {
+                'type': 'opponent_disconnected',
+                'reconnection_timeout': self._reconnection_timeout
+            })
+    
+    async def _close_room(self, room: _Room, reason: str) -> None:
+        """Cierra una sala, avisa a las plazas conectadas y borra su partida."""
+        if self._rooms.pop(room.id, None) is None:
+            return
+        
+        for seat in room.seats:
+            if seat.connection is not None:
+                self._connections[seat.connection] = None
+                await self._send(seat.connection, {'type': 'room_closed', 'reason': reason})
+                seat.connection = None
+        
+        if room.game_session_id:
+            self._game_repository.delete(room.game_session_id)
+    
+    def _take_seat(self, room: _Room, connection: WebSocketConnection, name: str) -> _Seat:
+        """Añade una plaza a la sala para la conexión."""
+        seat = _Seat(name=name, token=secrets.token_urlsafe(16), connection=connection)
+        room.seats.append(seat)
+        room.last_activity = time.monotonic()
+        self._connections[connection] = (room, seat)
+        return seat
+    
+    async def _send_error(
+        self,
+        connection: WebSocketConnection,
+        message: str,
+        errors: Optional[List[str]] = None
+    ) -> None:
+        """Envía un mensaje de error a una conexión."""
+        await self._send(connection, {
+            'type': 'error',
+            'message': message,
+            'errors': errors or [message]
+        })
+    
+    @staticmethod
+    async def _send(connection: Optional[WebSocketConnection], data: Dict[str, Any]) -> None:
+        """Envía un mensaje JSON si la conexión sigue abierta."""
+        if connection is not None:
+            await connection.send(dumps(data).decode('utf-8'))
+    
+    @staticmethod
+    async def _close_writer(writer: asyncio.StreamWriter) -> None:
+        """Envía lo pendiente y cierra un transporte sin WebSocket."""
+        try:
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
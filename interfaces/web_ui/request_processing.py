@@ -0,0 +1,344 @@
+"""
+Request Processing - Procesamiento de la API común a los adaptadores web.
+
+FlaskWebAdapter y AsgiWebAdapter exponen la misma API REST: cada uno
+traduce su protocolo (rutas, cookies, cuerpo, cabeceras) y delega en
+GameRequestProcessor la ejecución de los casos de uso y la construcción
+del cuerpo de la respuesta, de modo que el comportamiento es idéntico en
+ambos. Las operaciones son síncronas: el adaptador decide en qué hilo o
+actor de sesión se ejecutan.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import uuid
+
+from game.use_cases.start_new_game import StartNewGameRequest, StartNewGameUseCaseFactory
+from game.use_cases.make_move import MakeMoveRequest, MakeMoveUseCase
+from game.entities import GameSession, GameState, PlayerType
+from persistence.repositories.game_repository import GameRepository
+from .session_events import SessionEventBroker
+from .session_views import (
+    SessionViewCache, serialize_move_batch_response, serialize_move_delta,
+    serialize_move_response
+)
+
+
+# Movimientos máximos en una petición a /api/game/moves:batch
+MAX_BATCH_MOVES = 500
+
+# Partidas por página en /api/lobby
+LOBBY_PAGE_SIZE = 20
+MAX_LOBBY_PAGE_SIZE = 100
+
+_PLAYER_TYPES = {
+    'human': PlayerType.HUMAN,
+    'ai_easy': PlayerType.AI_EASY,
+    'ai_medium': PlayerType.AI_MEDIUM,
+    'ai_hard': PlayerType.AI_HARD
+}
+
+def parse_player_type(player_type_str: Any) -> PlayerType:
+    """
+    Convierte string del tipo de jugador a enum PlayerType.
+    
+    Args:
+        player_type_str: String del tipo de jugador
+        
+    Returns:
+        PlayerType correspondiente (humano si no se reconoce)
+    """
+    return _PLAYER_TYPES.get(str(player_type_str).lower(), PlayerType.HUMAN)
+
+
+def coordinate_errors(move: Dict[str, Any]) -> List[str]:
+    """
+    Comprueba que un movimiento recibido trae fila y columna enteras.
+    
+    El rango (0-2) lo valida el caso de uso; aquí se rechazan los tipos
+    que no son coordenadas (texto, null, decimales, booleanos).
+    
+    Args:
+        move: Movimiento recibido en el cuerpo JSON
+        
+    Returns:
+        Lista de errores (vacía si ambas coordenadas son enteras)
+    """
+    errors = []
+    for field, label in (('row', 'La fila'), ('col', 'La columna')):
+        value = move.get(field)
+        if not isinstance(value, int) or isinstance(value, bool):
+            errors.append(f"{label} debe ser un número entero")
+    return errors
+
+
+def parse_move(data: Dict[str, Any], game_session_id: str) -> Tuple[Optional[MakeMoveRequest], List[str]]:
+    """
+    Convierte el cuerpo de /api/game/move en una petición del caso de uso.
+    
+    Args:
+        data: Cuerpo JSON de la petición
+        game_session_id: Sesión del movimiento
+        
+    Returns:
+        Tupla (petición o None, errores de formato)
+    """
+    errors = coordinate_errors(data)
+    if errors:
+        return None, errors
+    
+    return MakeMoveRequest(
+        game_session_id=game_session_id,
+        player_id=data.get('player_id', ''),
+        row=data['row'],
+        col=data['col']
+    ), []
+
+
+def parse_move_batch(
+    data: Dict[str, Any],
+    default_session_id: Optional[str] = None
+) -> Tuple[List[MakeMoveRequest], List[str]]:
+    """
+    Convierte el cuerpo de /api/game/moves:batch en peticiones del caso de uso.
+    
+    Args:
+        data: Cuerpo JSON de la petición
+        default_session_id: Sesión de los movimientos que no indican
+            game_session_id
+            
+    Returns:
+        Tupla (peticiones en orden, errores); con errores no hay peticiones
+    """
+    moves = data.get('moves')
+    
+    if not isinstance(moves, list) or not moves:
+        return [], ['Se requiere una lista de movimientos no vacía']
+    if len(moves) > MAX_BATCH_MOVES:
+        return [], [f'El lote admite como máximo {MAX_BATCH_MOVES} movimientos']
+    if not all(isinstance(move, dict) for move in moves):
+        return [], ['Cada movimiento debe ser un objeto']
+    
+    errors = [
+        f"Movimiento {index}: {error}"
+        for index, move in enumerate(moves)
+        for error in coordinate_errors(move)
+    ]
+    if errors:
+        return [], errors
+    
+    requests = [
+        MakeMoveRequest(
+            game_session_id=move.get('game_session_id') or default_session_id or '',
+            player_id=move.get('player_id', ''),
+            row=move['row'],
+            col=move['col']
+        )
+        for move in moves
+    ]
+    return requests, []
+
+
+class GameRequestProcessor:
+    """
+    Procesador de las peticiones de juego comunes a los adaptadores web.
+    
+    Cada movimiento aplicado publica su evento 'move' para los flujos
+    Server-Sent Events de la sesión.
+    
+    Principios aplicados:
+    - Es un MECANISMO DE ENTREGA, no parte del dominio
+    - Una sola implementación de la API para todos los protocolos
+    """
+    
+    def __init__(
+        self,
+        game_repository: GameRepository,
+        move_repository: Any,
+        make_move_use_case: MakeMoveUseCase,
+        session_views: SessionViewCache,
+        session_events: SessionEventBroker
+    ):
+        """
+        Inicializa el procesador.
+        
+        Args:
+            game_repository: Repositorio de sesiones sobre el almacenamiento
+            move_repository: Repositorio para movimientos y reinicios (las
+                sesiones vivas en memoria si hay ejecutor por sesión)
+            make_move_use_case: Caso de uso de realizar movimiento
+            session_views: Caché de vistas serializadas
+            session_events: Difusor de eventos de las partidas
+        """
+        self._game_repository = game_repository
+        self._move_repository = move_repository
+        self._make_move_use_case = make_move_use_case
+        self._session_views = session_views
+        self._session_events = session_events
+        self._start_game_use_case = StartNewGameUseCaseFactory.create()
+    
+    def process_start(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """
+        Inicia y guarda una partida.
+        
+        Args:
+            data: Cuerpo JSON de la petición
+            
+        Returns:
+            Tupla (cuerpo de la respuesta, código de estado HTTP)
+        """
+        response = self._start_game_use_case.execute(StartNewGameRequest(
+            player1_name=data.get('player1_name', 'Jugador 1'),
+            player2_name=data.get('player2_name'),
+            player2_type=parse_player_type(data.get('player2_type', 'human')),
+            session_id=str(uuid.uuid4())
+        ))
+        
+        if response.success and response.game_session:
+            self._game_repository.save(response.game_session)
+            return {
+                'success': True,
+                'message': response.message,
+                'game_session': self._session_views.get(response.game_session)
+            }, 200
+        
+        return {
+            'success': False,
+            'message': response.message,
+            'errors': response.errors
+        }, 400
+    
+    def process_move(
+        self,
+        use_case_request: MakeMoveRequest,
+        known_version: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], int]:
+        """
+        Ejecuta un movimiento y publica sus cambios.
+        
+        Con known_version igual a la versión anterior al último movimiento,
+        la respuesta lleva solo sus cambios ('delta').
+        
+        Args:
+            use_case_request: Petición del caso de uso
+            known_version: Versión de la sesión que tiene el cliente
+            
+        Returns:
+            Tupla (cuerpo de la respuesta, código de estado HTTP)
+        """
+        response = self._make_move_use_case.execute(use_case_request)
+        
+        if response.success and response.game_session:
+            delta = self._publish_move(response.game_session)
+            
+            game_session = response.game_session
+            if known_version == game_session.version - 1:
+                result = serialize_move_response(response, delta=delta)
+            else:
+                result = serialize_move_response(
+                    response, session_view=self._session_views.get(game_session)
+                )
+        else:
+            result = serialize_move_response(response)
+        
+        if response.conflict:
+            return result, 409
+        
+        return result, 200
+    
+    def process_move_batch(self, use_case_requests: List[MakeMoveRequest]) -> Dict[str, Any]:
+        """
+        Ejecuta un lote de movimientos y construye la respuesta.
+        
+        Cada sesión modificada se serializa y se publica como evento
+        'snapshot' en su actor, justo tras guardarla.
+        
+        Args:
+            use_case_requests: Peticiones del caso de uso, en orden
+            
+        Returns:
+            Cuerpo de la respuesta
+        """
+        session_views: Dict[str, Dict[str, Any]] = {}
+        
+        def publish(game_session: GameSession) -> None:
+            view = self._session_views.get(game_session)
+            self._session_events.publish(game_session.id, game_session.version, 'snapshot', view)
+            session_views[game_session.id] = view
+        
+        response = self._make_move_use_case.execute_batch(use_case_requests, publish)
+        return serialize_move_batch_response(use_case_requests, response, session_views)
+    
+    def process_lobby(
+        self,
+        state_value: str,
+        cursor: Optional[str],
+        limit_value: Optional[str]
+    ) -> Tuple[Dict[str, Any], int]:
+        """
+        Obtiene una página del lobby a través del índice de sesiones por estado.
+        
+        Args:
+            state_value: Estado de las partidas (por defecto, esperando jugadores)
+            cursor: Cursor de la página anterior
+            limit_value: Tamaño de página solicitado
+            
+        Returns:
+            Tupla (cuerpo de la respuesta, código de estado HTTP)
+        """
+        try:
+            state = GameState(state_value or GameState.WAITING_FOR_PLAYERS.value)
+            limit = int(limit_value) if limit_value else LOBBY_PAGE_SIZE
+        except ValueError:
+            return {
+                'success': False,
+                'message': 'Parámetros de consulta inválidos',
+                'errors': ['state debe ser un estado de partida y limit un entero']
+            }, 400
+        
+        limit = max(1, min(limit, MAX_LOBBY_PAGE_SIZE))
+        sessions, next_cursor = self._game_repository.list_by_state(state, cursor or None, limit)
+        
+        return {
+            'success': True,
+            'state': state.value,
+            'sessions': sessions,
+            'next_cursor': next_cursor,
+            'total': self._game_repository.count_by_state(state)
+        }, 200
+    
+    def process_reset(self, game_session_id: str) -> Tuple[Dict[str, Any], int]:
+        """
+        Reinicia una partida y construye la respuesta.
+        
+        Args:
+            game_session_id: ID de la sesión
+            
+        Returns:
+            Tupla (cuerpo de la respuesta, código de estado HTTP)
+        """
+        game_session = self._move_repository.get_by_id(game_session_id)
+        
+        if not game_session:
+            return {
+                'success': False,
+                'message': 'Sesión de juego no encontrada'
+            }, 404
+        
+        # Reiniciar el juego
+        game_session.reset()
+        self._move_repository.save(game_session)
+        
+        serialized = self._session_views.get(game_session)
+        self._session_events.publish(game_session.id, game_session.version, 'reset', serialized)
+        
+        return {
+            'success': True,
+            'message': 'Juego reiniciado exitosamente',
+            'game_session': serialized
+        }, 200
+    
+    def _publish_move(self, game_session: GameSession) -> Dict[str, Any]:
+        """Publica el evento 'move' de un movimiento y devuelve sus cambios."""
+        delta = serialize_move_delta(game_session)
+        self._session_events.publish(game_session.id, game_session.version, 'move', delta)
+        return delta
@@ -0,0 +1,266 @@
+"""
+Response Encoder - Codificación de las respuestas JSON de la API.
+
+Los adaptadores web envían diccionarios anidados bastante verbosos. Este
+módulo los codifica con orjson cuando está instalado (con la biblioteca
+estándar en caso contrario) y comprime con brotli o gzip, según la
+cabecera Accept-Encoding, las respuestas que superan un umbral.
+
+El modo compacto omite de las vistas de partida los campos que el cliente
+puede deducir: available_moves (del tablero) e is_finished / is_draw (del
+estado y el resultado).
+"""
+
+from typing import Dict, Any, Mapping, NamedTuple, Optional, Tuple
+import gzip
+import json
+import threading
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: se usa json de la biblioteca estándar
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se comprime con gzip
+    brotli = None
+
+
+# Campos que el modo compacto omite, según la clave que permite deducirlos
+DERIVABLE_FIELDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ('board', ('available_moves',)),
+    ('state', ('is_finished', 'is_draw')),
+)
+
+
+class EncodedResponse(NamedTuple):
+    """Cuerpo codificado de una respuesta."""
+    body: bytes
+    content_encoding: Optional[str]  # 'br', 'gzip' o None si va sin comprimir
+
+
+def _default(value: Any) -> Any:
+    """Convierte a JSON los tipos que el codificador no admite directamente."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Tipo no serializable a JSON: {type(value).__name__}")
+
+
+def dumps(data: Any) -> bytes:
+    """
+    Codifica datos como JSON en UTF-8, sin espacios.
+    
+    Args:
+        data: Datos a codificar
+        
+    Returns:
+        JSON codificado
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """
+    Interpreta una cabecera Accept-Encoding.
+    
+    Args:
+        header: Valor de la cabecera (p. ej. "gzip, br;q=0.8")
+        
+    Returns:
+        Diccionario codificación -> peso q (se omiten las de peso 0)
+    """
+    accepted: Dict[str, float] = {}
+    
+    for item in (header or '').split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        
+        if weight > 0:
+            accepted[name] = weight
+    
+    return accepted
+
+
+def negotiate_encoding(header: Optional[str], available: Tuple[str, ...]) -> Optional[str]:
+    """
+    Elige la codificación de contenido preferida por el cliente.
+    
+    Args:
+        header: Cabecera Accept-Encoding de la petición
+        available: Codificaciones disponibles, en orden de preferencia
+        
+    Returns:
+        Codificación elegida, o None para enviar sin comprimir
+    """
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = accepted.get(encoding, wildcard)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    
+    return best
+
+
+def compact_payload(data: Any) -> Any:
+    """
+    Copia los datos omitiendo los campos deducibles (ver DERIVABLE_FIELDS).
+    
+    Las vistas de partida están en caché y se comparten, por lo que nunca
+    se modifican: se construyen diccionarios nuevos.
+    
+    Args:
+        data: Datos de la respuesta
+        
+    Returns:
+        Datos sin los campos deducibles
+    """
+    if isinstance(data, Mapping):
+        omitted = set()
+        for key, fields in DERIVABLE_FIELDS:
+            if key in data:
+                omitted.update(fields)
+        return {
+            key: compact_payload(value)
+            for key, value in data.items() if key not in omitted
+        }
+    
+    if isinstance(data, (list, tuple)):
+        return [compact_payload(item) for item in data]
+    
+    return data
+
+
+class ResponseEncoder:
+    """
+    Codificador de respuestas JSON con compresión negociada.
+    
+    Los adaptadores lo reciben por inyección, de modo que puede sustituirse
+    por otro con la misma interfaz (encode y get_statistics).
+    
+    Principios aplicados:
+    - Es un MECANISMO DE ENTREGA, no parte del dominio
+    - orjson y brotli son opcionales; sin ellos se usan json y gzip
+    """
+    
+    DEFAULT_COMPRESS_THRESHOLD = 1024
+    
+    def __init__(
+        self,
+        compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        compact: bool = False
+    ):
+        """
+        Inicializa el codificador.
+        
+        Args:
+            compress_threshold: Bytes a partir de los cuales se comprime
+            gzip_level: Nivel de compresión de gzip (1-9)
+            brotli_quality: Calidad de compresión de brotli (0-11)
+            compact: Usar el modo compacto por defecto
+            
+        Raises:
+            ValueError: Si los parámetros están fuera de rango
+        """
+        if compress_threshold < 0:
+            raise ValueError("El umbral de compresión no puede ser negativo")
+        if not 1 <= gzip_level <= 9:
+            raise ValueError("El nivel de gzip debe estar entre 1 y 9")
+        if not 0 <= brotli_quality <= 11:
+            raise ValueError("La calidad de brotli debe estar entre 0 y 11")
+        
+        self._compress_threshold = compress_threshold
+        self._gzip_level = gzip_level
+        self._brotli_quality = brotli_quality
+        self._compact = compact
+        self._encodings = ('br', 'gzip') if brotli is not None else ('gzip',)
+        
+        self._lock = threading.Lock()
+        self._responses = 0
+        self._compressed = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+    
+    @property
+    def encodings(self) -> Tuple[str, ...]:
+        """Codificaciones de contenido disponibles, en orden de preferencia."""
+        return self._encodings
+    
+    def encode(
+        self,
+        data: Any,
+        accept_encoding: Optional[str] = None,
+        compact: Optional[bool] = None
+    ) -> EncodedResponse:
+        """
+        Codifica el cuerpo de una respuesta.
+        
+        Args:
+            data: Datos de la respuesta
+            accept_encoding: Cabecera Accept-Encoding de la petición
+            compact: Omitir los campos deducibles (por defecto, el modo
+                del codificador)
+                
+        Returns:
+            Cuerpo codificado y su Content-Encoding
+        """
+        if self._compact if compact is None else compact:
+            data = compact_payload(data)
+        
+        body = dumps(data)
+        raw_size = len(body)
+        encoding = None
+        
+        if raw_size >= self._compress_threshold:
+            encoding = negotiate_encoding(accept_encoding, self._encodings)
+            if encoding == 'br':
+                body = brotli.compress(body, quality=self._brotli_quality)
+            elif encoding == 'gzip':
+                body = gzip.compress(body, compresslevel=self._gzip_level)
+        
+        with self._lock:
+            self._responses += 1
+            self._bytes_in += raw_size
+            self._bytes_out += len(body)
+            if encoding is not None:
+                self._compressed += 1
+        
+        return EncodedResponse(body, encoding)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene las métricas del codificador.
+        
+        Returns:
+            Diccionario con respuestas codificadas, comprimidas y bytes
+        """
+        with self._lock:
+            return {
+                'json_library': 'orjson' if orjson is not None else 'json',
+                'encodings': list(self._encodings),
+                'responses': self._responses,
+                'compressed': self._compressed,
+                'bytes_in': self._bytes_in,
+                'bytes_out': self._bytes_out,
+                'compression_ratio': self._bytes_out / self._bytes_in if self._bytes_in else 1.0
+            }
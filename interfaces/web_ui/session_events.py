@@ -0,0 +1,270 @@
+"""
+Session Events - Publicación de cambios de partidas en el proceso.
+
+Broker de publicación/suscripción por sesión de juego que alimenta el
+endpoint Server-Sent Events del adaptador web. Cada sesión tiene un canal
+con una Condition y un registro acotado de los últimos eventos; los
+suscriptores no tienen cola propia, solo recuerdan la última versión que
+han recibido, por lo que una conexión inactiva cuesta un hilo bloqueado
+en la Condition y unos pocos bytes. Los suscriptores asyncio esperan con
+un Future en lugar de un hilo.
+"""
+
+from typing import Dict, Any, List, NamedTuple, Optional, Set, Tuple
+from collections import deque
+import asyncio
+import threading
+
+from .response_encoder import dumps
+
+
+class SessionEvent(NamedTuple):
+    """Evento publicado para una sesión."""
+    version: int
+    event: str
+    data: Dict[str, Any]
+
+
+class _Channel:
+    """Canal de una sesión: últimos eventos y suscriptores en espera."""
+    
+    def __init__(self, history_size: int):
+        self.condition = threading.Condition()
+        self.events: deque = deque(maxlen=history_size)
+        self.subscribers = 0
+        self.async_waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = set()
+    
+    def notify_all(self) -> None:
+        """Despierta a los suscriptores en espera (se llama con la Condition tomada)."""
+        self.condition.notify_all()
+        for loop, waiter in self.async_waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+
+
+class Subscription:
+    """
+    Suscripción a los eventos de una sesión.
+    
+    No guarda estado del suscriptor: cada llamada a wait() recibe la
+    última versión conocida. Se usa como gestor de contexto para darse de
+    baja al terminar.
+    """
+    
+    def __init__(self, broker: 'SessionEventBroker', session_id: str, channel: _Channel):
+        self._broker = broker
+        self._session_id = session_id
+        self._channel = channel
+    
+    @property
+    def closed(self) -> bool:
+        """Indica si el broker se ha cerrado."""
+        return self._broker.closed
+    
+    def wait(self, last_version: int, timeout: Optional[float] = None) -> Optional[List[SessionEvent]]:
+        """
+        Espera eventos posteriores a una versión.
+        
+        Args:
+            last_version: Última versión conocida por el suscriptor
+            timeout: Segundos máximos de espera
+            
+        Returns:
+            Eventos nuevos en orden de versión, lista vacía si vence el
+            tiempo o se cierra el broker, o None si el registro ya no
+            cubre `last_version` y hace falta una instantánea completa
+        """
+        channel = self._channel
+        with channel.condition:
+            pending = _events_after(channel, last_version)
+            if pending == [] and not self.closed:
+                channel.condition.wait(timeout)
+                pending = _events_after(channel, last_version)
+            return pending
+    
+    async def wait_async(self, last_version: int, timeout: Optional[float] = None) -> Optional[List[SessionEvent]]:
+        """
+        Versión asyncio de wait(): espera sin bloquear un hilo.
+        
+        Args:
+            last_version: Última versión conocida por el suscriptor
+            timeout: Segundos máximos de espera
+            
+        Returns:
+            Igual que wait()
+        """
+        channel = self._channel
+        loop = asyncio.get_running_loop()
+        with channel.condition:
+            pending = _events_after(channel, last_version)
+            if pending != [] or self.closed:
+                return pending
+            waiter = loop.create_future()
+            channel.async_waiters.add((loop, waiter))
+        
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with channel.condition:
+                channel.async_waiters.discard((loop, waiter))
+        
+        with channel.condition:
+            return _events_after(channel, last_version)
+    
+    def close(self) -> None:
+        """Da de baja la suscripción."""
+        if self._channel is not None:
+            self._broker._release(self._session_id, self._channel)
+            self._channel = None
+    
+    def __enter__(self) -> 'Subscription':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SessionEventBroker:
+    """
+    Broker de eventos por sesión de juego.
+    
+    Los eventos llevan la versión de la sesión que los produjo. Un
+    suscriptor que se retrasa (o que se reconecta con Last-Event-ID)
+    recibe los eventos que siguen en el registro; si la versión que
+    conoce ya no está cubierta, el broker le indica que necesita una
+    instantánea completa.
+    
+    Los canales se eliminan cuando no tienen suscriptores, de modo que la
+    memoria solo depende de las sesiones observadas.
+    
+    Principios aplicados:
+    - Es un MECANISMO DE ENTREGA, no dominio
+    - Sin colas por suscriptor: coste constante por conexión inactiva
+    """
+    
+    def __init__(self, history_size: int = 32):
+        """
+        Inicializa el broker.
+        
+        Args:
+            history_size: Eventos conservados por sesión para suscriptores
+                retrasados o reconectados
+        """
+        if history_size < 1:
+            raise ValueError("El tamaño del registro de eventos debe ser al menos 1")
+        
+        self._history_size = history_size
+        self._channels: Dict[str, _Channel] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._published = 0
+    
+    def publish(self, session_id: str, version: int, event: str, data: Dict[str, Any]) -> None:
+        """
+        Publica un evento para los suscriptores de una sesión.
+        
+        Sin suscriptores no se guarda nada.
+        
+        Args:
+            session_id: ID de la sesión
+            version: Versión de la sesión tras el cambio
+            event: Tipo de evento
+            data: Datos del evento (serializables a JSON)
+        """
+        with self._lock:
+            channel = self._channels.get(session_id)
+            self._published += 1
+        
+        if channel is None:
+            return
+        
+        with channel.condition:
+            channel.events.append(SessionEvent(version, event, data))
+            channel.notify_all()
+    
+    @property
+    def closed(self) -> bool:
+        """Indica si el broker se ha cerrado."""
+        return self._closed
+    
+    def subscribe(self, session_id: str) -> Subscription:
+        """
+        Se suscribe a los eventos de una sesión.
+        
+        Args:
+            session_id: ID de la sesión
+            
+        Returns:
+            Suscripción (usar como gestor de contexto)
+        """
+        with self._lock:
+            channel = self._channels.get(session_id)
+            if channel is None:
+                channel = self._channels[session_id] = _Channel(self._history_size)
+            channel.subscribers += 1
+        
+        return Subscription(self, session_id, channel)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene las métricas del broker.
+        
+        Returns:
+            Diccionario con canales, suscriptores y eventos publicados
+        """
+        with self._lock:
+            return {
+                'channels': len(self._channels),
+                'subscribers': sum(channel.subscribers for channel in self._channels.values()),
+                'published_events': self._published
+            }
+    
+    def close(self) -> None:
+        """Despierta y termina todas las suscripciones."""
+        with self._lock:
+            self._closed = True
+            channels = list(self._channels.values())
+        
+        for channel in channels:
+            with channel.condition:
+                channel.notify_all()
+    
+    def _release(self, session_id: str, channel: _Channel) -> None:
+        """Da de baja un suscriptor y elimina el canal si queda vacío."""
+        with self._lock:
+            channel.subscribers -= 1
+            if channel.subscribers == 0 and self._channels.get(session_id) is channel:
+                del self._channels[session_id]
+
+
+def _events_after(channel: _Channel, last_version: int) -> Optional[List[SessionEvent]]:
+    """Eventos posteriores a una versión, o None si el registro no la cubre."""
+    events = channel.events
+    if not events or events[-1].version <= last_version:
+        return []
+    if events[0].version > last_version + 1:
+        return None
+    return [event for event in events if event.version > last_version]
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    """Completa el Future de un suscriptor asyncio si sigue esperando."""
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def format_sse_event(version: int, event: str, data: Dict[str, Any]) -> str:
+    """
+    Formatea un evento Server-Sent Events con la versión como ID.
+    
+    Args:
+        version: Versión de la sesión (se usa como Last-Event-ID)
+        event: Tipo de evento
+        data: Datos del evento
+        
+    Returns:
+        Fragmento SSE listo para enviar
+    """
+    payload = dumps(data).decode('utf-8')
+    return f"id: {version}\nevent: {event}\ndata: {payload}\n\n"
@@ -0,0 +1,325 @@
+"""
+Session Views - Representación JSON de las partidas.
+
+Funciones de serialización compartidas por los mecanismos de entrega
+(API REST, Server-Sent Events y servidor WebSocket multijugador), para
+que todos envíen a los clientes exactamente el mismo formato, y una
+caché de vistas por versión de sesión.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+import threading
+
+from game.entities import GameSession, Player
+from game.use_cases.make_move import MakeMoveBatchResponse, MakeMoveRequest, MakeMoveResponse
+
+
+def serialize_winner(winner: Optional[Player]) -> Optional[Dict[str, Any]]:
+    """
+    Serializa el jugador ganador.
+    
+    Args:
+        winner: Jugador ganador o None
+        
+    Returns:
+        Diccionario con datos del ganador o None
+    """
+    if not winner:
+        return None
+    
+    return {
+        'id': winner.id,
+        'name': winner.name,
+        'symbol': winner.symbol.value if winner.symbol else None
+    }
+
+
+def serialize_game_session(game_session: GameSession) -> Dict[str, Any]:
+    """
+    Serializa una GameSession a diccionario para JSON.
+    
+    Args:
+        game_session: Sesión de juego a serializar
+        
+    Returns:
+        Diccionario con los datos de la sesión
+    """
+    winner = game_session.get_winner()
+    
+    return {
+        'id': game_session.id,
+        'version': game_session.version,
+        'state': game_session.state.value,
+        'result': game_session.result.value if game_session.result else None,
+        'board': game_session.board.to_list(),
+        'current_player': {
+            'id': game_session.current_player.id,
+            'name': game_session.current_player.name,
+            'symbol': game_session.current_player_symbol.value
+        } if game_session.current_player else None,
+        'players': [
+            {
+                'id': player.id,
+                'name': player.name,
+                'symbol': player.symbol.value if player.symbol else None,
+                'type': player.player_type.value,
+                'stats': {
+                    'games_played': player.stats.games_played,
+                    'games_won': player.stats.games_won,
+                    'games_lost': player.stats.games_lost,
+                    'games_drawn': player.stats.games_drawn,
+                    'win_rate': player.stats.win_rate
+                }
+            }
+            for player in game_session.players
+        ],
+        'move_count': game_session.move_count,
+        'is_finished': game_session.is_finished(),
+        'is_draw': game_session.is_draw(),
+        'winner': serialize_winner(winner),
+        'available_moves': [
+            {'row': pos.row, 'col': pos.col} 
+            for pos in game_session.get_available_moves()
+        ],
+        'created_at': game_session.created_at.isoformat() if game_session.created_at else None,
+        'started_at': game_session.started_at.isoformat() if game_session.started_at else None,
+        'finished_at': game_session.finished_at.isoformat() if game_session.finished_at else None
+    }
+
+
+def serialize_move_delta(game_session: GameSession) -> Dict[str, Any]:
+    """
+    Serializa los cambios que produce un movimiento.
+    
+    Args:
+        game_session: Sesión de juego tras el movimiento
+        
+    Returns:
+        Diccionario con el último movimiento y el nuevo estado
+    """
+    history = game_session.board.move_history
+    last_move = history[-1] if history else None
+    current_player = game_session.current_player
+    winner = game_session.get_winner()
+    
+    return {
+        'version': game_session.version,
+        'move': {
+            'row': last_move.position.row,
+            'col': last_move.position.col,
+            'symbol': last_move.player.value
+        } if last_move else None,
+        'state': game_session.state.value,
+        'result': game_session.result.value if game_session.result else None,
+        'current_player': {
+            'id': current_player.id,
+            'name': current_player.name,
+            'symbol': game_session.current_player_symbol.value
+        } if current_player else None,
+        'move_count': game_session.move_count,
+        'is_finished': game_session.is_finished(),
+        'is_draw': game_session.is_draw(),
+        'winner': serialize_winner(winner) if winner else None
+    }
+
+
+def serialize_move_response(
+    response: MakeMoveResponse,
+    session_view: Optional[Dict[str, Any]] = None,
+    delta: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Serializa la respuesta del caso de uso MakeMove.
+    
+    Args:
+        response: Respuesta del caso de uso
+        session_view: Vista ya serializada de la sesión (p. ej. de la caché)
+        delta: Si se indica, se envía en 'delta' en lugar de la sesión
+            completa (el cliente ya conoce la versión anterior)
+            
+    Returns:
+        Diccionario con el resultado del movimiento
+    """
+    result = {
+        'success': response.success,
+        'message': response.message,
+        'is_game_over': response.is_game_over,
+        'is_draw': response.is_draw,
+        'errors': response.errors
+    }
+    
+    if delta is not None:
+        result['delta'] = delta
+    elif response.game_session:
+        result['game_session'] = session_view or serialize_game_session(response.game_session)
+    
+    if response.winner:
+        result['winner'] = serialize_winner(response.winner)
+    
+    return result
+
+
+def serialize_move_batch_response(
+    requests: List[MakeMoveRequest],
+    response: MakeMoveBatchResponse,
+    session_views: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Serializa la respuesta de un lote de movimientos.
+    
+    Cada resultado lleva solo el estado del movimiento; la vista de cada
+    sesión modificada se envía una vez, en 'game_sessions'.
+    
+    Args:
+        requests: Movimientos del lote, en orden
+        response: Respuesta del caso de uso
+        session_views: Vista serializada de cada sesión guardada, por ID
+        
+    Returns:
+        Diccionario con un resultado por movimiento
+    """
+    results = []
+    for move, result in zip(requests, response.results):
+        serialized = {
+            'game_session_id': move.game_session_id,
+            'success': result.success,
+            'message': result.message,
+            'is_game_over': result.is_game_over,
+            'is_draw': result.is_draw,
+            'errors': result.errors
+        }
+        if result.winner:
+            serialized['winner'] = serialize_winner(result.winner)
+        results.append(serialized)
+    
+    return {
+        'success': response.success,
+        'message': response.message,
+        'results': results,
+        'game_sessions': session_views,
+        'errors': response.errors
+    }
+
+
+class SessionViewCache:
+    """
+    Caché de vistas serializadas por versión de sesión.
+    
+    La versión de una sesión aumenta con cada guardado, por lo que la vista
+    de (ID, versión) nunca cambia: se serializa una vez y se reutiliza en
+    todas las respuestas hasta el siguiente cambio. Se guarda solo la
+    última versión de cada sesión, con expulsión LRU al superar la
+    capacidad.
+    
+    Las vistas devueltas se comparten entre peticiones y no deben
+    modificarse.
+    """
+    
+    DEFAULT_CAPACITY = 1024
+    
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Inicializa la caché.
+        
+        Args:
+            capacity: Número máximo de sesiones en caché
+            
+        Raises:
+            ValueError: Si la capacidad no es positiva
+        """
+        if capacity < 1:
+            raise ValueError("La capacidad de la caché de vistas debe ser al menos 1")
+        
+        self._capacity = capacity
+        self._views: "OrderedDict[str, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+    
+    def get(self, game_session: GameSession) -> Dict[str, Any]:
+        """
+        Obtiene la vista de una sesión, serializándola si no está en caché.
+        
+        Args:
+            game_session: Sesión de juego guardada
+            
+        Returns:
+            Vista serializada (ver serialize_game_session)
+        """
+        view = self.lookup(game_session.id, game_session.version)
+        if view is not None:
+            return view
+        
+        view = serialize_game_session(game_session)
+        self.store(game_session.id, game_session.version, view)
+        return view
+    
+    def lookup(self, session_id: str, version: int) -> Optional[Dict[str, Any]]:
+        """
+        Busca la vista de una versión concreta, sin necesidad de la sesión.
+        
+        Args:
+            session_id: ID de la sesión
+            version: Versión de la sesión
+            
+        Returns:
+            Vista serializada o None si no está en caché
+        """
+        with self._lock:
+            entry = self._views.get(session_id)
+            if entry is None or entry[0] != version:
+                self._misses += 1
+                return None
+            self._views.move_to_end(session_id)
+            self._hits += 1
+            return entry[1]
+    
+    def store(self, session_id: str, version: int, view: Dict[str, Any]) -> None:
+        """
+        Guarda la vista de una versión si es la más reciente conocida.
+        
+        Las sesiones sin guardar (versión 0) no se guardan, porque pueden
+        cambiar sin cambiar de versión.
+        
+        Args:
+            session_id: ID de la sesión
+            version: Versión de la sesión
+            view: Vista serializada
+        """
+        if version <= 0:
+            return
+        
+        with self._lock:
+            entry = self._views.get(session_id)
+            if entry is not None and entry[0] > version:
+                return
+            self._views[session_id] = (version, view)
+            self._views.move_to_end(session_id)
+            while len(self._views) > self._capacity:
+                self._views.popitem(last=False)
+    
+    def invalidate(self, session_id: str) -> None:
+        """
+        Elimina la vista de una sesión.
+        
+        Args:
+            session_id: ID de la sesión
+        """
+        with self._lock:
+            self._views.pop(session_id, None)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene las métricas de la caché.
+        
+        Returns:
+            Diccionario con entradas, aciertos y fallos
+        """
+        with self._lock:
+            return {
+                'entries': len(self._views),
+                'capacity': self._capacity,
+                'hits': self._hits,
+                'misses': self._misses
+            }
@@ -0,0 +1,234 @@
+"""
+Static Assets - Huellas de contenido y caché de larga duración.
+
+Registra los archivos estáticos de la interfaz web (css, js, imágenes...)
+calculando un hash de su contenido, de modo que cada versión de un
+archivo tiene su propia URL (/static/js/game.<hash>.js) y puede servirse
+con Cache-Control inmutable. Las referencias /static/... del HTML se
+reescriben a esas URLs al renderizar la página.
+
+Cada recurso se guarda además precomprimido con gzip (y brotli si está
+instalado); si junto al archivo existe una variante .gz o .br generada
+de antemano, se usa esa.
+"""
+
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+from pathlib import Path
+import gzip
+import hashlib
+import mimetypes
+import re
+
+from .response_encoder import brotli, negotiate_encoding
+
+
+# Cache-Control de las URLs con huella: el contenido de una URL nunca cambia
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Cache-Control de las URLs sin huella: se revalidan con su ETag
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# Tipos de contenido que merece la pena comprimir
+_COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+
+class StaticAsset(NamedTuple):
+    """Recurso estático registrado."""
+    path: str                              # Ruta relativa original (js/game.js)
+    url: str                               # URL con huella
+    content_type: str
+    etag: str
+    variants: Dict[Optional[str], bytes]   # Codificación (None, 'gzip', 'br') -> cuerpo
+
+
+class StaticAssetRegistry:
+    """
+    Registro de recursos estáticos con huella de contenido.
+    
+    register recorre el directorio una vez (al arrancar), calcula la huella
+    de cada archivo y prepara sus variantes comprimidas; después el registro
+    solo se lee, por lo que puede compartirse entre hilos sin locks.
+    
+    Principios aplicados:
+    - Es un MECANISMO DE ENTREGA, no parte del dominio
+    - Los navegadores no revalidan los recursos con huella
+    - brotli es opcional; sin él se sirven las variantes gzip
+    """
+    
+    DEFAULT_EXTENSIONS = ('.css', '.js', '.svg', '.png', '.jpg', '.gif', '.ico', '.webp', '.woff2')
+    HASH_LENGTH = 12
+    
+    def __init__(
+        self,
+        root: Path,
+        url_prefix: str = '/static/',
+        extensions: Iterable[str] = DEFAULT_EXTENSIONS,
+        min_compress_size: int = 256
+    ):
+        """
+        Inicializa el registro.
+        
+        Args:
+            root: Directorio raíz de los recursos estáticos
+            url_prefix: Prefijo de las URLs estáticas
+            extensions: Extensiones de los archivos que se registran
+            min_compress_size: Bytes a partir de los cuales se comprime
+        """
+        self._root = Path(root).resolve()
+        self._url_prefix = url_prefix
+        self._extensions = tuple(extension.lower() for extension in extensions)
+        self._min_compress_size = min_compress_size
+        
+        self._by_path: Dict[str, StaticAsset] = {}
+        self._by_url: Dict[str, StaticAsset] = {}
+        self._reference_pattern: Optional[re.Pattern] = None
+    
+    @property
+    def assets(self) -> Dict[str, StaticAsset]:
+        """Recursos registrados por ruta relativa original."""
+        return dict(self._by_path)
+    
+    def register(self) -> 'StaticAssetRegistry':
+        """
+        Registra los archivos del directorio raíz.
+        
+        Returns:
+            El propio registro, para encadenar la llamada
+        """
+        for file_path in sorted(self._root.rglob('*')):
+            if not file_path.is_file() or file_path.suffix.lower() not in self._extensions:
+                continue
+            if '__pycache__' in file_path.parts:
+                continue
+            
+            relative = file_path.relative_to(self._root).as_posix()
+            content = file_path.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()[:self.HASH_LENGTH]
+            stem, _, suffix = relative.rpartition('.')
+            
+            asset = StaticAsset(
+                path=relative,
+                url=f"{self._url_prefix}{stem}.{digest}.{suffix}",
+                content_type=mimetypes.guess_type(file_path.name)[0] or 'application/octet-stream',
+                etag=digest,
+                variants=self._build_variants(file_path, content)
+            )
+            self._by_path[relative] = asset
+            self._by_url[asset.url[len(self._url_prefix):]] = asset
+        
+        if self._by_path:
+            paths = sorted(self._by_path, key=len, reverse=True)
+            self._reference_pattern = re.compile(
+                re.escape(self._url_prefix) + '(' + '|'.join(re.escape(path) for path in paths) + r')(?=["\'?#)\s])'
+            )
+        
+        return self
+    
+    def url_for(self, path: str) -> str:
+        """
+        Obtiene la URL con huella de un recurso.
+        
+        Args:
+            path: Ruta relativa del recurso (p. ej. 'js/game.js')
+            
+        Returns:
+            URL con huella, o la URL sin huella si el recurso no está registrado
+        """
+        asset = self._by_path.get(path)
+        return asset.url if asset else f"{self._url_prefix}{path}"
+    
+    def resolve(self, path: str) -> Tuple[Optional[StaticAsset], bool]:
+        """
+        Busca el recurso de una ruta solicitada bajo el prefijo estático.
+        
+        Args:
+            path: Ruta tras el prefijo (con o sin huella)
+            
+        Returns:
+            Tupla (recurso o None, True si la ruta lleva huella)
+        """
+        asset = self._by_url.get(path)
+        if asset is not None:
+            return asset, True
+        return self._by_path.get(path), False
+    
+    def rewrite(self, html: str) -> str:
+        """
+        Reescribe las referencias /static/... registradas a sus URLs con huella.
+        
+        Args:
+            html: Documento HTML
+            
+        Returns:
+            Documento con las referencias reescritas
+        """
+        if self._reference_pattern is None:
+            return html
+        return self._reference_pattern.sub(lambda match: self._by_path[match.group(1)].url, html)
+    
+    def build_document(self, name: str, content: bytes, content_type: str) -> StaticAsset:
+        """
+        Prepara un documento generado (p. ej. la página principal renderizada).
+        
+        El documento no se registra bajo ninguna URL: se sirve en su propia
+        ruta con su ETag y sus variantes comprimidas.
+        
+        Args:
+            name: Nombre del documento
+            content: Contenido del documento
+            content_type: Tipo de contenido
+            
+        Returns:
+            Recurso con ETag de contenido y variantes comprimidas
+        """
+        return StaticAsset(
+            path=name,
+            url=name,
+            content_type=content_type,
+            etag=hashlib.sha256(content).hexdigest()[:self.HASH_LENGTH],
+            variants=self._compress(content, content_type)
+        )
+    
+    @staticmethod
+    def select(asset: StaticAsset, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """
+        Elige la variante de un recurso según la cabecera Accept-Encoding.
+        
+        Args:
+            asset: Recurso a enviar
+            accept_encoding: Cabecera Accept-Encoding de la petición
+            
+        Returns:
+            Tupla (cuerpo, Content-Encoding o None)
+        """
+        available = tuple(encoding for encoding in ('br', 'gzip') if encoding in asset.variants)
+        encoding = negotiate_encoding(accept_encoding, available) if available else None
+        return asset.variants[encoding], encoding
+    
+    def _build_variants(self, file_path: Path, content: bytes) -> Dict[Optional[str], bytes]:
+        """Variantes de un archivo: las precomprimidas en disco o generadas aquí."""
+        content_type = mimetypes.guess_type(file_path.name)[0] or ''
+        variants = self._compress(content, content_type)
+        
+        for encoding, extension in (('gzip', '.gz'), ('br', '.br')):
+            precompressed = file_path.with_name(file_path.name + extension)
+            if precompressed.is_file():
+                variants[encoding] = precompressed.read_bytes()
+        
+        return variants
+    
+    def _compress(self, content: bytes, content_type: str) -> Dict[Optional[str], bytes]:
+        """Comprime un contenido si es de un tipo comprimible y reduce su tamaño."""
+        variants: Dict[Optional[str], bytes] = {None: content}
+        if len(content) < self._min_compress_size or not content_type.startswith(_COMPRESSIBLE_TYPES):
+            return variants
+        
+        compressed = {'gzip': gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed['br'] = brotli.compress(content, quality=11)
+        
+        for encoding, body in compressed.items():
+            if len(body) < len(content):
+                variants[encoding] = body
+        
+        return variants
@@ -0,0 +1,458 @@
+"""
+WebSocket Protocol - Implementación mínima de RFC 6455 sobre asyncio.
+
+Cubre lo que necesita el servidor multijugador: negociación HTTP,
+mensajes de texto (fragmentados o no), ping/pong y cierre. No soporta
+extensiones ni subprotocolos. Incluye también el lado cliente, útil para
+pruebas y herramientas.
+"""
+
+from typing import Dict, Optional, Tuple
+import asyncio
+import base64
+import hashlib
+import os
+import struct
+import time
+
+
+# GUID fijo de RFC 6455 para calcular Sec-WebSocket-Accept
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+# Los opcodes 0x3-0x7 y 0xB-0xF están reservados
+_KNOWN_OPCODES = frozenset((
+    OPCODE_CONTINUATION, OPCODE_TEXT, OPCODE_BINARY, OPCODE_CLOSE, OPCODE_PING, OPCODE_PONG
+))
+
+CLOSE_NORMAL = 1000
+CLOSE_GOING_AWAY = 1001
+CLOSE_PROTOCOL_ERROR = 1002
+CLOSE_UNSUPPORTED_DATA = 1003
+CLOSE_INVALID_PAYLOAD = 1007
+CLOSE_MESSAGE_TOO_BIG = 1009
+CLOSE_TRY_AGAIN_LATER = 1013
+
+MAX_HEADER_BYTES = 8192
+
+
+class WebSocketError(Exception):
+    """Error de protocolo WebSocket."""
+    
+    def __init__(self, message: str, close_code: int = CLOSE_PROTOCOL_ERROR):
+        super().__init__(message)
+        self.close_code = close_code
+
+
+def compute_accept_key(key: str) -> str:
+    """
+    Calcula la cabecera Sec-WebSocket-Accept para una clave de cliente.
+    
+    Args:
+        key: Valor de Sec-WebSocket-Key
+        
+    Returns:
+        Valor de Sec-WebSocket-Accept
+    """
+    digest = hashlib.sha1((key + WEBSOCKET_GUID).encode('ascii')).digest()
+    return base64.b64encode(digest).decode('ascii')
+
+
+async def read_http_head(reader: asyncio.StreamReader) -> Tuple[str, Dict[str, str]]:
+    """
+    Lee la línea inicial y las cabeceras de una petición o respuesta HTTP.
+    
+    Args:
+        reader: Flujo de lectura
+        
+    Returns:
+        Tupla (línea inicial, cabeceras con nombres en minúsculas)
+        
+    Raises:
+        WebSocketError: Si la cabecera es demasiado grande o está incompleta
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError:
+        raise WebSocketError("Cabecera HTTP demasiado grande")
+    except asyncio.IncompleteReadError:
+        raise WebSocketError("Conexión cerrada durante la negociación")
+    
+    if len(head) > MAX_HEADER_BYTES:
+        raise WebSocketError("Cabecera HTTP demasiado grande")
+    
+    lines = head.decode('latin-1').split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        name, separator, value = line.partition(":")
+        if separator:
+            headers[name.strip().lower()] = value.strip()
+    
+    return lines[0], headers
+
+
+def validate_upgrade_request(request_line: str, headers: Dict[str, str]) -> str:
+    """
+    Valida una petición de negociación WebSocket.
+    
+    Args:
+        request_line: Línea inicial de la petición
+        headers: Cabeceras con nombres en minúsculas
+        
+    Returns:
+        Valor de Sec-WebSocket-Key
+        
+    Raises:
+        WebSocketError: Si la petición no es una negociación válida
+    """
+    parts = request_line.split()
+    if len(parts) != 3 or parts[0] != "GET":
+        raise WebSocketError("Se esperaba una petición GET")
+    if headers.get('upgrade', '').lower() != 'websocket':
+        raise WebSocketError("Falta la cabecera Upgrade: websocket")
+    if 'upgrade' not in headers.get('connection', '').lower():
+        raise WebSocketError("Falta la cabecera Connection: Upgrade")
+    if headers.get('sec-websocket-version') != '13':
+        raise WebSocketError("Versión de WebSocket no soportada")
+    
+    key = headers.get('sec-websocket-key', '')
+    try:
+        if len(base64.b64decode(key, validate=True)) != 16:
+            raise ValueError(key)
+    except ValueError:
+        raise WebSocketError("Sec-WebSocket-Key no válida")
+    
+    return key
+
+
+def build_accept_response(key: str) -> bytes:
+    """
+    Construye la respuesta 101 que acepta la negociación.
+    
+    Args:
+        key: Valor de Sec-WebSocket-Key del cliente
+        
+    Returns:
+        Respuesta HTTP en bytes
+    """
+    return (
+        "HTTP/1.1 101 Switching Protocols\r\n"
+        "Upgrade: websocket\r\n"
+        "Connection: Upgrade\r\n"
+        f"Sec-WebSocket-Accept: {compute_accept_key(key)}\r\n"
+        "\r\n"
+    ).encode('ascii')
+
+
+async def accept_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    key: str,
+    max_message_size: int = 64 * 1024
+) -> Optional['WebSocketConnection']:
+    """
+    Envía la respuesta 101 y crea la conexión del lado servidor.
+    
+    Args:
+        reader: Flujo de lectura
+        writer: Flujo de escritura
+        key: Valor de Sec-WebSocket-Key del cliente
+        max_message_size: Tamaño máximo de un mensaje recibido en bytes
+        
+    Returns:
+        Conexión establecida, o None si el cliente se desconectó
+    """
+    writer.write(build_accept_response(key))
+    try:
+        await writer.drain()
+    except (ConnectionError, OSError):
+        writer.close()
+        return None
+    
+    return WebSocketConnection(reader, writer, max_message_size=max_message_size)
+
+
+def build_reject_response(status: int, reason: str) -> bytes:
+    """
+    Construye una respuesta HTTP que rechaza la negociación.
+    
+    Args:
+        status: Código de estado HTTP
+        reason: Texto del estado
+        
+    Returns:
+        Respuesta HTTP en bytes
+    """
+    body = reason.encode('utf-8')
+    return (
+        f"HTTP/1.1 {status} {reason}\r\n"
+        "Content-Type: text/plain; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n"
+        "\r\n"
+    ).encode('latin-1') + body
+
+
+def _apply_mask(payload: bytes, mask: bytes) -> bytes:
+    """Aplica (o retira) la máscara de 4 bytes de un frame."""
+    if not payload:
+        return payload
+    length = len(payload)
+    repeated = (mask * (length // 4 + 1))[:length]
+    value = int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')
+    return value.to_bytes(length, 'big')
+
+
+class WebSocketConnection:
+    """
+    Conexión WebSocket sobre un par de flujos asyncio.
+    
+    Los frames de control (ping, pong, cierre) se atienden dentro de
+    receive(), que solo devuelve mensajes de texto completos. `last_seen`
+    se actualiza con cualquier frame recibido y sirve para detectar
+    conexiones muertas.
+    """
+    
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        is_client: bool = False,
+        max_message_size: int = 64 * 1024
+    ):
+        """
+        Inicializa la conexión tras la negociación.
+        
+        Args:
+            reader: Flujo de lectura
+            writer: Flujo de escritura
+            is_client: True en el lado cliente (enmascara los frames enviados)
+            max_message_size: Tamaño máximo de un mensaje recibido en bytes
+        """
+        self._reader = reader
+        self._writer = writer
+        self._is_client = is_client
+        self._max_message_size = max_message_size
+        self._write_lock = asyncio.Lock()
+        self._close_sent = False
+        self._closed = False
+        self.close_code: Optional[int] = None
+        self.last_seen = time.monotonic()
+    
+    @property
+    def closed(self) -> bool:
+        """Indica si la conexión está cerrada o cerrándose."""
+        return self._closed or self._close_sent
+    
+    async def receive(self) -> Optional[str]:
+        """
+        Espera el siguiente mensaje de texto.
+        
+        Returns:
+            Texto del mensaje o None si la conexión se ha cerrado
+        """
+        fragments = []
+        size = 0
+        
+        while not self._closed:
+            try:
+                fin, opcode, payload = await self._read_frame()
+            except WebSocketError as exc:
+                return await self._fail(exc.close_code, str(exc))
+            except (asyncio.IncompleteReadError, ConnectionError):
+                await self._abort()
+                return None
+            
+            self.last_seen = time.monotonic()
+            
+            if opcode == OPCODE_PING:
+                await self._send_frame(OPCODE_PONG, payload)
+                continue
+            if opcode == OPCODE_PONG:
+                continue
+            if opcode == OPCODE_CLOSE:
+                self.close_code = (
+                    struct.unpack("!H", payload[:2])[0] if len(payload) >= 2 else CLOSE_NORMAL
+                )
+                await self.close(self.close_code)
+                await self._abort()
+                return None
+            
+            # Un mensaje fragmentado solo puede continuar con frames de
+            # continuación, y estos solo pueden seguir a un mensaje iniciado
+            if opcode == OPCODE_CONTINUATION and not fragments:
+                return await self._fail(CLOSE_PROTOCOL_ERROR, "Continuación sin mensaje iniciado")
+            if opcode != OPCODE_CONTINUATION and fragments:
+                return await self._fail(CLOSE_PROTOCOL_ERROR, "Nuevo mensaje dentro de un mensaje fragmentado")
+            if opcode == OPCODE_BINARY:
+                return await self._fail(CLOSE_UNSUPPORTED_DATA, "Solo se admiten mensajes de texto")
+            
+            size += len(payload)
+            if size > self._max_message_size:
+                return await self._fail(CLOSE_MESSAGE_TOO_BIG, "Mensaje demasiado grande")
+            
+            fragments.append(payload)
+            if fin:
+                try:
+                    return b"".join(fragments).decode('utf-8')
+                except UnicodeDecodeError:
+                    return await self._fail(CLOSE_INVALID_PAYLOAD, "Texto UTF-8 no válido")
+        
+        return None
+    
+    async def send(self, text: str) -> bool:
+        """
+        Envía un mensaje de texto.
+        
+        Args:
+            text: Mensaje a enviar
+            
+        Returns:
+            True si se envió, False si la conexión ya estaba cerrada
+        """
+        if self.closed:
+            return False
+        return await self._send_frame(OPCODE_TEXT, text.encode('utf-8'))
+    
+    async def ping(self, payload: bytes = b"") -> bool:
+        """
+        Envía un ping; el pong de respuesta actualiza `last_seen`.
+        
+        Returns:
+            True si se envió, False si la conexión ya estaba cerrada
+        """
+        if self.closed:
+            return False
+        return await self._send_frame(OPCODE_PING, payload)
+    
+    async def close(self, code: int = CLOSE_NORMAL, reason: str = "") -> None:
+        """
+        Inicia (o responde) el cierre de la conexión.
+        
+        Args:
+            code: Código de cierre
+            reason: Motivo del cierre
+        """
+        if self._close_sent or self._closed:
+            return
+        self._close_sent = True
+        await self._send_frame(OPCODE_CLOSE, struct.pack("!H", code) + reason.encode('utf-8')[:120])
+    
+    async def wait_closed(self) -> None:
+        """Cierra el transporte y espera a que termine."""
+        await self._abort()
+    
+    async def _fail(self, code: int, reason: str) -> None:
+        """Falla la conexión: envía el cierre con el código indicado y cierra el transporte."""
+        await self.close(code, reason)
+        await self._abort()
+    
+    async def _abort(self) -> None:
+        """Cierra el transporte sin más negociación."""
+        if self._closed:
+            return
+        self._closed = True
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+    
+    async def _read_frame(self) -> Tuple[bool, int, bytes]:
+        """Lee un frame completo y devuelve (fin, opcode, datos sin máscara)."""
+        first, second = await self._reader.readexactly(2)
+        fin = bool(first & 0x80)
+        opcode = first & 0x0F
+        masked = bool(second & 0x80)
+        length = second & 0x7F
+        
+        if first & 0x70:
+            raise WebSocketError("Bits reservados activos sin extensión")
+        if opcode not in _KNOWN_OPCODES:
+            raise WebSocketError(f"Opcode reservado: {opcode:#x}")
+        if masked == self._is_client:
+            raise WebSocketError("Máscara de frame incorrecta")
+        
+        if length == 126:
+            length = struct.unpack("!H", await self._reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", await self._reader.readexactly(8))[0]
+        
+        if opcode >= OPCODE_CLOSE and (length > 125 or not fin):
+            raise WebSocketError("Frame de control no válido")
+        if length > self._max_message_size:
+            raise WebSocketError("Mensaje demasiado grande", CLOSE_MESSAGE_TOO_BIG)
+        
+        mask = await self._reader.readexactly(4) if masked else b""
+        payload = await self._reader.readexactly(length)
+        return fin, opcode, _apply_mask(payload, mask) if masked else payload
+    
+    async def _send_frame(self, opcode: int, payload: bytes) -> bool:
+        """Escribe un frame completo; devuelve False si el transporte falló."""
+        length = len(payload)
+        mask_bit = 0x80 if self._is_client else 0
+        
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, mask_bit | length)
+        elif length < 1 << 16:
+            header = struct.pack("!BBH", 0x80 | opcode, mask_bit | 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, mask_bit | 127, length)
+        
+        if self._is_client:
+            mask = os.urandom(4)
+            header += mask
+            payload = _apply_mask(payload, mask)
+        
+        async with self._write_lock:
+            if self._closed:
+                return False
+            try:
+                self._writer.write(header + payload)
+                await self._writer.drain()
+            except (ConnectionError, OSError):
+                self._closed = True
+                return False
+        return True
+
+
+async def connect(host: str, port: int, path: str = "/") -> WebSocketConnection:
+    """
+    Abre una conexión WebSocket como cliente.
+    
+    Args:
+        host: Host del servidor
+        port: Puerto del servidor
+        path: Ruta de la petición
+        
+    Returns:
+        Conexión establecida
+        
+    Raises:
+        WebSocketError: Si el servidor rechaza la negociación
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode('ascii')
+    writer.write((
+        f"GET {path} HTTP/1.1\r\n"
+        f"Host: {host}:{port}\r\n"
+        "Upgrade: websocket\r\n"
+        "Connection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\n"
+        "Sec-WebSocket-Version: 13\r\n"
+        "\r\n"
+    ).encode('ascii'))
+    await writer.drain()
+    
+    status_line, headers = await read_http_head(reader)
+    if status_line.split()[1:2] != ['101'] or headers.get('sec-websocket-accept') != compute_accept_key(key):
+        writer.close()
+        raise WebSocketError(f"Negociación rechazada: {status_line}")
+    
+    return WebSocketConnection(reader, writer, is_client=True)
@@ -0,0 +1,410 @@
+"""
+Game Archive - Archivo binario de partidas terminadas.
+
+Las partidas de Tres en Raya terminadas tienen forma fija (como máximo
+9 movimientos de un byte, resultado y marcas de tiempo), por lo que se
+almacenan como registros de ancho fijo en un archivo de solo anexado.
+El lector proyecta el archivo en memoria con mmap y lo expone como un
+array estructurado de NumPy sin copiar datos, para que estadísticas y
+clasificaciones puedan recorrer millones de partidas sin pasar por la
+deserialización de GameRepository.
+"""
+
+from typing import Optional, Dict, Any, Iterator, Iterable, Mapping, NamedTuple, Tuple
+from datetime import datetime
+import mmap
+import os
+import struct
+import threading
+
+from game.entities import GameSession, GameState, GameResult, PlayerType, PlayerSymbol
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo necesita GameArchiveReader.to_numpy
+    np = None
+
+
+ARCHIVE_MAGIC = b"TRAR"
+ARCHIVE_VERSION = 1
+
+# Cabecera: magic, versión, tamaño de registro y relleno hasta 16 bytes
+_HEADER = struct.Struct("<4sHH8x")
+HEADER_SIZE = _HEADER.size
+
+# Registro: ID de sesión y de jugadores (UUID en texto), tipos de jugador,
+# resultado, número de movimientos, casillas jugadas en orden
+# (fila * 3 + columna) y marcas de tiempo POSIX (NaN si no existen)
+_RECORD = struct.Struct("<36s36s36sBBBB9sddd")
+RECORD_SIZE = _RECORD.size
+
+MAX_MOVES = 9
+NO_MOVE = 0xFF
+NO_RESULT = 0xFF
+
+RESULT_CODES: Dict[GameResult, int] = {
+    GameResult.PLAYER_X_WINS: 0,
+    GameResult.PLAYER_O_WINS: 1,
+    GameResult.DRAW: 2,
+    GameResult.ABANDONED: 3,
+}
+
+PLAYER_TYPE_CODES: Dict[PlayerType, int] = {
+    PlayerType.HUMAN: 0,
+    PlayerType.AI_EASY: 1,
+    PlayerType.AI_MEDIUM: 2,
+    PlayerType.AI_HARD: 3,
+}
+
+# Búsquedas inversas de los códigos para decodificar registros
+_PLAYER_TYPES_BY_CODE: Dict[int, PlayerType] = {code: player_type for player_type, code in PLAYER_TYPE_CODES.items()}
+_RESULTS_BY_CODE: Dict[int, GameResult] = {code: game_result for game_result, code in RESULT_CODES.items()}
+
+# dtype equivalente a _RECORD para la vista NumPy
+ARCHIVE_DTYPE_SPEC = [
+    ('session_id', 'S36'),
+    ('player_x_id', 'S36'),
+    ('player_o_id', 'S36'),
+    ('player_x_type', 'u1'),
+    ('player_o_type', 'u1'),
+    ('result', 'u1'),
+    ('move_count', 'u1'),
+    ('moves', 'u1', (MAX_MOVES,)),
+    ('created_at', '<f8'),
+    ('started_at', '<f8'),
+    ('finished_at', '<f8'),
+]
+
+
+class ArchivedGame(NamedTuple):
+    """Partida archivada decodificada."""
+    session_id: str
+    player_x_id: str
+    player_o_id: str
+    player_x_type: Optional[PlayerType]
+    player_o_type: Optional[PlayerType]
+    result: Optional[GameResult]           # None si la sesión expiró sin terminar
+    moves: Tuple[int, ...]
+    created_at: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+
+class GameArchiveWriter:
+    """
+    Escritor de partidas terminadas en formato de ancho fijo.
+    
+    Además de append(), implementa save(collection, key, data) para
+    poder usarse como archive_storage de SessionSweeper; save archiva
+    también las sesiones que expiran sin terminar.
+    
+    Principios aplicados:
+    - Es INFRAESTRUCTURA, no dominio
+    - Archivo de solo anexado, seguro entre hilos
+    """
+    
+    def __init__(self, path: str):
+        """
+        Abre (o crea) el archivo de partidas.
+        
+        Args:
+            path: Ruta del archivo
+            
+        Raises:
+            ValueError: Si el archivo existe pero no es un archivo de partidas compatible
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'ab')
+        
+        if self._file.tell() == 0:
+            self._file.write(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, RECORD_SIZE))
+            self._file.flush()
+        else:
+            with open(path, 'rb') as existing:
+                _read_header(existing.read(HEADER_SIZE))
+    
+    @property
+    def path(self) -> str:
+        """Ruta del archivo."""
+        return self._path
+    
+    def append(self, game_session: GameSession) -> bool:
+        """
+        Añade una partida terminada al archivo.
+        
+        Args:
+            game_session: Sesión de juego
+            
+        Returns:
+            True si se archivó, False si la partida no ha terminado
+        """
+        if not game_session.is_finished():
+            return False
+        
+        player_x = game_session.player_x
+        player_o = game_session.player_o
+        record = _pack(
+            session_id=game_session.id,
+            player_x_id=player_x.id if player_x else "",
+            player_o_id=player_o.id if player_o else "",
+            player_x_type=player_x.player_type if player_x else None,
+            player_o_type=player_o.player_type if player_o else None,
+            result=game_session.result,
+            cells=[move.position.row * 3 + move.position.col for move in game_session.board.move_history],
+            created_at=game_session.created_at,
+            started_at=game_session.started_at,
+            finished_at=game_session.finished_at
+        )
+        self._write(record)
+        return True
+    
+    def append_many(self, game_sessions: Iterable[GameSession]) -> int:
+        """
+        Añade varias partidas, omitiendo las que no han terminado.
+        
+        Args:
+            game_sessions: Sesiones de juego
+            
+        Returns:
+            Número de partidas archivadas
+        """
+        return sum(1 for game_session in game_sessions if self.append(game_session))
+    
+    def save(self, collection: str, key: str, data: Mapping[str, Any]) -> bool:
+        """
+        Archiva una sesión serializada por GameRepository.
+        
+        Las sesiones que expiran sin terminar también se archivan, con los
+        movimientos jugados y sin resultado (GameResult.ABANDONED si su
+        estado es ABANDONED), para que no se pierdan al eliminarlas.
+        
+        Args:
+            collection: Nombre de la colección (ignorado)
+            key: ID de la sesión
+            data: Sesión serializada
+            
+        Returns:
+            True si la sesión se archivó
+        """
+        if data.get('result'):
+            result = GameResult(data['result'])
+        elif data.get('state') == GameState.ABANDONED.value:
+            result = GameResult.ABANDONED
+        else:
+            result = None
+        
+        players = data.get('players') or {}
+        player_x = players.get(PlayerSymbol.X.value) or {}
+        player_o = players.get(PlayerSymbol.O.value) or {}
+        record = _pack(
+            session_id=data.get('id', key),
+            player_x_id=player_x.get('id', ""),
+            player_o_id=player_o.get('id', ""),
+            player_x_type=PlayerType(player_x['player_type']) if player_x.get('player_type') else None,
+            player_o_type=PlayerType(player_o['player_type']) if player_o.get('player_type') else None,
+            result=result,
+            cells=[
+                move['position']['row'] * 3 + move['position']['col']
+                for move in data.get('move_history', ())
+            ],
+            created_at=_parse_datetime(data.get('created_at')),
+            started_at=_parse_datetime(data.get('started_at')),
+            finished_at=_parse_datetime(data.get('finished_at'))
+        )
+        self._write(record)
+        return True
+    
+    def flush(self) -> None:
+        """Vuelca al disco los registros pendientes."""
+        with self._lock:
+            self._file.flush()
+    
+    def close(self) -> None:
+        """Cierra el archivo."""
+        with self._lock:
+            self._file.close()
+    
+    def _write(self, record: bytes) -> None:
+        """Escribe un registro completo de forma atómica respecto a otros hilos."""
+        with self._lock:
+            self._file.write(record)
+            self._file.flush()
+    
+    def __enter__(self) -> 'GameArchiveWriter':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class GameArchiveReader:
+    """
+    Lector de partidas archivadas mediante mmap.
+    
+    El array devuelto por to_numpy() comparte la memoria del mmap, por lo
+    que el lector debe permanecer abierto mientras se use el array.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Proyecta el archivo en memoria.
+        
+        Args:
+            path: Ruta del archivo
+            
+        Raises:
+            ValueError: Si el archivo no es un archivo de partidas compatible
+        """
+        self._path = path
+        with open(path, 'rb') as archive_file:
+            self._mmap = mmap.mmap(archive_file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        _read_header(self._mmap[:HEADER_SIZE])
+        # Un registro a medio escribir al final del archivo se ignora
+        self._count = (len(self._mmap) - HEADER_SIZE) // RECORD_SIZE
+    
+    def __len__(self) -> int:
+        """Número de partidas archivadas."""
+        return self._count
+    
+    def to_numpy(self):
+        """
+        Expone el archivo como array estructurado de NumPy sin copiar datos.
+        
+        Returns:
+            numpy.ndarray de solo lectura con dtype ARCHIVE_DTYPE_SPEC
+            
+        Raises:
+            ImportError: Si NumPy no está instalado
+        """
+        if np is None:
+            raise ImportError("NumPy es necesario para GameArchiveReader.to_numpy")
+        
+        return np.frombuffer(
+            self._mmap,
+            dtype=np.dtype(ARCHIVE_DTYPE_SPEC),
+            count=self._count,
+            offset=HEADER_SIZE
+        )
+    
+    def iter_raw(self) -> Iterator[Tuple[Any, ...]]:
+        """
+        Recorre los registros sin decodificar (no requiere NumPy).
+        
+        Yields:
+            Tuplas con los campos en el orden de ARCHIVE_DTYPE_SPEC
+        """
+        view = memoryview(self._mmap)[HEADER_SIZE:HEADER_SIZE + self._count * RECORD_SIZE]
+        try:
+            yield from _RECORD.iter_unpack(view)
+        finally:
+            view.release()
+    
+    def __iter__(self) -> Iterator[ArchivedGame]:
+        """Recorre las partidas decodificadas."""
+        for raw in self.iter_raw():
+            yield _unpack(raw)
+    
+    def close(self) -> None:
+        """
+        Libera el mmap.
+        
+        Si todavía existen arrays NumPy que lo referencian, la liberación
+        se pospone hasta que dejen de usarse.
+        """
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+    
+    def __enter__(self) -> 'GameArchiveReader':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _read_header(header: bytes) -> None:
+    """
+    Valida la cabecera del archivo.
+    
+    Args:
+        header: Primeros HEADER_SIZE bytes del archivo
+        
+    Raises:
+        ValueError: Si la cabecera no es compatible
+    """
+    if len(header) < HEADER_SIZE:
+        raise ValueError("Archivo de partidas truncado")
+    
+    magic, version, record_size = _HEADER.unpack(header)
+    if magic != ARCHIVE_MAGIC:
+        raise ValueError("El archivo no es un archivo de partidas")
+    if version != ARCHIVE_VERSION or record_size != RECORD_SIZE:
+        raise ValueError(f"Versión de archivo de partidas no soportada: {version}")
+
+
+def _pack(
+    session_id: str,
+    player_x_id: str,
+    player_o_id: str,
+    player_x_type: Optional[PlayerType],
+    player_o_type: Optional[PlayerType],
+    result: Optional[GameResult],
+    cells: Iterable[int],
+    created_at: Optional[datetime],
+    started_at: Optional[datetime],
+    finished_at: Optional[datetime]
+) -> bytes:
+    """Codifica una partida como registro de ancho fijo."""
+    cells = list(cells)[:MAX_MOVES]
+    moves = bytes(cells) + bytes([NO_MOVE]) * (MAX_MOVES - len(cells))
+    
+    return _RECORD.pack(
+        session_id.encode('ascii', 'replace')[:36],
+        player_x_id.encode('ascii', 'replace')[:36],
+        player_o_id.encode('ascii', 'replace')[:36],
+        PLAYER_TYPE_CODES.get(player_x_type, NO_RESULT),
+        PLAYER_TYPE_CODES.get(player_o_type, NO_RESULT),
+        RESULT_CODES.get(result, NO_RESULT),
+        len(cells),
+        moves,
+        _to_timestamp(created_at),
+        _to_timestamp(started_at),
+        _to_timestamp(finished_at)
+    )
+
+
+def _unpack(raw: Tuple[Any, ...]) -> ArchivedGame:
+    """Decodifica un registro de ancho fijo."""
+    (session_id, player_x_id, player_o_id, player_x_type, player_o_type,
+     result, move_count, moves, created_at, started_at, finished_at) = raw
+    
+    return ArchivedGame(
+        session_id=session_id.rstrip(b'\0').decode('ascii'),
+        player_x_id=player_x_id.rstrip(b'\0').decode('ascii'),
+        player_o_id=player_o_id.rstrip(b'\0').decode('ascii'),
+        player_x_type=_PLAYER_TYPES_BY_CODE.get(player_x_type),
+        player_o_type=_PLAYER_TYPES_BY_CODE.get(player_o_type),
+        result=_RESULTS_BY_CODE.get(result),
+        moves=tuple(moves[:move_count]),
+        created_at=_from_timestamp(created_at),
+        started_at=_from_timestamp(started_at),
+        finished_at=_from_timestamp(finished_at)
+    )
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Convierte una fecha ISO serializada en datetime."""
+    return datetime.fromisoformat(value) if value else None
+
+
+def _to_timestamp(value: Optional[datetime]) -> float:
+    """Convierte un datetime en marca de tiempo POSIX (NaN si no existe)."""
+    return value.timestamp() if value else float('nan')
+
+
+def _from_timestamp(value: float) -> Optional[datetime]:
+    """Convierte una marca de tiempo POSIX en datetime (None si es NaN)."""
+    return None if value != value else datetime.fromtimestamp(value)
@@ -5,8 +5,119 @@ Implementa un almacenamiento en memoria simple para datos del juego.
 Este es un adaptador de infraestructura que implementa persistencia temporal.
 """
 
-from typing import Dict, Optional, Any, List
+from typing import Dict, Optional, Any, List, Iterator, Mapping, Callable, NamedTuple, Iterable, Tuple
+from contextlib import contextmanager
+from types import MappingProxyType
+from itertools import count, islice
+import bisect
 import threading
+import time
+
+
+def freeze_record(value: Any) -> Any:
+    """
+    Convierte recursivamente un valor en una instantánea inmutable.
+    
+    Los diccionarios se convierten en MappingProxyType, las listas y tuplas
+    en tuplas y los conjuntos en frozenset. El resto de valores se asumen
+    inmutables (str, int, float, bool, None).
+    
+    Args:
+        value: Valor a congelar
+        
+    Returns:
+        Copia inmutable del valor
+    """
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze_record(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_record(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+def thaw_record(value: Any) -> Any:
+    """
+    Obtiene una copia mutable de una instantánea creada con freeze_record.
+    
+    Args:
+        value: Valor inmutable
+        
+    Returns:
+        Copia profunda con diccionarios y listas mutables
+    """
+    if isinstance(value, Mapping):
+        return {key: thaw_record(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw_record(item) for item in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    return value
+
+
+class _StoredRecord(NamedTuple):
+    """Registro almacenado junto con sus metadatos."""
+    data: Mapping[str, Any]
+    modified_at: float  # time.monotonic() de la última escritura
+    version: int = 1  # Se incrementa con cada escritura
+    sequence: int = 0  # Orden de alta de la clave (se conserva al reemplazarla)
+
+
+class _FieldIndex:
+    """
+    Índice secundario de una colección por el valor de un campo.
+    
+    Para cada valor guarda sus claves en una lista ordenada, de modo que
+    una página a partir de un cursor se localiza con una búsqueda binaria
+    y su coste no depende del tamaño de la colección.
+    """
+    
+    def __init__(self):
+        self._keys_by_value: Dict[Any, List[str]] = {}
+        self._value_by_key: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+    
+    def update(self, key: str, record: Optional[Mapping[str, Any]], field: str) -> None:
+        """Actualiza la entrada de una clave (record None si se eliminó)."""
+        present = record is not None and field in record
+        value = record[field] if present else None
+        
+        with self._lock:
+            if key in self._value_by_key:
+                previous = self._value_by_key[key]
+                if present and previous == value:
+                    return
+                
+                keys = self._keys_by_value[previous]
+                del keys[bisect.bisect_left(keys, key)]
+                if not keys:
+                    del self._keys_by_value[previous]
+                del self._value_by_key[key]
+            
+            if present:
+                bisect.insort(self._keys_by_value.setdefault(value, []), key)
+                self._value_by_key[key] = value
+    
+    def page(self, value: Any, after: Optional[str], limit: int) -> List[str]:
+        """Claves con un valor, en orden, posteriores al cursor `after`."""
+        with self._lock:
+            keys = self._keys_by_value.get(value)
+            if not keys:
+                return []
+            start = bisect.bisect_right(keys, after) if after is not None else 0
+            return keys[start:start + limit]
+    
+    def count(self, value: Any) -> int:
+        """Número de claves con un valor."""
+        with self._lock:
+            return len(self._keys_by_value.get(value, ()))
+    
+    def clear(self) -> None:
+        """Vacía el índice."""
+        with self._lock:
+            self._keys_by_value.clear()
+            self._value_by_key.clear()
 
 
 class MemoryStorage:
@@ -16,37 +127,92 @@ class MemoryStorage:
     Proporciona operaciones básicas de almacenamiento usando
     diccionarios Python en memoria con protección de hilos.
     
+    En lugar de un único lock global, cada par (colección, clave) se
+    asigna a uno de N locks ("lock striping"), de modo que las peticiones
+    concurrentes sobre sesiones distintas no se serializan entre sí.
+    
+    Los registros se guardan como instantáneas inmutables (ver
+    freeze_record), por lo que las lecturas los devuelven sin copiarlos.
+    Para modificar un registro se guarda uno nuevo que reemplaza al anterior;
+    thaw_record proporciona una copia mutable cuando se necesita.
+    
+    create_index mantiene un índice secundario por el valor de un campo,
+    actualizado en cada escritura, para consultar con query_index páginas
+    de registros por ese valor sin recorrer la colección.
+    
     Principios aplicados:
     - Es INFRAESTRUCTURA, no dominio
     - Implementa persistencia temporal
     - Thread-safe para aplicaciones web
     """
     
-    def __init__(self):
-        """Inicializa el almacenamiento en memoria."""
-        self._data: Dict[str, Dict[str, Any]] = {}
-        self._lock = threading.RLock()
+    DEFAULT_LOCK_STRIPES = 16
+    
+    def __init__(self, lock_stripes: int = DEFAULT_LOCK_STRIPES):
+        """
+        Inicializa el almacenamiento en memoria.
+        
+        Args:
+            lock_stripes: Número de locks entre los que se reparten las claves
+            
+        Raises:
+            ValueError: Si el número de locks no es positivo
+        """
+        if lock_stripes < 1:
+            raise ValueError("El número de locks debe ser al menos 1")
+        
+        self._data: Dict[str, Dict[str, _StoredRecord]] = {}
+        self._sequence = count(1)
+        self._collections_lock = threading.Lock()
+        self._stripes = [threading.RLock() for _ in range(lock_stripes)]
+        
+        # Contadores por lock; solo se modifican mientras se posee el lock
+        self._acquisitions = [0] * lock_stripes
+        self._contentions = [0] * lock_stripes
+        
+        # Índices secundarios: colección -> campo -> índice
+        self._indexes: Dict[str, Dict[str, _FieldIndex]] = {}
     
-    def save(self, collection: str, key: str, data: Dict[str, Any]) -> bool:
+    def save(
+        self, 
+        collection: str, 
+        key: str, 
+        data: Mapping[str, Any], 
+        expected_version: Optional[int] = None
+    ) -> bool:
         """
         Guarda datos en la colección especificada.
         
+        El registro se congela antes de tomar el lock y reemplaza
+        por completo al anterior. Cada escritura incrementa la versión
+        del registro; si se indica expected_version, la escritura solo
+        se aplica cuando la versión actual coincide (compare-and-swap).
+        
         Args:
             collection: Nombre de la colección
             key: Clave única del elemento
             data: Datos a guardar
+            expected_version: Versión que debe tener el registro (0 si no debe existir)
             
         Returns:
-            True si se guardó exitosamente
+            True si se guardó exitosamente, False si la versión no coincide
         """
-        with self._lock:
-            if collection not in self._data:
-                self._data[collection] = {}
+        record = freeze_record(data)
+        with self._locked(collection, key):
+            items = self._get_collection(collection, create=True)
+            current = items.get(key)
+            current_version = current.version if current else 0
+            
+            if expected_version is not None and expected_version != current_version:
+                return False
             
-            self._data[collection][key] = data.copy()
+            items[key] = _StoredRecord(
+                record, time.monotonic(), current_version + 1, self._sequence_of(current)
+            )
+            self._update_indexes(collection, key, record)
             return True
     
-    def get(self, collection: str, key: str) -> Optional[Dict[str, Any]]:
+    def get(self, collection: str, key: str) -> Optional[Mapping[str, Any]]:
         """
         Obtiene datos por clave de una colección.
         
@@ -55,16 +221,116 @@ class MemoryStorage:
             key: Clave del elemento
             
         Returns:
-            Datos encontrados o None si no existe
+            Instantánea inmutable de los datos o None si no existe
         """
-        with self._lock:
-            if collection not in self._data:
+        with self._locked(collection, key):
+            items = self._get_collection(collection)
+            if items is None:
                 return None
             
-            data = self._data[collection].get(key)
-            return data.copy() if data else None
+            entry = items.get(key)
+            return entry.data if entry and entry.data else None
     
-    def get_all(self, collection: str) -> List[Dict[str, Any]]:
+    def get_version(self, collection: str, key: str) -> int:
+        """
+        Obtiene la versión actual de un elemento.
+        
+        Args:
+            collection: Nombre de la colección
+            key: Clave del elemento
+            
+        Returns:
+            Versión del elemento (0 si no existe)
+        """
+        with self._locked(collection, key):
+            items = self._get_collection(collection)
+            entry = items.get(key) if items is not None else None
+            return entry.version if entry else 0
+    
+    def get_entry(self, collection: str, key: str) -> Optional[Tuple[Mapping[str, Any], float, int]]:
+        """
+        Obtiene los datos de un elemento junto con su última modificación.
+        
+        Args:
+            collection: Nombre de la colección
+            key: Clave del elemento
+            
+        Returns:
+            Tupla (datos, modified_at, versión) o None si no existe
+        """
+        with self._locked(collection, key):
+            items = self._get_collection(collection)
+            if items is None or key not in items:
+                return None
+            
+            entry = items[key]
+            return entry.data, entry.modified_at, entry.version
+    
+    def save_many(
+        self, 
+        collection: str, 
+        items: Mapping[str, Mapping[str, Any]], 
+        expected_versions: Optional[Mapping[str, int]] = None
+    ) -> Dict[str, bool]:
+        """
+        Guarda varios elementos en una sola operación.
+        
+        Cada lock implicado se adquiere una única vez para todo el lote,
+        en lugar de una vez por elemento.
+        
+        Args:
+            collection: Nombre de la colección
+            items: Diccionario clave -> datos a guardar
+            expected_versions: Versión esperada por clave (ver save); las
+                claves ausentes se guardan sin comprobar la versión
+                
+        Returns:
+            Diccionario clave -> True si se guardó, False si la versión no coincide
+        """
+        records = {key: freeze_record(data) for key, data in items.items()}
+        expected_versions = expected_versions or {}
+        results: Dict[str, bool] = {}
+        
+        with self._locked_keys(collection, records):
+            target = self._get_collection(collection, create=True)
+            now = time.monotonic()
+            for key, record in records.items():
+                current = target.get(key)
+                current_version = current.version if current else 0
+                expected_version = expected_versions.get(key)
+                
+                if expected_version is not None and expected_version != current_version:
+                    results[key] = False
+                    continue
+                
+                target[key] = _StoredRecord(record, now, current_version + 1, self._sequence_of(current))
+                self._update_indexes(collection, key, record)
+                results[key] = True
+        
+        return results
+    
+    def get_many(self, collection: str, keys: Iterable[str]) -> Dict[str, Optional[Mapping[str, Any]]]:
+        """
+        Obtiene varios elementos en una sola operación.
+        
+        Args:
+            collection: Nombre de la colección
+            keys: Claves de los elementos
+            
+        Returns:
+            Diccionario clave -> instantánea inmutable o None si no existe
+        """
+        keys = list(keys)
+        
+        with self._locked_keys(collection, keys):
+            items = self._get_collection(collection) or {}
+            results: Dict[str, Optional[Mapping[str, Any]]] = {}
+            for key in keys:
+                entry = items.get(key)
+                results[key] = entry.data if entry and entry.data else None
+            return results
+    
+    def get_all(self, collection: str) -> List[Mapping[str, Any]]:
         """
         Obtiene todos los elementos de una colección.
         
@@ -72,13 +338,54 @@ class MemoryStorage:
             collection: Nombre de la colección
             
         Returns:
-            Lista de todos los elementos
+            Lista de instantáneas inmutables de todos los elementos
         """
-        with self._lock:
-            if collection not in self._data:
-                return []
+        return self._snapshot(collection)
+    
+    def iter_batches(self, collection: str, batch_size: int = 100) -> Iterator[List[Mapping[str, Any]]]:
+        """
+        Recorre una colección por lotes.
+        
+        Los registros se leen lote a lote directamente de la colección, sin
+        copiar antes sus claves, de modo que el recorrido usa memoria
+        proporcional al lote. Ningún registro se entrega dos veces; los
+        eliminados durante el recorrido se omiten y los añadidos pueden
+        entregarse u omitirse.
+        
+        Args:
+            collection: Nombre de la colección
+            batch_size: Número máximo de elementos por lote
+            
+        Yields:
+            Listas de instantáneas inmutables
+            
+        Raises:
+            ValueError: Si el tamaño de lote no es positivo
+        """
+        if batch_size < 1:
+            raise ValueError("El tamaño de lote debe ser al menos 1")
+        
+        items = self._get_collection(collection)
+        if items is None:
+            return
+        
+        entries = iter(items.values())
+        delivered = 0
+        while True:
+            try:
+                # list(islice(...)) se ejecuta íntegramente en C sin liberar el
+                # GIL (ver _snapshot) y los registros son inmutables
+                batch = list(islice(entries, batch_size))
+            except RuntimeError:
+                # Un alta o una baja concurrente invalida el iterador: se sigue
+                # sobre una instantánea con los registros aún no entregados
+                entries = (entry for entry in list(items.values()) if entry.sequence > delivered)
+                continue
             
-            return [data.copy() for data in self._data[collection].values()]
+            if not batch:
+                return
+            delivered = max(delivered, max(entry.sequence for entry in batch))
+            yield [entry.data for entry in batch]
     
     def exists(self, collection: str, key: str) -> bool:
         """
@@ -91,11 +398,9 @@ class MemoryStorage:
         Returns:
             True si el elemento existe
         """
-        with self._lock:
-            return (
-                collection in self._data and 
-                key in self._data[collection]
-            )
+        with self._locked(collection, key):
+            items = self._get_collection(collection)
+            return items is not None and key in items
     
     def delete(self, collection: str, key: str) -> bool:
         """
@@ -108,16 +413,80 @@ class MemoryStorage:
         Returns:
             True si se eliminó (existía)
         """
-        with self._lock:
-            if collection not in self._data:
+        with self._locked(collection, key):
+            items = self._get_collection(collection)
+            if items is None:
                 return False
             
-            if key in self._data[collection]:
-                del self._data[collection][key]
+            if key in items:
+                del items[key]
+                self._update_indexes(collection, key, None)
                 return True
             
             return False
     
+    def delete_if(
+        self, 
+        collection: str, 
+        key: str, 
+        predicate: Callable[[Mapping[str, Any], float], bool]
+    ) -> bool:
+        """
+        Elimina un elemento solo si cumple una condición.
+        
+        La condición se evalúa bajo el lock del elemento, por lo que
+        ninguna escritura concurrente puede colarse entre la comprobación
+        y el borrado.
+        
+        Args:
+            collection: Nombre de la colección
+            key: Clave del elemento
+            predicate: Función (datos, modified_at) que decide el borrado
+            
+        Returns:
+            True si se eliminó
+        """
+        return self._delete_entry_if(
+            collection, key, lambda entry: predicate(entry.data, entry.modified_at)
+        )
+    
+    def delete_if_unmodified(self, collection: str, key: str, version: int) -> bool:
+        """
+        Elimina un elemento solo si no se ha escrito desde que se leyó.
+        
+        Permite decidir el borrado (y hacer trabajo lento, como archivar)
+        sin retener el lock: se lee con get_entry y se borra con la
+        versión leída, que cambia con cada escritura.
+        
+        Args:
+            collection: Nombre de la colección
+            key: Clave del elemento
+            version: Versión devuelta por get_entry
+            
+        Returns:
+            True si se eliminó
+        """
+        return self._delete_entry_if(collection, key, lambda entry: entry.version == version)
+    
+    def _delete_entry_if(
+        self,
+        collection: str,
+        key: str,
+        predicate: Callable[[_StoredRecord], bool]
+    ) -> bool:
+        """Elimina un elemento si su registro cumple la condición (bajo su lock)."""
+        with self._locked(collection, key):
+            items = self._get_collection(collection)
+            if items is None or key not in items:
+                return False
+            
+            if not predicate(items[key]):
+                return False
+            
+            del items[key]
+            self._update_indexes(collection, key, None)
+            return True
+    
     def clear(self, collection: Optional[str] = None) -> None:
         """
         Limpia una colección o todo el almacenamiento.
@@ -125,11 +494,17 @@ class MemoryStorage:
         Args:
             collection: Colección a limpiar (None para limpiar todo)
         """
-        with self._lock:
+        with self._locked_all():
             if collection is None:
-                self._data.clear()
+                with self._collections_lock:
+                    self._data.clear()
             elif collection in self._data:
                 self._data[collection].clear()
+            
+            for name, indexes in self._indexes.items():
+                if collection is None or name == collection:
+                    for index in indexes.values():
+                        index.clear()
     
     def count(self, collection: str) -> int:
         """
@@ -141,11 +516,21 @@ class MemoryStorage:
         Returns:
             Número de elementos
         """
-        with self._lock:
-            if collection not in self._data:
-                return 0
+        items = self._get_collection(collection)
+        return len(items) if items is not None else 0
+    
+    def keys(self, collection: str) -> List[str]:
+        """
+        Obtiene las claves de una colección.
+        
+        Args:
+            collection: Nombre de la colección
             
-            return len(self._data[collection])
+        Returns:
+            Lista con las claves existentes en este momento
+        """
+        items = self._get_collection(collection)
+        return list(items) if items is not None else []
     
     def get_collections(self) -> List[str]:
         """
@@ -154,10 +539,9 @@ class MemoryStorage:
         Returns:
             Lista de nombres de colecciones
         """
-        with self._lock:
-            return list(self._data.keys())
+        return list(self._data.keys())
     
-    def find_by(self, collection: str, **criteria) -> List[Dict[str, Any]]:
+    def find_by(self, collection: str, **criteria) -> List[Mapping[str, Any]]:
         """
         Busca elementos que cumplan criterios.
         
@@ -166,21 +550,243 @@ class MemoryStorage:
             **criteria: Criterios de búsqueda (clave=valor)
             
         Returns:
-            Lista de elementos que cumplen los criterios
+            Lista de instantáneas inmutables que cumplen los criterios
         """
-        with self._lock:
-            if collection not in self._data:
-                return []
+        results = []
+        for data in self._snapshot(collection):
+            match = True
+            for key, value in criteria.items():
+                if data.get(key) != value:
+                    match = False
+                    break
             
-            results = []
-            for data in self._data[collection].values():
-                match = True
-                for key, value in criteria.items():
-                    if data.get(key) != value:
-                        match = False
-                        break
-                
-                if match:
-                    results.append(data.copy())
+            if match:
+                results.append(data)
+        
+        return results
+    
+    def create_index(self, collection: str, field: str) -> None:
+        """
+        Crea un índice secundario por el valor de un campo.
+        
+        Si el índice ya existe no se hace nada; si no, se construye con los
+        registros actuales. Los registros sin el campo no se indexan.
+        
+        Args:
+            collection: Nombre de la colección
+            field: Campo por cuyo valor se indexa
+        """
+        if field in self._indexes.get(collection, {}):
+            return
+        
+        with self._locked_all():
+            indexes = self._indexes.setdefault(collection, {})
+            if field in indexes:
+                return
+            
+            index = _FieldIndex()
+            for key, entry in (self._get_collection(collection) or {}).items():
+                index.update(key, entry.data, field)
+            indexes[field] = index
+    
+    def query_index(
+        self,
+        collection: str,
+        field: str,
+        value: Any,
+        after: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Tuple[str, Mapping[str, Any]]]:
+        """
+        Obtiene una página de registros con un valor en un campo indexado.
+        
+        Los registros se devuelven ordenados por clave; para la página
+        siguiente se pasa como `after` la última clave recibida.
+        
+        Args:
+            collection: Nombre de la colección
+            field: Campo indexado (ver create_index)
+            value: Valor buscado
+            after: Clave tras la que empieza la página (None para la primera)
+            limit: Número máximo de registros
+            
+        Returns:
+            Lista de tuplas (clave, instantánea inmutable)
             
-            return results
\ No newline at end of file
+        Raises:
+            ValueError: Si el campo no está indexado o el límite no es positivo
+        """
+        if limit < 1:
+            raise ValueError("El tamaño de página debe ser al menos 1")
+        
+        keys = self._get_index(collection, field).page(value, after, limit)
+        items = self._get_collection(collection) or {}
+        
+        # Cada dict.get es atómico y los registros son inmutables; un
+        # registro que cambió de valor entre ambas lecturas se omite
+        entries = ((key, items.get(key)) for key in keys)
+        return [
+            (key, entry.data) for key, entry in entries
+            if entry is not None and entry.data.get(field) == value
+        ]
+    
+    def count_index(self, collection: str, field: str, value: Any) -> int:
+        """
+        Cuenta los registros con un valor en un campo indexado.
+        
+        Args:
+            collection: Nombre de la colección
+            field: Campo indexado (ver create_index)
+            value: Valor buscado
+            
+        Returns:
+            Número de registros
+            
+        Raises:
+            ValueError: Si el campo no está indexado
+        """
+        return self._get_index(collection, field).count(value)
+    
+    def get_lock_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene métricas de contención de los locks.
+        
+        Una adquisición es "contendida" cuando el lock ya estaba tomado por
+        otro hilo y hubo que esperar por él.
+        
+        Returns:
+            Diccionario con número de locks, adquisiciones y contenciones
+        """
+        acquisitions = sum(self._acquisitions)
+        contentions = sum(self._contentions)
+        
+        return {
+            'lock_stripes': len(self._stripes),
+            'acquisitions': acquisitions,
+            'contentions': contentions,
+            'contention_rate': contentions / acquisitions if acquisitions else 0.0
+        }
+    
+    def reset_lock_statistics(self) -> None:
+        """Reinicia los contadores de contención."""
+        with self._locked_all():
+            self._acquisitions = [0] * len(self._stripes)
+            self._contentions = [0] * len(self._stripes)
+    
+    def _get_collection(
+        self, 
+        collection: str, 
+        create: bool = False
+    ) -> Optional[Dict[str, _StoredRecord]]:
+        """
+        Obtiene el diccionario interno de una colección.
+        
+        Args:
+            collection: Nombre de la colección
+            create: Crear la colección si no existe
+            
+        Returns:
+            Diccionario de la colección o None si no existe
+        """
+        items = self._data.get(collection)
+        if items is None and create:
+            with self._collections_lock:
+                items = self._data.setdefault(collection, {})
+        return items
+    
+    def _snapshot(self, collection: str) -> List[Mapping[str, Any]]:
+        """
+        Toma una instantánea de los valores de una colección sin bloquear escritores.
+        
+        Args:
+            collection: Nombre de la colección
+            
+        Returns:
+            Lista con las referencias a los elementos almacenados
+        """
+        items = self._get_collection(collection)
+        if items is None:
+            return []
+        
+        # list(dict.values()) se ejecuta íntegramente en C sin liberar el GIL,
+        # por lo que no puede observar el diccionario a medio modificar
+        return [entry.data for entry in list(items.values())]
+    
+    def _sequence_of(self, current: Optional[_StoredRecord]) -> int:
+        """Orden de alta de un registro: el del registro que reemplaza o uno nuevo."""
+        return current.sequence if current is not None else next(self._sequence)
+    
+    def _get_index(self, collection: str, field: str) -> _FieldIndex:
+        """
+        Obtiene el índice secundario de un campo.
+        
+        Raises:
+            ValueError: Si el campo no está indexado
+        """
+        index = self._indexes.get(collection, {}).get(field)
+        if index is None:
+            raise ValueError(f"No existe un índice de '{collection}' por '{field}'")
+        return index
+    
+    def _update_indexes(self, collection: str, key: str, record: Optional[Mapping[str, Any]]) -> None:
+        """Actualiza los índices de un registro (con su lock adquirido)."""
+        for field, index in self._indexes.get(collection, {}).items():
+            index.update(key, record, field)
+    
+    def _stripe_index(self, collection: str, key: str) -> int:
+        """Obtiene el índice del lock asignado a (colección, clave)."""
+        return hash((collection, key)) % len(self._stripes)
+    
+    def _acquire_stripe(self, index: int) -> None:
+        """
+        Adquiere un lock registrando si hubo contención.
+        
+        Args:
+            index: Índice del lock a adquirir
+        """
+        lock = self._stripes[index]
+        contended = not lock.acquire(blocking=False)
+        if contended:
+            lock.acquire()
+        
+        self._acquisitions[index] += 1
+        if contended:
+            self._contentions[index] += 1
+    
+    @contextmanager
+    def _locked(self, collection: str, key: str) -> Iterator[None]:
+        """Protege el acceso a un único elemento con su lock asignado."""
+        index = self._stripe_index(collection, key)
+        self._acquire_stripe(index)
+        try:
+            yield
+        finally:
+            self._stripes[index].release()
+    
+    @contextmanager
+    def _locked_keys(self, collection: str, keys: Iterable[str]) -> Iterator[None]:
+        """
+        Protege varios elementos adquiriendo cada lock implicado una sola vez.
+        
+        Los locks se toman en orden ascendente, igual que en _locked_all,
+        para evitar interbloqueos entre lotes concurrentes.
+        """
+        indexes = sorted({self._stripe_index(collection, key) for key in keys})
+        for index in indexes:
+            self._acquire_stripe(index)
+        try:
+            yield
+        finally:
+            for index in reversed(indexes):
+                self._stripes[index].release()
+    
+    @contextmanager
+    def _locked_all(self) -> Iterator[None]:
+        """Adquiere todos los locks (siempre en el mismo orden para evitar interbloqueos)."""
+        for index in range(len(self._stripes)):
+            self._acquire_stripe(index)
+        try:
+            yield
+        finally:
+            for lock in reversed(self._stripes):
+                lock.release()
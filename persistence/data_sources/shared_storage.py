@@ -0,0 +1,437 @@
+"""
+Shared Storage - Almacenamiento compartido entre procesos.
+
+Con varios procesos de trabajo (ServerSettings.processes > 1) cada proceso
+tendría su propio MemoryStorage y un jugador cuya petición llega a otro
+proceso no encontraría su partida. Este módulo aloja un único MemoryStorage
+en un servidor local accesible por socket Unix, al que todos los procesos
+del mismo host se conectan mediante SharedStorageClient.
+
+El servidor atiende cada conexión en su propio hilo, de modo que el
+bloqueo por registro de MemoryStorage sigue permitiendo que peticiones
+sobre sesiones distintas avancen en paralelo.
+"""
+
+from typing import Dict, Optional, Any, List, Iterator, Mapping, Callable, Iterable
+from multiprocessing.managers import BaseManager
+import os
+import tempfile
+import threading
+
+from persistence.data_sources.memory_storage import MemoryStorage, thaw_record
+
+
+def default_socket_path() -> str:
+    """
+    Obtiene una ruta de socket única para el proceso actual.
+    
+    Returns:
+        Ruta del socket Unix en el directorio temporal
+    """
+    return os.path.join(tempfile.gettempdir(), f"tres-en-raya-storage-{os.getpid()}.sock")
+
+
+class _SharedStorageService:
+    """
+    Fachada de MemoryStorage que solo recibe y devuelve datos serializables.
+    
+    Las instantáneas inmutables se descongelan antes de enviarse, y las
+    operaciones con funciones (delete_if) se sustituyen por equivalentes
+    con argumentos simples.
+    """
+    
+    def __init__(self, storage: MemoryStorage):
+        self._storage = storage
+    
+    def save(
+        self, collection: str, key: str, data: Dict[str, Any], expected_version: Optional[int] = None
+    ) -> bool:
+        return self._storage.save(collection, key, data, expected_version)
+    
+    def save_many(
+        self,
+        collection: str,
+        items: Dict[str, Dict[str, Any]],
+        expected_versions: Optional[Dict[str, int]] = None
+    ) -> Dict[str, bool]:
+        return self._storage.save_many(collection, items, expected_versions)
+    
+    def get_version(self, collection: str, key: str) -> int:
+        return self._storage.get_version(collection, key)
+    
+    def get(self, collection: str, key: str) -> Optional[Dict[str, Any]]:
+        return thaw_record(self._storage.get(collection, key))
+    
+    def get_entry(self, collection: str, key: str) -> Optional[tuple]:
+        entry = self._storage.get_entry(collection, key)
+        return (thaw_record(entry[0]), entry[1], entry[2]) if entry else None
+    
+    def get_many(self, collection: str, keys: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        return thaw_record(self._storage.get_many(collection, keys))
+    
+    def get_all(self, collection: str) -> List[Dict[str, Any]]:
+        return [thaw_record(data) for data in self._storage.get_all(collection)]
+    
+    def find_by(self, collection: str, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [thaw_record(data) for data in self._storage.find_by(collection, **criteria)]
+    
+    def exists(self, collection: str, key: str) -> bool:
+        return self._storage.exists(collection, key)
+    
+    def delete(self, collection: str, key: str) -> bool:
+        return self._storage.delete(collection, key)
+    
+    def delete_if_unmodified(self, collection: str, key: str, version: int) -> bool:
+        return self._storage.delete_if_unmodified(collection, key, version)
+    
+    def clear(self, collection: Optional[str] = None) -> None:
+        self._storage.clear(collection)
+    
+    def count(self, collection: str) -> int:
+        return self._storage.count(collection)
+    
+    def keys(self, collection: str) -> List[str]:
+        return self._storage.keys(collection)
+    
+    def get_collections(self) -> List[str]:
+        return self._storage.get_collections()
+    
+    def create_index(self, collection: str, field: str) -> None:
+        self._storage.create_index(collection, field)
+    
+    def query_index(
+        self, collection: str, field: str, value: Any, after: Optional[str], limit: int
+    ) -> List[tuple]:
+        return [
+            (key, thaw_record(data))
+            for key, data in self._storage.query_index(collection, field, value, after, limit)
+        ]
+    
+    def count_index(self, collection: str, field: str, value: Any) -> int:
+        return self._storage.count_index(collection, field, value)
+    
+    def get_lock_statistics(self) -> Dict[str, Any]:
+        return self._storage.get_lock_statistics()
+    
+    def reset_lock_statistics(self) -> None:
+        self._storage.reset_lock_statistics()
+
+
+class _StorageServerManager(BaseManager):
+    """Gestor del lado del servidor."""
+
+
+class _StorageClientManager(BaseManager):
+    """Gestor del lado del cliente."""
+
+
+_StorageClientManager.register('storage')
+
+
+class SharedStorageServer:
+    """
+    Servidor local que comparte un MemoryStorage entre procesos.
+    
+    Se ejecuta en un hilo del proceso principal antes de crear los
+    procesos de trabajo, que se conectan con SharedStorageClient.
+    
+    Principios aplicados:
+    - Es INFRAESTRUCTURA, no dominio
+    - Un único almacenamiento por host, bloqueo por registro
+    """
+    
+    def __init__(
+        self,
+        address: Optional[str] = None,
+        authkey: Optional[bytes] = None,
+        storage: Optional[MemoryStorage] = None
+    ):
+        """
+        Prepara el servidor.
+        
+        Args:
+            address: Ruta del socket Unix (por defecto default_socket_path())
+            authkey: Clave compartida con los clientes (por defecto aleatoria)
+            storage: Almacenamiento a compartir (por defecto uno nuevo)
+        """
+        self._address = address or default_socket_path()
+        self._authkey = authkey or os.urandom(32)
+        self._storage = storage or MemoryStorage()
+        self._service = _SharedStorageService(self._storage)
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def address(self) -> str:
+        """Ruta del socket Unix."""
+        return self._address
+    
+    @property
+    def authkey(self) -> bytes:
+        """Clave compartida con los clientes."""
+        return self._authkey
+    
+    @property
+    def storage(self) -> MemoryStorage:
+        """Almacenamiento compartido (solo accesible en este proceso)."""
+        return self._storage
+    
+    @property
+    def is_running(self) -> bool:
+        """Indica si el servidor está aceptando conexiones."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self) -> None:
+        """Empieza a aceptar conexiones en un hilo en segundo plano."""
+        if self.is_running:
+            return
+        
+        if os.path.exists(self._address):
+            os.remove(self._address)  # Socket huérfano de una ejecución anterior
+        
+        registry = type('_Registry', (_StorageServerManager,), {})
+        registry.register('storage', callable=lambda: self._service)
+        self._server = registry(address=self._address, authkey=self._authkey).get_server()
+        
+        self._thread = threading.Thread(
+            target=self._serve,
+            name="shared-storage-server",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Deja de aceptar conexiones y elimina el socket.
+        
+        Args:
+            timeout: Segundos máximos de espera por el hilo
+        """
+        if self._server is not None:
+            self._server.stop_event.set()
+            self._server.listener.close()
+        
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        
+        self._server = None
+        if os.path.exists(self._address):
+            os.remove(self._address)
+    
+    def _serve(self) -> None:
+        """Bucle del hilo del servidor."""
+        try:
+            self._server.serve_forever()
+        except SystemExit:
+            pass  # serve_forever termina siempre con sys.exit()
+    
+    def create_client(self) -> 'SharedStorageClient':
+        """
+        Crea un cliente conectado a este servidor.
+        
+        Returns:
+            Cliente de almacenamiento compartido
+        """
+        return SharedStorageClient(self._address, self._authkey)
+    
+    def __enter__(self) -> 'SharedStorageServer':
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class SharedStorageClient:
+    """
+    Cliente con la misma interfaz que MemoryStorage.
+    
+    La conexión se abre de forma perezosa y se vuelve a abrir cuando
+    el proceso cambia (por ejemplo, tras un fork), por lo que un mismo
+    cliente puede crearse antes de lanzar los procesos de trabajo.
+    
+    Los datos devueltos son copias mutables independientes del servidor.
+    """
+    
+    def __init__(self, address: str, authkey: bytes):
+        """
+        Inicializa el cliente.
+        
+        Args:
+            address: Ruta del socket Unix del servidor
+            authkey: Clave compartida con el servidor
+        """
+        self._address = address
+        self._authkey = authkey
+        self._proxy = None
+        self._pid: Optional[int] = None
+        self._connect_lock = threading.Lock()
+    
+    def save(
+        self,
+        collection: str,
+        key: str,
+        data: Mapping[str, Any],
+        expected_version: Optional[int] = None
+    ) -> bool:
+        """Guarda datos en la colección especificada (compare-and-swap opcional)."""
+        return self._service().save(collection, key, thaw_record(data), expected_version)
+    
+    def save_many(
+        self,
+        collection: str,
+        items: Mapping[str, Mapping[str, Any]],
+        expected_versions: Optional[Mapping[str, int]] = None
+    ) -> Dict[str, bool]:
+        """Guarda varios elementos en una sola operación."""
+        return self._service().save_many(
+            collection, thaw_record(items), dict(expected_versions) if expected_versions else None
+        )
+    
+    def get_version(self, collection: str, key: str) -> int:
+        """Obtiene la versión actual de un elemento (0 si no existe)."""
+        return self._service().get_version(collection, key)
+    
+    def get(self, collection: str, key: str) -> Optional[Dict[str, Any]]:
+        """Obtiene datos por clave de una colección."""
+        return self._service().get(collection, key)
+    
+    def get_entry(self, collection: str, key: str) -> Optional[tuple]:
+        """Obtiene los datos de un elemento con su última modificación y su versión."""
+        return self._service().get_entry(collection, key)
+    
+    def get_many(self, collection: str, keys: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Obtiene varios elementos en una sola operación."""
+        return self._service().get_many(collection, list(keys))
+    
+    def get_all(self, collection: str) -> List[Dict[str, Any]]:
+        """Obtiene todos los elementos de una colección."""
+        return self._service().get_all(collection)
+    
+    def iter_batches(self, collection: str, batch_size: int = 100) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Recorre una colección por lotes.
+        
+        Cada lote se obtiene con una única llamada al servidor.
+        
+        Args:
+            collection: Nombre de la colección
+            batch_size: Número máximo de elementos por lote
+            
+        Yields:
+            Listas de elementos
+        """
+        if batch_size < 1:
+            raise ValueError("El tamaño de lote debe ser al menos 1")
+        
+        keys = self.keys(collection)
+        for start in range(0, len(keys), batch_size):
+            records = self.get_many(collection, keys[start:start + batch_size])
+            batch = [data for data in records.values() if data is not None]
+            if batch:
+                yield batch
+    
+    def exists(self, collection: str, key: str) -> bool:
+        """Verifica si existe un elemento."""
+        return self._service().exists(collection, key)
+    
+    def delete(self, collection: str, key: str) -> bool:
+        """Elimina un elemento."""
+        return self._service().delete(collection, key)
+    
+    def delete_if(
+        self,
+        collection: str,
+        key: str,
+        predicate: Callable[[Mapping[str, Any], float], bool]
+    ) -> bool:
+        """
+        Elimina un elemento solo si cumple una condición.
+        
+        La condición se evalúa en este proceso y el borrado solo se aplica
+        si el elemento no se ha modificado desde que se leyó; si otro
+        proceso lo modificó entretanto, no se elimina.
+        
+        Args:
+            collection: Nombre de la colección
+            key: Clave del elemento
+            predicate: Función (datos, modified_at) que decide el borrado
+            
+        Returns:
+            True si se eliminó
+        """
+        entry = self.get_entry(collection, key)
+        if entry is None:
+            return False
+        
+        data, modified_at, version = entry
+        if not predicate(data, modified_at):
+            return False
+        
+        return self.delete_if_unmodified(collection, key, version)
+    
+    def delete_if_unmodified(self, collection: str, key: str, version: int) -> bool:
+        """Elimina un elemento solo si no se ha escrito desde que se leyó (ver get_entry)."""
+        return self._service().delete_if_unmodified(collection, key, version)
+    
+    def clear(self, collection: Optional[str] = None) -> None:
+        """Limpia una colección o todo el almacenamiento."""
+        self._service().clear(collection)
+    
+    def count(self, collection: str) -> int:
+        """Cuenta elementos en una colección."""
+        return self._service().count(collection)
+    
+    def keys(self, collection: str) -> List[str]:
+        """Obtiene las claves de una colección."""
+        return self._service().keys(collection)
+    
+    def get_collections(self) -> List[str]:
+        """Obtiene lista de colecciones existentes."""
+        return self._service().get_collections()
+    
+    def find_by(self, collection: str, **criteria) -> List[Dict[str, Any]]:
+        """Busca elementos que cumplan criterios (clave=valor)."""
+        return self._service().find_by(collection, criteria)
+    
+    def create_index(self, collection: str, field: str) -> None:
+        """Crea en el servidor un índice secundario por el valor de un campo."""
+        self._service().create_index(collection, field)
+    
+    def query_index(
+        self,
+        collection: str,
+        field: str,
+        value: Any,
+        after: Optional[str] = None,
+        limit: int = 50
+    ) -> List[tuple]:
+        """Obtiene una página de registros con un valor en un campo indexado."""
+        return self._service().query_index(collection, field, value, after, limit)
+    
+    def count_index(self, collection: str, field: str, value: Any) -> int:
+        """Cuenta los registros con un valor en un campo indexado."""
+        return self._service().count_index(collection, field, value)
+    
+    def get_lock_statistics(self) -> Dict[str, Any]:
+        """Obtiene las estadísticas de contención del servidor."""
+        return self._service().get_lock_statistics()
+    
+    def reset_lock_statistics(self) -> None:
+        """Reinicia las estadísticas de contención del servidor."""
+        self._service().reset_lock_statistics()
+    
+    def _service(self):
+        """Obtiene el proxy del servidor, conectando si es necesario."""
+        pid = os.getpid()
+        if self._proxy is not None and self._pid == pid:
+            return self._proxy
+        
+        with self._connect_lock:
+            if self._proxy is None or self._pid != pid:
+                manager = _StorageClientManager(address=self._address, authkey=self._authkey)
+                manager.connect()
+                self._proxy = manager.storage()
+                self._pid = pid
+            return self._proxy
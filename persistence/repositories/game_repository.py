@@ -5,9 +5,12 @@ Este repositorio implementa el patrón Repository para abstraer
 la persistencia de las sesiones de juego del dominio.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Mapping, Iterator, Callable, Iterable, Tuple
+from collections import OrderedDict
+import threading
+
 from game.entities import GameSession, GameState, GameResult, GameConfiguration
-from game.entities import Player, PlayerType, PlayerSymbol
+from game.entities import Player, PlayerType, PlayerSymbol, ConcurrentModificationError
 from persistence.data_sources.memory_storage import MemoryStorage
 
 
@@ -18,6 +21,10 @@ class GameRepository:
     Implementa el patrón Repository para proporcionar una interfaz
     abstracta para el acceso a datos de sesiones de juego.
     
+    Las sesiones se indexan por estado en el almacenamiento: list_by_state
+    pagina un estado con un cursor y devuelve un resumen de cada sesión
+    (sin deserializarla) que se guarda en caché por versión.
+    
     Principios aplicados:
     - Abstrae la persistencia del dominio
     - Convierte entre entidades del dominio y datos persistidos
@@ -26,6 +33,9 @@ class GameRepository:
     
     COLLECTION_NAME = "game_sessions"
     
+    # Resúmenes de sesión en caché (ver list_by_state)
+    SUMMARY_CACHE_SIZE = 4096
+    
     def __init__(self, storage: MemoryStorage):
         """
         Inicializa el repositorio.
@@ -34,26 +44,106 @@ class GameRepository:
             storage: Almacenamiento a utilizar
         """
         self._storage = storage
+        # Errores del último recorrido de cada hilo (ver last_scan_errors)
+        self._scan_state = threading.local()
+        self._summaries: "OrderedDict[str, Tuple[Any, Dict[str, Any]]]" = OrderedDict()
+        self._summaries_lock = threading.Lock()
+        
+        self._storage.create_index(self.COLLECTION_NAME, 'state')
+    
+    @property
+    def last_scan_errors(self) -> List[str]:
+        """
+        IDs de las sesiones que no se pudieron deserializar en el último
+        recorrido iniciado por el hilo actual.
+        
+        Los recorridos concurrentes de otros hilos no la modifican; para
+        los errores de un recorrido concreto, iter_all acepta una lista.
+        """
+        return list(getattr(self._scan_state, 'errors', ()))
     
     def save(self, game_session: GameSession) -> bool:
         """
         Guarda una sesión de juego.
         
+        La escritura solo se aplica si la sesión almacenada sigue en la
+        versión que se leyó (compare-and-swap); al guardarse, la versión
+        de la sesión se incrementa.
+        
         Args:
             game_session: Sesión de juego a guardar
             
         Returns:
             True si se guardó exitosamente
+            
+        Raises:
+            ConcurrentModificationError: Si otra operación guardó la sesión
+                después de que se leyera
         """
         try:
             data = self._serialize_game_session(game_session)
-            return self._storage.save(
+            data['version'] = game_session.version + 1
+            saved = self._storage.save(
                 self.COLLECTION_NAME, 
                 game_session.id, 
-                data
+                data,
+                expected_version=game_session.version
             )
         except Exception:
             return False
+        
+        if not saved:
+            raise ConcurrentModificationError(
+                f"La sesión {game_session.id} fue modificada por otra operación"
+            )
+        
+        game_session._version += 1
+        return True
+    
+    def save_many(self, game_sessions: Iterable[GameSession]) -> Dict[str, bool]:
+        """
+        Guarda varias sesiones de juego en un único lote.
+        
+        Las sesiones que no se pueden serializar o que fueron modificadas
+        por otra operación (ver save) se marcan como fallidas sin impedir
+        que se guarde el resto.
+        
+        Args:
+            game_sessions: Sesiones de juego a guardar
+            
+        Returns:
+            Diccionario ID de sesión -> True si se guardó exitosamente
+        """
+        results: Dict[str, bool] = {}
+        sessions: Dict[str, GameSession] = {}
+        serialized: Dict[str, Dict[str, Any]] = {}
+        
+        for game_session in game_sessions:
+            try:
+                data = self._serialize_game_session(game_session)
+                data['version'] = game_session.version + 1
+                serialized[game_session.id] = data
+                sessions[game_session.id] = game_session
+            except Exception:
+                results[game_session.id] = False
+        
+        if serialized:
+            try:
+                results.update(self._storage.save_many(
+                    self.COLLECTION_NAME,
+                    serialized,
+                    expected_versions={
+                        session_id: session.version for session_id, session in sessions.items()
+                    }
+                ))
+            except Exception:
+                results.update({session_id: False for session_id in serialized})
+        
+        for session_id, session in sessions.items():
+            if results.get(session_id):
+                session._version += 1
+        
+        return results
     
     def get_by_id(self, session_id: str) -> Optional[GameSession]:
         """
@@ -74,29 +164,69 @@ class GameRepository:
         except Exception:
             return None
     
+    def get_many(self, session_ids: Iterable[str]) -> Dict[str, Optional[GameSession]]:
+        """
+        Obtiene varias sesiones de juego en un único lote.
+        
+        Args:
+            session_ids: IDs de las sesiones
+            
+        Returns:
+            Diccionario ID de sesión -> sesión o None si no existe o es inválida
+        """
+        session_ids = list(session_ids)
+        
+        try:
+            records = self._storage.get_many(self.COLLECTION_NAME, session_ids)
+        except Exception:
+            return {session_id: None for session_id in session_ids}
+        
+        return {
+            session_id: self._deserialize_game_session(data) if data else None
+            for session_id, data in records.items()
+        }
+    
     def get_all(self) -> List[GameSession]:
         """
         Obtiene todas las sesiones de juego.
         
+        Para recorridos grandes es preferible iter_all, que no
+        materializa la lista completa.
+        
         Returns:
             Lista de todas las sesiones
         """
         try:
-            all_data = self._storage.get_all(self.COLLECTION_NAME)
-            sessions = []
-            
-            for data in all_data:
-                try:
-                    session = self._deserialize_game_session(data)
-                    if session:
-                        sessions.append(session)
-                except Exception:
-                    continue  # Skip invalid sessions
-            
-            return sessions
+            return list(self.iter_all())
         except Exception:
             return []
     
+    def iter_all(
+        self, 
+        batch_size: int = 100, 
+        filter: Optional[Callable[[GameSession], bool]] = None,
+        errors: Optional[List[str]] = None
+    ) -> Iterator[GameSession]:
+        """
+        Recorre todas las sesiones de juego de forma perezosa.
+        
+        Las sesiones se leen del almacenamiento por lotes y se deserializan
+        una a una, por lo que la memoria usada no depende del número total
+        de sesiones. Las sesiones que no se pueden deserializar se omiten y
+        sus IDs se añaden a errors y a last_scan_errors.
+        
+        Args:
+            batch_size: Número de registros leídos por lote
+            filter: Predicado opcional; solo se devuelven las sesiones que lo cumplen
+            errors: Lista opcional donde se añaden los IDs no deserializables
+            
+        Yields:
+            Sesiones de juego
+        """
+        for session in self._iter_sessions(batch_size, errors=errors):
+            if filter is None or filter(session):
+                yield session
+    
     def delete(self, session_id: str) -> bool:
         """
         Elimina una sesión de juego.
@@ -132,11 +262,9 @@ class GameRepository:
             Lista de sesiones que contienen al jugador
         """
         try:
-            all_sessions = self.get_all()
-            return [
-                session for session in all_sessions
-                if any(player.id == player_id for player in session.players)
-            ]
+            return list(self.iter_all(
+                filter=lambda session: any(player.id == player_id for player in session.players)
+            ))
         except Exception:
             return []
     
@@ -147,14 +275,82 @@ class GameRepository:
         Returns:
             Lista de sesiones activas
         """
+        errors = self._start_scan()
+        sessions = []
+        
         try:
-            all_sessions = self.get_all()
-            return [
-                session for session in all_sessions
-                if session.state in [GameState.IN_PROGRESS, GameState.PAUSED]
-            ]
+            # Solo se leen las sesiones activas, a través del índice por estado
+            for state in (GameState.IN_PROGRESS, GameState.PAUSED):
+                for data in self._iter_records_by_state(state):
+                    session = self._deserialize_game_session(data)
+                    if session is None:
+                        errors.append(data.get('id', '<sin id>'))
+                        continue
+                    sessions.append(session)
         except Exception:
             return []
+        
+        return sessions
+    
+    def list_by_state(
+        self,
+        state: GameState,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Obtiene una página de resúmenes de las sesiones en un estado.
+        
+        El coste depende del tamaño de la página, no del número total de
+        sesiones almacenadas.
+        
+        Args:
+            state: Estado de las sesiones
+            cursor: Cursor devuelto por la página anterior (None para la primera)
+            limit: Número máximo de sesiones
+            
+        Returns:
+            Tupla (resúmenes con id, version, state, players, move_count y
+            created_at; cursor de la página siguiente o None si no hay más)
+            
+        Raises:
+            ValueError: Si el límite no es positivo
+        """
+        if limit < 1:
+            raise ValueError("El tamaño de página debe ser al menos 1")
+        
+        records = self._storage.query_index(
+            self.COLLECTION_NAME, 'state', state.value, after=cursor, limit=limit + 1
+        )
+        page = records[:limit]
+        summaries = [self._summarize(key, data) for key, data in page]
+        next_cursor = page[-1][0] if len(records) > limit else None
+        
+        return summaries, next_cursor
+    
+    def count_by_state(self, state: GameState) -> int:
+        """
+        Cuenta las sesiones en un estado sin recorrerlas.
+        
+        Args:
+            state: Estado de las sesiones
+            
+        Returns:
+            Número de sesiones
+        """
+        return self._storage.count_index(self.COLLECTION_NAME, 'state', state.value)
+    
+    def get_version(self, session_id: str) -> int:
+        """
+        Obtiene la versión almacenada de una sesión sin deserializarla.
+        
+        Args:
+            session_id: ID de la sesión
+            
+        Returns:
+            Versión de la sesión (0 si no existe)
+        """
+        return self._storage.get_version(self.COLLECTION_NAME, session_id)
     
     def count(self) -> int:
         """
@@ -165,6 +361,113 @@ class GameRepository:
         """
         return self._storage.count(self.COLLECTION_NAME)
     
+    def _iter_sessions(
+        self, 
+        batch_size: int = 100, 
+        record_filter: Optional[Callable[[Mapping[str, Any]], bool]] = None,
+        errors: Optional[List[str]] = None
+    ) -> Iterator[GameSession]:
+        """
+        Recorre y deserializa las sesiones almacenadas.
+        
+        Args:
+            batch_size: Número de registros leídos por lote
+            record_filter: Predicado opcional sobre los datos sin deserializar
+            errors: Lista opcional donde se añaden los IDs no deserializables
+            
+        Yields:
+            Sesiones de juego
+        """
+        scan_errors = self._start_scan()
+        
+        for batch in self._storage.iter_batches(self.COLLECTION_NAME, batch_size):
+            for data in batch:
+                if record_filter is not None and not record_filter(data):
+                    continue
+                
+                session = self._deserialize_game_session(data)
+                if session is None:
+                    scan_errors.append(data.get('id', '<sin id>'))
+                    if errors is not None:
+                        errors.append(data.get('id', '<sin id>'))
+                    continue
+                
+                yield session
+    
+    def _start_scan(self) -> List[str]:
+        """Inicia la lista de errores del recorrido del hilo actual."""
+        errors: List[str] = []
+        self._scan_state.errors = errors
+        return errors
+    
+    def _iter_records_by_state(self, state: GameState, batch_size: int = 100) -> Iterator[Mapping[str, Any]]:
+        """
+        Recorre por páginas los registros de un estado a través del índice.
+        
+        Args:
+            state: Estado de las sesiones
+            batch_size: Número de registros leídos por página
+            
+        Yields:
+            Datos de las sesiones sin deserializar
+        """
+        cursor = None
+        while True:
+            records = self._storage.query_index(
+                self.COLLECTION_NAME, 'state', state.value, after=cursor, limit=batch_size
+            )
+            if not records:
+                return
+            
+            for _, data in records:
+                yield data
+            cursor = records[-1][0]
+    
+    def _summarize(self, session_id: str, data: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Obtiene el resumen de una sesión, de la caché si su versión no cambió.
+        
+        Args:
+            session_id: ID de la sesión
+            data: Datos almacenados de la sesión
+            
+        Returns:
+            Diccionario con el resumen de la sesión
+        """
+        version = data.get('version')
+        
+        with self._summaries_lock:
+            cached = self._summaries.get(session_id)
+            if cached is not None and cached[0] == version:
+                self._summaries.move_to_end(session_id)
+                return cached[1]
+        
+        players = data.get('players') or {}
+        summary = {
+            'id': session_id,
+            'version': version,
+            'state': data.get('state'),
+            'players': [
+                {
+                    'id': players[symbol]['id'],
+                    'name': players[symbol]['name'],
+                    'symbol': symbol,
+                    'type': players[symbol]['player_type']
+                }
+                for symbol in ('X', 'O') if players.get(symbol)
+            ],
+            'move_count': data.get('move_count', 0),
+            'created_at': data.get('created_at')
+        }
+        
+        with self._summaries_lock:
+            self._summaries[session_id] = (version, summary)
+            self._summaries.move_to_end(session_id)
+            while len(self._summaries) > self.SUMMARY_CACHE_SIZE:
+                self._summaries.popitem(last=False)
+        
+        return summary
+    
     def _serialize_game_session(self, game_session: GameSession) -> Dict[str, Any]:
         """
         Serializa una GameSession a diccionario.
@@ -230,7 +533,7 @@ class GameRepository:
             'is_active': player.is_active
         }
     
-    def _deserialize_game_session(self, data: Dict[str, Any]) -> Optional[GameSession]:
+    def _deserialize_game_session(self, data: Mapping[str, Any]) -> Optional[GameSession]:
         """
         Deserializa un diccionario a GameSession.
         
@@ -260,17 +563,14 @@ class GameRepository:
                 session_id=data['id']
             )
             
-            # Restaurar jugadores
+            # Restaurar jugadores (ya traen su símbolo, por lo que no se usa
+            # add_player, que intentaría asignarlo de nuevo)
             players_data = data.get('players', {})
-            if players_data.get('X'):
-                player_x = self._deserialize_player(players_data['X'])
-                if player_x:
-                    session.add_player(player_x, PlayerSymbol.X)
-            
-            if players_data.get('O'):
-                player_o = self._deserialize_player(players_data['O'])
-                if player_o:
-                    session.add_player(player_o, PlayerSymbol.O)
+            for symbol in (PlayerSymbol.X, PlayerSymbol.O):
+                if players_data.get(symbol.value):
+                    player = self._deserialize_player(players_data[symbol.value])
+                    if player:
+                        session._players[symbol] = player
             
             # Restaurar estado del juego (usando reflexión para acceder a atributos privados)
             session._state = GameState(data['state'])
@@ -278,6 +578,7 @@ class GameRepository:
                 session._result = GameResult(data['result'])
             session._current_player_symbol = PlayerSymbol(data['current_player_symbol'])
             session._move_count = data['move_count']
+            session._version = data.get('version', 0)
             
             # Restaurar timestamps
             session._created_at = datetime.fromisoformat(data['created_at'])
@@ -286,7 +587,15 @@ class GameRepository:
             if data.get('finished_at'):
                 session._finished_at = datetime.fromisoformat(data['finished_at'])
             
-            # Restaurar tablero
+            # Restaurar tablero, preferentemente en el orden real de los movimientos
+            move_history = data.get('move_history')
+            if move_history:
+                for move_data in move_history:
+                    position = Position(move_data['position']['row'], move_data['position']['col'])
+                    move = Move(position=position, player=CellState(move_data['player']))
+                    session.board.place_move(move)
+                return session
+            
             board_data = data.get('board', [])
             for row_idx, row in enumerate(board_data):
                 for col_idx, cell in enumerate(row):
@@ -297,11 +606,11 @@ class GameRepository:
                         session.board.place_move(move)
             
             return session
-            
+        
         except Exception:
             return None
     
-    def _deserialize_player(self, data: Dict[str, Any]) -> Optional[Player]:
+    def _deserialize_player(self, data: Mapping[str, Any]) -> Optional[Player]:
         """
         Deserializa un diccionario a Player.
         
@@ -340,6 +649,6 @@ class GameRepository:
             player._is_active = data.get('is_active', True)
             
             return player
-            
+        
         except Exception:
             return None
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Live Session Repository - Sesiones de juego vivas en memoria.
+
+Mantiene las instancias de GameSession que se están jugando para que
+el camino de cada movimiento no tenga que deserializar la sesión desde
+el almacenamiento. Las escrituras siguen llegando al repositorio
+subyacente, que es la fuente de verdad para el resto de la aplicación.
+"""
+
+from typing import Optional, Dict, Any
+from collections import OrderedDict
+import threading
+
+from game.entities import GameSession
+from persistence.repositories.game_repository import GameRepository
+
+
+class LiveSessionRepository:
+    """
+    Repositorio con caché de sesiones vivas.
+    
+    Está pensado para usarse desde los actores de sesión (ver
+    application.coordinators.session_actors), que garantizan que una misma
+    sesión nunca se modifica desde dos hilos a la vez.
+    
+    Antes de devolver una sesión en caché se compara su versión con la
+    almacenada, de modo que los cambios hechos por otros procesos o por
+    otras rutas se detectan sin deserializar la sesión.
+    
+    Principios aplicados:
+    - Implementa la misma interfaz que GameRepository para los casos de uso
+    - La caché nunca es la fuente de verdad
+    """
+    
+    def __init__(self, repository: GameRepository, max_live_sessions: int = 10000):
+        """
+        Inicializa el repositorio.
+        
+        Args:
+            repository: Repositorio subyacente
+            max_live_sessions: Máximo de sesiones en memoria (se descartan
+                las usadas hace más tiempo)
+        """
+        if max_live_sessions < 1:
+            raise ValueError("El máximo de sesiones debe ser al menos 1")
+        
+        self._repository = repository
+        self._max_live_sessions = max_live_sessions
+        self._live: "OrderedDict[str, GameSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+    
+    def get_by_id(self, session_id: str) -> Optional[GameSession]:
+        """
+        Obtiene una sesión de juego, preferentemente desde la caché.
+        
+        Args:
+            session_id: ID de la sesión
+            
+        Returns:
+            Sesión de juego o None si no existe
+        """
+        with self._lock:
+            session = self._live.get(session_id)
+        
+        if session is not None and session.version == self._repository.get_version(session_id):
+            with self._lock:
+                self._hits += 1
+                if session_id in self._live:
+                    self._live.move_to_end(session_id)
+            return session
+        
+        session = self._repository.get_by_id(session_id)
+        with self._lock:
+            self._misses += 1
+            if session is None:
+                self._live.pop(session_id, None)
+            else:
+                self._remember(session)
+        return session
+    
+    def save(self, game_session: GameSession) -> bool:
+        """
+        Guarda una sesión en el repositorio subyacente.
+        
+        Si la escritura falla (incluido un conflicto de versión) la sesión
+        se descarta de la caché, ya que puede contener cambios no guardados.
+        Las partidas terminadas también se descartan, porque ya no recibirán
+        más movimientos.
+        
+        Args:
+            game_session: Sesión de juego a guardar
+            
+        Returns:
+            True si se guardó exitosamente
+            
+        Raises:
+            ConcurrentModificationError: Si otra operación guardó la sesión antes
+        """
+        try:
+            saved = self._repository.save(game_session)
+        except Exception:
+            self.evict(game_session.id)
+            raise
+        
+        with self._lock:
+            if not saved or game_session.is_finished():
+                self._live.pop(game_session.id, None)
+            else:
+                self._remember(game_session)
+        return saved
+    
+    def evict(self, session_id: str) -> None:
+        """
+        Descarta una sesión de la caché.
+        
+        Args:
+            session_id: ID de la sesión
+        """
+        with self._lock:
+            self._live.pop(session_id, None)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene las métricas de la caché.
+        
+        Returns:
+            Diccionario con sesiones vivas, aciertos y fallos
+        """
+        with self._lock:
+            return {
+                'live_sessions': len(self._live),
+                'hits': self._hits,
+                'misses': self._misses
+            }
+    
+    def _remember(self, session: GameSession) -> None:
+        """Guarda una sesión en la caché (requiere el lock)."""
+        self._live[session.id] = session
+        self._live.move_to_end(session.id)
+        while len(self._live) > self._max_live_sessions:
+            self._live.popitem(last=False)
@@ -0,0 +1,368 @@
+"""
+Player Repository - Repositorio para gestionar jugadores.
+
+Este repositorio implementa el patrón Repository para los jugadores y
+mantiene un índice ordenado de la clasificación, actualizado de forma
+incremental cada vez que se guardan las estadísticas de un jugador.
+"""
+
+from typing import Optional, List, Dict, Any, Mapping, Set, Tuple
+from bisect import bisect_left, insort
+from datetime import datetime
+import threading
+
+from game.entities import Player, PlayerType, PlayerStats
+from persistence.data_sources.memory_storage import MemoryStorage
+
+
+# Clave de orden del índice: mayor tasa de victorias primero, después más
+# partidas jugadas y, en caso de empate, el ID para que el orden sea estable
+_RankKey = Tuple[float, int, str]
+
+
+class PlayerRepository:
+    """
+    Repositorio para gestionar jugadores.
+    
+    Además del almacenamiento, mantiene en memoria:
+    - Un índice ordenado con los jugadores que han jugado alguna partida,
+      con el mismo criterio que ManagePlayersUseCase.get_top_players
+      (tasa de victorias y partidas jugadas, de mayor a menor)
+    - Un índice de nombres para exists_by_name, con los IDs de todos los
+      jugadores que comparten cada nombre
+      
+    Las búsquedas en el índice son O(log n) mediante bisección, por lo que
+    get_top_players(limit) es O(limit) y get_rank es O(log n) en lugar de
+    ordenar todos los jugadores en cada consulta. Cada actualización
+    inserta y borra en una lista de Python, lo que cuesta O(n) por los
+    desplazamientos de elementos.
+    
+    Principios aplicados:
+    - Abstrae la persistencia del dominio
+    - Convierte entre entidades del dominio y datos persistidos
+    - Los índices se reconstruyen desde el almacenamiento al crearse
+    """
+    
+    COLLECTION_NAME = "players"
+    RATINGS_COLLECTION_NAME = "player_ratings"
+    
+    def __init__(self, storage: MemoryStorage):
+        """
+        Inicializa el repositorio y construye los índices.
+        
+        Args:
+            storage: Almacenamiento a utilizar
+        """
+        self._storage = storage
+        self._index_lock = threading.Lock()
+        self._ranking: List[_RankKey] = []
+        self._rank_keys: Dict[str, _RankKey] = {}
+        self._names: Dict[str, Set[str]] = {}
+        self._player_names: Dict[str, str] = {}
+        
+        for batch in self._storage.iter_batches(self.COLLECTION_NAME):
+            for data in batch:
+                player = self._deserialize_player(data)
+                if player:
+                    self._update_indexes(player)
+    
+    def save(self, player: Player) -> bool:
+        """
+        Guarda un jugador y actualiza los índices.
+        
+        Args:
+            player: Jugador a guardar
+            
+        Returns:
+            True si se guardó exitosamente
+        """
+        try:
+            data = self._serialize_player(player)
+            # El lock del índice abarca la escritura para que el índice
+            # refleje siempre la última versión guardada
+            with self._index_lock:
+                if not self._storage.save(self.COLLECTION_NAME, player.id, data):
+                    return False
+                
+                self._update_indexes(player)
+                return True
+        except Exception:
+            return False
+    
+    def get_by_id(self, player_id: str) -> Optional[Player]:
+        """
+        Obtiene un jugador por su ID.
+        
+        Args:
+            player_id: ID del jugador
+            
+        Returns:
+            Jugador o None si no existe
+        """
+        try:
+            data = self._storage.get(self.COLLECTION_NAME, player_id)
+            return self._deserialize_player(data) if data else None
+        except Exception:
+            return None
+    
+    def get_all(self) -> List[Player]:
+        """
+        Obtiene todos los jugadores.
+        
+        Returns:
+            Lista de todos los jugadores
+        """
+        players = []
+        for batch in self._storage.iter_batches(self.COLLECTION_NAME):
+            for data in batch:
+                player = self._deserialize_player(data)
+                if player:
+                    players.append(player)
+        return players
+    
+    def delete(self, player_id: str) -> bool:
+        """
+        Elimina un jugador.
+        
+        Args:
+            player_id: ID del jugador a eliminar
+            
+        Returns:
+            True si se eliminó exitosamente
+        """
+        with self._index_lock:
+            if not self._storage.delete(self.COLLECTION_NAME, player_id):
+                return False
+            
+            self._remove_from_indexes(player_id)
+            return True
+    
+    def exists(self, player_id: str) -> bool:
+        """
+        Verifica si existe un jugador.
+        
+        Args:
+            player_id: ID del jugador
+            
+        Returns:
+            True si el jugador existe
+        """
+        return self._storage.exists(self.COLLECTION_NAME, player_id)
+    
+    def exists_by_name(self, name: str) -> bool:
+        """
+        Verifica si existe un jugador con un nombre (sin distinguir mayúsculas).
+        
+        Args:
+            name: Nombre del jugador
+            
+        Returns:
+            True si existe un jugador con ese nombre
+        """
+        return self._normalize_name(name) in self._names
+    
+    def count(self) -> int:
+        """
+        Cuenta el número total de jugadores.
+        
+        Returns:
+            Número de jugadores
+        """
+        return self._storage.count(self.COLLECTION_NAME)
+    
+    def get_top_players(self, limit: int = 10) -> List[Player]:
+        """
+        Obtiene los mejores jugadores según el índice de clasificación.
+        
+        Solo se incluyen jugadores con al menos una partida jugada.
+        
+        Args:
+            limit: Número máximo de jugadores a retornar
+            
+        Returns:
+            Jugadores ordenados de mejor a peor
+        """
+        with self._index_lock:
+            player_ids = [key[2] for key in self._ranking[:max(limit, 0)]]
+        
+        records = self._storage.get_many(self.COLLECTION_NAME, player_ids)
+        players = []
+        for player_id in player_ids:
+            data = records.get(player_id)
+            player = self._deserialize_player(data) if data else None
+            if player:
+                players.append(player)
+        return players
+    
+    def get_rank(self, player_id: str) -> Optional[int]:
+        """
+        Obtiene la posición de un jugador en la clasificación.
+        
+        Args:
+            player_id: ID del jugador
+            
+        Returns:
+            Posición (1 = mejor) o None si el jugador no está clasificado
+        """
+        with self._index_lock:
+            key = self._rank_keys.get(player_id)
+            if key is None:
+                return None
+            return bisect_left(self._ranking, key) + 1
+    
+    def get_ranked_count(self) -> int:
+        """
+        Cuenta los jugadores clasificados.
+        
+        Returns:
+            Número de jugadores con al menos una partida jugada
+        """
+        return len(self._ranking)
+    
+    def save_ratings(self, system: str, ratings: List[Mapping[str, Any]]) -> bool:
+        """
+        Guarda valoraciones (Elo, Glicko-2...) de varios jugadores.
+        
+        Las valoraciones se guardan aparte de los jugadores, con una clave
+        por sistema y jugador, para poder recalcularlas sin reescribir
+        los jugadores.
+        
+        Args:
+            system: Nombre del sistema de valoración
+            ratings: Valoraciones con al menos la clave 'player_id'
+            
+        Returns:
+            True si se guardaron todas
+        """
+        items = {
+            self._rating_key(system, rating['player_id']): dict(rating, system=system)
+            for rating in ratings
+        }
+        results = self._storage.save_many(self.RATINGS_COLLECTION_NAME, items)
+        return all(results.values())
+    
+    def get_rating(self, system: str, player_id: str) -> Optional[Mapping[str, Any]]:
+        """
+        Obtiene la valoración de un jugador.
+        
+        Args:
+            system: Nombre del sistema de valoración
+            player_id: ID del jugador
+            
+        Returns:
+            Valoración o None si no existe
+        """
+        return self._storage.get(self.RATINGS_COLLECTION_NAME, self._rating_key(system, player_id))
+    
+    def get_all_ratings(self, system: str) -> List[Mapping[str, Any]]:
+        """
+        Obtiene todas las valoraciones de un sistema.
+        
+        Args:
+            system: Nombre del sistema de valoración
+            
+        Returns:
+            Lista de valoraciones
+        """
+        return self._storage.find_by(self.RATINGS_COLLECTION_NAME, system=system)
+    
+    @staticmethod
+    def _rating_key(system: str, player_id: str) -> str:
+        """Clave de almacenamiento de una valoración."""
+        return f"{system}:{player_id}"
+    
+    def _update_indexes(self, player: Player) -> None:
+        """Actualiza los índices con el estado de un jugador (requiere el lock)."""
+        self._remove_from_indexes(player.id)
+        
+        name = self._normalize_name(player.name)
+        self._names.setdefault(name, set()).add(player.id)
+        self._player_names[player.id] = name
+        
+        if player.stats.games_played > 0:
+            key = self._rank_key(player.id, player.stats)
+            insort(self._ranking, key)
+            self._rank_keys[player.id] = key
+    
+    def _remove_from_indexes(self, player_id: str) -> None:
+        """Elimina un jugador de los índices (requiere el lock)."""
+        name = self._player_names.pop(player_id, None)
+        if name is not None:
+            player_ids = self._names[name]
+            player_ids.discard(player_id)
+            if not player_ids:
+                del self._names[name]
+        
+        key = self._rank_keys.pop(player_id, None)
+        if key is not None:
+            position = bisect_left(self._ranking, key)
+            del self._ranking[position]
+    
+    @staticmethod
+    def _rank_key(player_id: str, stats: PlayerStats) -> _RankKey:
+        """Construye la clave de orden de un jugador."""
+        return (-stats.win_rate, -stats.games_played, player_id)
+    
+    @staticmethod
+    def _normalize_name(name: str) -> str:
+        """Normaliza un nombre para comparaciones."""
+        return name.strip().casefold()
+    
+    def _serialize_player(self, player: Player) -> Dict[str, Any]:
+        """
+        Serializa un Player a diccionario.
+        
+        El símbolo no se guarda porque se asigna en cada partida.
+        
+        Args:
+            player: Jugador a serializar
+            
+        Returns:
+            Diccionario con los datos del jugador
+        """
+        return {
+            'id': player.id,
+            'name': player.name,
+            'player_type': player.player_type.value,
+            'stats': {
+                'games_played': player.stats.games_played,
+                'games_won': player.stats.games_won,
+                'games_lost': player.stats.games_lost,
+                'games_drawn': player.stats.games_drawn
+            },
+            'created_at': player.created_at.isoformat(),
+            'is_active': player.is_active
+        }
+    
+    def _deserialize_player(self, data: Mapping[str, Any]) -> Optional[Player]:
+        """
+        Deserializa un diccionario a Player.
+        
+        Args:
+            data: Datos del jugador
+            
+        Returns:
+            Player reconstruido o None si hay error
+        """
+        try:
+            player = Player(
+                name=data['name'],
+                player_type=PlayerType(data['player_type']),
+                player_id=data['id']
+            )
+            
+            stats_data = data.get('stats', {})
+            player._stats = PlayerStats(
+                games_played=stats_data.get('games_played', 0),
+                games_won=stats_data.get('games_won', 0),
+                games_lost=stats_data.get('games_lost', 0),
+                games_drawn=stats_data.get('games_drawn', 0)
+            )
+            
+            player._created_at = datetime.fromisoformat(data['created_at'])
+            player._is_active = data.get('is_active', True)
+            
+            return player
+        
+        except Exception:
+            return None
@@ -0,0 +1,267 @@
+"""
+Session Sweeper - Expiración de sesiones de juego en memoria.
+
+Este módulo elimina del almacenamiento las sesiones terminadas o
+abandonadas una vez superado su tiempo de vida, para que la memoria
+de un servidor de larga duración no crezca sin límite.
+"""
+
+from typing import Optional, Dict, Any, List, Mapping, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+import threading
+import time
+
+from game.entities import GameState, GameResult
+from persistence.data_sources.memory_storage import MemoryStorage, thaw_record
+
+
+# Tiempo de vida (segundos desde la última escritura) por estado.
+# None significa que las sesiones en ese estado nunca expiran.
+DEFAULT_SESSION_TTLS: Dict[GameState, Optional[float]] = {
+    GameState.WAITING_FOR_PLAYERS: 120.0,
+    GameState.IN_PROGRESS: 3600.0,
+    GameState.PAUSED: 3600.0,
+    GameState.FINISHED: 600.0,
+    GameState.ABANDONED: 0.0,
+}
+
+
+@dataclass(frozen=True)
+class SessionExpiryPolicy:
+    """Política inmutable de tiempo de vida de las sesiones por estado."""
+    ttls: Mapping[GameState, Optional[float]] = field(
+        default_factory=lambda: dict(DEFAULT_SESSION_TTLS)
+    )
+    
+    def ttl_for(self, state: GameState) -> Optional[float]:
+        """
+        Obtiene el tiempo de vida configurado para un estado.
+        
+        Args:
+            state: Estado de la sesión
+            
+        Returns:
+            Segundos de vida o None si no expira
+        """
+        return self.ttls.get(state)
+    
+    def is_expired(self, record: Mapping[str, Any], idle_seconds: float) -> bool:
+        """
+        Determina si una sesión serializada ha expirado.
+        
+        Las partidas terminadas por abandono usan el tiempo de vida
+        de GameState.ABANDONED aunque su estado sea FINISHED.
+        
+        Args:
+            record: Sesión serializada por GameRepository
+            idle_seconds: Segundos desde la última escritura
+            
+        Returns:
+            True si la sesión debe eliminarse
+        """
+        try:
+            state = GameState(record.get('state'))
+        except ValueError:
+            return False
+        
+        if record.get('result') == GameResult.ABANDONED.value:
+            state = GameState.ABANDONED
+        
+        ttl = self.ttl_for(state)
+        return ttl is not None and idle_seconds >= ttl
+
+
+class SessionSweeper:
+    """
+    Barrido incremental de sesiones expiradas.
+    
+    Cada barrido examina como máximo `batch_size` sesiones, continuando
+    donde terminó el anterior, de modo que el coste por ejecución está
+    acotado aunque el almacenamiento contenga muchas sesiones.
+    
+    Las sesiones se leen, se archivan y se eliminan sin retener el lock
+    del almacenamiento: el borrado solo se aplica si la sesión no se ha
+    escrito desde que se leyó (delete_if_unmodified), de modo que el
+    archivado no bloquea las peticiones sobre otras sesiones del lock.
+    
+    Principios aplicados:
+    - Es INFRAESTRUCTURA, no dominio
+    - La política de expiración es configurable e inmutable
+    - Opcionalmente archiva las sesiones antes de eliminarlas
+    """
+    
+    COLLECTION_NAME = "game_sessions"
+    
+    def __init__(
+        self,
+        storage: MemoryStorage,
+        policy: Optional[SessionExpiryPolicy] = None,
+        archive_storage: Optional[Any] = None,
+        batch_size: int = 100,
+        interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicializa el barrido de sesiones.
+        
+        Args:
+            storage: Almacenamiento del que se eliminan las sesiones
+            policy: Política de expiración (por defecto DEFAULT_SESSION_TTLS)
+            archive_storage: Almacenamiento persistente con método
+                save(collection, key, data) donde archivar antes de eliminar
+            batch_size: Máximo de sesiones examinadas por barrido
+            interval: Segundos entre barridos del hilo en segundo plano
+            clock: Reloj compatible con time.monotonic
+        """
+        if batch_size < 1:
+            raise ValueError("El tamaño de lote debe ser al menos 1")
+        
+        self._storage = storage
+        self._policy = policy or SessionExpiryPolicy()
+        self._archive_storage = archive_storage
+        self._batch_size = batch_size
+        self._interval = interval
+        self._clock = clock
+        
+        self._pending_keys: List[str] = []
+        self._sweep_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        self._evicted_total = 0
+        self._evicted_by_state: Dict[str, int] = {}
+        self._archived_total = 0
+        self._archive_failures = 0
+        self._sweeps = 0
+        self._last_sweep_at: Optional[datetime] = None
+    
+    @property
+    def policy(self) -> SessionExpiryPolicy:
+        """Política de expiración en uso."""
+        return self._policy
+    
+    @property
+    def is_running(self) -> bool:
+        """Indica si el hilo de barrido está activo."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def sweep_once(self) -> int:
+        """
+        Ejecuta un barrido incremental.
+        
+        Returns:
+            Número de sesiones eliminadas
+        """
+        with self._sweep_lock:
+            if not self._pending_keys:
+                self._pending_keys = self._storage.keys(self.COLLECTION_NAME)
+            
+            batch = self._pending_keys[-self._batch_size:]
+            del self._pending_keys[-self._batch_size:]
+            
+            now = self._clock()
+            evicted = 0
+            for key in batch:
+                if self._evict(key, now):
+                    evicted += 1
+            
+            self._sweeps += 1
+            self._last_sweep_at = datetime.now()
+            return evicted
+    
+    def start(self) -> None:
+        """Inicia el barrido periódico en un hilo en segundo plano."""
+        if self.is_running:
+            return
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="session-sweeper",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Detiene el barrido periódico.
+        
+        Args:
+            timeout: Segundos máximos de espera por el hilo
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def get_gauges(self) -> Dict[str, Any]:
+        """
+        Obtiene las métricas del barrido.
+        
+        Returns:
+            Diccionario con sesiones vivas, eliminadas y archivadas
+        """
+        return {
+            'live_sessions': self._storage.count(self.COLLECTION_NAME),
+            'evicted_total': self._evicted_total,
+            'evicted_by_state': dict(self._evicted_by_state),
+            'archived_total': self._archived_total,
+            'archive_failures': self._archive_failures,
+            'sweeps': self._sweeps,
+            'last_sweep_at': self._last_sweep_at.isoformat() if self._last_sweep_at else None,
+            'running': self.is_running
+        }
+    
+    def _run(self) -> None:
+        """Bucle del hilo en segundo plano."""
+        while not self._stop_event.wait(self._interval):
+            try:
+                self.sweep_once()
+            except Exception:
+                continue  # Un barrido fallido no debe detener el hilo
+    
+    def _evict(self, key: str, now: float) -> bool:
+        """
+        Elimina una sesión expirada, archivándola antes si corresponde.
+        
+        Si la sesión se escribe mientras se archiva, no se elimina y se
+        vuelve a archivar cuando expire de nuevo (un archivo de solo
+        anexado conserva entonces ambas versiones).
+        
+        Args:
+            key: Clave de la sesión
+            now: Instante del barrido según el reloj
+            
+        Returns:
+            True si la sesión se eliminó
+        """
+        entry = self._storage.get_entry(self.COLLECTION_NAME, key)
+        if entry is None:
+            return False
+        
+        record, modified_at, version = entry
+        if not self._policy.is_expired(record, now - modified_at):
+            return False
+        
+        if self._archive_storage is not None:
+            try:
+                archived = self._archive_storage.save(
+                    self.COLLECTION_NAME, key, thaw_record(record)
+                )
+            except Exception:
+                archived = False
+            
+            if not archived:
+                self._archive_failures += 1
+                return False  # Conservar la sesión hasta poder archivarla
+            
+            self._archived_total += 1
+        
+        if not self._storage.delete_if_unmodified(self.COLLECTION_NAME, key, version):
+            return False
+        
+        state = record.get('state', 'unknown')
+        self._evicted_total += 1
+        self._evicted_by_state[state] = self._evicted_by_state.get(state, 0) + 1
+        return True
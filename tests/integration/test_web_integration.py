@@ -8,6 +8,10 @@ Solo incluye funcionalidad web (sin CLI ni multijugador).
 
 import unittest
 import sys
+import json
+import gzip
+import asyncio
+import tempfile
 from pathlib import Path
 
 # Configurar path para imports
@@ -19,7 +23,18 @@ from game.entities.player import Player, PlayerType, PlayerSymbol
 from game.entities.board import Board, Position, Move, CellState
 from game.entities.game_session import GameSession, GameState, GameResult, GameConfiguration
 from game.use_cases.start_new_game import StartNewGameUseCase
+from application.coordinators.game_statistics import GameStatisticsCoordinator
+from application.coordinators.matchmaking import MatchmakingCoordinator
 from application.entry_points.web_main import TicTacToeWebApp
+from interfaces.web_ui.flask_adapter import FlaskWebAdapter
+from interfaces.web_ui.asgi_adapter import AsgiWebAdapter
+from interfaces.web_ui.response_encoder import ResponseEncoder, negotiate_encoding
+from interfaces.web_ui.session_events import SessionEventBroker
+from interfaces.web_ui.session_views import SessionViewCache
+from interfaces.web_ui.static_assets import StaticAssetRegistry
+from persistence.data_sources.memory_storage import MemoryStorage
+from persistence.repositories.game_repository import GameRepository
+from persistence.repositories.player_repository import PlayerRepository
 
 
 class TestWebIntegration(unittest.TestCase):
@@ -29,6 +44,17 @@ class TestWebIntegration(unittest.TestCase):
         """Test de inicialización correcta de la aplicación web."""
         app = TicTacToeWebApp()
         self.assertIsNotNone(app)
+        self.assertIsNotNone(app.session_actors)
+    
+    def test_multiprocess_app_uses_shared_storage_directly(self):
+        """Con varios procesos no hay actores ni caché de sesiones vivas por proceso."""
+        app = TicTacToeWebApp(processes=2)
+        try:
+            self.assertIsNone(app.session_actors)
+            self.assertIsNone(app.web_adapter._live_sessions)
+            self.assertIsNone(app.game_statistics)
+        finally:
+            app._storage_server.stop(timeout=2)
         
     def test_complete_game_flow_domain(self):
         """Test de flujo completo de juego en el dominio."""
@@ -90,5 +116,477 @@ class TestWebIntegration(unittest.TestCase):
         self.assertIsNotNone(use_case)
 
 
+
+class TestWebApi(unittest.TestCase):
+    """Tests de la API HTTP del adaptador Flask."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        self.adapter = FlaskWebAdapter()
+        self.client = self.adapter.app.test_client()
+        response = self.client.post('/api/game/start', json={
+            'player1_name': 'Ana', 'player2_name': 'Bea'
+        })
+        self.game_session = response.get_json()['game_session']
+
+    def test_status_conditional_get(self):
+        """El estado sin cambios se revalida con 304 Not Modified."""
+        first = self.client.get('/api/game/status')
+        etag = first.headers['ETag']
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(etag.startswith('W/'))
+        
+        # La misma versión comprimida se revalida con el mismo ETag
+        compressed = self.client.get('/api/game/status', headers={
+            'If-None-Match': etag, 'Accept-Encoding': 'gzip'
+        })
+        self.assertEqual(compressed.status_code, 304)
+        
+        cached = self.client.get('/api/game/status', headers={'If-None-Match': etag})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.headers['ETag'], etag)
+        self.assertEqual(cached.data, b'')
+        
+        self.client.post('/api/game/move', json={
+            'player_id': self.game_session['current_player']['id'], 'row': 0, 'col': 0
+        })
+        changed = self.client.get('/api/game/status', headers={'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers['ETag'], etag)
+
+    def test_move_returns_delta_for_known_version(self):
+        """Con known_version el movimiento devuelve solo los cambios."""
+        player_id = self.game_session['current_player']['id']
+        result = self.client.post('/api/game/move', json={
+            'player_id': player_id, 'row': 0, 'col': 0,
+            'known_version': self.game_session['version']
+        }).get_json()
+        
+        self.assertNotIn('game_session', result)
+        self.assertEqual(result['delta']['version'], self.game_session['version'] + 1)
+        self.assertEqual(result['delta']['move'], {'row': 0, 'col': 0, 'symbol': 'X'})
+        
+        # Una versión desfasada recibe la sesión completa
+        second_player = result['delta']['current_player']['id']
+        result = self.client.post('/api/game/move', json={
+            'player_id': second_player, 'row': 1, 'col': 1,
+            'known_version': self.game_session['version']
+        }).get_json()
+        self.assertEqual(result['game_session']['move_count'], 2)
+        
+        # El estado de esa versión sale de la caché de vistas
+        status = self.client.get('/api/game/status').get_json()
+        self.assertEqual(status['game_session'], result['game_session'])
+        self.assertGreater(self.adapter._session_views.get_statistics()['hits'], 0)
+
+    def test_finished_games_feed_statistics(self):
+        """Las partidas terminadas llegan a las estadísticas de /api/metrics/sessions."""
+        storage = MemoryStorage()
+        adapter = FlaskWebAdapter(storage=storage, game_statistics=GameStatisticsCoordinator(
+            player_repository=PlayerRepository(storage)
+        ))
+        client = adapter.app.test_client()
+        game_session = client.post('/api/game/start', json={
+            'player1_name': 'Ana', 'player2_name': 'Bea'
+        }).get_json()['game_session']
+        self.assertEqual(client.get('/api/metrics/sessions').get_json()['statistics']['games_recorded'], 0)
+        
+        player_x, player_o = (player['id'] for player in game_session['players'])
+        for player_id, row, col in ((player_x, 0, 0), (player_o, 1, 0), (player_x, 0, 1),
+                                    (player_o, 1, 1), (player_x, 0, 2)):
+            result = client.post('/api/game/move', json={
+                'player_id': player_id, 'row': row, 'col': col
+            }).get_json()
+            self.assertTrue(result['success'])
+        
+        statistics = client.get('/api/metrics/sessions').get_json()['statistics']
+        self.assertEqual(statistics['games_recorded'], 1)
+        self.assertEqual(statistics['global']['total_players'], 2)
+        self.assertIsNone(self.client.get('/api/metrics/sessions').get_json()['statistics'])
+        
+        # Estadísticas del ganador a partir de su historial de partidas
+        result = client.get(f'/api/players/{player_x}/statistics?period=today').get_json()
+        self.assertEqual(result['statistics']['wins'], 1)
+        self.assertEqual(result['statistics']['total_games'], 1)
+        self.assertEqual(client.get(f'/api/players/{player_x}/statistics?period=never').status_code, 400)
+        self.assertEqual(client.get('/api/players/desconocido/statistics').status_code, 404)
+    
+    def test_batch_moves_across_sessions(self):
+        """El lote aplica los movimientos en orden, con un resultado por movimiento."""
+        other = self.client.post('/api/game/start', json={
+            'player1_name': 'Carla', 'player2_name': 'Dani'
+        }).get_json()['game_session']
+        self.client.post('/api/game/start', json={
+            'player1_name': 'Ana', 'player2_name': 'Bea'
+        })
+        first_x, first_o = (player['id'] for player in self.game_session['players'])
+        other_x = other['players'][0]['id']
+        
+        result = self.client.post('/api/game/moves:batch', json={'moves': [
+            {'game_session_id': self.game_session['id'], 'player_id': first_x, 'row': 0, 'col': 0},
+            {'game_session_id': other['id'], 'player_id': other_x, 'row': 1, 'col': 1},
+            {'game_session_id': self.game_session['id'], 'player_id': first_o, 'row': 0, 'col': 0},
+            {'game_session_id': self.game_session['id'], 'player_id': first_o, 'row': 2, 'col': 2}
+        ]}).get_json()
+        
+        self.assertEqual([move['success'] for move in result['results']], [True, True, False, True])
+        self.assertEqual(result['message'], '3 de 4 movimientos realizados')
+        first = result['game_sessions'][self.game_session['id']]
+        self.assertEqual(first['move_count'], 2)
+        self.assertEqual(first['version'], self.game_session['version'] + 1)
+        self.assertEqual(result['game_sessions'][other['id']]['move_count'], 1)
+        
+        invalid = self.client.post('/api/game/moves:batch', json={'moves': []})
+        self.assertEqual(invalid.status_code, 400)
+        
+        # Coordenadas que no son enteras: 400 sin aplicar ningún movimiento
+        invalid = self.client.post('/api/game/moves:batch', json={'moves': [
+            {'game_session_id': other['id'], 'player_id': other['players'][1]['id'], 'row': 0, 'col': 0},
+            {'game_session_id': other['id'], 'player_id': other_x, 'row': 'x', 'col': 0}
+        ]})
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(invalid.get_json()['errors'], ['Movimiento 1: La fila debe ser un número entero'])
+        
+        single = self.client.post('/api/game/move', json={'player_id': first_x, 'row': None, 'col': 1})
+        self.assertEqual(single.status_code, 400)
+
+    def test_matchmaking_assigns_online_game(self):
+        """Dos navegadores emparejados comparten la misma partida."""
+        storage = MemoryStorage()
+        matchmaker = MatchmakingCoordinator(GameRepository(storage))
+        adapter = FlaskWebAdapter(storage=storage, matchmaker=matchmaker)
+        first, second = adapter.app.test_client(), adapter.app.test_client()
+        
+        tickets = [
+            client.post('/api/matchmaking/queue', json={'player_name': name}).get_json()['ticket_id']
+            for client, name in ((first, 'Ana'), (second, 'Bea'))
+        ]
+        self.assertEqual(first.get(f'/api/matchmaking/{tickets[0]}').status_code, 202)
+        
+        matchmaker.tick()
+        match = first.get(f'/api/matchmaking/{tickets[0]}').get_json()['match']
+        second.get(f'/api/matchmaking/{tickets[1]}')
+        
+        moved = first.post('/api/game/move', json={
+            'player_id': match['player_id'], 'row': 0, 'col': 0
+        }).get_json()
+        self.assertTrue(moved['success'])
+        status = second.get('/api/game/status').get_json()
+        self.assertEqual(status['game_session']['id'], match['game_session_id'])
+        self.assertEqual(status['game_session']['move_count'], 1)
+        
+        self.assertEqual(self.client.post('/api/matchmaking/queue', json={}).status_code, 503)
+
+    def test_lobby_lists_sessions_by_state(self):
+        """El lobby lista las partidas de un estado con paginación por cursor."""
+        for index in range(2):
+            self.client.post('/api/game/start', json={
+                'player1_name': f'Ana {index}', 'player2_name': f'Bea {index}'
+            })
+        
+        first = self.client.get('/api/lobby?state=in_progress&limit=2').get_json()
+        self.assertEqual(first['total'], 3)
+        self.assertEqual(len(first['sessions']), 2)
+        self.assertIn('move_count', first['sessions'][0])
+        
+        second = self.client.get(
+            f"/api/lobby?state=in_progress&limit=2&cursor={first['next_cursor']}"
+        ).get_json()
+        self.assertEqual(len(second['sessions']), 1)
+        self.assertIsNone(second['next_cursor'])
+        
+        self.assertEqual(self.client.get('/api/lobby').get_json()['sessions'], [])
+        self.assertEqual(self.client.get('/api/lobby?state=otro').status_code, 400)
+
+    def test_responses_are_compressed_when_accepted(self):
+        """Las respuestas grandes se comprimen si el cliente lo acepta."""
+        self.adapter._response_encoder = ResponseEncoder(compress_threshold=64)
+        
+        response = self.client.get('/api/game/status', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        status = json.loads(gzip.decompress(response.data))
+        self.assertEqual(status['game_session']['id'], self.game_session['id'])
+        
+        compact = self.client.get('/api/game/status?compact=1').get_json()
+        self.assertNotIn('available_moves', compact['game_session'])
+        self.assertIn('board', compact['game_session'])
+        self.assertIn('available_moves', self.client.get('/api/game/status').get_json()['game_session'])
+
+    def test_static_assets_are_fingerprinted(self):
+        """Los recursos con huella se sirven precomprimidos y con caché inmutable."""
+        url = self.adapter._static_assets.url_for('js/game.js')
+        self.assertRegex(url, r'^/static/js/game\.[0-9a-f]{12}\.js$')
+        
+        response = self.client.get(url, headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response.headers['Cache-Control'])
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.data), (project_root / 'interfaces/web_ui/js/game.js').read_bytes())
+        
+        plain = self.client.get('/static/js/game.js')
+        self.assertEqual(plain.headers['Cache-Control'], 'no-cache')
+        self.assertNotIn('Content-Encoding', plain.headers)
+        revalidated = self.client.get('/static/js/game.js', headers={'If-None-Match': plain.headers['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+        
+        index = self.client.get('/')
+        self.assertTrue(index.headers['ETag'].startswith('W/'))
+        self.assertEqual(self.client.get('/', headers={'If-None-Match': index.headers['ETag']}).status_code, 304)
+        self.assertEqual(self.client.get('/', headers={
+            'If-None-Match': index.headers['ETag'], 'Accept-Encoding': 'gzip'
+        }).status_code, 304)
+        self.assertEqual(self.client.get('/static/flask_adapter.py').status_code, 404)
+        
+        # En modo debug la página se renderiza en cada petición
+        document = self.adapter._index_document
+        self.client.get('/')
+        self.assertIs(self.adapter._index_document, document)
+        self.adapter.app.debug = True
+        self.client.get('/')
+        self.assertIsNot(self.adapter._index_document, document)
+
+    def test_event_stream(self):
+        """El flujo SSE envía una instantánea y después los movimientos."""
+        self.adapter.SSE_HEARTBEAT_SECONDS = 0.01
+        game_session_id = self.game_session['id']
+        player_id = self.game_session['current_player']['id']
+        
+        response = self.client.get(f'/api/game/{game_session_id}/events')
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        stream = iter(response.response)
+        self.assertIn('event: snapshot', next(stream).decode())
+        
+        # Un cambio anterior a la suscripción se detecta en el latido
+        self.client.post('/api/game/move', json={'player_id': player_id, 'row': 0, 'col': 0})
+        self.assertIn('"move_count":1', next(stream).decode())
+        
+        second_player = self.client.get('/api/game/status').get_json()['game_session']['current_player']['id']
+        self.client.post('/api/game/move', json={'player_id': second_player, 'row': 1, 'col': 1})
+        chunk = next(stream).decode()
+        self.assertIn('event: move', chunk)
+        self.assertIn('"move":{"row":1,"col":1', chunk)
+        
+        response.close()
+        self.assertEqual(self.adapter._session_events.get_statistics()['channels'], 0)
+        self.assertEqual(self.client.get('/api/game/unknown/events').status_code, 404)
+
+
+class TestAsgiApi(unittest.IsolatedAsyncioTestCase):
+    """Tests de la API HTTP del adaptador ASGI."""
+    
+    async def asyncSetUp(self):
+        """Configuración antes de cada test."""
+        self.adapter = AsgiWebAdapter(max_workers=2)
+        _, _, body = await self._call('POST', '/api/game/start', {
+            'player1_name': 'Ana', 'player2_name': 'Bea'
+        })
+        self.game_session = json.loads(body)['game_session']
+    
+    async def asyncTearDown(self):
+        self.adapter.stop_background_tasks()
+    
+    async def _call(self, method, path, body=None, headers=(), query=b''):
+        """Ejecuta una petición ASGI y devuelve (estado, cabeceras, cuerpo)."""
+        scope = {
+            'type': 'http', 'method': method, 'path': path, 'query_string': query,
+            'headers': [(name.encode(), value.encode()) for name, value in headers]
+        }
+        request_body = json.dumps(body).encode() if body is not None else b''
+        messages = []
+        
+        async def receive():
+            return {'type': 'http.request', 'body': request_body, 'more_body': False}
+        
+        async def send(message):
+            messages.append(message)
+        
+        await self.adapter(scope, receive, send)
+        start = messages[0]
+        response_headers = {name.decode(): value.decode() for name, value in start['headers']}
+        return start['status'], response_headers, b''.join(m.get('body', b'') for m in messages[1:])
+    
+    async def test_move_and_conditional_status(self):
+        """Movimientos y estado con ETag a través de ASGI."""
+        query = f"game_session_id={self.game_session['id']}".encode()
+        status, headers, _ = await self._call('GET', '/api/game/status', query=query)
+        self.assertEqual(status, 200)
+        
+        status, _, body = await self._call(
+            'GET', '/api/game/status', headers=[('If-None-Match', headers['etag'])], query=query
+        )
+        self.assertEqual((status, body), (304, b''))
+        
+        status, _, body = await self._call('POST', '/api/game/move', {
+            'game_session_id': self.game_session['id'],
+            'player_id': self.game_session['current_player']['id'], 'row': 0, 'col': 0
+        })
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)['game_session']['move_count'], 1)
+        
+        status, _, _ = await self._call(
+            'GET', '/api/game/status', headers=[('If-None-Match', headers['etag'])], query=query
+        )
+        self.assertEqual(status, 200)
+    
+    async def test_event_stream_until_disconnect(self):
+        """El flujo SSE entrega movimientos y termina al desconectarse el cliente."""
+        chunks = asyncio.Queue()
+        disconnected = asyncio.Event()
+        scope = {
+            'type': 'http', 'method': 'GET', 'query_string': b'', 'headers': [],
+            'path': f"/api/game/{self.game_session['id']}/events"
+        }
+        
+        async def receive():
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+        
+        async def send(message):
+            if message['type'] == 'http.response.body':
+                await chunks.put(message['body'].decode())
+        
+        stream = asyncio.create_task(self.adapter(scope, receive, send))
+        self.assertIn('event: snapshot', await asyncio.wait_for(chunks.get(), 2))
+        
+        await self._call('POST', '/api/game/move', {
+            'game_session_id': self.game_session['id'],
+            'player_id': self.game_session['current_player']['id'], 'row': 2, 'col': 2
+        })
+        chunk = await asyncio.wait_for(chunks.get(), 2)
+        self.assertIn('event: move', chunk)
+        self.assertIn('"move":{"row":2,"col":2', chunk)
+        
+        disconnected.set()
+        await asyncio.wait_for(stream, 2)
+        self.assertEqual(self.adapter._session_events.get_statistics()['channels'], 0)
+    
+    async def test_unknown_route(self):
+        """Las rutas desconocidas responden 404."""
+        status, _, _ = await self._call('GET', '/api/unknown')
+        self.assertEqual(status, 404)
+        status, _, _ = await self._call('GET', '/static/../asgi_adapter.py')
+        self.assertEqual(status, 404)
+    
+    async def test_static_assets_are_fingerprinted(self):
+        """Los recursos con huella se sirven con caché inmutable y revalidación por ETag."""
+        url = self.adapter._static_assets.url_for('css/style.css')
+        status, headers, body = await self._call('GET', url, headers=[('Accept-Encoding', 'gzip')])
+        self.assertEqual(status, 200)
+        self.assertIn('immutable', headers['cache-control'])
+        self.assertEqual(headers['content-type'], 'text/css')
+        self.assertEqual(gzip.decompress(body), (project_root / 'interfaces/web_ui/css/style.css').read_bytes())
+        
+        status, headers, _ = await self._call('GET', '/')
+        self.assertTrue(headers['etag'].startswith('W/'))
+        status, _, _ = await self._call('GET', '/', headers=[('If-None-Match', headers['etag'])])
+        self.assertEqual(status, 304)
+        
+        # La página se renderiza de nuevo cuando cambia la fecha de la plantilla
+        modified_at, document = self.adapter._index_document
+        self.adapter._index_document = (modified_at - 1, document)
+        await self._call('GET', '/')
+        self.assertEqual(self.adapter._index_document[0], modified_at)
+        self.assertIsNot(self.adapter._index_document[1], document)
+
+
+class TestStaticAssetRegistry(unittest.TestCase):
+    """Tests del registro de recursos estáticos con huella."""
+
+    def test_rewrites_references_and_uses_precompressed_files(self):
+        with tempfile.TemporaryDirectory() as root:
+            (Path(root) / 'js').mkdir()
+            (Path(root) / 'js' / 'app.js').write_text('console.log("tres en raya");\n' * 20)
+            (Path(root) / 'js' / 'app.js.br').write_bytes(b'brotli-precomprimido')
+            registry = StaticAssetRegistry(Path(root)).register()
+        
+        url = registry.url_for('js/app.js')
+        html = registry.rewrite('<script src="/static/js/app.js"></script><script src="/static/js/other.js"></script>')
+        self.assertEqual(html, f'<script src="{url}"></script><script src="/static/js/other.js"></script>')
+        
+        asset, fingerprinted = registry.resolve(url[len('/static/'):])
+        self.assertTrue(fingerprinted)
+        self.assertEqual(registry.select(asset, 'gzip, br'), (b'brotli-precomprimido', 'br'))
+        self.assertEqual(registry.select(asset, 'gzip')[1], 'gzip')
+        self.assertEqual(registry.select(asset, None), (asset.variants[None], None))
+
+
+class TestResponseEncoder(unittest.TestCase):
+    """Tests del codificador de respuestas JSON."""
+
+    def test_negotiates_preferred_encoding(self):
+        self.assertEqual(negotiate_encoding('gzip, br', ('br', 'gzip')), 'br')
+        self.assertEqual(negotiate_encoding('br;q=0.5, gzip', ('br', 'gzip')), 'gzip')
+        self.assertEqual(negotiate_encoding('*', ('gzip',)), 'gzip')
+        self.assertIsNone(negotiate_encoding('gzip;q=0, identity', ('gzip',)))
+        self.assertIsNone(negotiate_encoding(None, ('gzip',)))
+
+    def test_small_payloads_are_not_compressed(self):
+        encoder = ResponseEncoder(compress_threshold=100)
+        small = encoder.encode({'success': True}, 'gzip')
+        self.assertIsNone(small.content_encoding)
+        self.assertEqual(json.loads(small.body), {'success': True})
+        
+        large = encoder.encode({'data': 'x' * 500}, 'gzip')
+        self.assertEqual(large.content_encoding, 'gzip')
+        self.assertLess(len(large.body), 500)
+        self.assertEqual(encoder.get_statistics()['compressed'], 1)
+
+
+class TestSessionViewCache(unittest.TestCase):
+    """Tests de la caché de vistas por versión de sesión."""
+
+    def test_views_are_cached_per_version(self):
+        cache = SessionViewCache(capacity=2)
+        game_session = GameSession()
+        game_session._version = 3
+        
+        view = cache.get(game_session)
+        self.assertIs(cache.get(game_session), view)
+        self.assertIs(cache.lookup(game_session.id, 3), view)
+        self.assertIsNone(cache.lookup(game_session.id, 4))
+        
+        # Una versión anterior no sustituye a la guardada
+        cache.store(game_session.id, 2, {'version': 2})
+        self.assertIs(cache.lookup(game_session.id, 3), view)
+        
+        for _ in range(2):
+            other = GameSession()
+            other._version = 1
+            cache.get(other)
+        self.assertIsNone(cache.lookup(game_session.id, 3))
+        self.assertEqual(cache.get_statistics()['entries'], 2)
+
+    def test_unsaved_sessions_are_not_cached(self):
+        cache = SessionViewCache()
+        cache.get(GameSession())
+        self.assertEqual(cache.get_statistics()['entries'], 0)
+
+
+class TestSessionEventBroker(unittest.TestCase):
+    """Tests del broker de eventos por sesión."""
+
+    def test_delivers_events_and_detects_gaps(self):
+        """Los suscriptores reciben los eventos pendientes o piden instantánea."""
+        broker = SessionEventBroker(history_size=2)
+        with broker.subscribe('partida') as subscription:
+            self.assertEqual(subscription.wait(1, timeout=0.01), [])
+            
+            broker.publish('partida', 2, 'move', {'n': 2})
+            broker.publish('partida', 3, 'move', {'n': 3})
+            self.assertEqual([event.version for event in subscription.wait(1)], [2, 3])
+            
+            for version in (4, 5, 6):
+                broker.publish('partida', version, 'move', {'n': version})
+            self.assertIsNone(subscription.wait(3))
+            self.assertEqual(subscription.wait(6, timeout=0.01), [])
+            
+            broker.close()
+            self.assertTrue(subscription.closed)
+            self.assertEqual(subscription.wait(6), [])
+        
+        self.assertEqual(broker.get_statistics()['channels'], 0)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
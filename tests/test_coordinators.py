@@ -0,0 +1,419 @@
+"""
+Tests para los coordinadores de la capa de aplicación.
+
+Verifican la coordinación de casos de uso del juego Tres en Raya
+entre hilos y sesiones.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path for Screaming Architecture imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from application.coordinators.game_statistics import GameStatisticsCoordinator
+from application.coordinators.matchmaking import MatchmakingCoordinator
+from application.coordinators.rating_engine import RatingEngine, RatingSystem, np
+from application.coordinators.session_actors import SessionActorPool
+from game.entities import Position
+from game.services import RankingService, StatisticsAggregator
+from game.use_cases.make_move import MakeMoveUseCase, MakeMoveRequest
+from game.use_cases.start_new_game import StartNewGameUseCase, StartNewGameRequest
+from persistence.data_sources.game_archive import GameArchiveWriter, GameArchiveReader
+from persistence.data_sources.memory_storage import MemoryStorage
+from persistence.repositories.game_repository import GameRepository
+from persistence.repositories.live_session_repository import LiveSessionRepository
+from persistence.repositories.player_repository import PlayerRepository
+
+
+class TestSessionActorPool(unittest.TestCase):
+    """Tests para los actores por sesión."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        self.pool = SessionActorPool(max_workers=4, max_batch=2)
+
+    def tearDown(self):
+        """Limpieza después de cada test."""
+        self.pool.shutdown()
+
+    def test_tasks_of_one_session_run_in_order(self):
+        """Las tareas de una sesión se ejecutan en orden y sin solaparse"""
+        results = []
+        running = []
+
+        def task(value):
+            running.append(value)
+            self.assertEqual(len(running), 1)
+            time.sleep(0.001)
+            results.append(value)
+            running.remove(value)
+            return value
+        
+        futures = [self.pool.submit("session", task, i) for i in range(20)]
+        
+        self.assertEqual([future.result(timeout=5) for future in futures], list(range(20)))
+        self.assertEqual(results, list(range(20)))
+
+    def test_sessions_run_in_parallel(self):
+        """Las tareas de sesiones distintas se ejecutan en paralelo"""
+        barrier = threading.Barrier(2, timeout=5)
+        
+        futures = [self.pool.submit(session_id, barrier.wait) for session_id in ("a", "b")]
+        
+        for future in futures:
+            future.result(timeout=5)
+
+    def test_exceptions_are_propagated(self):
+        """Una excepción en una tarea llega al Future sin detener el actor"""
+        def fail():
+            raise ValueError("fallo")
+        
+        failed = self.pool.submit("session", fail)
+        succeeded = self.pool.submit("session", lambda: "ok")
+        
+        with self.assertRaises(ValueError):
+            failed.result(timeout=5)
+        self.assertEqual(succeeded.result(timeout=5), "ok")
+
+    def test_nested_submit_runs_inline(self):
+        """Una tarea puede enviar otra a su propia sesión sin bloquearse"""
+        future = self.pool.submit(
+            "session", lambda: self.pool.submit("session", lambda: 42).result(timeout=5)
+        )
+        
+        self.assertEqual(future.result(timeout=5), 42)
+
+    def test_idle_actors_are_released(self):
+        """Los actores sin tareas pendientes desaparecen"""
+        self.pool.submit("session", lambda: None).result(timeout=5)
+        
+        deadline = time.monotonic() + 2
+        while self.pool.active_actors and time.monotonic() < deadline:
+            time.sleep(0.01)
+        
+        self.assertEqual(self.pool.active_actors, 0)
+        self.assertEqual(self.pool.get_statistics()["processed_tasks"], 1)
+
+
+class TestMakeMoveThroughActors(unittest.TestCase):
+    """Tests para el caso de uso de movimiento ejecutado en actores."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        self.pool = SessionActorPool(max_workers=4)
+        self.repository = GameRepository(MemoryStorage())
+        self.live_sessions = LiveSessionRepository(self.repository)
+        self.use_case = MakeMoveUseCase(self.live_sessions, session_executor=self.pool)
+        
+        self.session = StartNewGameUseCase().execute(
+            StartNewGameRequest(player1_name="Alice", player2_name="Bob")
+        ).game_session
+        self.repository.save(self.session)
+
+    def tearDown(self):
+        """Limpieza después de cada test."""
+        self.pool.shutdown()
+
+    def test_concurrent_duplicate_moves_apply_once(self):
+        """Dos peticiones simultáneas del mismo movimiento solo se aplican una vez"""
+        request = MakeMoveRequest(
+            game_session_id=self.session.id,
+            player_id=self.session.player_x.id,
+            row=0,
+            col=0
+        )
+        responses = []
+        threads = [
+            threading.Thread(target=lambda: responses.append(self.use_case.execute(request)))
+            for _ in range(2)
+        ]
+        
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        
+        self.assertEqual(sorted(response.success for response in responses), [False, True])
+        self.assertEqual(self.repository.get_by_id(self.session.id).move_count, 1)
+
+    def test_live_session_is_reused(self):
+        """Los movimientos consecutivos reutilizan la sesión viva"""
+        players = [self.session.player_x.id, self.session.player_o.id]
+        for index, (row, col) in enumerate([(0, 0), (1, 1), (0, 1)]):
+            response = self.use_case.execute(MakeMoveRequest(
+                game_session_id=self.session.id,
+                player_id=players[index % 2],
+                row=row,
+                col=col
+            ))
+            self.assertTrue(response.success)
+        
+        statistics = self.live_sessions.get_statistics()
+        self.assertEqual(statistics["misses"], 1)
+        self.assertEqual(statistics["hits"], 2)
+
+    def test_external_change_invalidates_live_session(self):
+        """Un cambio guardado por otra ruta invalida la sesión viva"""
+        self.use_case.execute(MakeMoveRequest(
+            game_session_id=self.session.id,
+            player_id=self.session.player_x.id,
+            row=0,
+            col=0
+        ))
+        
+        external = self.repository.get_by_id(self.session.id)
+        external.reset()
+        self.repository.save(external)
+        
+        response = self.use_case.execute(MakeMoveRequest(
+            game_session_id=self.session.id,
+            player_id=self.session.player_x.id,
+            row=0,
+            col=0
+        ))
+        
+        self.assertTrue(response.success)
+        self.assertEqual(self.repository.get_by_id(self.session.id).move_count, 1)
+
+    def test_finished_game_notifies_listeners(self):
+        """Al terminar la partida se actualizan la clasificación y el agregado"""
+        ranking = RankingService()
+        aggregator = StatisticsAggregator()
+        self.use_case.add_game_finished_listener(ranking.record_game_result)
+        self.use_case.add_game_finished_listener(aggregator.record_game_result)
+        
+        x_id, o_id = self.session.player_x.id, self.session.player_o.id
+        moves = [(x_id, 0, 0), (o_id, 1, 0), (x_id, 0, 1), (o_id, 1, 1), (x_id, 0, 2)]
+        for player_id, row, col in moves:
+            response = self.use_case.execute(MakeMoveRequest(self.session.id, player_id, row, col))
+            self.assertTrue(response.success)
+        
+        self.assertTrue(response.is_game_over)
+        self.assertEqual(ranking.get_rank(x_id), 1)
+        self.assertEqual(ranking.get_rank(o_id), 2)
+        statistics = aggregator.get_global_statistics()
+        self.assertEqual(statistics["total_games"], 2)
+        self.assertEqual(statistics["most_active_player"]["name"], "Alice")
+
+
+@unittest.skipUnless(np is not None, "NumPy no está instalado")
+class TestRatingEngine(unittest.TestCase):
+    """Tests para el motor de valoración Elo / Glicko-2."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        self.players = PlayerRepository(MemoryStorage())
+
+    def test_elo_batch_is_zero_sum(self):
+        """Un lote Elo reparte los puntos entre ganadores y perdedores"""
+        engine = RatingEngine(RatingSystem.ELO, k_factor=32)
+        engine.process_batch([("ana", "bea", 1.0), ("carla", "bea", 0.5)])
+        
+        self.assertAlmostEqual(engine.get_rating("ana").rating, 1516.0)
+        self.assertAlmostEqual(engine.get_rating("bea").rating, 1484.0)
+        self.assertAlmostEqual(engine.get_rating("carla").rating, 1500.0)
+        self.assertEqual(engine.get_rating("bea").games_played, 2)
+        self.assertEqual([r.player_id for r in engine.get_leaderboard(2)], ["ana", "carla"])
+
+    def test_glicko2_reference_example(self):
+        """Reproduce el ejemplo del artículo de Glickman"""
+        self.players.save_ratings("glicko2", [
+            {"player_id": "p", "rating": 1500.0, "deviation": 200.0, "volatility": 0.06},
+            {"player_id": "a", "rating": 1400.0, "deviation": 30.0, "volatility": 0.06},
+            {"player_id": "b", "rating": 1550.0, "deviation": 100.0, "volatility": 0.06},
+            {"player_id": "c", "rating": 1700.0, "deviation": 300.0, "volatility": 0.06},
+        ])
+        engine = RatingEngine(RatingSystem.GLICKO2, self.players, tau=0.5)
+        
+        # Solo interesa el jugador p: los rivales juegan contra él en el período
+        engine.process_batch([("p", "a", 1.0), ("p", "b", 0.0), ("p", "c", 0.0)])
+        rating = engine.get_rating("p")
+        
+        self.assertAlmostEqual(rating.rating, 1464.06, places=1)
+        self.assertAlmostEqual(rating.deviation, 151.52, places=1)
+        self.assertAlmostEqual(rating.volatility, 0.05999, places=4)
+        self.assertAlmostEqual(self.players.get_rating("glicko2", "p")["rating"], rating.rating)
+
+    def test_recompute_from_archive(self):
+        """El recálculo desde el archivo coincide con procesar las partidas"""
+        handle, path = tempfile.mkstemp(suffix=".archive")
+        os.close(handle)
+        try:
+            sessions = []
+            with GameArchiveWriter(path) as writer:
+                for _ in range(3):
+                    session = StartNewGameUseCase().execute(
+                        StartNewGameRequest(player1_name="Alice", player2_name="Bob")
+                    ).game_session
+                    for row, col in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+                        session.make_move(Position(row, col), session.current_player)
+                    writer.append(session)
+                    sessions.append(session)
+            
+            engine = RatingEngine(RatingSystem.ELO, self.players)
+            with GameArchiveReader(path) as reader:
+                self.assertEqual(engine.recompute_from_archive(reader), 3)
+            
+            expected = RatingEngine(RatingSystem.ELO)
+            expected.process_batch([(s.player_x.id, s.player_o.id, 1.0) for s in sessions])
+            winner = sessions[0].player_x.id
+            self.assertAlmostEqual(engine.get_rating(winner).rating, expected.get_rating(winner).rating)
+            self.assertEqual(len(self.players.get_all_ratings("elo")), 6)
+            
+            reloaded = RatingEngine(RatingSystem.ELO, self.players)
+            self.assertAlmostEqual(reloaded.get_rating(winner).rating, engine.get_rating(winner).rating)
+        finally:
+            os.remove(path)
+
+
+
+class TestMatchmakingCoordinator(unittest.TestCase):
+    """Tests de la cola de emparejamiento."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        self.now = 0.0
+        self.repository = GameRepository(MemoryStorage())
+        self.matchmaker = MatchmakingCoordinator(
+            self.repository, rating_window=100, window_growth=10,
+            max_rating_window=500, clock=lambda: self.now
+        )
+
+    def test_pairs_nearest_rating_and_notifies_both(self):
+        """Cada jugador se empareja con el rival más cercano de su cola"""
+        notified = []
+        ana = self.matchmaker.enqueue("Ana", 1500, on_match=notified.append)
+        self.matchmaker.enqueue("Bea", 1900)
+        carla = self.matchmaker.enqueue("Carla", 1550)
+        self.matchmaker.enqueue("Dani", 1540, queue="ranked")
+        
+        self.assertEqual(self.matchmaker.tick(), 1)
+        
+        self.assertEqual(len(notified), 1)
+        self.assertEqual(notified[0].symbol, "X")
+        self.assertEqual(notified[0].opponent_name, "Carla")
+        match = self.matchmaker.poll(carla)
+        self.assertEqual(match.symbol, "O")
+        self.assertEqual(match.game_session_id, notified[0].game_session_id)
+        self.assertIsNone(self.matchmaker.poll(ana))
+        
+        # El resultado se puede volver a consultar hasta que caduca
+        self.assertEqual(self.matchmaker.poll(carla), match)
+        self.now = 61.0
+        self.assertIsNone(self.matchmaker.poll(carla))
+        
+        game_session = self.repository.get_by_id(match.game_session_id)
+        self.assertEqual(game_session.player_o.id, match.player_id)
+        self.assertEqual(self.matchmaker.get_statistics()['waiting_by_queue'], {'casual': 1, 'ranked': 1})
+
+    def test_rating_window_grows_with_waiting_time(self):
+        """Un rival lejano se acepta cuando la espera amplía la ventana"""
+        first = self.matchmaker.enqueue("Ana", 1500)
+        self.matchmaker.enqueue("Bea", 1750)
+        
+        self.assertEqual(self.matchmaker.tick(), 0)
+        self.now = 15.0
+        self.assertEqual(self.matchmaker.tick(), 1)
+        self.assertFalse(self.matchmaker.is_waiting(first))
+
+    def test_cancel_and_validation(self):
+        """Un ticket cancelado no se empareja y los nombres se validan"""
+        ticket = self.matchmaker.enqueue("Ana", 1500)
+        self.matchmaker.enqueue("Bea", 1500)
+        self.assertTrue(self.matchmaker.cancel(ticket))
+        self.assertFalse(self.matchmaker.cancel(ticket))
+        self.assertEqual(self.matchmaker.tick(), 0)
+        
+        with self.assertRaises(ValueError):
+            self.matchmaker.enqueue("A")
+        for rating in (float("nan"), float("inf"), "-inf"):
+            with self.assertRaises(ValueError):
+                self.matchmaker.enqueue("Carla", rating)
+
+    def test_failed_match_keeps_arrival_order(self):
+        """Si la partida no se crea, los jugadores vuelven con su orden de llegada"""
+        class FailingUseCase:
+            def execute(self, request):
+                raise RuntimeError("sin partidas")
+        
+        matchmaker = MatchmakingCoordinator(start_game_use_case=FailingUseCase(), clock=lambda: self.now)
+        matchmaker.enqueue("Ana", 1500)
+        matchmaker.enqueue("Bea", 1500)
+        before = list(matchmaker._buckets["casual"].entries)
+        
+        self.assertEqual(matchmaker.tick(), 0)
+        self.assertEqual(matchmaker._buckets["casual"].entries, before)
+        self.assertEqual(matchmaker.get_statistics()["failed_matches"], 1)
+
+    def test_large_queue_is_paired_in_one_tick(self):
+        """Miles de jugadores en espera se emparejan en un solo tick"""
+        for index in range(2000):
+            self.matchmaker.enqueue(f"Jugador {index}", 1000 + index % 400)
+        
+        self.assertEqual(self.matchmaker.tick(), 1000)
+        self.assertEqual(self.matchmaker.waiting_players, 0)
+
+
+class TestGameStatisticsCoordinator(unittest.TestCase):
+    """Tests para las estadísticas alimentadas por partidas terminadas."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        self.storage = MemoryStorage()
+        self.repository = GameRepository(self.storage)
+        self.use_case = MakeMoveUseCase(self.repository)
+        self.players = PlayerRepository(self.storage)
+        self.statistics = GameStatisticsCoordinator(player_repository=self.players)
+        self.statistics.register(self.use_case)
+
+    def _play_game(self, player1_name, player2_name):
+        """Juega una partida en la que gana el primer jugador."""
+        session = StartNewGameUseCase().execute(
+            StartNewGameRequest(player1_name=player1_name, player2_name=player2_name)
+        ).game_session
+        self.repository.save(session)
+        
+        players = [session.player_x.id, session.player_o.id]
+        for index, (row, col) in enumerate([(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]):
+            response = self.use_case.execute(MakeMoveRequest(
+                game_session_id=session.id,
+                player_id=players[index % 2],
+                row=row,
+                col=col
+            ))
+            self.assertTrue(response.success)
+        return session
+
+    def test_finished_games_are_recorded(self):
+        """Cada partida terminada actualiza el agregado y el repositorio de jugadores"""
+        self._play_game("Alice", "Bob")
+        self._play_game("Carla", "Dani")
+        
+        statistics = self.statistics.get_statistics()
+        self.assertEqual(statistics["games_recorded"], 2)
+        self.assertEqual(statistics["global"]["total_players"], 4)
+        self.assertEqual(statistics["periods"]["today"]["total_games"], 2)
+        self.assertEqual(statistics["periods"]["week"]["total_games"], 2)
+        
+        # Clasificación por puntuación: los ganadores comparten la primera posición
+        ranking = statistics["ranking"]
+        self.assertEqual([entry["rank"] for entry in ranking], [1, 1, 3, 3])
+        self.assertEqual({entry["player_name"] for entry in ranking[:2]}, {"Alice", "Carla"})
+        self.assertGreater(ranking[0]["score"], ranking[2]["score"])
+        self.assertEqual(self.players.get_ranked_count(), 4)
+        
+        # Los ganadores (empatados a 100 %) encabezan la clasificación
+        leaderboard = statistics["leaderboard"]
+        self.assertEqual([entry["rank"] for entry in leaderboard], [1, 2, 3, 4])
+        self.assertEqual({entry["name"] for entry in leaderboard[:2]}, {"Alice", "Carla"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import os
 import sys
 import unittest
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # Add project root to path for Screaming Architecture imports
@@ -9,6 +10,11 @@ sys.path.insert(0, str(project_root))
 
 from game.entities.board import Board, Position, Move, CellState
 from game.entities.player import Player
+from game.services import (
+    ScoreCalculator, RankingService, StatisticsAggregator, StatisticsTracker,
+    StatisticsPeriod, TrendDirection, GameHistory, GameRecord, GameOutcome,
+    StatisticsRollups
+)
 
 
 class TestGameLogic(unittest.TestCase):
@@ -96,5 +102,216 @@ class TestGameLogic(unittest.TestCase):
         self.assertIsNone(winner)
 
 
+def create_player(name, won=0, drawn=0, lost=0):
+    """Create a player with the given results"""
+    player = Player(name)
+    for _ in range(won):
+        player.record_game_won()
+    for _ in range(drawn):
+        player.record_game_drawn()
+    for _ in range(lost):
+        player.record_game_lost()
+    return player
+
+
+class TestRankingService(unittest.TestCase):
+
+    def setUp(self):
+        self.ranking = RankingService()
+
+    def test_rank_top_and_around(self):
+        """Test rank, top-k and around-me queries"""
+        players = [create_player(f"P{i}", won=i) for i in range(10)]
+        self.ranking.update_players(players)
+        
+        self.assertEqual(self.ranking.get_rank(players[9].id), 1)
+        self.assertEqual(self.ranking.get_rank(players[0].id), 10)
+        self.assertEqual([e.player_name for e in self.ranking.get_top(3)], ["P9", "P8", "P7"])
+        
+        around = self.ranking.get_around(players[5].id, radius=1)
+        self.assertEqual([e.player_name for e in around], ["P6", "P5", "P4"])
+        self.assertEqual([e.rank for e in around], [4, 5, 6])
+        self.assertEqual(self.ranking.get_around("unknown"), [])
+
+    def test_ties_share_rank(self):
+        """Test that tied players share the same rank"""
+        first = create_player("Ana", won=1)
+        second = create_player("Bea", won=1)
+        third = create_player("Carla", drawn=1)
+        self.ranking.update_players([first, second, third])
+        
+        self.assertEqual(self.ranking.get_rank(first.id), 1)
+        self.assertEqual(self.ranking.get_rank(second.id), 1)
+        self.assertEqual(self.ranking.get_rank(third.id), 3)
+        self.assertEqual([e.rank for e in self.ranking.get_top(3)], [1, 1, 3])
+
+    def test_updates_after_game_results(self):
+        """Test incremental updates, growth and removal"""
+        leader = create_player("Ana", won=2)
+        climber = create_player("Bea")
+        self.ranking.update_players([leader, climber])
+        self.assertEqual(self.ranking.get_rank(climber.id), 2)
+        
+        for _ in range(100):
+            climber.record_game_won()
+        self.ranking.update_player(climber)
+        self.assertEqual(self.ranking.get_rank(climber.id), 1)
+        self.assertEqual(self.ranking.get_score(climber.id), 10000)
+        
+        self.assertTrue(self.ranking.remove_player(climber.id))
+        self.assertFalse(self.ranking.remove_player(climber.id))
+        self.assertEqual(len(self.ranking), 1)
+        self.assertEqual(self.ranking.get_rank(leader.id), 1)
+
+    def test_matches_score_calculator_positions(self):
+        """Test agreement with ScoreCalculator for distinct scores"""
+        calculator = ScoreCalculator()
+        players = [create_player(f"P{i}", won=i % 7, drawn=i // 7) for i in range(21)]
+        self.ranking.update_players(players)
+        
+        for player in players:
+            self.assertEqual(self.ranking.get_score(player.id), calculator.calculate_total_score(player))
+        top = self.ranking.get_top(len(players))
+        self.assertEqual(len(top), len(players))
+        self.assertEqual([e.score for e in top], sorted((e.score for e in top), reverse=True))
+
+
+class TestStatisticsAggregator(unittest.TestCase):
+
+    def test_matches_tracker_global_statistics(self):
+        """Test that the running aggregate matches a full recomputation"""
+        players = [create_player(f"P{i}", won=i % 4, drawn=i % 3, lost=i % 5) for i in range(12)]
+        players.append(create_player("Idle"))
+        aggregator = StatisticsAggregator(players)
+        tracker = StatisticsTracker(aggregator)
+        
+        for player in players[:6]:
+            player.record_game_won()
+            aggregator.update_player(player)
+        
+        self.assertEqual(tracker.get_global_statistics(), StatisticsTracker().get_global_statistics(players))
+
+    def test_remove_player_updates_leaders(self):
+        """Test that removed players no longer lead the aggregate"""
+        veteran = create_player("Veterano", won=9, lost=1)
+        rookie = create_player("Novato", won=1, lost=1)
+        aggregator = StatisticsAggregator([veteran, rookie])
+        
+        self.assertEqual(aggregator.get_global_statistics()["best_performer"]["name"], "Veterano")
+        self.assertTrue(aggregator.remove_player(veteran.id))
+        
+        statistics = aggregator.get_global_statistics()
+        self.assertEqual(statistics["total_players"], 1)
+        self.assertEqual(statistics["total_games"], 2)
+        self.assertEqual(statistics["most_active_player"]["name"], "Novato")
+
+    def test_empty_aggregate(self):
+        """Test global statistics without players"""
+        self.assertIsNone(StatisticsTracker(StatisticsAggregator()).get_global_statistics()["best_performer"])
+
+
+class TestGameHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.player = create_player("Ana", won=3, lost=3)
+        self.history = GameHistory(capacity_per_player=6)
+        self.tracker = StatisticsTracker(history=self.history)
+        now = datetime.now()
+        
+        # Three old losses followed by three recent wins
+        for days_ago, outcome, duration in [
+            (40, GameOutcome.LOSS, 90.0), (20, GameOutcome.LOSS, 60.0), (3, GameOutcome.LOSS, 30.0),
+            (0, GameOutcome.WIN, 20.0), (0, GameOutcome.WIN, 40.0), (0, GameOutcome.WIN, 60.0)
+        ]:
+            self.history.record(self.player.id, GameRecord(now - timedelta(days=days_ago), outcome, duration, 5))
+
+    def test_ring_keeps_latest_games(self):
+        """Test that the ring is bounded and stays chronological"""
+        newest = GameRecord(datetime.now(), GameOutcome.DRAW, 10.0, 9)
+        self.history.record(self.player.id, newest)
+        
+        records = self.history.get_history(self.player.id)
+        self.assertEqual(len(records), 6)
+        self.assertEqual(records[-1], newest)
+        self.assertEqual(records[0].duration, 60.0)
+        self.assertEqual(self.history.get_last_activity(self.player.id), newest.finished_at)
+
+    def test_period_statistics(self):
+        """Test period-filtered statistics from real games"""
+        today = self.tracker.get_player_statistics(self.player, StatisticsPeriod.TODAY)
+        self.assertEqual((today.total_games, today.wins, today.losses), (3, 3, 0))
+        self.assertEqual((today.shortest_game, today.longest_game), (20.0, 60.0))
+        self.assertEqual(today.average_game_duration, 40.0)
+        
+        week = self.tracker.get_player_statistics(self.player, StatisticsPeriod.WEEK)
+        self.assertEqual((week.total_games, week.losses), (4, 1))
+        self.assertEqual(self.tracker.get_player_statistics(self.player, StatisticsPeriod.MONTH).total_games, 5)
+        self.assertEqual(self.tracker.get_player_statistics(self.player).total_games, 6)
+
+    def test_trend_uses_recent_games(self):
+        """Test that trends compare recent games with older ones"""
+        trend = self.tracker.analyze_player_trend(self.player, analysis_period=3)
+        self.assertEqual(trend.recent_performance, 100.0)
+        self.assertEqual(trend.historical_performance, 0.0)
+        
+        self.history.record(self.player.id, GameRecord(datetime.now(), GameOutcome.LOSS, 10.0, 5))
+        trend = self.tracker.analyze_player_trend(self.player, analysis_period=1)
+        self.assertEqual(trend.direction, TrendDirection.DECLINING)
+
+
+class TestStatisticsRollups(unittest.TestCase):
+
+    def setUp(self):
+        self.rollups = StatisticsRollups()
+        self.now = datetime(2026, 3, 15, 14, 30)
+        
+        # One game per day from early January until now, lasting 60 seconds
+        day = datetime(2026, 1, 1, 10, 0)
+        while day <= self.now:
+            self.rollups.record("ana", day, GameOutcome.WIN, 60.0)
+            day += timedelta(days=1)
+        self.rollups.record("ana", datetime(2026, 3, 15, 13, 5), GameOutcome.LOSS, 30.0)
+
+    def test_summarize_matches_scan(self):
+        """Test that bucket sums match counting games directly"""
+        start = datetime(2026, 1, 20)
+        totals = self.rollups.summarize("ana", start, self.now)
+        
+        self.assertEqual(totals.games, (self.now - start).days + 2)
+        self.assertEqual(totals.losses, 1)
+        self.assertEqual((totals.shortest_game, totals.longest_game), (30.0, 60.0))
+        self.assertEqual(self.rollups.summarize("ana").games, 75)
+        self.assertEqual(self.rollups.summarize("nadie", start).games, 0)
+
+    def test_summarize_hour_precision(self):
+        """Test that partial days are summed from hourly buckets"""
+        totals = self.rollups.summarize("ana", datetime(2026, 3, 15, 11), datetime(2026, 3, 15, 12))
+        self.assertEqual(totals.games, 0)
+        
+        totals = self.rollups.summarize("ana", datetime(2026, 3, 15), datetime(2026, 3, 15, 13, 10))
+        self.assertEqual((totals.wins, totals.losses), (1, 1))
+
+    def test_tracker_period_statistics_from_rollups(self):
+        """Test tracker period queries answered from rollups"""
+        winner = create_player("Ana", won=2)
+        loser = create_player("Bea", lost=2)
+        rollups = StatisticsRollups()
+        finished = datetime.now()
+        rollups.record(winner.id, finished, GameOutcome.WIN, 40.0)
+        rollups.record(loser.id, finished, GameOutcome.LOSS, 40.0)
+        rollups.record("", finished, None, 40.0)
+        tracker = StatisticsTracker(rollups=rollups)
+        
+        today = tracker.get_player_statistics(winner, StatisticsPeriod.TODAY)
+        self.assertEqual((today.total_games, today.wins, today.average_game_duration), (1, 1, 40.0))
+        self.assertEqual(tracker.get_player_statistics(winner).total_games, 2)
+        
+        week = tracker.get_global_statistics(period=StatisticsPeriod.WEEK)
+        self.assertEqual(week["total_games"], 1)
+        self.assertEqual(week["average_game_duration"], 40.0)
+        with self.assertRaises(ValueError):
+            StatisticsTracker().get_global_statistics(period=StatisticsPeriod.WEEK)
+
+
 if __name__ == "__main__":
     unittest.main()
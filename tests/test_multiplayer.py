@@ -6,6 +6,10 @@ Este archivo ahora testa la infraestructura web para multijugador online.
 
 import os
 import sys
+import json
+import time
+import struct
+import asyncio
 import unittest
 from pathlib import Path
 
@@ -15,6 +19,10 @@ sys.path.insert(0, str(project_root))
 
 from game.entities.game_session import GameSession, GameState
 from game.entities.player import Player
+from interfaces.web_ui.multiplayer_server import MultiplayerRoomServer
+from interfaces.web_ui.websocket_protocol import (
+    WebSocketError, accept_connection, connect, CLOSE_INVALID_PAYLOAD, CLOSE_PROTOCOL_ERROR
+)
 
 
 class TestMultiplayerOnlineInfrastructure(unittest.TestCase):
@@ -147,5 +155,171 @@ class TestOnlineGameInfrastructure(unittest.TestCase):
         self.assertEqual(session.state, GameState.WAITING_FOR_PLAYERS)
 
 
+
+class TestMultiplayerRoomServer(unittest.IsolatedAsyncioTestCase):
+    """Tests para el servidor de salas WebSocket."""
+    
+    async def asyncSetUp(self):
+        self.server = MultiplayerRoomServer(max_connections=3, heartbeat_interval=30)
+        await self.server.start('127.0.0.1', 0)
+    
+    async def asyncTearDown(self):
+        await self.server.stop()
+    
+    async def _connect(self):
+        return await connect('127.0.0.1', self.server.port)
+    
+    async def _send(self, connection, **message):
+        await connection.send(json.dumps(message))
+    
+    async def _receive(self, connection):
+        return json.loads(await asyncio.wait_for(connection.receive(), 2))
+    
+    async def _start_game(self):
+        host, guest = await self._connect(), await self._connect()
+        await self._send(host, type='create_room', player_name='Ana')
+        created = await self._receive(host)
+        await self._send(guest, type='join_room', room_id=created['room_id'], player_name='Bea')
+        joined = await self._receive(guest)
+        host_start, guest_start = await self._receive(host), await self._receive(guest)
+        return host, guest, created, joined, host_start, guest_start
+    
+    async def test_moves_are_broadcast_to_both_players(self):
+        """Test movimientos difundidos a los dos jugadores de la sala"""
+        host, guest, created, _, host_start, guest_start = await self._start_game()
+        
+        self.assertEqual(host_start['type'], 'game_started')
+        self.assertEqual(host_start['game_session']['id'], created['room_id'])
+        self.assertEqual(host_start['game_session']['current_player']['id'], host_start['player_id'])
+        
+        # Mover fuera de turno devuelve un error solo al remitente
+        await self._send(guest, type='move', row=0, col=0)
+        self.assertEqual((await self._receive(guest))['type'], 'error')
+        
+        await self._send(host, type='move', row=1, col=1)
+        for connection in (host, guest):
+            message = await self._receive(connection)
+            self.assertEqual(message['type'], 'move')
+            self.assertEqual(message['move'], {'row': 1, 'col': 1, 'symbol': 'X'})
+            self.assertEqual(message['current_player']['id'], guest_start['player_id'])
+    
+    async def test_invalid_coordinates_return_error_and_keep_connection(self):
+        """Test coordenadas no enteras: error al remitente sin cerrar la conexión"""
+        host, guest, _, _, _, _ = await self._start_game()
+        
+        for row in ('x', None, 1.5, True):
+            await self._send(host, type='move', row=row, col=0)
+            error = await self._receive(host)
+            self.assertEqual(error['type'], 'error')
+            self.assertEqual(error['errors'], ['La fila debe ser un número entero'])
+        
+        await self._send(host, type='move', row=0, col=0)
+        self.assertEqual((await self._receive(guest))['type'], 'move')
+    
+    async def test_connections_over_limit_are_rejected(self):
+        """Test rechazo de conexiones por encima de max_connections"""
+        connections = [await self._connect() for _ in range(3)]
+        
+        with self.assertRaises(WebSocketError):
+            await self._connect()
+        self.assertEqual(self.server.get_statistics()['rejected_connections'], 1)
+        
+        for connection in connections:
+            await connection.wait_closed()
+    
+    async def test_player_can_resume_seat_after_disconnect(self):
+        """Test reconexión de un jugador a su plaza"""
+        host, guest, created, _, host_start, _ = await self._start_game()
+        await self._send(host, type='move', row=0, col=0)
+        await self._receive(host)
+        await self._receive(guest)
+        
+        await host.wait_closed()
+        self.assertEqual((await self._receive(guest))['type'], 'opponent_disconnected')
+        
+        host = await self._connect()
+        await self._send(host, type='resume', room_id=created['room_id'], seat_token=created['seat_token'])
+        resumed = await self._receive(host)
+        self.assertEqual(resumed['type'], 'resumed')
+        self.assertEqual(resumed['player_id'], host_start['player_id'])
+        self.assertEqual(resumed['game_session']['move_count'], 1)
+        self.assertEqual((await self._receive(guest))['type'], 'opponent_reconnected')
+    
+    async def test_room_closes_after_reconnection_timeout(self):
+        """Test cierre de la sala si el jugador no vuelve a tiempo"""
+        host, guest, _, _, _, _ = await self._start_game()
+        
+        await host.wait_closed()
+        self.assertEqual((await self._receive(guest))['type'], 'opponent_disconnected')
+        
+        await self.server.reap(now=time.monotonic() + 61)
+        closed = await self._receive(guest)
+        self.assertEqual(closed, {'type': 'room_closed', 'reason': 'reconnection_timeout'})
+        self.assertEqual(self.server.get_statistics()['rooms'], 0)
+
+
+class TestWebSocketProtocol(unittest.IsolatedAsyncioTestCase):
+    """Tests de los casos de error de RFC 6455 en el servidor."""
+    
+    async def asyncSetUp(self):
+        self.server = MultiplayerRoomServer(heartbeat_interval=30)
+        await self.server.start('127.0.0.1', 0)
+        self.client = await connect('127.0.0.1', self.server.port)
+    
+    async def asyncTearDown(self):
+        await self.client.wait_closed()
+        await self.server.stop()
+    
+    async def _send_raw(self, opcode, payload, fin=True):
+        """Escribe un frame de cliente (máscara nula) sin pasar por la validación."""
+        header = struct.pack("!BB", (0x80 if fin else 0) | opcode, 0x80 | len(payload))
+        self.client._writer.write(header + b"\0\0\0\0" + payload)
+        await self.client._writer.drain()
+    
+    async def _close_code(self):
+        self.assertIsNone(await asyncio.wait_for(self.client.receive(), 2))
+        return self.client.close_code
+    
+    async def test_reserved_opcode_fails_connection(self):
+        """Test opcode reservado: cierre 1002"""
+        await self._send_raw(0x3, b"{}")
+        self.assertEqual(await self._close_code(), CLOSE_PROTOCOL_ERROR)
+    
+    async def test_new_message_inside_fragmented_message_fails_connection(self):
+        """Test frame de texto nuevo dentro de un mensaje fragmentado: cierre 1002"""
+        await self._send_raw(0x1, b'{"type":', fin=False)
+        await self._send_raw(0x1, b'{"type": "leave"}')
+        self.assertEqual(await self._close_code(), CLOSE_PROTOCOL_ERROR)
+    
+    async def test_invalid_utf8_fails_connection_with_1007(self):
+        """Test texto UTF-8 no válido: cierre 1007"""
+        await self._send_raw(0x1, b"\xff\xfe")
+        self.assertEqual(await self._close_code(), CLOSE_INVALID_PAYLOAD)
+    
+    async def test_fragmented_message_is_reassembled(self):
+        """Test mensaje fragmentado con continuación válida"""
+        await self._send_raw(0x1, b'{"type": "cre', fin=False)
+        await self._send_raw(0x0, b'ate_room", "player_name": "Ana"}')
+        reply = json.loads(await asyncio.wait_for(self.client.receive(), 2))
+        self.assertEqual(reply['type'], 'room_created')
+    
+    async def test_handshake_response_is_drained(self):
+        """Test la respuesta 101 se vacía antes de crear la conexión"""
+        class RecordingWriter:
+            def __init__(self):
+                self.calls = []
+            
+            def write(self, data):
+                self.calls.append('write')
+            
+            async def drain(self):
+                self.calls.append('drain')
+        
+        writer = RecordingWriter()
+        connection = await accept_connection(asyncio.StreamReader(), writer, 'dGhlIHNhbXBsZSBub25jZQ==')
+        self.assertIsNotNone(connection)
+        self.assertEqual(writer.calls, ['write', 'drain'])
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
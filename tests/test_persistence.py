@@ -0,0 +1,907 @@
+"""
+Tests para la capa de persistencia del juego Tres en Raya.
+
+Verifican el almacenamiento en memoria y los repositorios que
+traducen entre entidades del dominio y datos persistidos.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path for Screaming Architecture imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from game.entities import ConcurrentModificationError, GameState, GameResult, Player, Position
+from game.use_cases.make_move import MakeMoveUseCase, MakeMoveRequest
+from game.use_cases.manage_players import ManagePlayersUseCase
+from game.use_cases.start_new_game import StartNewGameUseCase, StartNewGameRequest
+from persistence.data_sources.game_archive import GameArchiveReader, GameArchiveWriter, np
+from persistence.data_sources.memory_storage import MemoryStorage, thaw_record
+from persistence.data_sources.shared_storage import SharedStorageServer
+from persistence.repositories.game_repository import GameRepository
+from persistence.repositories.player_repository import PlayerRepository
+from persistence.repositories.session_sweeper import SessionExpiryPolicy, SessionSweeper
+
+
+def create_started_session(player1_name="Alice", player2_name="Bob"):
+    """Crea una sesión en progreso con dos jugadores humanos."""
+    response = StartNewGameUseCase().execute(
+        StartNewGameRequest(player1_name=player1_name, player2_name=player2_name)
+    )
+    return response.game_session
+
+
+class TestMemoryStorageLockStriping(unittest.TestCase):
+    """Tests para el bloqueo por segmentos de MemoryStorage."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        self.storage = MemoryStorage(lock_stripes=8)
+
+    def test_basic_operations_still_work(self):
+        """Las operaciones básicas mantienen su comportamiento"""
+        self.assertTrue(self.storage.save("games", "a", {"state": "in_progress"}))
+        self.storage.save("games", "b", {"state": "finished"})
+        
+        self.assertEqual(self.storage.get("games", "a"), {"state": "in_progress"})
+        self.assertIsNone(self.storage.get("games", "missing"))
+        self.assertTrue(self.storage.exists("games", "b"))
+        self.assertEqual(self.storage.count("games"), 2)
+        self.assertEqual(len(self.storage.find_by("games", state="finished")), 1)
+        self.assertEqual(self.storage.get_collections(), ["games"])
+        
+        self.assertTrue(self.storage.delete("games", "a"))
+        self.assertFalse(self.storage.delete("games", "a"))
+        self.storage.clear()
+        self.assertEqual(self.storage.count("games"), 0)
+
+    def test_invalid_stripe_count_rejected(self):
+        """No se permite un almacenamiento sin locks"""
+        with self.assertRaises(ValueError):
+            MemoryStorage(lock_stripes=0)
+
+    def test_concurrent_writes_to_different_keys(self):
+        """Escrituras concurrentes sobre claves distintas no pierden datos"""
+        def writer(thread_id):
+            for i in range(200):
+                self.storage.save("games", f"{thread_id}-{i}", {"value": i})
+        
+        threads = [threading.Thread(target=writer, args=(t,)) for t in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(self.storage.count("games"), 8 * 200)
+
+    def test_contention_counter_detects_waiting(self):
+        """El contador registra la espera por un lock ocupado"""
+        self.storage.reset_lock_statistics()
+        stripe = self.storage._stripes[self.storage._stripe_index("games", "a")]
+        
+        stripe.acquire()
+        writer = threading.Thread(target=self.storage.save, args=("games", "a", {}))
+        writer.start()
+        writer.join(timeout=0.1)
+        self.assertTrue(writer.is_alive())
+        stripe.release()
+        writer.join()
+        
+        stats = self.storage.get_lock_statistics()
+        self.assertEqual(stats["lock_stripes"], 8)
+        self.assertEqual(stats["acquisitions"], 1)
+        self.assertEqual(stats["contentions"], 1)
+
+    def test_different_keys_do_not_contend(self):
+        """Una clave bloqueada no detiene a las claves de otros locks"""
+        self.storage.reset_lock_statistics()
+        busy_index = self.storage._stripe_index("games", "a")
+        other_key = next(
+            f"k{i}" for i in range(100)
+            if self.storage._stripe_index("games", f"k{i}") != busy_index
+        )
+        
+        self.storage._stripes[busy_index].acquire()
+        try:
+            writer = threading.Thread(target=self.storage.save, args=("games", other_key, {}))
+            writer.start()
+            writer.join(timeout=1)
+            self.assertFalse(writer.is_alive())
+        finally:
+            self.storage._stripes[busy_index].release()
+        
+        self.assertEqual(self.storage.get_lock_statistics()["contentions"], 0)
+
+
+class TestMemoryStorageImmutableRecords(unittest.TestCase):
+    """Tests para los registros inmutables de MemoryStorage."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        self.storage = MemoryStorage()
+        self.original = {"state": "in_progress", "board": [["X", " "], [" ", "O"]]}
+        self.storage.save("games", "a", self.original)
+
+    def test_reads_share_the_same_snapshot(self):
+        """Las lecturas devuelven la instantánea sin copiarla"""
+        first = self.storage.get("games", "a")
+        self.assertIs(first, self.storage.get("games", "a"))
+        self.assertIs(first, self.storage.get_all("games")[0])
+        self.assertIs(first, self.storage.find_by("games", state="in_progress")[0])
+
+    def test_snapshot_cannot_be_modified(self):
+        """Ni el registro ni sus estructuras anidadas son modificables"""
+        record = self.storage.get("games", "a")
+        with self.assertRaises(TypeError):
+            record["state"] = "finished"
+        with self.assertRaises(TypeError):
+            record["board"][0][0] = "O"
+
+    def test_caller_mutations_do_not_leak_into_storage(self):
+        """Modificar el diccionario guardado no altera el almacenamiento"""
+        self.original["board"][0][1] = "X"
+        self.assertEqual(self.storage.get("games", "a")["board"][0], ("X", " "))
+
+    def test_thaw_record_returns_mutable_copy(self):
+        """thaw_record proporciona una copia mutable profunda"""
+        copy = thaw_record(self.storage.get("games", "a"))
+        copy["board"][0][1] = "O"
+        self.assertEqual(copy["board"], [["X", "O"], [" ", "O"]])
+        self.assertEqual(self.storage.get("games", "a")["board"][0], ("X", " "))
+
+    def test_repository_round_trip_with_frozen_records(self):
+        """El repositorio reconstruye sesiones desde registros inmutables"""
+        repository = GameRepository(self.storage)
+        session = create_started_session()
+        session.make_move(Position(1, 1), session.current_player)
+        repository.save(session)
+        
+        restored = repository.get_by_id(session.id)
+        self.assertIsNotNone(restored)
+        self.assertEqual(restored.board.to_list(), session.board.to_list())
+        self.assertEqual(restored.move_count, 1)
+        self.assertEqual(restored.current_player_symbol, session.current_player_symbol)
+
+
+class TestGameRepositoryStreaming(unittest.TestCase):
+    """Tests para el recorrido perezoso de GameRepository."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        self.storage = MemoryStorage()
+        self.repository = GameRepository(self.storage)
+        self.sessions = [create_started_session(f"Alice{i}", f"Bob{i}") for i in range(5)]
+        self.sessions[0].abandon()
+        for session in self.sessions:
+            self.repository.save(session)
+
+    def test_iter_all_yields_every_session(self):
+        """iter_all devuelve todas las sesiones almacenadas"""
+        ids = {session.id for session in self.repository.iter_all(batch_size=2)}
+        self.assertEqual(ids, {session.id for session in self.sessions})
+
+    def test_iter_all_deserializes_lazily(self):
+        """Solo se deserializan las sesiones consumidas"""
+        calls = []
+        original = self.repository._deserialize_game_session
+
+        def counting_deserialize(data):
+            calls.append(data["id"])
+            return original(data)
+        
+        self.repository._deserialize_game_session = counting_deserialize
+        iterator = self.repository.iter_all(batch_size=2)
+        next(iterator)
+        self.assertEqual(len(calls), 1)
+
+    def test_iter_all_applies_filter(self):
+        """El filtro selecciona las sesiones devueltas"""
+        finished = list(self.repository.iter_all(filter=lambda session: session.is_finished()))
+        self.assertEqual([session.id for session in finished], [self.sessions[0].id])
+        self.assertEqual(len(self.repository.find_active_sessions()), 4)
+
+    def test_invalid_sessions_are_reported(self):
+        """Las sesiones corruptas se omiten pero quedan registradas"""
+        self.storage.save(GameRepository.COLLECTION_NAME, "broken", {"id": "broken"})
+        sessions = self.repository.get_all()
+        self.assertEqual(len(sessions), 5)
+        self.assertEqual(self.repository.last_scan_errors, ["broken"])
+
+    def test_scan_errors_are_kept_per_call(self):
+        """Los errores de un recorrido no se mezclan con los de otros hilos"""
+        self.storage.save(GameRepository.COLLECTION_NAME, "broken", {"id": "broken"})
+        errors = []
+        iterator = self.repository.iter_all(errors=errors)
+        next(iterator)
+        
+        # Un recorrido completo en otro hilo no toca los errores de este
+        worker = threading.Thread(target=lambda: self.repository.get_all())
+        worker.start()
+        worker.join(timeout=5)
+        self.assertEqual(self.repository.last_scan_errors, [])
+        
+        list(iterator)
+        self.assertEqual(errors, ["broken"])
+        self.assertEqual(self.repository.last_scan_errors, ["broken"])
+
+    def test_storage_batches_skip_deleted_records(self):
+        """Los registros eliminados durante el recorrido se omiten"""
+        batches = self.storage.iter_batches(GameRepository.COLLECTION_NAME, batch_size=2)
+        first = next(batches)
+        self.repository.delete(self.sessions[-1].id)
+        remaining = [record for batch in batches for record in batch]
+        self.assertEqual(len(first) + len(remaining), 4)
+
+    def test_storage_batches_never_repeat_records(self):
+        """Las altas y bajas durante el recorrido no repiten registros"""
+        collection = GameRepository.COLLECTION_NAME
+        batches = self.storage.iter_batches(collection, batch_size=2)
+        seen = [record["id"] for record in next(batches)]
+        
+        self.storage.save(collection, "late", {"id": "late"})
+        self.storage.delete(collection, seen[0])
+        self.storage.save(collection, seen[1], {"id": seen[1], "updated": True})
+        seen.extend(record["id"] for batch in batches for record in batch)
+        
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(set(seen), {session.id for session in self.sessions} | {"late"})
+
+
+class TestBulkOperations(unittest.TestCase):
+    """Tests para el guardado y la carga por lotes."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        self.storage = MemoryStorage(lock_stripes=4)
+        self.repository = GameRepository(self.storage)
+
+    def test_save_many_acquires_each_lock_once(self):
+        """Un lote adquiere cada lock como máximo una vez"""
+        items = {f"key-{i}": {"value": i} for i in range(100)}
+        self.storage.reset_lock_statistics()
+        
+        results = self.storage.save_many("games", items)
+        
+        self.assertTrue(all(results.values()))
+        self.assertEqual(len(results), 100)
+        self.assertEqual(self.storage.count("games"), 100)
+        self.assertLessEqual(self.storage.get_lock_statistics()["acquisitions"], 4)
+
+    def test_get_many_reports_missing_keys(self):
+        """get_many devuelve None para las claves inexistentes"""
+        self.storage.save_many("games", {"a": {"value": 1}, "b": {"value": 2}})
+        results = self.storage.get_many("games", ["a", "missing"])
+        self.assertEqual(results["a"], {"value": 1})
+        self.assertIsNone(results["missing"])
+
+    def test_repository_bulk_round_trip(self):
+        """El repositorio guarda y carga sesiones por lotes"""
+        sessions = [create_started_session(f"Alice{i}", f"Bob{i}") for i in range(10)]
+        
+        results = self.repository.save_many(sessions)
+        self.assertEqual(results, {session.id: True for session in sessions})
+        
+        loaded = self.repository.get_many([session.id for session in sessions] + ["missing"])
+        self.assertIsNone(loaded["missing"])
+        for session in sessions:
+            self.assertEqual(loaded[session.id].player_x.name, session.player_x.name)
+
+    def test_repository_reports_per_item_failures(self):
+        """Una sesión que no se puede serializar no bloquea el lote"""
+        valid = create_started_session()
+        broken = create_started_session("Carol", "Dave")
+        broken._created_at = None
+        
+        results = self.repository.save_many([valid, broken])
+        self.assertTrue(results[valid.id])
+        self.assertFalse(results[broken.id])
+        self.assertTrue(self.repository.exists(valid.id))
+        self.assertFalse(self.repository.exists(broken.id))
+
+
+class TestSessionSweeper(unittest.TestCase):
+    """Tests para la expiración de sesiones en memoria."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        self.storage = MemoryStorage()
+        self.repository = GameRepository(self.storage)
+        self.policy = SessionExpiryPolicy(ttls={
+            GameState.IN_PROGRESS: None,
+            GameState.FINISHED: 600.0,
+            GameState.ABANDONED: 0.0,
+        })
+        
+        self.active = create_started_session("Alice", "Bob")
+        self.finished = create_started_session("Carol", "Dave")
+        self.abandoned = create_started_session("Erin", "Frank")
+        for row, col in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+            self.finished.make_move(Position(row, col), self.finished.current_player)
+        self.abandoned.abandon()
+        
+        for session in (self.active, self.finished, self.abandoned):
+            self.repository.save(session)
+
+    def create_sweeper(self, offset=0.0, **kwargs):
+        """Crea un barrido cuyo reloj está adelantado `offset` segundos."""
+        return SessionSweeper(
+            self.storage,
+            policy=self.policy,
+            clock=lambda: time.monotonic() + offset,
+            **kwargs
+        )
+
+    def test_abandoned_sessions_expire_immediately(self):
+        """Las sesiones abandonadas se eliminan en el primer barrido"""
+        sweeper = self.create_sweeper()
+        self.assertEqual(sweeper.sweep_once(), 1)
+        self.assertFalse(self.repository.exists(self.abandoned.id))
+        self.assertTrue(self.repository.exists(self.finished.id))
+        self.assertTrue(self.repository.exists(self.active.id))
+
+    def test_finished_sessions_expire_after_ttl(self):
+        """Las sesiones terminadas se eliminan al superar su TTL"""
+        sweeper = self.create_sweeper(offset=601.0)
+        sweeper.sweep_once()
+        self.assertFalse(self.repository.exists(self.finished.id))
+        self.assertTrue(self.repository.exists(self.active.id))
+        
+        gauges = sweeper.get_gauges()
+        self.assertEqual(gauges["live_sessions"], 1)
+        self.assertEqual(gauges["evicted_total"], 2)
+        self.assertEqual(gauges["evicted_by_state"], {"finished": 2})
+
+    def test_sweep_is_incremental(self):
+        """Cada barrido examina como máximo batch_size sesiones"""
+        sweeper = self.create_sweeper(offset=601.0, batch_size=1)
+        evicted = [sweeper.sweep_once() for _ in range(3)]
+        self.assertEqual(sum(evicted), 2)
+        self.assertTrue(all(count <= 1 for count in evicted))
+        self.assertEqual(sweeper.get_gauges()["sweeps"], 3)
+
+    def test_expired_sessions_are_archived_first(self):
+        """Las sesiones se archivan antes de eliminarlas"""
+        archive = MemoryStorage()
+        sweeper = self.create_sweeper(offset=601.0, archive_storage=archive)
+        sweeper.sweep_once()
+        
+        archived = archive.get(SessionSweeper.COLLECTION_NAME, self.finished.id)
+        self.assertIsNotNone(archived)
+        self.assertEqual(archived["state"], "finished")
+        self.assertEqual(sweeper.get_gauges()["archived_total"], 2)
+
+    def test_failed_archive_keeps_session(self):
+        """Si no se puede archivar, la sesión se conserva"""
+        class FailingArchive:
+            def save(self, collection, key, data):
+                return False
+        
+        sweeper = self.create_sweeper(archive_storage=FailingArchive())
+        self.assertEqual(sweeper.sweep_once(), 0)
+        self.assertTrue(self.repository.exists(self.abandoned.id))
+        self.assertEqual(sweeper.get_gauges()["archive_failures"], 1)
+
+    def test_archive_runs_outside_the_storage_lock(self):
+        """Se puede escribir la sesión mientras se archiva y entonces se conserva"""
+        repository = self.repository
+        abandoned = self.abandoned
+        writers = []
+        
+        class WritingArchive:
+            def save(self, collection, key, data):
+                # Otro hilo escribe la sesión mientras se archiva
+                writer = threading.Thread(target=lambda: repository.save(abandoned))
+                writer.start()
+                writer.join(timeout=2)
+                writers.append(writer.is_alive())
+                return True
+        
+        sweeper = self.create_sweeper(archive_storage=WritingArchive())
+        self.assertEqual(sweeper.sweep_once(), 0)
+        self.assertEqual(writers, [False])
+        self.assertTrue(self.repository.exists(self.abandoned.id))
+
+    def test_background_thread_start_and_stop(self):
+        """El hilo de barrido elimina sesiones y se detiene limpiamente"""
+        sweeper = self.create_sweeper(interval=0.01)
+        sweeper.start()
+        try:
+            deadline = time.monotonic() + 2
+            while self.repository.exists(self.abandoned.id) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(sweeper.is_running)
+        finally:
+            sweeper.stop(timeout=1)
+        
+        self.assertFalse(self.repository.exists(self.abandoned.id))
+        self.assertFalse(sweeper.is_running)
+
+
+class TestGameArchive(unittest.TestCase):
+    """Tests para el archivo binario de partidas terminadas."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        handle, self.path = tempfile.mkstemp(suffix=".archive")
+        os.close(handle)
+        os.remove(self.path)
+        
+        self.finished = create_started_session("Carol", "Dave")
+        for row, col in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+            self.finished.make_move(Position(row, col), self.finished.current_player)
+        self.active = create_started_session("Alice", "Bob")
+
+    def tearDown(self):
+        """Limpieza después de cada test."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_append_and_read_back(self):
+        """Las partidas terminadas se leen con sus movimientos en orden"""
+        with GameArchiveWriter(self.path) as writer:
+            self.assertTrue(writer.append(self.finished))
+            self.assertFalse(writer.append(self.active))
+        
+        with GameArchiveReader(self.path) as reader:
+            games = list(reader)
+        
+        self.assertEqual(len(games), 1)
+        self.assertEqual(games[0].session_id, self.finished.id)
+        self.assertEqual(games[0].result, GameResult.PLAYER_X_WINS)
+        self.assertEqual(games[0].moves, (0, 3, 1, 4, 2))
+        self.assertEqual(games[0].player_x_id, self.finished.player_x.id)
+
+    def test_archive_as_sweeper_storage(self):
+        """El escritor sirve como archivo del barrido de sesiones"""
+        storage = MemoryStorage()
+        repository = GameRepository(storage)
+        repository.save(self.finished)
+        self.active.make_move(Position(1, 1), self.active.current_player)
+        repository.save(self.active)
+        
+        with GameArchiveWriter(self.path) as writer:
+            sweeper = SessionSweeper(
+                storage,
+                policy=SessionExpiryPolicy(ttls={GameState.FINISHED: 0.0, GameState.IN_PROGRESS: 0.0}),
+                archive_storage=writer
+            )
+            self.assertEqual(sweeper.sweep_once(), 2)
+        
+        with GameArchiveReader(self.path) as reader:
+            games = {game.session_id: game for game in reader}
+        
+        self.assertEqual(len(games), 2)
+        self.assertEqual(games[self.finished.id].moves, (0, 3, 1, 4, 2))
+        self.assertIsNotNone(games[self.finished.id].finished_at)
+        
+        # Las sesiones que expiran sin terminar se archivan sin resultado
+        self.assertIsNone(games[self.active.id].result)
+        self.assertEqual(games[self.active.id].moves, (4,))
+        self.assertIsNone(games[self.active.id].finished_at)
+
+    def test_rejects_foreign_file(self):
+        """Un archivo con otra cabecera se rechaza"""
+        with open(self.path, "wb") as handle:
+            handle.write(b"not an archive file")
+        
+        with self.assertRaises(ValueError):
+            GameArchiveReader(self.path)
+
+    @unittest.skipUnless(np is not None, "NumPy no está instalado")
+    def test_numpy_view(self):
+        """La vista NumPy expone las columnas sin copiar datos"""
+        with GameArchiveWriter(self.path) as writer:
+            writer.append_many([self.finished, self.finished])
+        
+        reader = GameArchiveReader(self.path)
+        games = reader.to_numpy()
+        
+        self.assertEqual(len(games), 2)
+        self.assertEqual(list(games["move_count"]), [5, 5])
+        self.assertEqual(list(games["moves"][0][:5]), [0, 3, 1, 4, 2])
+        self.assertFalse(games.flags.writeable)
+        del games
+        reader.close()
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "Requiere sockets Unix y fork")
+class TestSharedStorage(unittest.TestCase):
+    """Tests para el almacenamiento compartido entre procesos."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        self.server = SharedStorageServer(
+            address=os.path.join(tempfile.mkdtemp(), "storage.sock")
+        )
+        self.server.start()
+        self.client = self.server.create_client()
+
+    def tearDown(self):
+        """Limpieza después de cada test."""
+        self.server.stop(timeout=2)
+        os.rmdir(os.path.dirname(self.server.address))
+
+    def test_repository_over_shared_storage(self):
+        """GameRepository funciona sobre el cliente compartido"""
+        repository = GameRepository(self.client)
+        session = create_started_session()
+        session.make_move(Position(1, 1), session.current_player)
+        
+        self.assertTrue(repository.save(session))
+        restored = repository.get_by_id(session.id)
+        
+        self.assertIsNotNone(restored)
+        self.assertEqual(restored.board.move_history, session.board.move_history)
+        self.assertEqual(self.server.storage.count(GameRepository.COLLECTION_NAME), 1)
+
+    def test_sessions_visible_across_processes(self):
+        """Una sesión guardada por un proceso hijo es visible en el padre"""
+        session = create_started_session()
+        self.client.count("game_sessions")  # Conexión abierta antes del fork
+        
+        pid = os.fork()
+        if pid == 0:
+            try:
+                saved = GameRepository(self.client).save(session)
+            finally:
+                os._exit(0 if saved else 1)
+        
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.WEXITSTATUS(status), 0)
+        self.assertIsNotNone(GameRepository(self.client).get_by_id(session.id))
+
+    def test_delete_if_skips_concurrent_modification(self):
+        """delete_if no elimina un registro modificado tras evaluarse la condición"""
+        self.client.save("items", "key", {"value": 1})
+
+        def modify_then_accept(data, modified_at):
+            self.server.storage.save("items", "key", {"value": 2})
+            return True
+        
+        self.assertFalse(self.client.delete_if("items", "key", modify_then_accept))
+        self.assertEqual(self.client.get("items", "key"), {"value": 2})
+        self.assertTrue(self.client.delete_if("items", "key", lambda data, modified_at: True))
+        self.assertFalse(self.client.exists("items", "key"))
+
+    def test_iter_batches_and_find_by(self):
+        """Los recorridos por lotes y búsquedas devuelven copias mutables"""
+        self.client.save_many("items", {str(i): {"parity": i % 2} for i in range(5)})
+        
+        batches = list(self.client.iter_batches("items", batch_size=2))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(len(self.client.find_by("items", parity=0)), 3)
+
+
+class TestOptimisticConcurrency(unittest.TestCase):
+    """Tests para el control de versiones de las sesiones."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        self.storage = MemoryStorage()
+        self.repository = GameRepository(self.storage)
+        self.session = create_started_session()
+        self.repository.save(self.session)
+
+    def test_storage_compare_and_swap(self):
+        """save con expected_version solo escribe si la versión coincide"""
+        self.assertTrue(self.storage.save("items", "key", {"value": 1}, expected_version=0))
+        self.assertFalse(self.storage.save("items", "key", {"value": 2}, expected_version=0))
+        self.assertTrue(self.storage.save("items", "key", {"value": 3}, expected_version=1))
+        self.assertEqual(self.storage.get_version("items", "key"), 2)
+        self.assertEqual(self.storage.get("items", "key")["value"], 3)
+
+    def test_delete_if_unmodified_compares_versions(self):
+        """delete_if_unmodified solo borra la versión leída con get_entry"""
+        self.storage.save("items", "key", {"value": 1})
+        _, _, stale_version = self.storage.get_entry("items", "key")
+        self.storage.save("items", "key", {"value": 2})
+
+        self.assertFalse(self.storage.delete_if_unmodified("items", "key", stale_version))
+        _, _, version = self.storage.get_entry("items", "key")
+        self.assertEqual(version, stale_version + 1)
+        self.assertTrue(self.storage.delete_if_unmodified("items", "key", version))
+        self.assertFalse(self.storage.exists("items", "key"))
+
+    def test_stale_session_raises_conflict(self):
+        """Guardar una copia desactualizada lanza ConcurrentModificationError"""
+        first = self.repository.get_by_id(self.session.id)
+        second = self.repository.get_by_id(self.session.id)
+        self.assertEqual(first.version, 1)
+        
+        first.make_move(Position(0, 0), first.current_player)
+        self.assertTrue(self.repository.save(first))
+        self.assertEqual(first.version, 2)
+        
+        second.make_move(Position(1, 1), second.current_player)
+        with self.assertRaises(ConcurrentModificationError):
+            self.repository.save(second)
+        
+        stored = self.repository.get_by_id(self.session.id)
+        self.assertEqual(stored.move_count, 1)
+
+    def test_save_many_reports_conflicts(self):
+        """save_many marca como fallidas las sesiones desactualizadas"""
+        stale = self.repository.get_by_id(self.session.id)
+        self.repository.save(self.repository.get_by_id(self.session.id))
+        fresh = create_started_session("Carol", "Dave")
+        
+        results = self.repository.save_many([stale, fresh])
+        
+        self.assertFalse(results[stale.id])
+        self.assertTrue(results[fresh.id])
+        self.assertEqual(fresh.version, 1)
+
+    def test_use_case_retries_after_conflict(self):
+        """El caso de uso reaplica el movimiento sobre la versión actual"""
+        repository = self.repository
+
+        class InterferingRepository:
+            """Simula otra petición que guarda la sesión antes que el caso de uso."""
+            interfered = False
+
+            def get_by_id(self, session_id):
+                return repository.get_by_id(session_id)
+
+            def save(self, game_session):
+                if not self.interfered:
+                    self.interfered = True
+                    other = repository.get_by_id(game_session.id)
+                    repository.save(other)
+                return repository.save(game_session)
+        
+        use_case = MakeMoveUseCase(InterferingRepository())
+        response = use_case.execute(MakeMoveRequest(
+            game_session_id=self.session.id,
+            player_id=self.session.player_x.id,
+            row=0,
+            col=0
+        ))
+        
+        self.assertTrue(response.success)
+        self.assertEqual(response.game_session.version, 3)
+        self.assertEqual(self.repository.get_by_id(self.session.id).move_count, 1)
+
+    def test_use_case_reports_persistent_conflict(self):
+        """Si el conflicto persiste, la respuesta lo indica"""
+        class ConflictingRepository:
+            def get_by_id(inner_self, session_id):
+                return self.repository.get_by_id(session_id)
+
+            def save(inner_self, game_session):
+                raise ConcurrentModificationError(game_session.id)
+        
+        response = MakeMoveUseCase(ConflictingRepository()).execute(MakeMoveRequest(
+            game_session_id=self.session.id,
+            player_id=self.session.player_x.id,
+            row=0,
+            col=0
+        ))
+        
+        self.assertFalse(response.success)
+        self.assertTrue(response.conflict)
+
+    def test_use_case_batch_saves_each_session_once(self):
+        """execute_batch lee y guarda cada sesión una vez, con resultados por movimiento"""
+        other = create_started_session("Carol", "Dave")
+        self.repository.save(other)
+        repository = self.repository
+
+        class CountingRepository:
+            """Cuenta las lecturas y escrituras del caso de uso."""
+            def __init__(self):
+                self.reads = []
+                self.writes = []
+
+            def get_by_id(self, session_id):
+                self.reads.append(session_id)
+                return repository.get_by_id(session_id)
+
+            def save(self, game_session):
+                self.writes.append(game_session.id)
+                return repository.save(game_session)
+        
+        counting = CountingRepository()
+        x1, o1 = self.session.player_x.id, self.session.player_o.id
+        x2 = other.player_x.id
+        response = MakeMoveUseCase(counting).execute_batch([
+            MakeMoveRequest(game_session_id=self.session.id, player_id=x1, row=0, col=0),
+            MakeMoveRequest(game_session_id=other.id, player_id=x2, row=1, col=1),
+            MakeMoveRequest(game_session_id=self.session.id, player_id=o1, row=0, col=0),
+            MakeMoveRequest(game_session_id=self.session.id, player_id=o1, row=2, col=2),
+            MakeMoveRequest(game_session_id=self.session.id, player_id=x1, row=9, col=0),
+        ])
+        
+        self.assertFalse(response.success)
+        self.assertEqual(
+            [result.success for result in response.results],
+            [True, True, False, True, False]
+        )
+        self.assertEqual(response.message, "3 de 5 movimientos realizados")
+        self.assertTrue(response.errors[0].startswith("Movimiento 2:"))
+        self.assertEqual(sorted(counting.reads), sorted([self.session.id, other.id]))
+        self.assertEqual(sorted(counting.writes), sorted([self.session.id, other.id]))
+        self.assertEqual(self.repository.get_by_id(self.session.id).move_count, 2)
+        self.assertEqual(self.repository.get_by_id(other.id).move_count, 1)
+
+    def test_use_case_rejects_non_integer_coordinates(self):
+        """Las coordenadas que no son enteras dan un error por movimiento, no una excepción"""
+        x1 = self.session.player_x.id
+        response = MakeMoveUseCase(self.repository).execute_batch([
+            MakeMoveRequest(game_session_id=self.session.id, player_id=x1, row=0, col=0),
+            MakeMoveRequest(game_session_id=self.session.id, player_id=x1, row="x", col=None),
+            MakeMoveRequest(game_session_id=self.session.id, player_id=x1, row=True, col=1),
+        ])
+        
+        self.assertEqual([result.success for result in response.results], [True, False, False])
+        self.assertIn("La fila debe ser un entero entre 0 y 2", response.results[1].errors)
+        self.assertIn("La columna debe ser un entero entre 0 y 2", response.results[1].errors)
+        self.assertEqual(self.repository.get_by_id(self.session.id).move_count, 1)
+        
+        single = MakeMoveUseCase(self.repository).execute(
+            MakeMoveRequest(game_session_id=self.session.id, player_id=x1, row=None, col=2)
+        )
+        self.assertFalse(single.success)
+
+
+
+class TestSessionStateIndex(unittest.TestCase):
+    """Tests del índice de sesiones por estado y del listado paginado."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        self.storage = MemoryStorage()
+        self.repository = GameRepository(self.storage)
+        self.sessions = [create_started_session(f"Ana {i}", f"Bea {i}") for i in range(5)]
+        for session in self.sessions:
+            self.repository.save(session)
+
+    def test_storage_index_follows_writes(self):
+        """El índice se actualiza al guardar, cambiar de valor y eliminar"""
+        self.storage.save("items", "a", {"color": "rojo"})
+        self.storage.create_index("items", "color")
+        self.storage.save_many("items", {"b": {"color": "rojo"}, "c": {"color": "azul"}})
+        self.assertEqual(self.storage.count_index("items", "color", "rojo"), 2)
+        
+        self.storage.save("items", "a", {"color": "azul"})
+        self.storage.delete("items", "c")
+        self.assertEqual([key for key, _ in self.storage.query_index("items", "color", "azul")], ["a"])
+        self.assertEqual(self.storage.query_index("items", "color", "rojo")[0][1]["color"], "rojo")
+        
+        with self.assertRaises(ValueError):
+            self.storage.query_index("items", "size", 1)
+
+    def test_list_by_state_paginates_with_cursor(self):
+        """Las páginas recorren todas las sesiones del estado sin repetir"""
+        seen = []
+        summaries, cursor = self.repository.list_by_state(GameState.IN_PROGRESS, limit=2)
+        seen.extend(summaries)
+        while cursor is not None:
+            summaries, cursor = self.repository.list_by_state(GameState.IN_PROGRESS, cursor, limit=2)
+            seen.extend(summaries)
+        
+        self.assertEqual(sorted(summary['id'] for summary in seen), sorted(s.id for s in self.sessions))
+        self.assertEqual(seen[0]['players'][0]['symbol'], 'X')
+        self.assertEqual(self.repository.count_by_state(GameState.IN_PROGRESS), 5)
+        self.assertEqual(self.repository.list_by_state(GameState.FINISHED), ([], None))
+
+    def test_summaries_are_cached_per_version(self):
+        """El resumen se reutiliza hasta que la sesión cambia de versión"""
+        first, _ = self.repository.list_by_state(GameState.IN_PROGRESS, limit=5)
+        again, _ = self.repository.list_by_state(GameState.IN_PROGRESS, limit=5)
+        self.assertIs(first[0], again[0])
+        
+        session = self.repository.get_by_id(first[0]['id'])
+        session.make_move(Position(0, 0), session.current_player)
+        self.repository.save(session)
+        
+        updated, _ = self.repository.list_by_state(GameState.IN_PROGRESS, limit=5)
+        changed = next(summary for summary in updated if summary['id'] == session.id)
+        self.assertEqual(changed['move_count'], 1)
+        self.assertEqual(len(self.repository.find_active_sessions()), 5)
+
+
+class TestPlayerRepository(unittest.TestCase):
+    """Tests para el repositorio de jugadores y su clasificación."""
+
+    def setUp(self):
+        """Configuración antes de cada test."""
+        self.storage = MemoryStorage()
+        self.repository = PlayerRepository(self.storage)
+
+    def create_player(self, name, wins=0, losses=0, draws=0):
+        """Crea y guarda un jugador con las estadísticas indicadas."""
+        player = Player(name)
+        for _ in range(wins):
+            player.record_game_won()
+        for _ in range(losses):
+            player.record_game_lost()
+        for _ in range(draws):
+            player.record_game_drawn()
+        self.repository.save(player)
+        return player
+
+    def test_save_and_get_by_id(self):
+        """Un jugador guardado se recupera con sus estadísticas"""
+        player = self.create_player("Alice", wins=2, losses=1)
+        
+        restored = self.repository.get_by_id(player.id)
+        
+        self.assertEqual(restored.name, "Alice")
+        self.assertEqual(restored.stats, player.stats)
+        self.assertTrue(self.repository.exists_by_name("alice"))
+
+    def test_top_players_match_full_sort(self):
+        """La clasificación indexada coincide con ordenar todos los jugadores"""
+        self.create_player("Alice", wins=3, losses=1)
+        self.create_player("Bob", wins=1, losses=1)
+        self.create_player("Carol", wins=6, losses=2)
+        self.create_player("Dave")
+        
+        expected = sorted(
+            [p for p in self.repository.get_all() if p.stats.games_played > 0],
+            key=lambda p: (p.stats.win_rate, p.stats.games_played),
+            reverse=True
+        )
+        
+        top = self.repository.get_top_players(10)
+        self.assertEqual([p.name for p in top], [p.name for p in expected])
+        self.assertEqual([p.name for p in top], ["Carol", "Alice", "Bob"])
+
+    def test_index_updates_incrementally(self):
+        """Guardar nuevas estadísticas reordena la clasificación"""
+        alice = self.create_player("Alice", wins=1, losses=1)
+        bob = self.create_player("Bob", wins=2, losses=1)
+        self.assertEqual(self.repository.get_rank(alice.id), 2)
+        
+        alice.record_game_won()
+        alice.record_game_won()
+        self.repository.save(alice)
+        
+        self.assertEqual(self.repository.get_rank(alice.id), 1)
+        self.assertEqual(self.repository.get_rank(bob.id), 2)
+        self.assertEqual(self.repository.get_ranked_count(), 2)
+        
+        self.repository.delete(alice.id)
+        self.assertIsNone(self.repository.get_rank(alice.id))
+        self.assertEqual(self.repository.get_rank(bob.id), 1)
+        self.assertFalse(self.repository.exists_by_name("Alice"))
+
+    def test_name_index_keeps_players_with_the_same_name(self):
+        """Borrar un jugador no oculta a otro con el mismo nombre"""
+        first = self.create_player("Alice")
+        second = self.create_player("alice")
+
+        self.repository.delete(second.id)
+        self.assertTrue(self.repository.exists_by_name("Alice"))
+
+        self.repository.delete(first.id)
+        self.assertFalse(self.repository.exists_by_name("Alice"))
+
+    def test_indexes_rebuilt_from_storage(self):
+        """Un repositorio nuevo reconstruye los índices del almacenamiento"""
+        alice = self.create_player("Alice", wins=1)
+        
+        repository = PlayerRepository(self.storage)
+        
+        self.assertEqual(repository.get_rank(alice.id), 1)
+        self.assertTrue(repository.exists_by_name("Alice"))
+
+    def test_use_case_uses_indexed_ranking(self):
+        """ManagePlayersUseCase obtiene el ranking del repositorio"""
+        self.create_player("Alice", wins=1, losses=3)
+        self.create_player("Bob", wins=3, losses=1)
+        
+        response = ManagePlayersUseCase(self.repository).get_top_players(limit=1)
+        
+        self.assertTrue(response.success)
+        self.assertEqual([p.name for p in response.players], ["Bob"])
+
+
+if __name__ == "__main__":
+    unittest.main()